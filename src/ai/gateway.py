@@ -8,11 +8,16 @@ Provides a single interface for all AI operations with:
 - Usage tracking
 """
 
-from collections.abc import AsyncIterator
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Optional
 
+from src.ai.cost import CostCalculator
+from src.core.telemetry import Span, get_telemetry
+
 
 class AICapability(str, Enum):
     """AI capabilities that providers can support."""
@@ -199,7 +204,9 @@ class AIGateway:
         last_error = None
         for p in providers:
             try:
-                response = await p.generate(prompt, config)
+                with self._observe(p.name, "generate") as span:
+                    response = await p.generate(prompt, config)
+                    self._record_response(span, response)
                 self._log_usage(p.name, "generate", response.usage)
                 return response
             except Exception as e:
@@ -240,7 +247,9 @@ class AIGateway:
         last_error = None
         for p in providers:
             try:
-                response = await p.chat(messages, config)
+                with self._observe(p.name, "chat") as span:
+                    response = await p.chat(messages, config)
+                    self._record_response(span, response)
                 self._log_usage(p.name, "chat", response.usage)
                 return response
             except Exception as e:
@@ -310,7 +319,8 @@ class AIGateway:
         last_error = None
         for p in providers:
             try:
-                embeddings = await p.embed(texts)
+                with self._observe(p.name, "embed", {"ai.texts": len(texts)}):
+                    embeddings = await p.embed(texts)
                 self._log_usage(p.name, "embed", {"texts": len(texts)})
                 return embeddings
             except Exception as e:
@@ -321,6 +331,54 @@ class AIGateway:
 
         raise RuntimeError(f"All providers failed. Last error: {last_error}")
 
+    @contextmanager
+    def _observe(
+        self, provider: str, operation: str, attributes: dict | None = None
+    ) -> Iterator[Span]:
+        """Trace one provider call and record its latency and outcome."""
+        telemetry = get_telemetry()
+        metric_attributes = {"ai.provider": provider, "ai.operation": operation}
+        outcome = "error"
+        started = time.perf_counter()
+        try:
+            span_attributes = {**metric_attributes, **(attributes or {})}
+            with telemetry.span(f"ai.{operation}", span_attributes) as span:
+                yield span
+            outcome = "success"
+        finally:
+            metric_attributes["outcome"] = outcome
+            telemetry.add("skynette.ai.requests", 1, metric_attributes)
+            telemetry.record(
+                "skynette.ai.duration", (time.perf_counter() - started) * 1000, metric_attributes
+            )
+
+    def _record_response(self, span: Span, response: AIResponse):
+        """Record token usage and estimated cost of a response."""
+        telemetry = get_telemetry()
+        if not telemetry.enabled:
+            return
+        usage = response.usage or {}
+        prompt_tokens = int(usage.get("prompt_tokens") or 0)
+        completion_tokens = int(usage.get("completion_tokens") or 0)
+        cost = CostCalculator().calculate_cost(
+            response.provider, response.model, prompt_tokens, completion_tokens
+        )
+        span.set_attributes(
+            {
+                "ai.model": response.model,
+                "ai.prompt_tokens": prompt_tokens,
+                "ai.completion_tokens": completion_tokens,
+                "ai.cost_usd": cost,
+            }
+        )
+        attributes = {"ai.provider": response.provider, "ai.model": response.model}
+        telemetry.add("skynette.ai.tokens", prompt_tokens, {**attributes, "token.type": "input"})
+        telemetry.add(
+            "skynette.ai.tokens", completion_tokens, {**attributes, "token.type": "output"}
+        )
+        if cost:
+            telemetry.add("skynette.ai.cost", cost, attributes)
+
     def _log_usage(self, provider: str, operation: str, usage: dict):
         """Log usage for tracking."""
         self._usage_log.append(
@@ -19,8 +19,11 @@ PROJECT_ROOT = Path(__file__).parent.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from src.core.blobs import DEFAULT_BLOB_GRACE_PERIOD, encode_blob_refs, materialize
 from src.core.workflow.executor import WorkflowExecutor
 from src.core.workflow.models import Workflow
+from src.core.workflow.profiler import PHASES, performance_report, to_chrome_trace
+from src.core.workflow.queue import DEFAULT_WORKERS, DEFAULT_WORKFLOW_CONCURRENCY
 from src.data.storage import get_storage
 
 
@@ -118,6 +121,7 @@ async def cmd_run(args):
 
     executor = WorkflowExecutor()
     execution = await executor.execute(workflow, trigger_data=trigger_data, trigger_type="cli")
+    await executor.node_registry.close_pools()
 
     # Print results
     print("-" * 50)
@@ -143,7 +147,7 @@ async def cmd_run(args):
         )
 
         if args.verbose and result.data:
-            data_str = json.dumps(result.data, indent=4, default=str)
+            data_str = json.dumps(result.data, indent=4, default=encode_blob_refs)
             for line in data_str.split("\n"):
                 print(f"      {Colors.DIM}{line}{Colors.RESET}")
 
@@ -163,7 +167,9 @@ async def cmd_run(args):
             "status": execution.status,
             "duration_ms": execution.duration_ms,
             "error": execution.error,
-            "results": {r.node_id: r.data for r in execution.node_results if r.success},
+            "results": {
+                r.node_id: materialize(r.data) for r in execution.node_results if r.success
+            },
         }
 
         if args.output == "-":
@@ -194,6 +200,14 @@ async def cmd_exec(args):
             print(f"{Colors.RED}Error: Invalid JSON data{Colors.RESET}")
             return 1
 
+    if getattr(args, "queue", False):
+        from src.core.workflow.queue import get_execution_queue
+
+        run_id = get_execution_queue().enqueue(workflow.id, trigger_data, trigger_type="manual")
+        print(f"{Colors.GREEN}Queued: {workflow.name}{Colors.RESET} (execution {run_id})")
+        print(f"{Colors.DIM}Start workers with: skynette worker{Colors.RESET}")
+        return 0
+
     print(f"{Colors.CYAN}Executing: {workflow.name}{Colors.RESET}")
     print("-" * 50)
 
@@ -203,6 +217,7 @@ async def cmd_exec(args):
     start_node = args.resume_from if hasattr(args, "resume_from") else None
 
     execution = await executor.execute(workflow, trigger_data=trigger_data, trigger_type="cli")
+    await executor.node_registry.close_pools()
 
     # Save execution
     storage.save_execution(execution)
@@ -218,6 +233,32 @@ async def cmd_exec(args):
     return 0 if execution.status == "completed" else 1
 
 
+async def cmd_worker(args):
+    """Run execution queue workers until interrupted."""
+    from src.core.nodes.manifest import iter_builtin_node_classes
+    from src.core.workflow.process_pool import get_cpu_pool
+    from src.core.workflow.queue import get_execution_queue
+
+    cpu_pool = get_cpu_pool()
+    cpu_pool.configure(max_workers=args.cpu_workers)
+    cpu_nodes = [cls for cls in iter_builtin_node_classes() if cls.execution_affinity == "cpu"]
+    processes = await cpu_pool.warm_up(cpu_nodes)
+
+    queue = get_execution_queue()
+    queue.workflow_concurrency = args.per_workflow
+    queue.start(workers=args.workers)
+    print(
+        f"{Colors.CYAN}Processing queued executions with {args.workers} workers "
+        f"and {processes} CPU node processes (Ctrl+C to stop){Colors.RESET}"
+    )
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await queue.stop()
+        cpu_pool.shutdown()
+    return 0
+
+
 def cmd_list(args):
     """List all workflows."""
     storage = get_storage()
@@ -347,6 +388,82 @@ def cmd_export(args):
     return 0
 
 
+def cmd_trace(args):
+    """Export an execution's timeline as Chrome trace JSON."""
+    storage = get_storage()
+    execution = storage.load_execution(args.execution_id)
+
+    if not execution:
+        print(f"{Colors.RED}Error: Execution not found: {args.execution_id}{Colors.RESET}")
+        return 1
+
+    trace = to_chrome_trace(execution, storage.load_workflow(execution.workflow_id))
+    trace_json = json.dumps(trace, indent=2)
+
+    if args.output == "-":
+        print(trace_json)
+    else:
+        output_path = Path(args.output)
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(trace_json)
+        print(f"{Colors.GREEN}Trace written to {output_path}{Colors.RESET}")
+        print(f"{Colors.DIM}Open it in chrome://tracing or ui.perfetto.dev{Colors.RESET}")
+
+    return 0
+
+
+def cmd_profile(args):
+    """Show which nodes of a workflow take the most time across its recent runs."""
+    storage = get_storage()
+    workflow = storage.load_workflow(args.workflow_id)
+    executions = storage.load_executions(args.workflow_id, limit=args.limit)
+    report = performance_report(executions)
+
+    if not report:
+        print(f"{Colors.YELLOW}No profiled executions found.{Colors.RESET}")
+        return 0
+
+    names = {node.id: node.name for node in workflow.nodes} if workflow else {}
+    grand_total = sum(entry.total_ms for entry in report) or 1.0
+    shown_phases = [phase for phase in PHASES if any(e.phase_ms.get(phase) for e in report)]
+
+    print(f"{Colors.BOLD}Node Performance ({len(executions)} runs):{Colors.RESET}")
+    print()
+    for entry in report:
+        name = names.get(entry.node_id, entry.node_id)
+        share = entry.total_ms / grand_total * 100
+        print(f"  {Colors.CYAN}{name}{Colors.RESET}  {share:.0f}% of node time")
+        print(
+            f"           Runs: {entry.runs}  |  Failures: {entry.failures}  |  "
+            f"p50: {format_duration(entry.p50_ms)}  |  p95: {format_duration(entry.p95_ms)}  |  "
+            f"max: {format_duration(entry.max_ms)}"
+        )
+        phases = "  ".join(
+            f"{phase} {format_duration(entry.phase_ms.get(phase, 0.0))}" for phase in shown_phases
+        )
+        print(f"           {Colors.DIM}Mean per run: {phases}{Colors.RESET}")
+        if entry.mean_bytes_in is not None or entry.mean_bytes_out is not None:
+            # ">=" marks means of estimates that stopped at the spill threshold
+            at_least_in = ">=" if entry.bytes_in_truncated else ""
+            at_least_out = ">=" if entry.bytes_out_truncated else ""
+            print(
+                f"           {Colors.DIM}Mean bytes in: "
+                f"{at_least_in}{entry.mean_bytes_in or 0:.0f}  |  "
+                f"out: {at_least_out}{entry.mean_bytes_out or 0:.0f}{Colors.RESET}"
+            )
+        print()
+
+    return 0
+
+
+def cmd_gc(args):
+    """Delete spilled node outputs no longer referenced by execution history."""
+    storage = get_storage()
+    deleted = storage.prune_blobs(min_age=args.min_age)
+    print(f"{Colors.GREEN}Deleted {deleted} unreferenced blobs.{Colors.RESET}")
+    return 0
+
+
 def cmd_credentials(args):
     """Manage credentials."""
     from src.data.credentials import CredentialVault
@@ -397,6 +514,34 @@ def cmd_credentials(args):
 # ==================== Main Entry Point ====================
 
 
+def print_startup_profile():
+    """Print how long the node registry takes to start and what lazy loading saves."""
+    from src.core.nodes.manifest import profile_startup
+
+    report = profile_startup()
+
+    print(f"{Colors.BOLD}Startup profile:{Colors.RESET}")
+    print(f"  Node types:        {report['node_count']} ({report['lazy_node_count']} lazy)")
+    print(f"  Registry startup:  {report['registry_ms']:.1f}ms")
+    print(
+        f"  Import time saved: {Colors.GREEN}{report['deferred_import_ms']:.1f}ms{Colors.RESET} "
+        f"({report['module_count']} node modules deferred)"
+    )
+    if report["slowest_modules"]:
+        print(f"  {Colors.DIM}Slowest node modules:{Colors.RESET}")
+        for module, duration_ms in report["slowest_modules"]:
+            print(f"    {duration_ms:7.1f}ms  {module}")
+    print()
+
+
+def _run_until_interrupted(coro) -> int:
+    """Run a long-lived command, exiting cleanly on Ctrl+C."""
+    try:
+        return asyncio.run(coro)
+    except KeyboardInterrupt:
+        return 0
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -409,15 +554,23 @@ Examples:
   skynette run workflow.yaml -d '{"key":"value"}'  Run with trigger data
   skynette list                           List saved workflows
   skynette exec abc123                    Execute workflow by ID
+  skynette exec abc123 --queue            Queue workflow for a worker
+  skynette worker -n 4                    Process queued executions
   skynette history                        Show execution history
   skynette validate workflow.yaml         Validate a workflow file
   skynette export abc123 -o workflow.yaml Export workflow to file
+  skynette gc                             Delete unreferenced spilled outputs
         """,
     )
 
     parser.add_argument("--version", action="version", version="Skynette CLI 2.0.0")
     parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose output")
     parser.add_argument("--no-banner", action="store_true", help="Suppress banner")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Report node registry startup time and the import time saved by lazy loading",
+    )
 
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
@@ -436,8 +589,29 @@ Examples:
     exec_parser.add_argument("workflow_id", help="Workflow ID")
     exec_parser.add_argument("-d", "--data", help="Trigger data as JSON string")
     exec_parser.add_argument("--resume-from", help="Resume from specific node ID")
+    exec_parser.add_argument(
+        "--queue", action="store_true", help="Add to the execution queue instead of running now"
+    )
     exec_parser.set_defaults(func=lambda args: asyncio.run(cmd_exec(args)))
 
+    # Worker command
+    worker_parser = subparsers.add_parser("worker", help="Process queued executions")
+    worker_parser.add_argument(
+        "-n", "--workers", type=int, default=DEFAULT_WORKERS, help="Number of concurrent workers"
+    )
+    worker_parser.add_argument(
+        "--per-workflow",
+        type=int,
+        default=DEFAULT_WORKFLOW_CONCURRENCY,
+        help="Maximum concurrent runs per workflow",
+    )
+    worker_parser.add_argument(
+        "--cpu-workers",
+        type=int,
+        help="Processes for CPU-bound nodes (default: one per core, less one)",
+    )
+    worker_parser.set_defaults(func=lambda args: _run_until_interrupted(cmd_worker(args)))
+
     # List command
     list_parser = subparsers.add_parser("list", aliases=["ls"], help="List saved workflows")
     list_parser.set_defaults(func=cmd_list)
@@ -459,6 +633,36 @@ Examples:
     export_parser.add_argument("-o", "--output", default="-", help="Output file (- for stdout)")
     export_parser.set_defaults(func=cmd_export)
 
+    # Trace command
+    trace_parser = subparsers.add_parser(
+        "trace", help="Export an execution's timeline as Chrome trace JSON"
+    )
+    trace_parser.add_argument("execution_id", help="Execution ID")
+    trace_parser.add_argument("-o", "--output", default="-", help="Output file (- for stdout)")
+    trace_parser.set_defaults(func=cmd_trace)
+
+    # Profile command
+    profile_parser = subparsers.add_parser(
+        "profile", help="Show which nodes of a workflow take the most time"
+    )
+    profile_parser.add_argument("workflow_id", help="Workflow ID")
+    profile_parser.add_argument(
+        "-n", "--limit", type=int, default=1000, help="Number of recent runs to include"
+    )
+    profile_parser.set_defaults(func=cmd_profile)
+
+    # GC command
+    gc_parser = subparsers.add_parser(
+        "gc", help="Delete spilled node outputs no execution refers to"
+    )
+    gc_parser.add_argument(
+        "--min-age",
+        type=float,
+        default=DEFAULT_BLOB_GRACE_PERIOD,
+        help="Keep blobs written less than this many seconds ago (runs may still use them)",
+    )
+    gc_parser.set_defaults(func=cmd_gc)
+
     # Credentials command
     creds_parser = subparsers.add_parser(
         "credentials", aliases=["creds"], help="Manage credentials"
@@ -476,6 +680,11 @@ Examples:
     if not args.no_banner and args.command:
         print_banner()
 
+    if args.profile_startup:
+        print_startup_profile()
+        if not args.command:
+            sys.exit(0)
+
     # Execute command
     if args.command:
         sys.exit(args.func(args))
@@ -0,0 +1,323 @@
+"""
+Blob Store
+
+Content-addressed storage for large node outputs. When a node's output is
+bigger than the spill threshold, the executor writes it to
+``~/.skynette/blobs`` and keeps only a BlobRef in the execution context. The
+ref loads the value the first time an expression reads it.
+
+Execution history stores refs as ``{"$blob": "<sha256>", "size": <bytes>}``.
+Blobs no execution in history refers to any more are deleted by a
+mark-and-sweep (see ``WorkflowStorage.prune_blobs``), which runs when a
+workflow is deleted and from ``skynette gc``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Outputs whose JSON encoding is at least this many bytes are spilled to disk
+DEFAULT_SPILL_THRESHOLD = 1024 * 1024
+
+# Key identifying a serialized BlobRef
+BLOB_KEY = "$blob"
+
+# Blobs written or reused more recently than this (seconds) are never pruned:
+# runs still in progress haven't saved their refs to history yet
+DEFAULT_BLOB_GRACE_PERIOD = 3600
+
+
+class BlobRef:
+    """Lazy reference to a value in the blob store."""
+
+    __slots__ = ("sha", "size", "store", "_value", "_loaded")
+
+    def __init__(self, sha: str, size: int, store: "BlobStore"):
+        self.sha = sha
+        self.size = size
+        self.store = store
+        self._value: Any = None
+        self._loaded = False
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the value has been read from disk."""
+        return self._loaded
+
+    def load(self) -> Any:
+        """
+        Read the value from the store and keep it for later calls.
+
+        Use ``store.read(ref.sha)`` for a one-off read that doesn't stay in memory.
+        """
+        if not self._loaded:
+            self._value = self.store.read(self.sha)
+            self._loaded = True
+        return self._value
+
+    def to_json(self) -> dict:
+        """Get the form stored in execution history."""
+        return {BLOB_KEY: self.sha, "size": self.size}
+
+    def __getstate__(self):
+        # Never send the loaded value along (e.g. to a worker process)
+        return {"sha": self.sha, "size": self.size, "root": str(self.store.root)}
+
+    def __setstate__(self, state: dict):
+        self.sha = state["sha"]
+        self.size = state["size"]
+        self.store = BlobStore(state["root"])
+        self._value = None
+        self._loaded = False
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, BlobRef) and other.sha == self.sha
+
+    def __hash__(self) -> int:
+        return hash(self.sha)
+
+    def __repr__(self) -> str:
+        return f"BlobRef({self.sha[:12]}, {self.size} bytes)"
+
+
+class BlobStore:
+    """Content-addressed JSON blobs, one file per value."""
+
+    def __init__(self, root: str | Path | None = None):
+        if root:
+            self.root = Path(root)
+        else:
+            self.root = Path.home() / ".skynette" / "blobs"
+
+    def _path(self, sha: str) -> Path:
+        return self.root / sha[:2] / sha
+
+    def put(self, value: Any) -> BlobRef:
+        """
+        Store a JSON-serializable value.
+
+        Raises:
+            TypeError: If the value is not JSON-serializable
+        """
+        return self.put_encoded(json.dumps(value).encode("utf-8"))
+
+    def put_encoded(self, encoded: bytes) -> BlobRef:
+        """Store an already JSON-encoded value."""
+        sha = hashlib.sha256(encoded).hexdigest()
+        path = self._path(sha)
+        if path.exists():
+            # Reused by this run, so keep it out of the next prune's reach
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file first so readers never see a partial blob
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(encoded)
+                os.replace(tmp, path)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+        return BlobRef(sha, len(encoded), self)
+
+    def read(self, sha: str) -> Any:
+        """
+        Read a stored value.
+
+        Raises:
+            FileNotFoundError: If the blob does not exist
+        """
+        with open(self._path(sha), "rb") as f:
+            return json.loads(f.read())
+
+    def ref(self, sha: str, size: int = 0) -> BlobRef:
+        """Get a ref to a stored value."""
+        return BlobRef(sha, size, self)
+
+    def from_json(self, value: Any) -> Any:
+        """Turn a serialized ref (see BlobRef.to_json) back into a BlobRef."""
+        if is_blob_json(value):
+            return self.ref(value[BLOB_KEY], value.get("size", 0))
+        return value
+
+    def exists(self, sha: str) -> bool:
+        """Check whether a blob is stored."""
+        return self._path(sha).exists()
+
+    def modified_at(self, sha: str) -> float | None:
+        """When a blob was last written or reused (Unix time), or None if it doesn't exist."""
+        try:
+            return self._path(sha).stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    def delete(self, sha: str) -> bool:
+        """Delete a blob. Returns False if it did not exist."""
+        try:
+            self._path(sha).unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
+    def shas(self) -> Iterator[str]:
+        """Iterate over the SHAs of all stored blobs."""
+        if not self.root.is_dir():
+            return
+        for directory in self.root.iterdir():
+            if not directory.is_dir():
+                continue
+            for path in directory.iterdir():
+                if not path.name.startswith(".tmp-"):
+                    yield path.name
+
+    def prune(self, keep: Iterable[str], min_age: float = DEFAULT_BLOB_GRACE_PERIOD) -> int:
+        """
+        Delete blobs that are not in ``keep``.
+
+        Args:
+            keep: SHAs of the blobs still referenced
+            min_age: Skip blobs written or reused less than this many seconds ago
+
+        Returns:
+            The number of blobs deleted
+        """
+        keep = set(keep)
+        cutoff = time.time() - min_age
+        deleted = 0
+        for sha in list(self.shas()):
+            if sha in keep:
+                continue
+            modified = self.modified_at(sha)
+            if modified is None or modified > cutoff:
+                continue
+            if self.delete(sha):
+                deleted += 1
+        if deleted:
+            logger.info(f"Pruned {deleted} unreferenced blobs from {self.root}")
+        return deleted
+
+    def spill(self, value: Any, threshold: int = DEFAULT_SPILL_THRESHOLD) -> Any:
+        """
+        Move a value to the store if it is large.
+
+        Args:
+            value: A node output
+            threshold: Minimum JSON size, in bytes, to spill
+
+        Returns:
+            A BlobRef if the value was spilled, otherwise the value itself.
+            Values that are not JSON-serializable are never spilled.
+        """
+        if isinstance(value, BlobRef) or estimate_size(value, threshold) < threshold:
+            return value
+        try:
+            encoded = json.dumps(value).encode("utf-8")
+        except (TypeError, ValueError):
+            return value
+        if len(encoded) < threshold:
+            return value
+        try:
+            ref = self.put_encoded(encoded)
+        except OSError as e:
+            logger.warning(f"Could not spill {len(encoded)} byte output to disk: {e}")
+            return value
+        logger.debug(f"Spilled {ref.size} byte output to blob {ref.sha[:12]}")
+        return ref
+
+
+def estimate_size(value: Any, limit: int) -> int:
+    """
+    Roughly estimate the JSON size of a value, without encoding it.
+
+    Stops counting once the estimate reaches ``limit``.
+    """
+    total = 0
+    stack = [value]
+    while stack and total < limit:
+        item = stack.pop()
+        if isinstance(item, str | bytes):
+            total += len(item) + 2
+        elif isinstance(item, dict):
+            total += 2
+            for key, child in item.items():
+                total += len(str(key)) + 4
+                stack.append(child)
+        elif isinstance(item, list | tuple):
+            total += 2 + len(item)
+            stack.extend(item)
+        else:
+            total += 8
+    return total
+
+
+def get_spill_threshold(settings: dict | None) -> int:
+    """
+    Read the spill threshold from workflow settings.
+
+    ``settings["spill_threshold"]`` is a size in bytes; 0 turns spilling off.
+    """
+    value = (settings or {}).get("spill_threshold", DEFAULT_SPILL_THRESHOLD)
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid spill_threshold {value!r}, using {DEFAULT_SPILL_THRESHOLD}")
+        return DEFAULT_SPILL_THRESHOLD
+
+
+def is_blob_json(value: Any) -> bool:
+    """Check whether a value is a serialized BlobRef."""
+    return isinstance(value, dict) and isinstance(value.get(BLOB_KEY), str) and len(value) <= 2
+
+
+def find_blob_refs(value: Any) -> set[str]:
+    """Get the SHAs of the serialized BlobRefs anywhere inside a JSON value."""
+    shas = set()
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            if is_blob_json(item):
+                shas.add(item[BLOB_KEY])
+            else:
+                stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return shas
+
+
+def materialize(value: Any) -> Any:
+    """Load a BlobRef; any other value is returned as is."""
+    if isinstance(value, BlobRef):
+        return value.load()
+    return value
+
+
+def encode_blob_refs(value: Any) -> Any:
+    """JSON ``default`` hook that writes BlobRefs in their serialized form."""
+    if isinstance(value, BlobRef):
+        return value.to_json()
+    return str(value)
+
+
+# Global blob store instance
+_blob_store: BlobStore | None = None
+
+
+def get_blob_store() -> BlobStore:
+    """Get the global blob store."""
+    global _blob_store
+    if _blob_store is None:
+        _blob_store = BlobStore()
+    return _blob_store
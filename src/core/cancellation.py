@@ -0,0 +1,227 @@
+"""
+Cancellation
+
+Cancellation tokens and deadlines for workflow runs. Each execution gets a
+CancellationToken, passed to nodes as ``$cancel`` in their context. Cancelling
+it (``WorkflowExecutor.cancel()``), or reaching the run's deadline
+(``settings["deadline_seconds"]``), cancels the tasks of every running node
+and marks the execution ``cancelled``.
+
+Workflows run from inside another workflow (Execute Workflow, Map) inherit the
+parent run's token: cancelling the parent cancels them, and their deadline is
+never later than the parent's.
+
+Nodes that start subprocesses use run_process(), which kills the process (and
+everything it started) when the node is cancelled.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import subprocess
+import time
+from collections.abc import Callable, Sequence
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for a killed subprocess to exit
+KILL_WAIT = 2.0
+
+
+class CancellationToken:
+    """Cancellation flag and optional deadline shared by everything in one run."""
+
+    def __init__(
+        self,
+        timeout: float | None = None,
+        parent: "CancellationToken | None" = None,
+    ):
+        """
+        Create a token.
+
+        Args:
+            timeout: Seconds from now until the run is cancelled, if any
+            parent: Token of the run this one is part of
+        """
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self.reason: str | None = None
+        self._event = asyncio.Event()
+        self._callbacks: list[Callable[[str], None]] = []
+        self._parent = parent
+
+        if parent is not None:
+            if parent.deadline is not None and (
+                self.deadline is None or parent.deadline < self.deadline
+            ):
+                self.deadline = parent.deadline
+            if parent.cancelled:
+                self.cancel(parent.reason)
+            else:
+                parent._callbacks.append(self.cancel)
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the run was cancelled or its deadline has passed."""
+        if self.reason is None and self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel("Deadline exceeded")
+        return self.reason is not None
+
+    def remaining(self) -> float | None:
+        """Seconds until the deadline (None if there is none)."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def cancel(self, reason: str = "Cancelled"):
+        """Cancel the run. Only the first reason is kept."""
+        if self.reason is not None:
+            return
+        self.reason = reason
+        self._event.set()
+        for callback in self._callbacks:
+            callback(reason)
+        self._callbacks.clear()
+
+    def raise_if_cancelled(self):
+        """
+        Raise if the run was cancelled.
+
+        Raises:
+            asyncio.CancelledError: With the cancellation reason
+        """
+        if self.cancelled:
+            raise asyncio.CancelledError(self.reason)
+
+    async def wait(self) -> str:
+        """Wait until the run is cancelled (not counting the deadline) and get the reason."""
+        await self._event.wait()
+        return self.reason
+
+    def detach(self):
+        """Stop following the parent token, once this token's run has finished."""
+        if self._parent is not None and self.cancel in self._parent._callbacks:
+            self._parent._callbacks.remove(self.cancel)
+        self._parent = None
+
+
+# Token of the run the current task belongs to
+_current_token: ContextVar[CancellationToken | None] = ContextVar(
+    "cancellation_token", default=None
+)
+
+
+def current_token() -> CancellationToken | None:
+    """Get the token of the run the current task belongs to."""
+    return _current_token.get()
+
+
+def set_current_token(token: CancellationToken | None):
+    """Set the current run's token; returns a ContextVar token for reset_current_token()."""
+    return _current_token.set(token)
+
+
+def reset_current_token(reset_token) -> None:
+    """Restore the token that was current before set_current_token()."""
+    _current_token.reset(reset_token)
+
+
+def get_deadline(settings: dict | None) -> float | None:
+    """
+    Read the run deadline from workflow settings.
+
+    ``settings["deadline_seconds"]`` is the most a run may take; 0 or unset means
+    no deadline.
+    """
+    value = (settings or {}).get("deadline_seconds")
+    if value in (None, ""):
+        return None
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid deadline_seconds {value!r}, ignoring")
+        return None
+    return seconds if seconds > 0 else None
+
+
+async def run_process(
+    cmd: Sequence[str] | str,
+    *,
+    shell: bool = False,
+    input: str | None = None,
+    timeout: float | None = None,
+    cwd: str | None = None,
+    env: dict | None = None,
+    token: CancellationToken | None = None,
+) -> subprocess.CompletedProcess:
+    """
+    Run a command and capture its text output, like ``subprocess.run``.
+
+    Unlike ``subprocess.run`` in a thread, the process is killed when the
+    calling task is cancelled. On POSIX the command gets its own process group,
+    so anything it started is killed too. The timeout is cut short by the run's
+    deadline.
+
+    Args:
+        cmd: Program and arguments, or a command line if ``shell`` is set
+        shell: Run the command line through the system shell
+        input: Text written to the process's stdin
+        timeout: Seconds to wait for the process
+        cwd: Working directory
+        env: Environment (defaults to this process's)
+        token: The run's token (defaults to the current run's)
+
+    Raises:
+        subprocess.TimeoutExpired: If the process ran past the timeout or deadline
+    """
+    token = token or current_token()
+    remaining = token.remaining() if token is not None else None
+    if remaining is not None and (timeout is None or remaining < timeout):
+        timeout = remaining
+
+    options = {
+        "stdin": subprocess.PIPE if input is not None else subprocess.DEVNULL,
+        "stdout": subprocess.PIPE,
+        "stderr": subprocess.PIPE,
+        "cwd": cwd,
+        "env": env,
+        "start_new_session": os.name != "nt",
+    }
+    if shell:
+        process = await asyncio.create_subprocess_shell(cmd, **options)
+    else:
+        process = await asyncio.create_subprocess_exec(*cmd, **options)
+    data = input.encode("utf-8") if input is not None else None
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(data), timeout=timeout)
+    except TimeoutError:
+        await _kill(process)
+        raise subprocess.TimeoutExpired(cmd, timeout) from None
+    except asyncio.CancelledError:
+        await _kill(process)
+        raise
+
+    return subprocess.CompletedProcess(
+        cmd,
+        process.returncode,
+        stdout.decode("utf-8", errors="replace"),
+        stderr.decode("utf-8", errors="replace"),
+    )
+
+
+async def _kill(process: asyncio.subprocess.Process):
+    """Kill a process and its process group, and reap it."""
+    if process.returncode is not None:
+        return
+    try:
+        if os.name != "nt":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+    try:
+        await asyncio.wait_for(process.wait(), timeout=KILL_WAIT)
+    except TimeoutError:
+        logger.warning(f"Process {process.pid} did not exit after being killed")
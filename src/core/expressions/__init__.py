@@ -1,17 +1,40 @@
 """Expression parser and evaluator."""
 
-from src.core.expressions.parser import (
+from src.core.expressions.batch import evaluate_batch, evaluate_items
+from src.core.expressions.compiler import (
+    CompiledExpression,
     ExpressionError,
+    ExpressionSyntaxError,
+    References,
+)
+from src.core.expressions.parser import (
     ExpressionParser,
+    compile_expression,
     evaluate_expression,
     get_parser,
     resolve_expressions,
 )
+from src.core.expressions.template import (
+    ConfigTemplate,
+    ConfigTemplateCache,
+    StringTemplate,
+    get_template_cache,
+)
 
 __all__ = [
     "ExpressionParser",
     "ExpressionError",
+    "ExpressionSyntaxError",
+    "CompiledExpression",
+    "References",
     "get_parser",
     "resolve_expressions",
     "evaluate_expression",
+    "compile_expression",
+    "ConfigTemplate",
+    "ConfigTemplateCache",
+    "StringTemplate",
+    "get_template_cache",
+    "evaluate_batch",
+    "evaluate_items",
 ]
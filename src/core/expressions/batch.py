@@ -0,0 +1,427 @@
+"""
+Batch Evaluation
+
+Evaluates a compiled expression for many contexts at once, such as once per
+element of a list, column by column instead of row by row.
+
+Each node of the expression's AST is evaluated once for the whole batch.
+Values shared by every row (literals, $vars, $nodes) are computed once, and
+per-row values are lists. Comparisons and arithmetic on columns of plain
+numbers run in NumPy when it is installed. Anything else runs in a Python
+loop with the same semantics as CompiledExpression.evaluate.
+
+``&&`` and ``||`` evaluate their right side only for the rows that need it,
+so guards like ``$item.x != null && $item.x > 5`` work as they do per row.
+Function calls still run once per row, since functions such as $uuid() must
+not be shared.
+"""
+
+from collections.abc import Callable, Mapping, Sequence
+from functools import cache
+from itertools import repeat
+from typing import Any
+
+from src.core.expressions.compiler import (
+    _MAPPING_ROOTS,
+    Binary,
+    Call,
+    CompiledExpression,
+    ExpressionError,
+    GetPath,
+    Literal,
+    Node,
+    Unary,
+    Variable,
+    arithmetic,
+    compare,
+    compile_node,
+    walk_path,
+)
+from src.core.expressions.template import StringTemplate
+
+# Batches smaller than this are evaluated row by row
+MIN_BATCH_SIZE = 32
+
+# Path segments walk_path treats specially, so columns can't use plain indexing
+_SPECIAL_SEGMENTS = frozenset({"length", "first", "last", "keys", "values"})
+
+# Values a path can end on without walk_path doing anything more (e.g. loading a blob)
+_PLAIN_TYPES = frozenset({str, int, float, bool, dict, list, type(None)})
+
+_DICT = frozenset({dict})
+_DICT_OR_NONE = frozenset({dict, type(None)})
+
+_COMPARISON_OPS = frozenset({"==", "!=", "<", "<=", ">", ">="})
+
+
+@cache
+def _numpy():
+    """NumPy, or None if it isn't installed."""
+    try:
+        import numpy
+
+        return numpy
+    except ImportError:
+        return None
+
+
+class _Const:
+    """A value shared by every row of a batch."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+# A column: one shared value, a list with one value per row, or a NumPy array
+Column = Any
+
+
+class _Batch:
+    """The rows being evaluated: per-row root values plus a shared context."""
+
+    def __init__(
+        self,
+        size: int,
+        rows: dict[str, list | range],
+        context: Mapping | None = None,
+        contexts: Sequence[Mapping] | None = None,
+    ):
+        self.size = size
+        self.rows = rows
+        self.context = context or {}
+        self.contexts = contexts
+
+    def root(self, name: str, default: Any) -> Column:
+        """Get the column of a context root, e.g. ``$item``."""
+        column = self.rows.get(name)
+        if isinstance(column, range):
+            column = self.rows[name] = list(column)
+        if column is not None:
+            return column
+        if self.contexts is None:
+            return _Const(self.context.get(name, default))
+
+        values = [context.get(name, default) for context in self.contexts]
+        first = values[0]
+        column = _Const(first) if all(value is first for value in values) else values
+        self.rows[name] = column
+        return column
+
+    def take(self, indexes: list[int]) -> "_Batch":
+        """Get a batch of some of the rows."""
+        rows = {
+            name: column if isinstance(column, _Const) else [column[i] for i in indexes]
+            for name, column in self.rows.items()
+        }
+        contexts = [self.contexts[i] for i in indexes] if self.contexts is not None else None
+        return _Batch(len(indexes), rows, self.context, contexts)
+
+
+def _values(column: Column, size: int) -> list:
+    """Get a column as a list of Python values."""
+    if isinstance(column, _Const):
+        return [column.value] * size
+    if isinstance(column, list):
+        return column
+    return column.tolist()
+
+
+def _broadcast(column: Column) -> Sequence:
+    """Get a column as something to zip over."""
+    if isinstance(column, _Const):
+        return repeat(column.value)
+    if isinstance(column, list):
+        return column
+    return column.tolist()
+
+
+def _numeric(column: Column):
+    """Get a column of plain numbers (bools included) as a number or array, else None."""
+    np = _numpy()
+    if np is None:
+        return None
+    if isinstance(column, _Const):
+        value = column.value
+        return value if type(value) in (int, float, bool) else None
+    if isinstance(column, list):
+        try:
+            column = np.array(column)
+        except (ValueError, TypeError):
+            return None
+    if column.ndim == 1 and column.dtype.kind in "biuf":
+        return column
+    return None
+
+
+def _path(column: Column, path: tuple[str, ...]) -> Column:
+    """Follow a path into every value of a column."""
+    if not path:
+        return column
+    if isinstance(column, _Const):
+        return _Const(walk_path(column.value, path))
+
+    values = _broadcast(column)
+    if not _SPECIAL_SEGMENTS.intersection(path):
+        # Plain dict access; anything else (lists, objects, blobs) walks each row
+        result = values
+        for part in path:
+            types = set(map(type, result))
+            if types <= _DICT:
+                result = [value.get(part) for value in result]
+            elif types <= _DICT_OR_NONE:
+                result = [value.get(part) if value is not None else None for value in result]
+            else:
+                break
+        else:
+            if set(map(type, result)) <= _PLAIN_TYPES:
+                return result
+    return [walk_path(value, path) for value in values]
+
+
+def _truth(column: Column) -> Column:
+    """Get the truthiness of every value of a column."""
+    if isinstance(column, _Const):
+        return _Const(bool(column.value))
+    if not isinstance(column, list):
+        return column != 0 if column.dtype.kind != "b" else column
+    return [bool(value) for value in column]
+
+
+def _true_rows(truth: Column, want: bool) -> list[int]:
+    if isinstance(truth, list):
+        return [i for i, value in enumerate(truth) if value is want]
+    np = _numpy()
+    return np.flatnonzero(truth if want else ~truth).tolist()
+
+
+def _evaluate(node: Node, batch: _Batch, functions: Mapping[str, Callable]) -> Column:
+    if isinstance(node, Literal):
+        return _Const(node.value)
+
+    if isinstance(node, Variable):
+        if node.root == "$env":
+            return _Const(compile_node(node, functions)({}))
+        if node.root == "$nodes" and node.path:
+            column = batch.root("$nodes", {})
+            node_id, rest = node.path[0], node.path[1:]
+            if isinstance(column, _Const):
+                return _Const(walk_path(column.value.get(node_id, {}), rest))
+            return [walk_path(nodes.get(node_id, {}), rest) for nodes in column]
+        default = {} if node.root in _MAPPING_ROOTS or node.root == "$nodes" else None
+        return _path(batch.root(node.root, default), node.path)
+
+    if isinstance(node, GetPath):
+        return _path(_evaluate(node.target, batch, functions), node.path)
+
+    if isinstance(node, Call):
+        return _call(node, batch, functions)
+
+    if isinstance(node, Unary):
+        operand = _evaluate(node.operand, batch, functions)
+        if node.op == "!":
+            truth = _truth(operand)
+            if isinstance(truth, _Const):
+                return _Const(not truth.value)
+            return [not value for value in truth] if isinstance(truth, list) else ~truth
+        if isinstance(operand, _Const):
+            return _Const(arithmetic("-", 0, operand.value))
+        return _arithmetic("-", _Const(0), operand, batch.size)
+
+    if isinstance(node, Binary):
+        if node.op in ("&&", "||"):
+            return _logical(node, batch, functions)
+        left = _evaluate(node.left, batch, functions)
+        right = _evaluate(node.right, batch, functions)
+        if isinstance(left, _Const) and isinstance(right, _Const):
+            if node.op in _COMPARISON_OPS:
+                return _Const(compare(node.op, left.value, right.value))
+            return _Const(arithmetic(node.op, left.value, right.value))
+        if node.op in _COMPARISON_OPS:
+            return _compare(node.op, left, right)
+        return _arithmetic(node.op, left, right, batch.size)
+
+    raise ExpressionError(f"Cannot evaluate {type(node).__name__}")
+
+
+def _logical(node: Binary, batch: _Batch, functions: Mapping[str, Callable]) -> Column:
+    """``&&`` / ``||``, evaluating the right side only where the left doesn't decide."""
+    # && needs the right side where the left is true, || where it is false
+    undecided = node.op == "&&"
+    left = _truth(_evaluate(node.left, batch, functions))
+    if isinstance(left, _Const):
+        if left.value is not undecided:
+            return left
+        return _truth(_evaluate(node.right, batch, functions))
+
+    rows = _true_rows(left, undecided)
+    if not rows:
+        return left
+    right = _truth(_evaluate(node.right, batch.take(rows), functions))
+    if isinstance(left, list):
+        result = list(left)
+        for i, value in zip(rows, _broadcast(right)):
+            result[i] = value
+        return result
+    result = left.copy()
+    result[rows] = right.value if isinstance(right, _Const) else right
+    return result
+
+
+def _compare(op: str, left: Column, right: Column) -> Column:
+    left_numbers, right_numbers = _numeric(left), _numeric(right)
+    if left_numbers is not None and right_numbers is not None:
+        np = _numpy()
+        return {
+            "==": np.equal,
+            "!=": np.not_equal,
+            "<": np.less,
+            "<=": np.less_equal,
+            ">": np.greater,
+            ">=": np.greater_equal,
+        }[op](left_numbers, right_numbers)
+    pairs = zip(_broadcast(left), _broadcast(right))
+    if op == "==":
+        return [a == b for a, b in pairs]
+    if op == "!=":
+        return [a != b for a, b in pairs]
+    return [compare(op, a, b) for a, b in pairs]
+
+
+def _arithmetic(op: str, left: Column, right: Column, size: int) -> Column:
+    left_numbers, right_numbers = _numeric(left), _numeric(right)
+    if left_numbers is None or right_numbers is None:
+        return [arithmetic(op, a, b) for a, b in zip(_broadcast(left), _broadcast(right))]
+
+    np = _numpy()
+    a = np.asarray(left_numbers, dtype=np.float64)
+    b = np.asarray(right_numbers, dtype=np.float64)
+    if op == "+":
+        return np.broadcast_to(a + b, (size,))
+    if op == "-":
+        return np.broadcast_to(a - b, (size,))
+    if op == "*":
+        return np.broadcast_to(a * b, (size,))
+
+    # Division by zero is 0 (an int, as in arithmetic())
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.broadcast_to(a / b if op == "/" else np.remainder(a, b), (size,))
+    zero = np.broadcast_to(b == 0, (size,))
+    if not zero.any():
+        return result
+    values = result.tolist()
+    for i in np.flatnonzero(zero).tolist():
+        values[i] = 0
+    return values
+
+
+def _call(node: Call, batch: _Batch, functions: Mapping[str, Callable]) -> list:
+    name = node.name
+    func = functions.get(name)
+    if func is None:
+        raise ExpressionError(f"Unknown function: {name}")
+
+    size = batch.size
+    args = [_values(_evaluate(arg, batch, functions), size) for arg in node.args]
+    keys = [key for key, _ in node.kwargs]
+    kwargs = [_values(_evaluate(value, batch, functions), size) for _, value in node.kwargs]
+
+    split = len(args)
+    try:
+        if kwargs:
+            return [
+                func(*row[:split], **dict(zip(keys, row[split:]))) for row in zip(*args, *kwargs)
+            ]
+        if args:
+            return list(map(func, *args))
+        return [func() for _ in range(size)]
+    except Exception as e:
+        raise ExpressionError(f"Error calling {name}: {e}")
+
+
+def _run(
+    expression: CompiledExpression | StringTemplate,
+    batch: _Batch,
+    functions: Mapping[str, Callable] | None,
+) -> list:
+    if functions is None:
+        from src.core.expressions.parser import get_parser
+
+        functions = get_parser().BUILTIN_FUNCTIONS
+
+    if isinstance(expression, CompiledExpression):
+        return _values(_evaluate(expression.node, batch, functions), batch.size)
+
+    # Text with expressions inside: evaluate each expression, then join per row
+    parts = [
+        repeat(part)
+        if isinstance(part, str)
+        else (
+            "" if value is None else str(value)
+            for value in _values(_evaluate(part.node, batch, functions), batch.size)
+        )
+        for part in expression.parts
+    ]
+    return ["".join(row) for _, row in zip(range(batch.size), zip(*parts))]
+
+
+def evaluate_batch(
+    expression: CompiledExpression | StringTemplate,
+    contexts: Sequence[Mapping],
+    functions: Mapping[str, Callable] | None = None,
+) -> list:
+    """
+    Evaluate an expression once per context.
+
+    Args:
+        expression: A compiled expression, or text with expressions inside
+        contexts: One execution context per row
+        functions: Built-in functions (defaults to the global parser's)
+
+    Returns:
+        One value per context, as ``expression.evaluate(context)`` would give
+
+    Raises:
+        ExpressionError: If any row fails to evaluate
+    """
+    if len(contexts) < MIN_BATCH_SIZE:
+        return [expression.evaluate(context) for context in contexts]
+    return _run(expression, _Batch(len(contexts), {}, contexts=contexts), functions)
+
+
+def evaluate_items(
+    expression: CompiledExpression | StringTemplate,
+    items: Sequence,
+    context: Mapping | None = None,
+    functions: Mapping[str, Callable] | None = None,
+    start: int = 0,
+) -> list:
+    """
+    Evaluate an expression once per element of a list.
+
+    Each row sees the element as ``$item`` and ``$prev`` and its position as
+    ``$index``, on top of a shared context, without building a context per row.
+
+    Args:
+        expression: A compiled expression, or text with expressions inside
+        items: The elements
+        context: Context shared by every row ($vars, $nodes, ...)
+        functions: Built-in functions (defaults to the global parser's)
+        start: ``$index`` of the first element
+
+    Returns:
+        One value per element
+
+    Raises:
+        ExpressionError: If any row fails to evaluate
+    """
+    context = context or {}
+    items = items if isinstance(items, list) else list(items)
+    if len(items) < MIN_BATCH_SIZE:
+        return [
+            expression.evaluate({**context, "$prev": item, "$item": item, "$index": start + i})
+            for i, item in enumerate(items)
+        ]
+    rows = {"$item": items, "$prev": items, "$index": range(start, start + len(items))}
+    return _run(expression, _Batch(len(items), rows, context), functions)
@@ -0,0 +1,664 @@
+"""
+Expression Compiler
+
+Turns the text of an expression (without the {{}} wrapper) into an AST and a
+Python closure that evaluates it against an execution context.
+
+Grammar, loosest binding first:
+
+    a || b                  logical or
+    a && b                  logical and
+    a == b, a != b          equality
+    a < b, a <= b, ...      comparison
+    a + b, a - b            addition (+ concatenates non-numbers)
+    a * b, a / b, a % b     multiplication
+    !a, -a                  unary
+    (a), f(a, key=b)        grouping, function calls
+    $prev.items.0           variable paths
+
+Bare words evaluate to themselves as strings, as do expressions that fail to
+parse, so text that merely looks like a template is left alone. Words joined
+by ``-`` or ``/`` without spaces (``Content-Type``, ``application/json``,
+``2024-01-15``) and dotted versions (``1.5.3``) are single words, not
+arithmetic or paths; put spaces around operators on bare values.
+
+Operators on constants are folded when an expression is compiled, so
+``{{60 * 60 * 24}}`` or ``{{false && $expensive($prev)}}`` cost nothing per run.
+
+find_references() lists the nodes and variables an expression reads without
+evaluating it, so the executor can order nodes by the data they use.
+"""
+
+import os
+import re
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from src.core.blobs import BlobRef
+
+
+class ExpressionError(Exception):
+    """Error during expression evaluation."""
+
+    pass
+
+
+class ExpressionSyntaxError(ExpressionError):
+    """An expression could not be parsed."""
+
+    pass
+
+
+# =============================================================================
+# AST
+# =============================================================================
+
+
+class Node:
+    """Base class for expression AST nodes."""
+
+    __slots__ = ()
+
+
+@dataclass(frozen=True, slots=True)
+class Literal(Node):
+    """A constant: number, string, boolean or null."""
+
+    value: Any
+
+
+@dataclass(frozen=True, slots=True)
+class Variable(Node):
+    """A context variable and the path into it, e.g. ``$prev.items.0``."""
+
+    root: str
+    path: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class GetPath(Node):
+    """A path into a computed value, e.g. ``($prev).items``."""
+
+    target: Node
+    path: tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class Call(Node):
+    """A call to a built-in function."""
+
+    name: str
+    args: tuple[Node, ...] = ()
+    kwargs: tuple[tuple[str, Node], ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class Unary(Node):
+    """``!operand`` or ``-operand``."""
+
+    op: str
+    operand: Node
+
+
+@dataclass(frozen=True, slots=True)
+class Binary(Node):
+    """An arithmetic, comparison or logical operation."""
+
+    op: str
+    left: Node
+    right: Node
+
+
+# =============================================================================
+# TOKENIZER
+# =============================================================================
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<space>\s+)
+    | (?P<number>\d+\.\d+|\d+)
+    | (?P<string>"[^"]*"|'[^']*')
+    | (?P<variable>\$\w+)
+    | (?P<name>[A-Za-z_]\w*)
+    | (?P<op>==|!=|>=|<=|&&|\|\||[-+*/%<>!=(),.])
+    """,
+    re.VERBOSE,
+)
+
+# A path segment after a dot: node IDs may contain hyphens, and "-1" indexes
+# from the end of a list
+_SEGMENT_PATTERN = re.compile(r"""[^\s.()\[\],+*/%<>=!&|'"]+""")
+
+# Unquoted text such as "x-api-key", "application/json" or "1.5.3": a run of
+# word characters joined by "-", "/" or "." (see _is_word)
+_WORD_PATTERN = re.compile(r"\w+(?:[-/.]\w+)+")
+_NUMBER_PATTERN = re.compile(r"\d+\.\d+")
+
+KEYWORDS = {"true": True, "false": False, "null": None, "none": None}
+
+
+def _is_word(text: str) -> bool:
+    # Dotted names ("example.com") are left to the parser, which reads them as
+    # bare words too
+    if "-" in text or "/" in text:
+        return True
+    return text[0].isdigit() and not _NUMBER_PATTERN.fullmatch(text)
+
+
+@dataclass(frozen=True, slots=True)
+class Token:
+    kind: str  # number, string, variable, name, word, segment, op, end
+    text: str
+    pos: int
+
+
+def tokenize(expression: str) -> list[Token]:
+    """
+    Split an expression into tokens.
+
+    Raises:
+        ExpressionSyntaxError: On characters that start no token
+    """
+    tokens = []
+    pos = 0
+    length = len(expression)
+    while pos < length:
+        word = _WORD_PATTERN.match(expression, pos)
+        if word is not None and _is_word(word.group()):
+            tokens.append(Token("word", word.group(), pos))
+            pos = word.end()
+            continue
+        match = _TOKEN_PATTERN.match(expression, pos)
+        if match is None:
+            raise ExpressionSyntaxError(f"Unexpected character {expression[pos]!r} at {pos}")
+        kind = match.lastgroup
+        text = match.group()
+        if kind != "space":
+            tokens.append(Token(kind, text, pos))
+        pos = match.end()
+        if text == ".":
+            segment = _SEGMENT_PATTERN.match(expression, pos)
+            if segment is None:
+                raise ExpressionSyntaxError(f"Expected a name after '.' at {pos}")
+            tokens.append(Token("segment", segment.group(), pos))
+            pos = segment.end()
+    tokens.append(Token("end", "", length))
+    return tokens
+
+
+# =============================================================================
+# PARSER
+# =============================================================================
+
+# Binding power of infix operators
+_BINDING_POWER = {
+    "||": 10,
+    "&&": 20,
+    "==": 30,
+    "!=": 30,
+    "<": 40,
+    "<=": 40,
+    ">": 40,
+    ">=": 40,
+    "+": 50,
+    "-": 50,
+    "*": 60,
+    "/": 60,
+    "%": 60,
+    ".": 80,
+}
+_UNARY_BINDING_POWER = 70
+
+
+class _Parser:
+    """Pratt parser over a token list."""
+
+    def __init__(self, tokens: list[Token]):
+        self.tokens = tokens
+        self.index = 0
+
+    def peek(self, offset: int = 0) -> Token:
+        return self.tokens[min(self.index + offset, len(self.tokens) - 1)]
+
+    def advance(self) -> Token:
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def expect(self, text: str) -> Token:
+        token = self.advance()
+        if token.text != text or token.kind != "op":
+            raise ExpressionSyntaxError(f"Expected '{text}' at {token.pos}")
+        return token
+
+    def parse(self) -> Node:
+        node = self.expression()
+        token = self.peek()
+        if token.kind != "end":
+            raise ExpressionSyntaxError(f"Unexpected '{token.text}' at {token.pos}")
+        return node
+
+    def expression(self, binding_power: int = 0) -> Node:
+        left = self.prefix(self.advance())
+        while True:
+            token = self.peek()
+            power = _BINDING_POWER.get(token.text, 0) if token.kind == "op" else 0
+            if power <= binding_power:
+                return left
+            self.advance()
+            if token.text == ".":
+                left = GetPath(left, self.path(first=self.advance().text))
+            else:
+                left = Binary(token.text, left, self.expression(power))
+
+    def prefix(self, token: Token) -> Node:
+        if token.kind == "number":
+            return Literal(float(token.text) if "." in token.text else int(token.text))
+        if token.kind == "string":
+            return Literal(token.text[1:-1])
+        if token.kind == "word":
+            return Literal(token.text)
+        if token.kind == "variable":
+            if self.peek().text == "(":
+                return self.call(token.text[1:])
+            return self.variable(token.text)
+        if token.kind == "name":
+            if self.peek().text == "(":
+                return self.call(token.text)
+            if token.text.lower() in KEYWORDS:
+                return Literal(KEYWORDS[token.text.lower()])
+            # Bare words are strings, dots included ("example.com")
+            return Literal(".".join(self.path(first=token.text)))
+        if token.kind == "op":
+            if token.text == "(":
+                node = self.expression()
+                self.expect(")")
+                return node
+            if token.text in ("!", "-"):
+                operand = self.expression(_UNARY_BINDING_POWER)
+                if token.text == "-" and isinstance(operand, Literal):
+                    if isinstance(operand.value, int | float) and not isinstance(
+                        operand.value, bool
+                    ):
+                        return Literal(-operand.value)
+                return Unary(token.text, operand)
+        if token.kind == "end":
+            raise ExpressionSyntaxError("Unexpected end of expression")
+        raise ExpressionSyntaxError(f"Unexpected '{token.text}' at {token.pos}")
+
+    def path(self, first: str | None = None) -> tuple[str, ...]:
+        """Read ``.segment`` tokens following the current position."""
+        parts = [first] if first is not None else []
+        while self.peek().text == "." and self.peek().kind == "op":
+            self.advance()
+            parts.append(self.advance().text)
+        return tuple(parts)
+
+    def variable(self, root: str) -> Node:
+        path = self.path()
+        # $node.X is an alias for $nodes.X
+        if root == "$node":
+            root = "$nodes"
+        return Variable(root, path)
+
+    def call(self, name: str) -> Call:
+        self.expect("(")
+        args: list[Node] = []
+        kwargs: list[tuple[str, Node]] = []
+        if self.peek().text == ")" and self.peek().kind == "op":
+            self.advance()
+            return Call(name)
+        while True:
+            token = self.peek()
+            if token.kind == "name" and self.peek(1).text == "=" and self.peek(1).kind == "op":
+                self.advance()
+                self.advance()
+                kwargs.append((token.text, self.expression()))
+            else:
+                args.append(self.expression())
+            separator = self.advance()
+            if separator.kind == "op" and separator.text == ")":
+                return Call(name, tuple(args), tuple(kwargs))
+            if separator.kind != "op" or separator.text != ",":
+                raise ExpressionSyntaxError(f"Expected ',' or ')' at {separator.pos}")
+
+
+def parse(expression: str) -> Node:
+    """
+    Parse an expression into an AST.
+
+    Raises:
+        ExpressionSyntaxError: If the expression is malformed
+    """
+    return _Parser(tokenize(expression)).parse()
+
+
+# =============================================================================
+# EVALUATION
+# =============================================================================
+
+# Roots that default to an empty mapping when missing from the context
+_MAPPING_ROOTS = frozenset({"$trigger", "$prev", "$vars", "$workflow", "$execution"})
+
+
+def walk_path(value: Any, path: tuple[str, ...]) -> Any:
+    """Follow a path into a value, loading spilled node outputs on first access."""
+    for part in path:
+        if isinstance(value, BlobRef):
+            value = value.load()
+        if value is None:
+            return None
+
+        # Special array properties
+        if part == "length" and isinstance(value, (list, str, Mapping)):
+            return len(value)
+        elif part == "first" and isinstance(value, list):
+            return value[0] if len(value) > 0 else None
+        elif part == "last" and isinstance(value, list):
+            return value[-1] if len(value) > 0 else None
+        elif part == "keys" and isinstance(value, Mapping):
+            return list(value.keys())
+        elif part == "values" and isinstance(value, Mapping):
+            return list(value.values())
+
+        # Normal access (context values such as $vars and $nodes are read-only mappings)
+        if isinstance(value, Mapping):
+            value = value.get(part, None)
+        elif isinstance(value, list):
+            if part.isdigit() or (part.startswith("-") and part[1:].isdigit()):
+                idx = int(part)
+                value = value[idx] if -len(value) <= idx < len(value) else None
+            else:
+                value = None
+        elif hasattr(value, part):
+            value = getattr(value, part)
+        else:
+            return None
+
+    if isinstance(value, BlobRef):
+        value = value.load()
+    return value
+
+
+def _to_number(value: Any) -> float:
+    return float(value) if value is not None else 0
+
+
+def arithmetic(op: str, left: Any, right: Any) -> Any:
+    """Apply an arithmetic operator; ``+`` concatenates values that aren't numbers."""
+    try:
+        left_num = _to_number(left)
+        right_num = _to_number(right)
+    except (ValueError, TypeError):
+        if op == "+":
+            return str(left or "") + str(right or "")
+        return 0
+
+    if op == "+":
+        return left_num + right_num
+    if op == "-":
+        return left_num - right_num
+    if op == "*":
+        return left_num * right_num
+    if op == "/":
+        return left_num / right_num if right_num != 0 else 0
+    return left_num % right_num if right_num != 0 else 0
+
+
+_COMPARISONS: dict[str, Callable[[Any, Any], bool]] = {
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+}
+
+
+def compare(op: str, left: Any, right: Any) -> bool:
+    """Apply a comparison operator."""
+    if op == "==":
+        return left == right
+    if op == "!=":
+        return left != right
+    try:
+        return _COMPARISONS[op](left, right)
+    except TypeError:
+        raise ExpressionError(f"Cannot compare {type(left).__name__} {op} {type(right).__name__}")
+
+
+def fold_constants(node: Node) -> Node:
+    """
+    Evaluate the operators of an AST whose operands are constants.
+
+    ``&&`` and ``||`` are folded when a constant left side decides them.
+    Function calls are never folded, since functions may be impure or
+    registered later; their arguments are. Comparisons that would fail are
+    left to fail when evaluated.
+    """
+    if isinstance(node, GetPath):
+        return GetPath(fold_constants(node.target), node.path)
+
+    if isinstance(node, Call):
+        return Call(
+            node.name,
+            tuple(fold_constants(arg) for arg in node.args),
+            tuple((key, fold_constants(value)) for key, value in node.kwargs),
+        )
+
+    if isinstance(node, Unary):
+        operand = fold_constants(node.operand)
+        if not isinstance(operand, Literal):
+            return Unary(node.op, operand)
+        if node.op == "!":
+            return Literal(not operand.value)
+        return Literal(arithmetic("-", 0, operand.value))
+
+    if isinstance(node, Binary):
+        op = node.op
+        left = fold_constants(node.left)
+        if op in ("&&", "||") and isinstance(left, Literal):
+            if bool(left.value) == (op == "||"):
+                return Literal(op == "||")
+        right = fold_constants(node.right)
+        if not (isinstance(left, Literal) and isinstance(right, Literal)):
+            return Binary(op, left, right)
+        if op in ("&&", "||"):
+            return Literal(bool(right.value))
+        if op in ("==", "!=", "<", "<=", ">", ">="):
+            try:
+                return Literal(compare(op, left.value, right.value))
+            except ExpressionError:
+                return Binary(op, left, right)
+        return Literal(arithmetic(op, left.value, right.value))
+
+    return node
+
+
+Evaluator = Callable[[dict], Any]
+
+
+def compile_node(node: Node, functions: Mapping[str, Callable]) -> Evaluator:
+    """
+    Compile an AST into a closure taking the execution context.
+
+    Args:
+        node: Parsed expression
+        functions: Built-in functions, looked up by name on each call
+    """
+    if isinstance(node, Literal):
+        value = node.value
+        return lambda context: value
+
+    if isinstance(node, Variable):
+        return _compile_variable(node)
+
+    if isinstance(node, GetPath):
+        target = compile_node(node.target, functions)
+        path = node.path
+        return lambda context: walk_path(target(context), path)
+
+    if isinstance(node, Call):
+        return _compile_call(node, functions)
+
+    if isinstance(node, Unary):
+        operand = compile_node(node.operand, functions)
+        if node.op == "!":
+            return lambda context: not operand(context)
+        return lambda context: arithmetic("-", 0, operand(context))
+
+    if isinstance(node, Binary):
+        left = compile_node(node.left, functions)
+        right = compile_node(node.right, functions)
+        op = node.op
+        if op == "&&":
+            return lambda context: bool(left(context)) and bool(right(context))
+        if op == "||":
+            return lambda context: bool(left(context)) or bool(right(context))
+        if op in ("==", "!=", "<", "<=", ">", ">="):
+            return lambda context: compare(op, left(context), right(context))
+        return lambda context: arithmetic(op, left(context), right(context))
+
+    raise ExpressionError(f"Cannot compile {type(node).__name__}")
+
+
+def _compile_variable(node: Variable) -> Evaluator:
+    root, path = node.root, node.path
+
+    if root == "$env":
+        if path:
+            name = path[0]
+            return lambda context: os.environ.get(name, "")
+        return lambda context: {}
+
+    if root == "$nodes" and path:
+        # Node output: $nodes.node_id.field
+        node_id, rest = path[0], path[1:]
+        return lambda context: walk_path(context.get("$nodes", {}).get(node_id, {}), rest)
+
+    default = {} if root in _MAPPING_ROOTS or root == "$nodes" else None
+    return lambda context: walk_path(context.get(root, default), path)
+
+
+def _compile_call(node: Call, functions: Mapping[str, Callable]) -> Evaluator:
+    name = node.name
+    args = tuple(compile_node(arg, functions) for arg in node.args)
+    kwargs = tuple((key, compile_node(value, functions)) for key, value in node.kwargs)
+
+    def call(context: dict) -> Any:
+        func = functions.get(name)
+        if func is None:
+            raise ExpressionError(f"Unknown function: {name}")
+        arg_values = [arg(context) for arg in args]
+        kwarg_values = {key: value(context) for key, value in kwargs}
+        try:
+            return func(*arg_values, **kwarg_values)
+        except Exception as e:
+            raise ExpressionError(f"Error calling {name}: {e}")
+
+    return call
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledExpression:
+    """An expression parsed once, ready to evaluate against many contexts."""
+
+    source: str
+    node: Node
+    evaluate: Evaluator
+
+    def __call__(self, context: dict) -> Any:
+        return self.evaluate(context)
+
+    @property
+    def references(self) -> "References":
+        """The nodes, variables and other context values the expression reads."""
+        return find_references(self.node)
+
+
+def compile_text(expression: str, functions: Mapping[str, Callable]) -> CompiledExpression:
+    """
+    Compile the text of an expression.
+
+    Expressions that don't parse compile to their own text, which is what an
+    unrecognized bare value has always evaluated to.
+
+    Args:
+        expression: The expression without the {{}} wrapper
+        functions: Built-in functions available to calls
+    """
+    source = expression.strip()
+    try:
+        node = fold_constants(parse(source))
+    except ExpressionSyntaxError:
+        node = Literal(source)
+    return CompiledExpression(source, node, compile_node(node, functions))
+
+
+# =============================================================================
+# ANALYSIS
+# =============================================================================
+
+
+@dataclass(frozen=True, slots=True)
+class References:
+    """The context values an expression reads, found without evaluating it."""
+
+    # Context roots, e.g. {"$prev", "$nodes"}
+    roots: frozenset[str] = frozenset()
+    # Node IDs read through $nodes.X (or $node.X)
+    nodes: frozenset[str] = frozenset()
+    # Variable names read through $vars.X
+    variables: frozenset[str] = frozenset()
+    # $nodes or $vars read as a whole, e.g. $json($nodes)
+    all_nodes: bool = False
+    all_variables: bool = False
+
+    def __or__(self, other: "References") -> "References":
+        return References(
+            self.roots | other.roots,
+            self.nodes | other.nodes,
+            self.variables | other.variables,
+            self.all_nodes or other.all_nodes,
+            self.all_variables or other.all_variables,
+        )
+
+
+NO_REFERENCES = References()
+
+
+def find_references(node: Node) -> References:
+    """Collect the context values read by an AST."""
+    roots: set[str] = set()
+    nodes: set[str] = set()
+    variables: set[str] = set()
+    all_nodes = all_variables = False
+
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, Variable):
+            roots.add(current.root)
+            if current.root == "$nodes":
+                if current.path:
+                    nodes.add(current.path[0])
+                else:
+                    all_nodes = True
+            elif current.root == "$vars":
+                if current.path:
+                    variables.add(current.path[0])
+                else:
+                    all_variables = True
+        elif isinstance(current, GetPath):
+            stack.append(current.target)
+        elif isinstance(current, Call):
+            stack.extend(current.args)
+            stack.extend(value for _, value in current.kwargs)
+        elif isinstance(current, Unary):
+            stack.append(current.operand)
+        elif isinstance(current, Binary):
+            stack.append(current.left)
+            stack.append(current.right)
+
+    return References(
+        frozenset(roots), frozenset(nodes), frozenset(variables), all_nodes, all_variables
+    )
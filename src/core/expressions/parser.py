@@ -15,6 +15,9 @@ Supported expression formats:
 - $json($prev) - Convert to JSON string
 - $length($prev.items) - Array/string length
 
+Operators, with the usual precedence: || && == != < <= > >= + - * / % ! and
+unary minus; parentheses group.
+
 Array operations:
 - $prev.items.0 - Index access
 - $prev.items.first - First element
@@ -24,25 +27,40 @@ Array operations:
 
 import hashlib
 import json
-import os
 import re
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from datetime import UTC, datetime
+from functools import lru_cache
 from typing import Any
 from uuid import uuid4
 
+from src.core.blobs import BlobRef
+from src.core.expressions.compiler import (
+    CompiledExpression,
+    compile_text,
+)
+from src.core.expressions.template import ConfigTemplate, StringTemplate
+
+# Maximum number of compiled expressions (and strings) kept per parser
+DEFAULT_EXPRESSION_CACHE_SIZE = 4096
 
-class ExpressionError(Exception):
-    """Error during expression evaluation."""
 
-    pass
+def _json_default(value: Any) -> Any:
+    """Encode read-only context mappings ($vars, $nodes) like dicts."""
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, BlobRef):
+        return value.load()
+    return str(value)
 
 
 class ExpressionParser:
     """
     Parses and evaluates expressions in workflow configurations.
 
-    Expressions are wrapped in double curly braces: {{expression}}
+    Expressions are wrapped in double curly braces: {{expression}}. Each
+    expression, and each string containing expressions, is compiled once (see
+    src.core.expressions.compiler) and kept in an LRU cache keyed by its text.
     """
 
     # Pattern to match expressions
@@ -51,8 +69,15 @@ class ExpressionParser:
     # Built-in functions
     BUILTIN_FUNCTIONS: dict[str, Callable] = {}
 
-    def __init__(self):
+    def __init__(self, cache_size: int = DEFAULT_EXPRESSION_CACHE_SIZE):
+        """
+        Args:
+            cache_size: Compiled expressions and strings kept, least recently used
+                dropped first
+        """
         self._register_builtins()
+        self._compile_cached = lru_cache(maxsize=cache_size)(self._compile)
+        self._compile_string_cached = lru_cache(maxsize=cache_size)(self._compile_string)
 
     def _register_builtins(self):
         """Register built-in functions."""
@@ -62,7 +87,7 @@ class ExpressionParser:
             "date": lambda: datetime.now(UTC).strftime("%Y-%m-%d"),
             "time": lambda: datetime.now(UTC).strftime("%H:%M:%S"),
             "timestamp": lambda: int(datetime.now(UTC).timestamp()),
-            "json": lambda x: json.dumps(x, default=str),
+            "json": lambda x: json.dumps(x, default=_json_default),
             "parse_json": lambda x: json.loads(x) if isinstance(x, str) else x,
             "length": lambda x: len(x) if hasattr(x, "__len__") else 0,
             "string": lambda x: str(x),
@@ -79,8 +104,8 @@ class ExpressionParser:
             "reverse": lambda x: list(reversed(x)) if isinstance(x, list) else str(x)[::-1],
             "sort": lambda x: sorted(x) if isinstance(x, list) else x,
             "unique": lambda x: list(set(x)) if isinstance(x, list) else x,
-            "keys": lambda x: list(x.keys()) if isinstance(x, dict) else [],
-            "values": lambda x: list(x.values()) if isinstance(x, dict) else [],
+            "keys": lambda x: list(x.keys()) if isinstance(x, Mapping) else [],
+            "values": lambda x: list(x.values()) if isinstance(x, Mapping) else [],
             "default": lambda x, default="": x if x is not None else default,
             "hash": lambda x: hashlib.sha256(str(x).encode()).hexdigest(),
             # MD5 used for non-security purposes (checksums, identifiers)
@@ -110,6 +135,77 @@ class ExpressionParser:
             "ternary": lambda cond, if_true, if_false: if_true if cond else if_false,
         }
 
+    def compile(self, expression: str) -> CompiledExpression:
+        """
+        Compile a single expression, reusing the cached result for the same text.
+
+        Args:
+            expression: The expression without the {{}} wrapper
+
+        Returns:
+            CompiledExpression to call with an execution context
+        """
+        return self._compile_cached(expression.strip())
+
+    def _compile(self, expression: str) -> CompiledExpression:
+        return compile_text(expression, self.BUILTIN_FUNCTIONS)
+
+    def compile_string(self, value: str) -> CompiledExpression | StringTemplate | None:
+        """
+        Compile a string containing {{expressions}}, reusing the cached result.
+
+        Returns:
+            The expression if the whole string is one (it resolves to the raw
+            value), a StringTemplate if expressions are embedded in text, or
+            None if the string has no expressions
+        """
+        return self._compile_string_cached(value)
+
+    def _compile_string(self, value: str) -> CompiledExpression | StringTemplate | None:
+        matches = list(self.EXPRESSION_PATTERN.finditer(value))
+        if not matches:
+            return None
+
+        # If the entire string is a single expression, return the raw value
+        if len(matches) == 1 and value.strip() == matches[0].group():
+            return self.compile(matches[0].group(1))
+
+        # Otherwise, convert all expressions to strings and substitute
+        parts: list[str | CompiledExpression] = []
+        position = 0
+        for match in matches:
+            if match.start() > position:
+                parts.append(value[position : match.start()])
+            parts.append(self.compile(match.group(1)))
+            position = match.end()
+        if position < len(value):
+            parts.append(value[position:])
+        return StringTemplate(tuple(parts))
+
+    def compile_config(
+        self,
+        config: dict,
+        raw_keys: tuple[str, ...] = (),
+        expression_keys: tuple[str, ...] = (),
+    ) -> ConfigTemplate:
+        """
+        Compile a node config into a template (see src.core.expressions.template).
+
+        Args:
+            config: The node config as written
+            raw_keys: Top-level keys passed through without resolving expressions
+            expression_keys: Raw keys whose expressions the node evaluates itself,
+                included in the template's references
+        """
+        return ConfigTemplate(config, self.compile_string, raw_keys, expression_keys)
+
+    def cache_info(self):
+        """Hit/miss statistics of the compiled expression and string caches."""
+        return {
+            "expressions": self._compile_cached.cache_info(),
+            "strings": self._compile_string_cached.cache_info(),
+        }
+
     def resolve(self, value: Any, context: dict) -> Any:
         """
         Resolve all expressions in a value.
@@ -131,24 +227,10 @@ class ExpressionParser:
 
     def _resolve_string(self, value: str, context: dict) -> Any:
         """Resolve expressions in a string value."""
-        matches = self.EXPRESSION_PATTERN.findall(value)
-
-        if not matches:
+        compiled = self._compile_string_cached(value)
+        if compiled is None:
             return value
-
-        # If the entire string is a single expression, return the raw value
-        if value.strip() == f"{{{{{matches[0]}}}}}":
-            return self.evaluate(matches[0].strip(), context)
-
-        # Otherwise, convert all expressions to strings and substitute
-        result = value
-        for match in matches:
-            expr_value = self.evaluate(match.strip(), context)
-            result = result.replace(
-                f"{{{{{match}}}}}", str(expr_value) if expr_value is not None else ""
-            )
-
-        return result
+        return compiled.evaluate(context)
 
     def evaluate(self, expression: str, context: dict) -> Any:
         """
@@ -161,271 +243,7 @@ class ExpressionParser:
         Returns:
             The evaluated value
         """
-        expression = expression.strip()
-
-        # Check for function call
-        if "(" in expression:
-            return self._evaluate_function(expression, context)
-
-        # Check for comparison operators
-        if any(op in expression for op in [" == ", " != ", " > ", " < ", " >= ", " <= "]):
-            return self._evaluate_comparison(expression, context)
-
-        # Check for logical operators
-        if " && " in expression or " || " in expression or expression.startswith("!"):
-            return self._evaluate_logical(expression, context)
-
-        # Check for arithmetic
-        if any(op in expression for op in [" + ", " - ", " * ", " / ", " % "]):
-            return self._evaluate_arithmetic(expression, context)
-
-        # Simple variable reference
-        return self._evaluate_variable(expression, context)
-
-    def _evaluate_variable(self, expression: str, context: dict) -> Any:
-        """Evaluate a variable reference like $prev.data.items."""
-        if not expression.startswith("$"):
-            # Literal value
-            # Try to parse as number
-            try:
-                if "." in expression:
-                    return float(expression)
-                return int(expression)
-            except ValueError:
-                pass
-
-            # String literal (quoted)
-            if expression.startswith('"') and expression.endswith('"'):
-                return expression[1:-1]
-            if expression.startswith("'") and expression.endswith("'"):
-                return expression[1:-1]
-
-            # Boolean
-            if expression.lower() == "true":
-                return True
-            if expression.lower() == "false":
-                return False
-            if expression.lower() in ("null", "none"):
-                return None
-
-            return expression
-
-        parts = expression.split(".")
-        var_name = parts[0]
-
-        # Get base value from context
-        if var_name == "$trigger":
-            value = context.get("$trigger", {})
-            parts = parts[1:]
-        elif var_name == "$prev":
-            value = context.get("$prev", {})
-            parts = parts[1:]
-        elif var_name == "$vars":
-            value = context.get("$vars", {})
-            parts = parts[1:]
-        elif var_name == "$env":
-            # Environment variables
-            if len(parts) > 1:
-                return os.environ.get(parts[1], "")
-            return {}
-        elif var_name == "$node" or var_name == "$nodes":
-            # Node output: $node.NodeName.field or $nodes.node_id.field
-            if len(parts) > 1:
-                node_ref = parts[1]
-                value = context.get("$nodes", {}).get(node_ref, {})
-                parts = parts[2:]
-            else:
-                value = context.get("$nodes", {})
-                parts = []
-        elif var_name == "$workflow":
-            value = context.get("$workflow", {})
-            parts = parts[1:]
-        elif var_name == "$execution":
-            value = context.get("$execution", {})
-            parts = parts[1:]
-        else:
-            value = context.get(var_name, None)
-            parts = parts[1:]
-
-        # Navigate path
-        for part in parts:
-            if value is None:
-                return None
-
-            # Special array properties
-            if part == "length" and isinstance(value, (list, str, dict)):
-                return len(value)
-            elif part == "first" and isinstance(value, list):
-                return value[0] if len(value) > 0 else None
-            elif part == "last" and isinstance(value, list):
-                return value[-1] if len(value) > 0 else None
-            elif part == "keys" and isinstance(value, dict):
-                return list(value.keys())
-            elif part == "values" and isinstance(value, dict):
-                return list(value.values())
-
-            # Normal access
-            if isinstance(value, dict):
-                value = value.get(part, None)
-            elif isinstance(value, list):
-                if part.isdigit() or (part.startswith("-") and part[1:].isdigit()):
-                    idx = int(part)
-                    value = value[idx] if -len(value) <= idx < len(value) else None
-                else:
-                    value = None
-            elif hasattr(value, part):
-                value = getattr(value, part)
-            else:
-                return None
-
-        return value
-
-    def _evaluate_function(self, expression: str, context: dict) -> Any:
-        """Evaluate a function call like $now() or $json($prev)."""
-        # Parse function name and arguments
-        match = re.match(r"\$?(\w+)\s*\((.*)\)$", expression, re.DOTALL)
-        if not match:
-            return None
-
-        func_name = match.group(1)
-        args_str = match.group(2).strip()
-
-        # Get the function
-        func = self.BUILTIN_FUNCTIONS.get(func_name)
-        if not func:
-            raise ExpressionError(f"Unknown function: {func_name}")
-
-        # Parse arguments
-        args = []
-        kwargs = {}
-
-        if args_str:
-            # Simple argument parsing (doesn't handle nested functions well yet)
-            raw_args = self._split_args(args_str)
-
-            for arg in raw_args:
-                arg = arg.strip()
-
-                # Check for keyword argument
-                if "=" in arg and not any(op in arg for op in ["==", "!=", ">=", "<="]):
-                    key, value = arg.split("=", 1)
-                    kwargs[key.strip()] = self.evaluate(value.strip(), context)
-                else:
-                    args.append(self.evaluate(arg, context))
-
-        # Call the function
-        try:
-            if kwargs:
-                return func(*args, **kwargs)
-            return func(*args)
-        except Exception as e:
-            raise ExpressionError(f"Error calling {func_name}: {e}")
-
-    def _split_args(self, args_str: str) -> list[str]:
-        """Split function arguments handling nested parentheses."""
-        args = []
-        current = ""
-        depth = 0
-        in_string = False
-        string_char = None
-
-        for char in args_str:
-            if char in ('"', "'") and not in_string:
-                in_string = True
-                string_char = char
-                current += char
-            elif char == string_char and in_string:
-                in_string = False
-                string_char = None
-                current += char
-            elif char == "(" and not in_string:
-                depth += 1
-                current += char
-            elif char == ")" and not in_string:
-                depth -= 1
-                current += char
-            elif char == "," and depth == 0 and not in_string:
-                args.append(current.strip())
-                current = ""
-            else:
-                current += char
-
-        if current.strip():
-            args.append(current.strip())
-
-        return args
-
-    def _evaluate_comparison(self, expression: str, context: dict) -> bool:
-        """Evaluate a comparison expression."""
-        for op in [" == ", " != ", " >= ", " <= ", " > ", " < "]:
-            if op in expression:
-                left, right = expression.split(op, 1)
-                left_val = self.evaluate(left.strip(), context)
-                right_val = self.evaluate(right.strip(), context)
-
-                if op == " == ":
-                    return left_val == right_val
-                elif op == " != ":
-                    return left_val != right_val
-                elif op == " >= ":
-                    return left_val >= right_val
-                elif op == " <= ":
-                    return left_val <= right_val
-                elif op == " > ":
-                    return left_val > right_val
-                elif op == " < ":
-                    return left_val < right_val
-
-        return False
-
-    def _evaluate_logical(self, expression: str, context: dict) -> bool:
-        """Evaluate a logical expression."""
-        if expression.startswith("!"):
-            return not bool(self.evaluate(expression[1:].strip(), context))
-
-        if " && " in expression:
-            parts = expression.split(" && ")
-            return all(bool(self.evaluate(p.strip(), context)) for p in parts)
-
-        if " || " in expression:
-            parts = expression.split(" || ")
-            return any(bool(self.evaluate(p.strip(), context)) for p in parts)
-
-        return bool(self.evaluate(expression, context))
-
-    def _evaluate_arithmetic(self, expression: str, context: dict) -> float:
-        """Evaluate an arithmetic expression."""
-        # Simple evaluation - doesn't handle operator precedence properly
-        # For complex expressions, consider using a proper parser
-
-        for op in [" + ", " - ", " * ", " / ", " % "]:
-            if op in expression:
-                parts = expression.rsplit(op, 1)
-                left_val = self.evaluate(parts[0].strip(), context)
-                right_val = self.evaluate(parts[1].strip(), context)
-
-                # Convert to numbers
-                try:
-                    left_num = float(left_val) if left_val is not None else 0
-                    right_num = float(right_val) if right_val is not None else 0
-                except (ValueError, TypeError):
-                    # String concatenation for +
-                    if op == " + ":
-                        return str(left_val or "") + str(right_val or "")
-                    return 0
-
-                if op == " + ":
-                    return left_num + right_num
-                elif op == " - ":
-                    return left_num - right_num
-                elif op == " * ":
-                    return left_num * right_num
-                elif op == " / ":
-                    return left_num / right_num if right_num != 0 else 0
-                elif op == " % ":
-                    return left_num % right_num if right_num != 0 else 0
-
-        return 0
+        return self.compile(expression).evaluate(context)
 
 
 # Singleton instance
@@ -448,3 +266,8 @@ def resolve_expressions(value: Any, context: dict) -> Any:
 def evaluate_expression(expression: str, context: dict) -> Any:
     """Convenience function to evaluate a single expression."""
     return get_parser().evaluate(expression, context)
+
+
+def compile_expression(expression: str) -> CompiledExpression:
+    """Convenience function to compile a single expression."""
+    return get_parser().compile(expression)
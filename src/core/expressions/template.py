@@ -0,0 +1,318 @@
+"""
+Config Templates
+
+A node config compiled once into a template that knows which of its leaves
+are dynamic, so resolving it for a run only evaluates those leaves.
+
+Every string leaf is one of:
+
+    literal         no {{...}}; returned as written
+    expression      exactly one {{...}}; resolves to the raw value
+    interpolated    text with {{...}} inside; resolves to a string
+
+Every dict and list is rebuilt on each render, even ones with no dynamic
+leaves, so a node that modifies its resolved config in place can't change the
+workflow's config or another run's. Strings and other scalars are shared.
+Raw keys are passed through as written.
+
+render_batch() resolves a config for many contexts at once (e.g. one per item),
+evaluating each leaf for all of them together (see src.core.expressions.batch).
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Sequence
+from dataclasses import dataclass
+from functools import cached_property, reduce
+from operator import itemgetter
+from typing import Any
+
+from src.core.expressions.compiler import (
+    NO_REFERENCES,
+    CompiledExpression,
+    ExpressionError,
+    References,
+)
+
+EXPRESSION = "expression"
+INTERPOLATED = "interpolated"
+
+# Maximum number of compiled node configs kept in memory
+DEFAULT_TEMPLATE_CACHE_SIZE = 1024
+
+
+class StringTemplate:
+    """Text with {{expressions}} inside, rendered to a string."""
+
+    __slots__ = ("parts",)
+
+    def __init__(self, parts: tuple[str | CompiledExpression, ...]):
+        """
+        Args:
+            parts: Literal text and compiled expressions, in order
+        """
+        self.parts = parts
+
+    @property
+    def expressions(self) -> tuple[CompiledExpression, ...]:
+        """The compiled expressions in the text."""
+        return tuple(part for part in self.parts if isinstance(part, CompiledExpression))
+
+    @property
+    def references(self) -> References:
+        """The context values read by the expressions in the text."""
+        return _union(expression.references for expression in self.expressions)
+
+    def evaluate(self, context: dict) -> str:
+        """Render the text, converting expression results to strings (None to "")."""
+        pieces = []
+        for part in self.parts:
+            if isinstance(part, str):
+                pieces.append(part)
+            else:
+                result = part.evaluate(context)
+                pieces.append(str(result) if result is not None else "")
+        return "".join(pieces)
+
+    __call__ = evaluate
+
+
+def _union(references) -> References:
+    return reduce(lambda a, b: a | b, references, NO_REFERENCES)
+
+
+# Compiles a string: None for literals
+StringCompiler = Callable[[str], CompiledExpression | StringTemplate | None]
+
+
+@dataclass(frozen=True, slots=True)
+class TemplateLeaf:
+    """A dynamic leaf of a config template."""
+
+    # Keys and list indexes from the top of the config
+    path: tuple[str | int, ...]
+    kind: str  # expression or interpolated
+    compiled: CompiledExpression | StringTemplate
+
+    @property
+    def expressions(self) -> tuple[CompiledExpression, ...]:
+        """The compiled expressions in this leaf."""
+        if isinstance(self.compiled, CompiledExpression):
+            return (self.compiled,)
+        return self.compiled.expressions
+
+
+def _evaluate_leaf(compiled: CompiledExpression | StringTemplate, index: int) -> Callable:
+    return compiled.evaluate
+
+
+def _row_leaf(compiled: CompiledExpression | StringTemplate, index: int) -> Callable:
+    return itemgetter(index)
+
+
+def _build(
+    value: Any,
+    path: tuple,
+    compile_string: StringCompiler,
+    leaves: list[TemplateLeaf],
+    leaf: Callable = _evaluate_leaf,
+) -> Callable[[Any], Any] | None:
+    """
+    Compile a config value, adding its dynamic leaves.
+
+    Returns None for scalars with no expressions, which are used as written;
+    dicts and lists always get a closure, so each render gets its own copy.
+    The closure built for each leaf takes the context by default; with
+    ``_row_leaf`` it takes a tuple of already evaluated leaf values instead.
+    """
+    if isinstance(value, str):
+        compiled = compile_string(value)
+        if compiled is None:
+            return None
+        kind = EXPRESSION if isinstance(compiled, CompiledExpression) else INTERPOLATED
+        leaves.append(TemplateLeaf(path, kind, compiled))
+        return leaf(compiled, len(leaves) - 1)
+
+    if isinstance(value, dict):
+        entries = tuple(
+            (key, item, _build(item, (*path, key), compile_string, leaves, leaf))
+            for key, item in value.items()
+        )
+        return lambda context: {
+            key: render(context) if render else item for key, item, render in entries
+        }
+
+    if isinstance(value, list):
+        entries = tuple(
+            (item, _build(item, (*path, index), compile_string, leaves, leaf))
+            for index, item in enumerate(value)
+        )
+        return lambda context: [render(context) if render else item for item, render in entries]
+
+    return None
+
+
+class ConfigTemplate:
+    """A node config compiled for repeated resolution."""
+
+    def __init__(
+        self,
+        config: dict,
+        compile_string: StringCompiler,
+        raw_keys: tuple[str, ...] = (),
+        expression_keys: tuple[str, ...] = (),
+    ):
+        """
+        Args:
+            config: The node config as written
+            compile_string: Compiles one string (see ExpressionParser.compile_string)
+            raw_keys: Top-level keys passed through without resolving expressions
+            expression_keys: Raw keys holding an expression the node evaluates
+                itself; what it reads still counts towards ``references``
+        """
+        leaves: list[TemplateLeaf] = []
+        self.config = config
+        self.raw_keys = tuple(raw_keys)
+        self.expression_keys = tuple(expression_keys)
+        self._compile_string = compile_string
+        self._entries = tuple(
+            (key, value, None if key in raw_keys else _build(value, (key,), compile_string, leaves))
+            for key, value in config.items()
+        )
+        self.leaves = tuple(leaves)
+
+    @property
+    def is_static(self) -> bool:
+        """True if the config has no expressions."""
+        return not self.leaves
+
+    @property
+    def expressions(self) -> tuple[CompiledExpression, ...]:
+        """Every compiled expression in the config."""
+        return tuple(expression for leaf in self.leaves for expression in leaf.expressions)
+
+    @cached_property
+    def references(self) -> References:
+        """
+        The context values the resolved config reads ($prev, $nodes.X, $vars.X, ...).
+
+        Raw keys are not included, since they are resolved elsewhere if at all,
+        except for ``expression_keys`` (see ``raw_references``).
+        """
+        references = [expression.references for expression in self.expressions]
+        return _union([*references, self.raw_references])
+
+    @cached_property
+    def raw_references(self) -> References:
+        """The context values read by ``expression_keys``, which the node resolves itself."""
+        references = []
+        for key in self.expression_keys:
+            value = self.config.get(key)
+            if not isinstance(value, str):
+                continue
+            # Written with or without {{ }}, as the node compiles it either way
+            try:
+                compiled = self._compile_string(value) or self._compile_string(f"{{{{{value}}}}}")
+            except ExpressionError:
+                continue  # Reported by the node when it compiles the expression
+            if compiled is not None:
+                references.append(compiled.references)
+        return _union(references)
+
+    def render(self, context: dict) -> dict:
+        """Resolve the config for one run."""
+        return {key: render(context) if render else value for key, value, render in self._entries}
+
+    @cached_property
+    def _row_entries(self) -> tuple:
+        # Same shape as _entries, but built from a row of evaluated leaf values
+        leaves: list[TemplateLeaf] = []
+        return tuple(
+            (
+                key,
+                value,
+                None
+                if key in self.raw_keys
+                else _build(value, (key,), self._compile_string, leaves, _row_leaf),
+            )
+            for key, value in self.config.items()
+        )
+
+    def render_batch(self, contexts: Sequence[dict]) -> list[dict]:
+        """Resolve the config once per context, e.g. once per item."""
+        if self.is_static:
+            return [self.render(context) for context in contexts]
+
+        from src.core.expressions.batch import evaluate_batch
+
+        columns = [evaluate_batch(leaf.compiled, contexts) for leaf in self.leaves]
+        entries = self._row_entries
+        return [
+            {key: render(row) if render else value for key, value, render in entries}
+            for row in zip(*columns)
+        ]
+
+
+class ConfigTemplateCache:
+    """
+    LRU cache of config templates keyed by a caller-supplied version.
+
+    The key must change whenever the config does, e.g. a node fingerprint
+    (see src.core.workflow.incremental), since configs are edited in place.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_TEMPLATE_CACHE_SIZE):
+        self.max_size = max_size
+        self._templates: OrderedDict[Hashable, ConfigTemplate] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        key: Hashable,
+        config: dict,
+        raw_keys: tuple[str, ...] = (),
+        expression_keys: tuple[str, ...] = (),
+    ) -> ConfigTemplate:
+        """Get the template for a config, compiling it if needed."""
+        key = (key, tuple(raw_keys), tuple(expression_keys))
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self._templates.move_to_end(key)
+                self.hits += 1
+                return template
+
+        from src.core.expressions.parser import get_parser
+
+        template = get_parser().compile_config(config, raw_keys, expression_keys)
+
+        with self._lock:
+            self.misses += 1
+            self._templates[key] = template
+            self._templates.move_to_end(key)
+            while len(self._templates) > self.max_size:
+                self._templates.popitem(last=False)
+
+        return template
+
+    def clear(self):
+        """Drop all cached templates."""
+        with self._lock:
+            self._templates.clear()
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+
+# Global template cache instance
+_template_cache: ConfigTemplateCache | None = None
+
+
+def get_template_cache() -> ConfigTemplateCache:
+    """Get the global config template cache."""
+    global _template_cache
+    if _template_cache is None:
+        _template_cache = ConfigTemplateCache()
+    return _template_cache
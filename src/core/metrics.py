@@ -0,0 +1,247 @@
+"""
+Metrics Registry
+
+In-process aggregation of the telemetry metrics (see src.core.telemetry.METRICS)
+for scraping in the Prometheus text format, plus gauges read at scrape time
+such as queue depth and event-loop lag.
+
+Metric names follow Prometheus conventions: ``skynette.node.duration`` in ms
+becomes the ``skynette_node_duration_seconds`` histogram and counters get a
+``_total`` suffix. Attributes become labels, except per-run identifiers such as
+``workflow.id`` that would create a series per run.
+"""
+
+import asyncio
+import bisect
+import logging
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from src.core.telemetry import COUNTER, HISTOGRAM, METRICS, UP_DOWN_COUNTER
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+# Attributes that identify a single run, node or request; not used as labels
+UNLABELED_ATTRIBUTES = frozenset(
+    {"workflow.id", "workflow.name", "execution.id", "node.id", "webhook.path"}
+)
+
+GAUGE = "gauge"
+
+# Gauges read at scrape time: name -> (unit, description)
+GAUGES: dict[str, tuple[str, str]] = {
+    "skynette.queue.runs": ("{run}", "Runs in the execution queue, by status"),
+    "skynette.event_loop.lag": ("ms", "Delay of the event loop behind its schedule"),
+}
+
+Labels = tuple[tuple[str, str], ...]
+
+# A gauge callback returns one value, or values by label set
+GaugeCallback = Callable[[], float | dict[Labels, float]]
+
+
+def prometheus_name(name: str, kind: str, unit: str) -> str:
+    """Prometheus name for a dotted metric name."""
+    base = name.replace(".", "_")
+    if unit == "ms":
+        base += "_seconds"
+    elif not unit.startswith("{"):
+        base += "_" + unit.lower()
+    if kind == COUNTER:
+        base += "_total"
+    return base
+
+
+def labels(attributes: dict[str, Any] | None) -> Labels:
+    """Turn telemetry attributes into a sorted tuple of Prometheus labels."""
+    result = []
+    for key, value in (attributes or {}).items():
+        if value is None or key in UNLABELED_ATTRIBUTES:
+            continue
+        if isinstance(value, bool):
+            value = str(value).lower()
+        result.append((key.replace(".", "_"), str(value)))
+    return tuple(sorted(result))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(label_set: Labels, extra: tuple[str, str] | None = None) -> str:
+    pairs = list(label_set) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Histogram:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, buckets: tuple[float, ...], value: float):
+        index = bisect.bisect_left(buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms, rendered in the Prometheus text format."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Args:
+            buckets: Histogram bucket upper bounds, in seconds
+        """
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[Labels, float]] = {}
+        self._histograms: dict[str, dict[Labels, _Histogram]] = {}
+        self._gauges: dict[str, GaugeCallback] = {}
+        self._gauge_values: dict[str, dict[Labels, float]] = {}
+
+    def add(self, name: str, value: float = 1, attributes: dict[str, Any] | None = None):
+        """Add to a counter from METRICS."""
+        key = labels(attributes)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def record(self, name: str, value: float, attributes: dict[str, Any] | None = None):
+        """Record a histogram value from METRICS."""
+        if METRICS.get(name, (HISTOGRAM, "", ""))[1] == "ms":
+            value = value / 1000
+        key = labels(attributes)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(self.buckets)
+            histogram.observe(self.buckets, value)
+
+    def set_gauge(self, name: str, value: float, attributes: dict[str, Any] | None = None):
+        """Set a gauge from GAUGES."""
+        with self._lock:
+            self._gauge_values.setdefault(name, {})[labels(attributes)] = value
+
+    def register_gauge(self, name: str, callback: GaugeCallback):
+        """Read a gauge from GAUGES by calling ``callback`` on every scrape."""
+        with self._lock:
+            self._gauges[name] = callback
+
+    def unregister_gauge(self, name: str):
+        """Stop reading a gauge registered with register_gauge()."""
+        with self._lock:
+            self._gauges.pop(name, None)
+
+    def get(self, name: str, attributes: dict[str, Any] | None = None) -> float:
+        """Current value of a counter (or the count of a histogram)."""
+        key = labels(attributes)
+        with self._lock:
+            if name in self._histograms:
+                histogram = self._histograms[name].get(key)
+                return histogram.count if histogram else 0
+            return self._counters.get(name, {}).get(key, 0)
+
+    def _read_gauges(self) -> dict[str, dict[Labels, float]]:
+        with self._lock:
+            values = {name: dict(series) for name, series in self._gauge_values.items()}
+            callbacks = list(self._gauges.items())
+        for name, callback in callbacks:
+            try:
+                result = callback()
+            except Exception as e:
+                logger.warning(f"Could not read gauge {name}: {e}")
+                continue
+            values[name] = result if isinstance(result, dict) else {(): result}
+        return values
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        gauges = self._read_gauges()
+        lines: list[str] = []
+
+        def header(name: str, kind: str, description: str):
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                kind, unit, description = METRICS.get(name, (COUNTER, "", name))
+                prom_kind = GAUGE if kind == UP_DOWN_COUNTER else COUNTER
+                prom_name = prometheus_name(name, prom_kind, unit)
+                header(prom_name, prom_kind, description)
+                for key, value in sorted(series.items()):
+                    lines.append(f"{prom_name}{_format_labels(key)} {_format_value(value)}")
+
+            for name, series in sorted(self._histograms.items()):
+                _, unit, description = METRICS.get(name, (HISTOGRAM, "", name))
+                prom_name = prometheus_name(name, HISTOGRAM, unit)
+                header(prom_name, HISTOGRAM, description)
+                for key, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(self.buckets, histogram.counts, strict=True):
+                        cumulative += count
+                        bucket_labels = _format_labels(key, ("le", _format_value(bound)))
+                        lines.append(f"{prom_name}_bucket{bucket_labels} {cumulative}")
+                    inf_labels = _format_labels(key, ("le", "+Inf"))
+                    lines.append(f"{prom_name}_bucket{inf_labels} {histogram.count}")
+                    lines.append(f"{prom_name}_sum{_format_labels(key)} {histogram.sum!r}")
+                    lines.append(f"{prom_name}_count{_format_labels(key)} {histogram.count}")
+
+        for name, series in sorted(gauges.items()):
+            unit, description = GAUGES.get(name, ("", name))
+            if unit == "ms":
+                series = {key: value / 1000 for key, value in series.items()}
+            prom_name = prometheus_name(name, GAUGE, unit)
+            header(prom_name, GAUGE, description)
+            for key, value in sorted(series.items()):
+                lines.append(f"{prom_name}{_format_labels(key)} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+async def monitor_event_loop(registry: MetricsRegistry, interval: float = 0.5):
+    """
+    Measure event-loop lag until cancelled.
+
+    Sleeps for ``interval`` and records how much later than scheduled it woke
+    up as the ``skynette.event_loop.lag`` gauge.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - started - interval)
+        registry.set_gauge("skynette.event_loop.lag", lag * 1000)
@@ -1,10 +1,15 @@
 """AI workflow nodes."""
 
-from src.core.nodes.ai.chat import ChatNode
-from src.core.nodes.ai.classify import ClassifyNode
-from src.core.nodes.ai.extract import ExtractNode
-from src.core.nodes.ai.summarize import SummarizeNode
-from src.core.nodes.ai.text_generation import TextGenerationNode
+from src.core.nodes.lazy import lazy_exports
+
+# Class name -> module that defines it. Modules are imported on first access.
+_NODE_MODULES = {
+    "ChatNode": "src.core.nodes.ai.chat",
+    "ClassifyNode": "src.core.nodes.ai.classify",
+    "ExtractNode": "src.core.nodes.ai.extract",
+    "SummarizeNode": "src.core.nodes.ai.summarize",
+    "TextGenerationNode": "src.core.nodes.ai.text_generation",
+}
 
 __all__ = [
     "TextGenerationNode",
@@ -15,10 +20,12 @@ __all__ = [
 ]
 
 # Register AI nodes
-AI_NODES = [
-    TextGenerationNode,
-    ChatNode,
-    SummarizeNode,
-    ExtractNode,
-    ClassifyNode,
+_AI_NODES_NAMES = [
+    "TextGenerationNode",
+    "ChatNode",
+    "SummarizeNode",
+    "ExtractNode",
+    "ClassifyNode",
 ]
+
+__getattr__, __dir__ = lazy_exports(globals(), _NODE_MODULES, {"AI_NODES": _AI_NODES_NAMES})
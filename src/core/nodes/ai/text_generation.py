@@ -2,6 +2,8 @@
 Text Generation Node - Generate text using AI.
 """
 
+from collections.abc import Mapping
+
 from src.core.nodes.base import BaseNode, FieldType, NodeField
 
 
@@ -149,7 +151,7 @@ class TextGenerationNode(BaseNode):
             parts = var_path.split(".")
             current = context
             for part in parts:
-                if isinstance(current, dict) and part in current:
+                if isinstance(current, Mapping) and part in current:
                     current = current[part]
                 else:
                     return match.group(0)  # Keep original if not found
@@ -1,150 +1,127 @@
 """App integration nodes."""
 
-from src.core.nodes.apps.airtable import (
-    AirtableCreateRecordNode,
-    AirtableDeleteRecordNode,
-    AirtableGetRecordNode,
-    AirtableListBasesNode,
-    AirtableListRecordsNode,
-    AirtableUpdateRecordNode,
-)
-from src.core.nodes.apps.aws_s3 import S3DownloadNode, S3ListObjectsNode, S3UploadNode
-from src.core.nodes.apps.database import (
-    MongoDBQueryNode,
-    MongoDBWriteNode,
-    MySQLQueryNode,
-    PostgreSQLQueryNode,
-    SQLiteQueryNode,
-)
-from src.core.nodes.apps.discord import DiscordBotMessageNode, DiscordWebhookNode
-from src.core.nodes.apps.dropbox import (
-    DropboxCreateFolderNode,
-    DropboxDeleteNode,
-    DropboxDownloadNode,
-    DropboxGetLinkNode,
-    DropboxListNode,
-    DropboxUploadNode,
-)
-from src.core.nodes.apps.email import EmailReadNode, EmailSendNode
-from src.core.nodes.apps.github import (
-    GitHubCreateIssueNode,
-    GitHubCreatePRNode,
-    GitHubListReposNode,
-)
-from src.core.nodes.apps.google_drive import (
-    GoogleDriveCreateFolderNode,
-    GoogleDriveDeleteNode,
-    GoogleDriveDownloadNode,
-    GoogleDriveListNode,
-    GoogleDriveUploadNode,
-)
-from src.core.nodes.apps.google_sheets import GoogleSheetsReadNode, GoogleSheetsWriteNode
-from src.core.nodes.apps.hubspot import (
-    HubSpotCreateContactNode,
-    HubSpotCreateDealNode,
-    HubSpotGetContactNode,
-    HubSpotGetDealNode,
-    HubSpotListDealsNode,
-    HubSpotSearchContactsNode,
-    HubSpotUpdateContactNode,
-)
-from src.core.nodes.apps.jira import (
-    JiraAddCommentNode,
-    JiraCreateIssueNode,
-    JiraGetIssueNode,
-    JiraGetTransitionsNode,
-    JiraListProjectsNode,
-    JiraSearchIssuesNode,
-    JiraTransitionIssueNode,
-    JiraUpdateIssueNode,
-)
-from src.core.nodes.apps.mailchimp import (
-    MailchimpAddSubscriberNode,
-    MailchimpCreateCampaignNode,
-    MailchimpGetAudienceNode,
-    MailchimpGetSubscriberNode,
-    MailchimpListAudiencesNode,
-    MailchimpListCampaignsNode,
-    MailchimpSendCampaignNode,
-    MailchimpUpdateSubscriberNode,
-)
-from src.core.nodes.apps.notion import (
-    NotionCreatePageNode,
-    NotionQueryDatabaseNode,
-    NotionUpdatePageNode,
-)
-from src.core.nodes.apps.sendgrid import (
-    SendGridAddContactNode,
-    SendGridGetStatsNode,
-    SendGridListTemplatesNode,
-    SendGridSearchContactsNode,
-    SendGridSendEmailNode,
-    SendGridSendTemplateNode,
-)
-from src.core.nodes.apps.shopify import (
-    ShopifyCreateCustomerNode,
-    ShopifyGetOrderNode,
-    ShopifyGetProductNode,
-    ShopifyListCustomersNode,
-    ShopifyListOrdersNode,
-    ShopifyListProductsNode,
-    ShopifyUpdateInventoryNode,
-)
-from src.core.nodes.apps.slack import SlackReactionNode, SlackSendMessageNode
-from src.core.nodes.apps.stripe import (
-    StripeCreateCustomerNode,
-    StripeCreateInvoiceNode,
-    StripeCreatePaymentIntentNode,
-    StripeCreateProductNode,
-    StripeCreateRefundNode,
-    StripeGetCustomerNode,
-    StripeListChargesNode,
-)
-from src.core.nodes.apps.teams import (
-    TeamsCreateMeetingNode,
-    TeamsGetMessagesNode,
-    TeamsListChannelsNode,
-    TeamsListTeamsNode,
-    TeamsSendMessageNode,
-)
-from src.core.nodes.apps.telegram import (
-    TelegramGetUpdatesNode,
-    TelegramSendMessageNode,
-    TelegramSendPhotoNode,
-)
-from src.core.nodes.apps.trello import (
-    TrelloAddCommentNode,
-    TrelloCreateCardNode,
-    TrelloDeleteCardNode,
-    TrelloListBoardsNode,
-    TrelloListCardsNode,
-    TrelloListListsNode,
-    TrelloUpdateCardNode,
-)
-from src.core.nodes.apps.twilio import (
-    TwilioGetMessageNode,
-    TwilioListMessagesNode,
-    TwilioLookupNode,
-    TwilioMakeCallNode,
-    TwilioSendSMSNode,
-    TwilioSendWhatsAppNode,
-)
-from src.core.nodes.apps.twitter import (
-    TwitterGetUserNode,
-    TwitterPostTweetNode,
-    TwitterSearchTweetsNode,
-)
-from src.core.nodes.apps.webhook import WebhookCallNode, WebhookResponseNode, WebhookTriggerNode
-from src.core.nodes.apps.zendesk import (
-    ZendeskAddCommentNode,
-    ZendeskCreateTicketNode,
-    ZendeskCreateUserNode,
-    ZendeskGetTicketNode,
-    ZendeskGetUserNode,
-    ZendeskListTicketsNode,
-    ZendeskSearchTicketsNode,
-    ZendeskUpdateTicketNode,
-)
+from src.core.nodes.lazy import lazy_exports
+
+# Class name -> module that defines it. Modules are imported on first access.
+_NODE_MODULES = {
+    "AirtableCreateRecordNode": "src.core.nodes.apps.airtable",
+    "AirtableDeleteRecordNode": "src.core.nodes.apps.airtable",
+    "AirtableGetRecordNode": "src.core.nodes.apps.airtable",
+    "AirtableListBasesNode": "src.core.nodes.apps.airtable",
+    "AirtableListRecordsNode": "src.core.nodes.apps.airtable",
+    "AirtableUpdateRecordNode": "src.core.nodes.apps.airtable",
+    "S3DownloadNode": "src.core.nodes.apps.aws_s3",
+    "S3ListObjectsNode": "src.core.nodes.apps.aws_s3",
+    "S3UploadNode": "src.core.nodes.apps.aws_s3",
+    "MongoDBQueryNode": "src.core.nodes.apps.database",
+    "MongoDBWriteNode": "src.core.nodes.apps.database",
+    "MySQLQueryNode": "src.core.nodes.apps.database",
+    "PostgreSQLQueryNode": "src.core.nodes.apps.database",
+    "SQLiteQueryNode": "src.core.nodes.apps.database",
+    "DiscordBotMessageNode": "src.core.nodes.apps.discord",
+    "DiscordWebhookNode": "src.core.nodes.apps.discord",
+    "DropboxCreateFolderNode": "src.core.nodes.apps.dropbox",
+    "DropboxDeleteNode": "src.core.nodes.apps.dropbox",
+    "DropboxDownloadNode": "src.core.nodes.apps.dropbox",
+    "DropboxGetLinkNode": "src.core.nodes.apps.dropbox",
+    "DropboxListNode": "src.core.nodes.apps.dropbox",
+    "DropboxUploadNode": "src.core.nodes.apps.dropbox",
+    "EmailReadNode": "src.core.nodes.apps.email",
+    "EmailSendNode": "src.core.nodes.apps.email",
+    "GitHubCreateIssueNode": "src.core.nodes.apps.github",
+    "GitHubCreatePRNode": "src.core.nodes.apps.github",
+    "GitHubListReposNode": "src.core.nodes.apps.github",
+    "GoogleDriveCreateFolderNode": "src.core.nodes.apps.google_drive",
+    "GoogleDriveDeleteNode": "src.core.nodes.apps.google_drive",
+    "GoogleDriveDownloadNode": "src.core.nodes.apps.google_drive",
+    "GoogleDriveListNode": "src.core.nodes.apps.google_drive",
+    "GoogleDriveUploadNode": "src.core.nodes.apps.google_drive",
+    "GoogleSheetsReadNode": "src.core.nodes.apps.google_sheets",
+    "GoogleSheetsWriteNode": "src.core.nodes.apps.google_sheets",
+    "HubSpotCreateContactNode": "src.core.nodes.apps.hubspot",
+    "HubSpotCreateDealNode": "src.core.nodes.apps.hubspot",
+    "HubSpotGetContactNode": "src.core.nodes.apps.hubspot",
+    "HubSpotGetDealNode": "src.core.nodes.apps.hubspot",
+    "HubSpotListDealsNode": "src.core.nodes.apps.hubspot",
+    "HubSpotSearchContactsNode": "src.core.nodes.apps.hubspot",
+    "HubSpotUpdateContactNode": "src.core.nodes.apps.hubspot",
+    "JiraAddCommentNode": "src.core.nodes.apps.jira",
+    "JiraCreateIssueNode": "src.core.nodes.apps.jira",
+    "JiraGetIssueNode": "src.core.nodes.apps.jira",
+    "JiraGetTransitionsNode": "src.core.nodes.apps.jira",
+    "JiraListProjectsNode": "src.core.nodes.apps.jira",
+    "JiraSearchIssuesNode": "src.core.nodes.apps.jira",
+    "JiraTransitionIssueNode": "src.core.nodes.apps.jira",
+    "JiraUpdateIssueNode": "src.core.nodes.apps.jira",
+    "MailchimpAddSubscriberNode": "src.core.nodes.apps.mailchimp",
+    "MailchimpCreateCampaignNode": "src.core.nodes.apps.mailchimp",
+    "MailchimpGetAudienceNode": "src.core.nodes.apps.mailchimp",
+    "MailchimpGetSubscriberNode": "src.core.nodes.apps.mailchimp",
+    "MailchimpListAudiencesNode": "src.core.nodes.apps.mailchimp",
+    "MailchimpListCampaignsNode": "src.core.nodes.apps.mailchimp",
+    "MailchimpSendCampaignNode": "src.core.nodes.apps.mailchimp",
+    "MailchimpUpdateSubscriberNode": "src.core.nodes.apps.mailchimp",
+    "NotionCreatePageNode": "src.core.nodes.apps.notion",
+    "NotionQueryDatabaseNode": "src.core.nodes.apps.notion",
+    "NotionUpdatePageNode": "src.core.nodes.apps.notion",
+    "SendGridAddContactNode": "src.core.nodes.apps.sendgrid",
+    "SendGridGetStatsNode": "src.core.nodes.apps.sendgrid",
+    "SendGridListTemplatesNode": "src.core.nodes.apps.sendgrid",
+    "SendGridSearchContactsNode": "src.core.nodes.apps.sendgrid",
+    "SendGridSendEmailNode": "src.core.nodes.apps.sendgrid",
+    "SendGridSendTemplateNode": "src.core.nodes.apps.sendgrid",
+    "ShopifyCreateCustomerNode": "src.core.nodes.apps.shopify",
+    "ShopifyGetOrderNode": "src.core.nodes.apps.shopify",
+    "ShopifyGetProductNode": "src.core.nodes.apps.shopify",
+    "ShopifyListCustomersNode": "src.core.nodes.apps.shopify",
+    "ShopifyListOrdersNode": "src.core.nodes.apps.shopify",
+    "ShopifyListProductsNode": "src.core.nodes.apps.shopify",
+    "ShopifyUpdateInventoryNode": "src.core.nodes.apps.shopify",
+    "SlackReactionNode": "src.core.nodes.apps.slack",
+    "SlackSendMessageNode": "src.core.nodes.apps.slack",
+    "StripeCreateCustomerNode": "src.core.nodes.apps.stripe",
+    "StripeCreateInvoiceNode": "src.core.nodes.apps.stripe",
+    "StripeCreatePaymentIntentNode": "src.core.nodes.apps.stripe",
+    "StripeCreateProductNode": "src.core.nodes.apps.stripe",
+    "StripeCreateRefundNode": "src.core.nodes.apps.stripe",
+    "StripeGetCustomerNode": "src.core.nodes.apps.stripe",
+    "StripeListChargesNode": "src.core.nodes.apps.stripe",
+    "TeamsCreateMeetingNode": "src.core.nodes.apps.teams",
+    "TeamsGetMessagesNode": "src.core.nodes.apps.teams",
+    "TeamsListChannelsNode": "src.core.nodes.apps.teams",
+    "TeamsListTeamsNode": "src.core.nodes.apps.teams",
+    "TeamsSendMessageNode": "src.core.nodes.apps.teams",
+    "TelegramGetUpdatesNode": "src.core.nodes.apps.telegram",
+    "TelegramSendMessageNode": "src.core.nodes.apps.telegram",
+    "TelegramSendPhotoNode": "src.core.nodes.apps.telegram",
+    "TrelloAddCommentNode": "src.core.nodes.apps.trello",
+    "TrelloCreateCardNode": "src.core.nodes.apps.trello",
+    "TrelloDeleteCardNode": "src.core.nodes.apps.trello",
+    "TrelloListBoardsNode": "src.core.nodes.apps.trello",
+    "TrelloListCardsNode": "src.core.nodes.apps.trello",
+    "TrelloListListsNode": "src.core.nodes.apps.trello",
+    "TrelloUpdateCardNode": "src.core.nodes.apps.trello",
+    "TwilioGetMessageNode": "src.core.nodes.apps.twilio",
+    "TwilioListMessagesNode": "src.core.nodes.apps.twilio",
+    "TwilioLookupNode": "src.core.nodes.apps.twilio",
+    "TwilioMakeCallNode": "src.core.nodes.apps.twilio",
+    "TwilioSendSMSNode": "src.core.nodes.apps.twilio",
+    "TwilioSendWhatsAppNode": "src.core.nodes.apps.twilio",
+    "TwitterGetUserNode": "src.core.nodes.apps.twitter",
+    "TwitterPostTweetNode": "src.core.nodes.apps.twitter",
+    "TwitterSearchTweetsNode": "src.core.nodes.apps.twitter",
+    "WebhookCallNode": "src.core.nodes.apps.webhook",
+    "WebhookResponseNode": "src.core.nodes.apps.webhook",
+    "WebhookTriggerNode": "src.core.nodes.apps.webhook",
+    "ZendeskAddCommentNode": "src.core.nodes.apps.zendesk",
+    "ZendeskCreateTicketNode": "src.core.nodes.apps.zendesk",
+    "ZendeskCreateUserNode": "src.core.nodes.apps.zendesk",
+    "ZendeskGetTicketNode": "src.core.nodes.apps.zendesk",
+    "ZendeskGetUserNode": "src.core.nodes.apps.zendesk",
+    "ZendeskListTicketsNode": "src.core.nodes.apps.zendesk",
+    "ZendeskSearchTicketsNode": "src.core.nodes.apps.zendesk",
+    "ZendeskUpdateTicketNode": "src.core.nodes.apps.zendesk",
+}
 
 __all__ = [
     # Slack
@@ -291,146 +268,148 @@ __all__ = [
 ]
 
 # All app nodes for registry
-APP_NODES = [
+_APP_NODES_NAMES = [
     # Slack
-    SlackSendMessageNode,
-    SlackReactionNode,
+    "SlackSendMessageNode",
+    "SlackReactionNode",
     # Email
-    EmailSendNode,
-    EmailReadNode,
+    "EmailSendNode",
+    "EmailReadNode",
     # Discord
-    DiscordWebhookNode,
-    DiscordBotMessageNode,
+    "DiscordWebhookNode",
+    "DiscordBotMessageNode",
     # Database
-    SQLiteQueryNode,
-    PostgreSQLQueryNode,
-    MySQLQueryNode,
-    MongoDBQueryNode,
-    MongoDBWriteNode,
+    "SQLiteQueryNode",
+    "PostgreSQLQueryNode",
+    "MySQLQueryNode",
+    "MongoDBQueryNode",
+    "MongoDBWriteNode",
     # Google Sheets
-    GoogleSheetsReadNode,
-    GoogleSheetsWriteNode,
+    "GoogleSheetsReadNode",
+    "GoogleSheetsWriteNode",
     # Google Drive
-    GoogleDriveListNode,
-    GoogleDriveDownloadNode,
-    GoogleDriveUploadNode,
-    GoogleDriveCreateFolderNode,
-    GoogleDriveDeleteNode,
+    "GoogleDriveListNode",
+    "GoogleDriveDownloadNode",
+    "GoogleDriveUploadNode",
+    "GoogleDriveCreateFolderNode",
+    "GoogleDriveDeleteNode",
     # Webhook
-    WebhookTriggerNode,
-    WebhookResponseNode,
-    WebhookCallNode,
+    "WebhookTriggerNode",
+    "WebhookResponseNode",
+    "WebhookCallNode",
     # Telegram
-    TelegramSendMessageNode,
-    TelegramSendPhotoNode,
-    TelegramGetUpdatesNode,
+    "TelegramSendMessageNode",
+    "TelegramSendPhotoNode",
+    "TelegramGetUpdatesNode",
     # GitHub
-    GitHubCreateIssueNode,
-    GitHubCreatePRNode,
-    GitHubListReposNode,
+    "GitHubCreateIssueNode",
+    "GitHubCreatePRNode",
+    "GitHubListReposNode",
     # Notion
-    NotionQueryDatabaseNode,
-    NotionCreatePageNode,
-    NotionUpdatePageNode,
+    "NotionQueryDatabaseNode",
+    "NotionCreatePageNode",
+    "NotionUpdatePageNode",
     # AWS S3
-    S3UploadNode,
-    S3DownloadNode,
-    S3ListObjectsNode,
+    "S3UploadNode",
+    "S3DownloadNode",
+    "S3ListObjectsNode",
     # Twitter
-    TwitterPostTweetNode,
-    TwitterSearchTweetsNode,
-    TwitterGetUserNode,
+    "TwitterPostTweetNode",
+    "TwitterSearchTweetsNode",
+    "TwitterGetUserNode",
     # Microsoft Teams
-    TeamsSendMessageNode,
-    TeamsListChannelsNode,
-    TeamsListTeamsNode,
-    TeamsGetMessagesNode,
-    TeamsCreateMeetingNode,
+    "TeamsSendMessageNode",
+    "TeamsListChannelsNode",
+    "TeamsListTeamsNode",
+    "TeamsGetMessagesNode",
+    "TeamsCreateMeetingNode",
     # Dropbox
-    DropboxListNode,
-    DropboxDownloadNode,
-    DropboxUploadNode,
-    DropboxCreateFolderNode,
-    DropboxDeleteNode,
-    DropboxGetLinkNode,
+    "DropboxListNode",
+    "DropboxDownloadNode",
+    "DropboxUploadNode",
+    "DropboxCreateFolderNode",
+    "DropboxDeleteNode",
+    "DropboxGetLinkNode",
     # Trello
-    TrelloListBoardsNode,
-    TrelloListListsNode,
-    TrelloListCardsNode,
-    TrelloCreateCardNode,
-    TrelloUpdateCardNode,
-    TrelloDeleteCardNode,
-    TrelloAddCommentNode,
+    "TrelloListBoardsNode",
+    "TrelloListListsNode",
+    "TrelloListCardsNode",
+    "TrelloCreateCardNode",
+    "TrelloUpdateCardNode",
+    "TrelloDeleteCardNode",
+    "TrelloAddCommentNode",
     # Airtable
-    AirtableListBasesNode,
-    AirtableListRecordsNode,
-    AirtableGetRecordNode,
-    AirtableCreateRecordNode,
-    AirtableUpdateRecordNode,
-    AirtableDeleteRecordNode,
+    "AirtableListBasesNode",
+    "AirtableListRecordsNode",
+    "AirtableGetRecordNode",
+    "AirtableCreateRecordNode",
+    "AirtableUpdateRecordNode",
+    "AirtableDeleteRecordNode",
     # Jira
-    JiraListProjectsNode,
-    JiraSearchIssuesNode,
-    JiraGetIssueNode,
-    JiraCreateIssueNode,
-    JiraUpdateIssueNode,
-    JiraAddCommentNode,
-    JiraTransitionIssueNode,
-    JiraGetTransitionsNode,
+    "JiraListProjectsNode",
+    "JiraSearchIssuesNode",
+    "JiraGetIssueNode",
+    "JiraCreateIssueNode",
+    "JiraUpdateIssueNode",
+    "JiraAddCommentNode",
+    "JiraTransitionIssueNode",
+    "JiraGetTransitionsNode",
     # Twilio
-    TwilioSendSMSNode,
-    TwilioSendWhatsAppNode,
-    TwilioGetMessageNode,
-    TwilioListMessagesNode,
-    TwilioMakeCallNode,
-    TwilioLookupNode,
+    "TwilioSendSMSNode",
+    "TwilioSendWhatsAppNode",
+    "TwilioGetMessageNode",
+    "TwilioListMessagesNode",
+    "TwilioMakeCallNode",
+    "TwilioLookupNode",
     # SendGrid
-    SendGridSendEmailNode,
-    SendGridSendTemplateNode,
-    SendGridGetStatsNode,
-    SendGridListTemplatesNode,
-    SendGridAddContactNode,
-    SendGridSearchContactsNode,
+    "SendGridSendEmailNode",
+    "SendGridSendTemplateNode",
+    "SendGridGetStatsNode",
+    "SendGridListTemplatesNode",
+    "SendGridAddContactNode",
+    "SendGridSearchContactsNode",
     # Stripe
-    StripeCreateCustomerNode,
-    StripeGetCustomerNode,
-    StripeCreatePaymentIntentNode,
-    StripeListChargesNode,
-    StripeCreateInvoiceNode,
-    StripeCreateProductNode,
-    StripeCreateRefundNode,
+    "StripeCreateCustomerNode",
+    "StripeGetCustomerNode",
+    "StripeCreatePaymentIntentNode",
+    "StripeListChargesNode",
+    "StripeCreateInvoiceNode",
+    "StripeCreateProductNode",
+    "StripeCreateRefundNode",
     # Shopify
-    ShopifyListProductsNode,
-    ShopifyGetProductNode,
-    ShopifyListOrdersNode,
-    ShopifyGetOrderNode,
-    ShopifyListCustomersNode,
-    ShopifyCreateCustomerNode,
-    ShopifyUpdateInventoryNode,
+    "ShopifyListProductsNode",
+    "ShopifyGetProductNode",
+    "ShopifyListOrdersNode",
+    "ShopifyGetOrderNode",
+    "ShopifyListCustomersNode",
+    "ShopifyCreateCustomerNode",
+    "ShopifyUpdateInventoryNode",
     # HubSpot
-    HubSpotGetContactNode,
-    HubSpotSearchContactsNode,
-    HubSpotCreateContactNode,
-    HubSpotUpdateContactNode,
-    HubSpotGetDealNode,
-    HubSpotListDealsNode,
-    HubSpotCreateDealNode,
+    "HubSpotGetContactNode",
+    "HubSpotSearchContactsNode",
+    "HubSpotCreateContactNode",
+    "HubSpotUpdateContactNode",
+    "HubSpotGetDealNode",
+    "HubSpotListDealsNode",
+    "HubSpotCreateDealNode",
     # Zendesk
-    ZendeskCreateTicketNode,
-    ZendeskGetTicketNode,
-    ZendeskUpdateTicketNode,
-    ZendeskListTicketsNode,
-    ZendeskSearchTicketsNode,
-    ZendeskAddCommentNode,
-    ZendeskGetUserNode,
-    ZendeskCreateUserNode,
+    "ZendeskCreateTicketNode",
+    "ZendeskGetTicketNode",
+    "ZendeskUpdateTicketNode",
+    "ZendeskListTicketsNode",
+    "ZendeskSearchTicketsNode",
+    "ZendeskAddCommentNode",
+    "ZendeskGetUserNode",
+    "ZendeskCreateUserNode",
     # Mailchimp
-    MailchimpListAudiencesNode,
-    MailchimpGetAudienceNode,
-    MailchimpAddSubscriberNode,
-    MailchimpUpdateSubscriberNode,
-    MailchimpGetSubscriberNode,
-    MailchimpListCampaignsNode,
-    MailchimpCreateCampaignNode,
-    MailchimpSendCampaignNode,
+    "MailchimpListAudiencesNode",
+    "MailchimpGetAudienceNode",
+    "MailchimpAddSubscriberNode",
+    "MailchimpUpdateSubscriberNode",
+    "MailchimpGetSubscriberNode",
+    "MailchimpListCampaignsNode",
+    "MailchimpCreateCampaignNode",
+    "MailchimpSendCampaignNode",
 ]
+
+__getattr__, __dir__ = lazy_exports(globals(), _NODE_MODULES, {"APP_NODES": _APP_NODES_NAMES})
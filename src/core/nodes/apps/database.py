@@ -85,9 +85,43 @@ class SQLiteQueryNode(BaseNode):
 
     async def execute(self, config: dict, context: dict) -> dict:
         """Execute SQLite query."""
+        results = await self.execute_batch([config], [context])
+        return results[0]
+
+    async def execute_batch(self, configs: list[dict], contexts: list[dict]) -> list[dict]:
+        """
+        Execute a batch of SQLite queries on one connection.
+
+        In items mode, writes for the whole batch are committed in a single
+        transaction instead of one per row.
+        """
         import sqlite3
 
-        database = config.get("database", "")
+        loop = asyncio.get_event_loop()
+
+        def run_queries():
+            results = []
+            connections: dict[str, sqlite3.Connection] = {}
+            try:
+                for config in configs:
+                    database = config.get("database", "")
+                    if database not in connections:
+                        conn = sqlite3.connect(database)
+                        conn.row_factory = sqlite3.Row
+                        connections[database] = conn
+                    results.append(self._run_query(connections[database].cursor(), config))
+                for conn in connections.values():
+                    conn.commit()
+            finally:
+                for conn in connections.values():
+                    conn.close()
+            return results
+
+        return await loop.run_in_executor(None, run_queries)
+
+    @staticmethod
+    def _run_query(cursor, config: dict) -> dict | None:
+        """Run one query on an open cursor (the caller commits)."""
         query = config.get("query", "")
         parameters = config.get("parameters", [])
         operation = config.get("operation", "query")
@@ -101,43 +135,29 @@ class SQLiteQueryNode(BaseNode):
             except:
                 parameters = []
 
-        loop = asyncio.get_event_loop()
-
-        def run_query():
-            conn = sqlite3.connect(database)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-
-            try:
-                if operation == "query":
-                    cursor.execute(query, parameters or [])
-                    rows = [dict(row) for row in cursor.fetchall()]
-                    return {
-                        "rows": rows,
-                        "row_count": len(rows),
-                        "last_id": 0,
-                    }
-                elif operation == "execute":
-                    cursor.execute(query, parameters or [])
-                    conn.commit()
-                    return {
-                        "rows": [],
-                        "row_count": cursor.rowcount,
-                        "last_id": cursor.lastrowid,
-                    }
-                elif operation == "executemany":
-                    cursor.executemany(query, parameters or [])
-                    conn.commit()
-                    return {
-                        "rows": [],
-                        "row_count": cursor.rowcount,
-                        "last_id": cursor.lastrowid,
-                    }
-            finally:
-                conn.close()
-
-        result = await loop.run_in_executor(None, run_query)
-        return result
+        if operation == "query":
+            cursor.execute(query, parameters or [])
+            rows = [dict(row) for row in cursor.fetchall()]
+            return {
+                "rows": rows,
+                "row_count": len(rows),
+                "last_id": 0,
+            }
+        elif operation == "execute":
+            cursor.execute(query, parameters or [])
+            return {
+                "rows": [],
+                "row_count": cursor.rowcount,
+                "last_id": cursor.lastrowid,
+            }
+        elif operation == "executemany":
+            cursor.executemany(query, parameters or [])
+            return {
+                "rows": [],
+                "row_count": cursor.rowcount,
+                "last_id": cursor.lastrowid,
+            }
+        return None
 
 
 class PostgreSQLQueryNode(BaseNode):
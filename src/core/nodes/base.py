@@ -79,6 +79,16 @@ class BaseNode(ABC):
     color: str = "#6B7280"
     is_trigger: bool = False
     requires_credentials: list[str] = []
+    # "cpu" nodes run in the executor's process pool instead of on the event loop
+    execution_affinity: str = "io"
+    # Config keys passed to execute() as written, without resolving expressions in them
+    raw_config_keys: tuple[str, ...] = ()
+    # Raw keys holding an expression execute() evaluates itself; the $nodes and $prev
+    # it reads still count as reads of this node (see src.core.workflow.dataflow)
+    expression_config_keys: tuple[str, ...] = ()
+    # False if execute() reads upstream data only through config expressions, never
+    # context["$prev"] (see the ``dataflow`` setting in src.core.workflow.dataflow)
+    reads_prev: bool = True
 
     @classmethod
     def get_inputs(cls) -> list[NodeField]:
@@ -106,6 +116,53 @@ class BaseNode(ABC):
             requires_credentials=cls.requires_credentials,
         )
 
+    @classmethod
+    def get_active_ports(cls, output: Any) -> set[str] | None:
+        """
+        Get the output ports that were taken for a given output.
+
+        Branching nodes override this so the executor can skip nodes connected to
+        ports that were not taken. Connections from the default "output" port are
+        always followed.
+
+        Args:
+            output: The data returned by execute()
+
+        Returns:
+            Set of active port names, or None if every port is active
+        """
+        return None
+
+    @classmethod
+    def get_variable_updates(cls, output: Any) -> dict | None:
+        """
+        Get the workflow variables set by a given output.
+
+        Nodes that set variables override this. The executor makes the new values
+        visible through ``$vars`` to downstream nodes only; other branches and the
+        workflow's own variables are unchanged.
+
+        Args:
+            output: The data returned by execute()
+
+        Returns:
+            Variable name -> value, or None if the node sets no variables
+        """
+        return None
+
+    async def setup(self):
+        """
+        Prepare long-lived resources (HTTP clients, DB pools, compiled regexes).
+
+        Called once when the registry creates a pooled instance, before its first
+        execute(). Instances are reused across executions until evicted.
+        """
+        pass
+
+    async def teardown(self):
+        """Release resources acquired in setup(). Called when the instance is evicted."""
+        pass
+
     @abstractmethod
     async def execute(self, config: dict, context: dict) -> Any:
         """
@@ -120,6 +177,25 @@ class BaseNode(ABC):
         """
         pass
 
+    async def execute_batch(self, configs: list[dict], contexts: list[dict]) -> list[Any]:
+        """
+        Execute the node for a batch of items (see the ``items`` node setting).
+
+        Override to provide a fast path, such as a multi-row insert or a single
+        batched API call. Nodes that don't override it are run once per item.
+
+        Args:
+            configs: The resolved configuration for each item
+            contexts: The execution context for each item (``$item`` is the item)
+
+        Returns:
+            One output per item, in the same order
+        """
+        return [
+            await self.execute(config, context)
+            for config, context in zip(configs, contexts, strict=True)
+        ]
+
 
 class TriggerNode(BaseNode):
     """Base class for trigger nodes."""
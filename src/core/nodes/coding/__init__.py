@@ -1,53 +1,46 @@
 """Coding and development workflow nodes."""
 
-from src.core.nodes.coding.cicd import (
-    GitHubActionsNode,
-    NPMPublishNode,
-    PyPIPublishNode,
-    WaitForCINode,
-)
-from src.core.nodes.coding.debugging import (
-    ConditionalBranchNode,
-    DebugLoopNode,
-    ErrorAggregatorNode,
-    ErrorDetectorNode,
-    RetryLoopNode,
-    TryCatchNode,
-    VerifyFixNode,
-    WaitNode,
-)
-from src.core.nodes.coding.deployment import (
-    CloudflareDeployNode,
-    HerokuDeployNode,
-    NetlifyDeployNode,
-    RailwayDeployNode,
-    SupabaseDeployNode,
-    VercelDeployNode,
-)
-from src.core.nodes.coding.docker import (
-    DockerBuildNode,
-    DockerComposeNode,
-    DockerExecNode,
-    DockerLogsNode,
-    DockerPushNode,
-    DockerRunNode,
-)
-from src.core.nodes.coding.execution import (
-    LintCodeNode,
-    RunNodeJSNode,
-    RunPythonNode,
-    RunShellNode,
-    RunTestsNode,
-)
-from src.core.nodes.coding.git import (
-    GitBranchNode,
-    GitCloneNode,
-    GitCommitNode,
-    GitDiffNode,
-    GitPullNode,
-    GitPushNode,
-    GitStatusNode,
-)
+from src.core.nodes.lazy import lazy_exports
+
+# Class name -> module that defines it. Modules are imported on first access.
+_NODE_MODULES = {
+    "GitHubActionsNode": "src.core.nodes.coding.cicd",
+    "NPMPublishNode": "src.core.nodes.coding.cicd",
+    "PyPIPublishNode": "src.core.nodes.coding.cicd",
+    "WaitForCINode": "src.core.nodes.coding.cicd",
+    "ConditionalBranchNode": "src.core.nodes.coding.debugging",
+    "DebugLoopNode": "src.core.nodes.coding.debugging",
+    "ErrorAggregatorNode": "src.core.nodes.coding.debugging",
+    "ErrorDetectorNode": "src.core.nodes.coding.debugging",
+    "RetryLoopNode": "src.core.nodes.coding.debugging",
+    "TryCatchNode": "src.core.nodes.coding.debugging",
+    "VerifyFixNode": "src.core.nodes.coding.debugging",
+    "WaitNode": "src.core.nodes.coding.debugging",
+    "CloudflareDeployNode": "src.core.nodes.coding.deployment",
+    "HerokuDeployNode": "src.core.nodes.coding.deployment",
+    "NetlifyDeployNode": "src.core.nodes.coding.deployment",
+    "RailwayDeployNode": "src.core.nodes.coding.deployment",
+    "SupabaseDeployNode": "src.core.nodes.coding.deployment",
+    "VercelDeployNode": "src.core.nodes.coding.deployment",
+    "DockerBuildNode": "src.core.nodes.coding.docker",
+    "DockerComposeNode": "src.core.nodes.coding.docker",
+    "DockerExecNode": "src.core.nodes.coding.docker",
+    "DockerLogsNode": "src.core.nodes.coding.docker",
+    "DockerPushNode": "src.core.nodes.coding.docker",
+    "DockerRunNode": "src.core.nodes.coding.docker",
+    "LintCodeNode": "src.core.nodes.coding.execution",
+    "RunNodeJSNode": "src.core.nodes.coding.execution",
+    "RunPythonNode": "src.core.nodes.coding.execution",
+    "RunShellNode": "src.core.nodes.coding.execution",
+    "RunTestsNode": "src.core.nodes.coding.execution",
+    "GitBranchNode": "src.core.nodes.coding.git",
+    "GitCloneNode": "src.core.nodes.coding.git",
+    "GitCommitNode": "src.core.nodes.coding.git",
+    "GitDiffNode": "src.core.nodes.coding.git",
+    "GitPullNode": "src.core.nodes.coding.git",
+    "GitPushNode": "src.core.nodes.coding.git",
+    "GitStatusNode": "src.core.nodes.coding.git",
+}
 
 __all__ = [
     # Git
@@ -95,47 +88,49 @@ __all__ = [
 ]
 
 # All coding nodes for registry
-CODING_NODES = [
+_CODING_NODES_NAMES = [
     # Git Operations
-    GitCloneNode,
-    GitCommitNode,
-    GitPushNode,
-    GitPullNode,
-    GitBranchNode,
-    GitStatusNode,
-    GitDiffNode,
+    "GitCloneNode",
+    "GitCommitNode",
+    "GitPushNode",
+    "GitPullNode",
+    "GitBranchNode",
+    "GitStatusNode",
+    "GitDiffNode",
     # Code Execution
-    RunPythonNode,
-    RunNodeJSNode,
-    RunShellNode,
-    RunTestsNode,
-    LintCodeNode,
+    "RunPythonNode",
+    "RunNodeJSNode",
+    "RunShellNode",
+    "RunTestsNode",
+    "LintCodeNode",
     # Debugging & Error Handling
-    TryCatchNode,
-    RetryLoopNode,
-    ErrorDetectorNode,
-    DebugLoopNode,
-    VerifyFixNode,
-    ErrorAggregatorNode,
-    ConditionalBranchNode,
-    WaitNode,
+    "TryCatchNode",
+    "RetryLoopNode",
+    "ErrorDetectorNode",
+    "DebugLoopNode",
+    "VerifyFixNode",
+    "ErrorAggregatorNode",
+    "ConditionalBranchNode",
+    "WaitNode",
     # Docker
-    DockerBuildNode,
-    DockerRunNode,
-    DockerComposeNode,
-    DockerExecNode,
-    DockerLogsNode,
-    DockerPushNode,
+    "DockerBuildNode",
+    "DockerRunNode",
+    "DockerComposeNode",
+    "DockerExecNode",
+    "DockerLogsNode",
+    "DockerPushNode",
     # CI/CD
-    GitHubActionsNode,
-    WaitForCINode,
-    NPMPublishNode,
-    PyPIPublishNode,
+    "GitHubActionsNode",
+    "WaitForCINode",
+    "NPMPublishNode",
+    "PyPIPublishNode",
     # Deployment
-    VercelDeployNode,
-    NetlifyDeployNode,
-    CloudflareDeployNode,
-    HerokuDeployNode,
-    RailwayDeployNode,
-    SupabaseDeployNode,
+    "VercelDeployNode",
+    "NetlifyDeployNode",
+    "CloudflareDeployNode",
+    "HerokuDeployNode",
+    "RailwayDeployNode",
+    "SupabaseDeployNode",
 ]
+
+__getattr__, __dir__ = lazy_exports(globals(), _NODE_MODULES, {"CODING_NODES": _CODING_NODES_NAMES})
@@ -2,9 +2,7 @@
 Docker Integration Nodes - Container management for development workflows.
 """
 
-import asyncio
-import subprocess
-
+from src.core.cancellation import run_process
 from src.core.nodes.base import BaseNode, FieldType, NodeField
 
 
@@ -86,22 +84,12 @@ class DockerBuildNode(BaseNode):
 
         cmd.append(context_path)
 
-        loop = asyncio.get_event_loop()
         try:
-            result = await loop.run_in_executor(
-                None, lambda: subprocess.run(cmd, capture_output=True, text=True, timeout=600)
-            )
+            result = await run_process(cmd, timeout=600)
 
             if result.returncode == 0:
                 # Get image ID
-                inspect_result = await loop.run_in_executor(
-                    None,
-                    lambda: subprocess.run(
-                        ["docker", "inspect", "--format={{.Id}}", tag],
-                        capture_output=True,
-                        text=True,
-                    ),
-                )
+                inspect_result = await run_process(["docker", "inspect", "--format={{.Id}}", tag])
                 image_id = inspect_result.stdout.strip()[:12]
 
                 return {
@@ -225,11 +213,8 @@ class DockerRunNode(BaseNode):
         if command:
             cmd.extend(command.split())
 
-        loop = asyncio.get_event_loop()
         try:
-            result = await loop.run_in_executor(
-                None, lambda: subprocess.run(cmd, capture_output=True, text=True, timeout=120)
-            )
+            result = await run_process(cmd, timeout=120)
 
             if result.returncode == 0:
                 container_id = result.stdout.strip()[:12]
@@ -338,14 +323,8 @@ class DockerComposeNode(BaseNode):
         if service:
             cmd.append(service)
 
-        loop = asyncio.get_event_loop()
         try:
-            result = await loop.run_in_executor(
-                None,
-                lambda: subprocess.run(
-                    cmd, capture_output=True, text=True, cwd=project_path, timeout=300
-                ),
-            )
+            result = await run_process(cmd, cwd=project_path, timeout=300)
 
             containers = []
             if action == "ps":
@@ -419,11 +398,8 @@ class DockerExecNode(BaseNode):
         cmd.append(container)
         cmd.extend(["sh", "-c", command])
 
-        loop = asyncio.get_event_loop()
         try:
-            result = await loop.run_in_executor(
-                None, lambda: subprocess.run(cmd, capture_output=True, text=True, timeout=120)
-            )
+            result = await run_process(cmd, timeout=120)
 
             return {
                 "success": result.returncode == 0,
@@ -488,11 +464,8 @@ class DockerLogsNode(BaseNode):
 
         cmd.append(container)
 
-        loop = asyncio.get_event_loop()
         try:
-            result = await loop.run_in_executor(
-                None, lambda: subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            )
+            result = await run_process(cmd, timeout=30)
 
             logs = result.stdout + result.stderr
             return {
@@ -539,26 +512,14 @@ class DockerPushNode(BaseNode):
         username = config.get("username")
         password = config.get("password")
 
-        loop = asyncio.get_event_loop()
-
         try:
             # Login if credentials provided
             if username and password and registry:
                 login_cmd = ["docker", "login", registry, "-u", username, "--password-stdin"]
-                await loop.run_in_executor(
-                    None,
-                    lambda: subprocess.run(
-                        login_cmd, input=password, capture_output=True, text=True
-                    ),
-                )
+                await run_process(login_cmd, input=password)
 
             # Push
-            result = await loop.run_in_executor(
-                None,
-                lambda: subprocess.run(
-                    ["docker", "push", image], capture_output=True, text=True, timeout=600
-                ),
-            )
+            result = await run_process(["docker", "push", image], timeout=600)
 
             if result.returncode == 0:
                 # Extract digest
@@ -2,12 +2,12 @@
 Code Execution Nodes - Run code in various languages with error handling.
 """
 
-import asyncio
 import os
 import subprocess
 import tempfile
 from pathlib import Path
 
+from src.core.cancellation import run_process
 from src.core.nodes.base import BaseNode, FieldType, NodeField
 
 
@@ -74,9 +74,7 @@ class RunPythonNode(BaseNode):
         python_path = config.get("python_path") or "python"
         env_vars = config.get("env_vars") or {}
 
-        loop = asyncio.get_event_loop()
-
-        def run_code():
+        async def run_code():
             # Create temp file
             with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
                 f.write(code)
@@ -86,10 +84,8 @@ class RunPythonNode(BaseNode):
                 env = os.environ.copy()
                 env.update(env_vars)
 
-                result = subprocess.run(
+                result = await run_process(
                     [python_path, temp_path],
-                    capture_output=True,
-                    text=True,
                     timeout=timeout,
                     cwd=working_dir,
                     env=env,
@@ -131,7 +127,7 @@ class RunPythonNode(BaseNode):
                 os.unlink(temp_path)
 
         try:
-            return await loop.run_in_executor(None, run_code)
+            return await run_code()
         except Exception as e:
             return {
                 "success": False,
@@ -182,18 +178,14 @@ class RunNodeJSNode(BaseNode):
         timeout = int(config.get("timeout", 30))
         node_path = config.get("node_path") or "node"
 
-        loop = asyncio.get_event_loop()
-
-        def run_code():
+        async def run_code():
             with tempfile.NamedTemporaryFile(mode="w", suffix=".js", delete=False) as f:
                 f.write(code)
                 temp_path = f.name
 
             try:
-                result = subprocess.run(
+                result = await run_process(
                     [node_path, temp_path],
-                    capture_output=True,
-                    text=True,
                     timeout=timeout,
                     cwd=working_dir,
                 )
@@ -226,7 +218,7 @@ class RunNodeJSNode(BaseNode):
                 os.unlink(temp_path)
 
         try:
-            return await loop.run_in_executor(None, run_code)
+            return await run_code()
         except Exception as e:
             return {
                 "success": False,
@@ -287,9 +279,7 @@ class RunShellNode(BaseNode):
         timeout = int(config.get("timeout", 60))
         shell_type = config.get("shell", "auto")
 
-        loop = asyncio.get_event_loop()
-
-        def run_cmd():
+        async def run_cmd():
 
             if shell_type == "auto":
                 shell = True
@@ -308,20 +298,16 @@ class RunShellNode(BaseNode):
                     # designed to execute user-provided shell commands. The node is
                     # meant for workflow automation where users explicitly choose
                     # to run shell commands. Timeout prevents runaway processes.
-                    result = subprocess.run(
+                    result = await run_process(
                         command,
                         shell=True,  # nosec B602 - intentional for shell execution node
-                        capture_output=True,
-                        text=True,
                         timeout=timeout,
                         cwd=working_dir,
                     )
                 else:
-                    result = subprocess.run(
+                    result = await run_process(
                         shell if shell_type != "auto" else command,
                         shell=shell_type == "auto",  # nosec B602 - intentional
-                        capture_output=True,
-                        text=True,
                         timeout=timeout,
                         cwd=working_dir,
                     )
@@ -342,7 +328,7 @@ class RunShellNode(BaseNode):
                 }
 
         try:
-            return await loop.run_in_executor(None, run_cmd)
+            return await run_cmd()
         except Exception as e:
             return {
                 "success": False,
@@ -415,9 +401,7 @@ class RunTestsNode(BaseNode):
         verbose = config.get("verbose", True)
         timeout = int(config.get("timeout", 300))
 
-        loop = asyncio.get_event_loop()
-
-        def run_tests():
+        async def run_tests():
             if framework == "pytest":
                 cmd = ["python", "-m", "pytest"]
                 if verbose:
@@ -463,10 +447,8 @@ class RunTestsNode(BaseNode):
                 }
 
             try:
-                result = subprocess.run(
+                result = await run_process(
                     cmd,
-                    capture_output=True,
-                    text=True,
                     timeout=timeout,
                     cwd=project_path,
                 )
@@ -528,7 +510,7 @@ class RunTestsNode(BaseNode):
                 }
 
         try:
-            return await loop.run_in_executor(None, run_tests)
+            return await run_tests()
         except Exception as e:
             return {
                 "success": False,
@@ -589,9 +571,7 @@ class LintCodeNode(BaseNode):
         linter = config.get("linter", "auto")
         fix = config.get("fix", False)
 
-        loop = asyncio.get_event_loop()
-
-        def run_linter():
+        async def run_linter():
             # Auto-detect linter based on project files
             if linter == "auto":
                 project = Path(project_path)
@@ -624,10 +604,8 @@ class LintCodeNode(BaseNode):
                 cmd = ["ruff", "check", "."]
 
             try:
-                result = subprocess.run(
+                result = await run_process(
                     cmd,
-                    capture_output=True,
-                    text=True,
                     cwd=project_path,
                 )
 
@@ -657,7 +635,7 @@ class LintCodeNode(BaseNode):
                 }
 
         try:
-            return await loop.run_in_executor(None, run_linter)
+            return await run_linter()
         except Exception as e:
             return {
                 "success": False,
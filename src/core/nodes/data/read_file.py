@@ -18,6 +18,7 @@ class ReadFileNode(DataNode):
     name = "Read File"
     description = "Read content from a local file"
     icon = "file_open"
+    reads_prev = False
 
     @classmethod
     def get_inputs(cls) -> list[NodeField]:
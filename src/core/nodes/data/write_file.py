@@ -18,6 +18,7 @@ class WriteFileNode(DataNode):
     name = "Write File"
     description = "Write content to a local file"
     icon = "save"
+    reads_prev = False
 
     @classmethod
     def get_inputs(cls) -> list[NodeField]:
@@ -4,7 +4,6 @@ Code Execution Node
 Unified code execution node supporting multiple languages with timeout protection.
 """
 
-import asyncio
 import json
 import os
 import subprocess
@@ -12,6 +11,7 @@ import tempfile
 from pathlib import Path
 from typing import Any
 
+from src.core.cancellation import run_process
 from src.core.nodes.base import BaseNode, FieldType, NodeField, NodeOutput
 
 
@@ -181,10 +181,7 @@ class CodeExecutionNode(BaseNode):
             "powershell": ".ps1",
         }
 
-        # Get event loop for running blocking code
-        loop = asyncio.get_event_loop()
-
-        def run_code():
+        async def run_code():
             # Write code to temp file
             with tempfile.NamedTemporaryFile(
                 mode="w", suffix=suffix_map.get(language, ".txt"), delete=False, encoding="utf-8"
@@ -202,10 +199,8 @@ class CodeExecutionNode(BaseNode):
                 }.get(language, ["python", temp_path])
 
                 # Execute the code
-                result = subprocess.run(
+                result = await run_process(
                     cmd,
-                    capture_output=True,
-                    text=True,
                     timeout=timeout,
                     cwd=working_dir,
                     env=os.environ.copy(),
@@ -238,7 +233,7 @@ class CodeExecutionNode(BaseNode):
                 Path(temp_path).unlink(missing_ok=True)
 
         try:
-            return await loop.run_in_executor(None, run_code)
+            return await run_code()
         except Exception as e:
             return {
                 "stdout": "",
@@ -0,0 +1,172 @@
+"""
+Execute Workflow Node
+
+Runs another saved workflow as a step of this one.
+"""
+
+import logging
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+from src.core.nodes.base import FieldType, FlowNode, NodeField, NodeOutput
+
+if TYPE_CHECKING:
+    from src.core.workflow.models import Workflow
+
+logger = logging.getLogger(__name__)
+
+# Deepest chain of nested workflow calls allowed
+MAX_WORKFLOW_DEPTH = 10
+
+# IDs of the workflows currently running inline in this task, outermost first
+_call_stack: ContextVar[tuple[str, ...]] = ContextVar("workflow_call_stack", default=())
+
+
+class ExecuteWorkflowNode(FlowNode):
+    """Execute Workflow node - calls a saved workflow with inputs."""
+
+    type = "execute_workflow"
+    name = "Execute Workflow"
+    description = "Run another saved workflow and use its output"
+    icon = "account_tree"
+
+    @classmethod
+    def get_inputs(cls) -> list[NodeField]:
+        return [
+            NodeField(
+                name="workflow_id",
+                label="Workflow ID",
+                type=FieldType.STRING,
+                description="ID of the saved workflow to run",
+                required=True,
+            ),
+            NodeField(
+                name="inputs",
+                label="Inputs",
+                type=FieldType.EXPRESSION,
+                description="Trigger data for the workflow (default: previous node output)",
+                required=False,
+                default="{{$prev}}",
+            ),
+            NodeField(
+                name="mode",
+                label="Mode",
+                type=FieldType.SELECT,
+                description="Wait for the workflow, or hand it to the execution queue",
+                required=False,
+                default="inline",
+                options=[
+                    {"label": "Inline (wait for output)", "value": "inline"},
+                    {"label": "Queue (don't wait)", "value": "queue"},
+                ],
+            ),
+        ]
+
+    @classmethod
+    def get_outputs(cls) -> list[NodeOutput]:
+        return [
+            NodeOutput(
+                name="output",
+                type="object",
+                description="Output of the workflow's last node (inline mode)",
+            ),
+            NodeOutput(
+                name="outputs",
+                type="object",
+                description="Output of every node that succeeded, by node ID (inline mode)",
+            ),
+            NodeOutput(
+                name="execution_id",
+                type="string",
+                description="ID of the workflow's execution (the queue run ID in queue mode)",
+            ),
+            NodeOutput(
+                name="status",
+                type="string",
+                description="completed, or queued in queue mode",
+            ),
+        ]
+
+    async def execute(self, config: dict, context: dict) -> Any:
+        """Run the workflow."""
+        workflow_id = str(config.get("workflow_id") or "").strip()
+        if not workflow_id:
+            raise ValueError("Workflow ID is required")
+
+        inputs = config.get("inputs", context.get("$prev"))
+        if inputs is None:
+            inputs = {}
+        elif not isinstance(inputs, dict):
+            inputs = {"input": inputs}
+
+        if config.get("mode", "inline") == "queue":
+            from src.core.workflow.queue import get_execution_queue
+
+            run_id = get_execution_queue().enqueue(workflow_id, inputs, trigger_type="workflow")
+            return {"output": None, "outputs": {}, "execution_id": run_id, "status": "queued"}
+
+        return await run_workflow(load_workflow(workflow_id), inputs)
+
+
+def load_workflow(workflow_id: str) -> "Workflow":
+    """
+    Load a saved workflow to run from another workflow.
+
+    Parsed YAML is cached by the storage and the compiled plan by the executor,
+    so calling the same workflow again does not re-read or re-plan it.
+
+    Raises:
+        ValueError: If there is no workflow with the ID
+    """
+    from src.data.storage import get_storage
+
+    workflow = get_storage().load_workflow_cached(workflow_id)
+    if workflow is None:
+        raise ValueError(f"Workflow not found: {workflow_id}")
+    return workflow
+
+
+async def run_workflow(workflow: "Workflow", inputs: dict, trigger_type: str = "workflow") -> dict:
+    """
+    Run a workflow from inside another one and wait for it.
+
+    Args:
+        workflow: The workflow to run
+        inputs: Its trigger data
+        trigger_type: Trigger type recorded on the child execution
+
+    Returns:
+        The last successful node output, every successful output by node ID,
+        the execution ID and status
+
+    Raises:
+        ValueError: If the call would recurse or nest too deeply
+        RuntimeError: If the workflow did not complete
+    """
+    from src.core.workflow.executor import WorkflowExecutor
+
+    stack = _call_stack.get()
+    if workflow.id in stack:
+        raise ValueError(f"Workflow {workflow.id} calls itself")
+    if len(stack) >= MAX_WORKFLOW_DEPTH:
+        raise ValueError(f"Workflows nested more than {MAX_WORKFLOW_DEPTH} deep")
+
+    logger.debug(f"Running workflow {workflow.name} inline (depth {len(stack) + 1})")
+    token = _call_stack.set((*stack, workflow.id))
+    try:
+        execution = await WorkflowExecutor().execute(
+            workflow, trigger_data=inputs, trigger_type=trigger_type
+        )
+    finally:
+        _call_stack.reset(token)
+
+    if execution.status != "completed":
+        raise RuntimeError(f"Workflow '{workflow.name}' {execution.status}: {execution.error}")
+
+    outputs = {r.node_id: r.data for r in execution.node_results if r.success}
+    return {
+        "output": list(outputs.values())[-1] if outputs else None,
+        "outputs": outputs,
+        "execution_id": execution.id,
+        "status": execution.status,
+    }
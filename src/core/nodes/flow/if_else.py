@@ -104,6 +104,13 @@ class IfElseNode(FlowNode):
             ),
         ]
 
+    @classmethod
+    def get_active_ports(cls, output: Any) -> set[str] | None:
+        """Only the "true" or "false" port matching the evaluated branch is taken."""
+        if isinstance(output, dict) and output.get("branch") in ("true", "false"):
+            return {output["branch"]}
+        return None
+
     async def execute(self, config: dict, context: dict) -> Any:
         """Evaluate the condition."""
         condition_type = config.get("condition_type", "expression")
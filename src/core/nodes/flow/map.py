@@ -0,0 +1,243 @@
+"""
+Map Node
+
+Runs a sub-workflow once for each element of an array.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+from uuid import uuid4
+
+from src.core.nodes.base import FieldType, FlowNode, NodeField, NodeOutput
+from src.core.nodes.flow.execute_workflow import load_workflow, run_workflow
+
+logger = logging.getLogger(__name__)
+
+# Items run at the same time by default
+DEFAULT_MAP_CONCURRENCY = 5
+
+# Fixed version for inline sub-graphs, so their plans are cached by content
+_SUBGRAPH_VERSION = datetime(2000, 1, 1, tzinfo=UTC)
+
+
+@dataclass
+class MapProgress:
+    """Progress of a Map node run, sent to listeners after each item."""
+
+    map_id: str
+    total: int
+    completed: int
+    failed: int
+    index: int
+    error: str | None = None
+
+
+# Callbacks notified of Map node progress
+_progress_listeners: list[Callable[[MapProgress], None]] = []
+
+
+def add_progress_listener(callback: Callable[[MapProgress], None]) -> None:
+    """Register a callback to be notified after each item of a Map node run."""
+    _progress_listeners.append(callback)
+
+
+def remove_progress_listener(callback: Callable[[MapProgress], None]) -> None:
+    """Unregister a progress callback."""
+    if callback in _progress_listeners:
+        _progress_listeners.remove(callback)
+
+
+def _notify(progress: MapProgress) -> None:
+    for listener in list(_progress_listeners):
+        try:
+            listener(progress)
+        except Exception as e:
+            logger.warning(f"Map progress listener failed: {e}")
+
+
+class MapNode(FlowNode):
+    """Map node - runs a sub-workflow for each item of a list."""
+
+    type = "map"
+    name = "Map"
+    description = "Run a sub-workflow for each item of a list, several at a time"
+    icon = "repeat"
+
+    # The sub-graph's expressions refer to each item's run, not to this one
+    raw_config_keys = ("subgraph",)
+
+    @classmethod
+    def get_inputs(cls) -> list[NodeField]:
+        return [
+            NodeField(
+                name="array",
+                label="Array",
+                type=FieldType.EXPRESSION,
+                description="List to map over (default: previous node output)",
+                required=False,
+                default="{{$prev}}",
+            ),
+            NodeField(
+                name="workflow_id",
+                label="Workflow ID",
+                type=FieldType.STRING,
+                description="Saved workflow to run for each item",
+                required=False,
+            ),
+            NodeField(
+                name="subgraph",
+                label="Sub-graph",
+                type=FieldType.JSON,
+                description="Nodes and connections to run for each item, instead of a workflow",
+                required=False,
+            ),
+            NodeField(
+                name="max_concurrency",
+                label="Max Concurrency",
+                type=FieldType.NUMBER,
+                description="Items running at the same time",
+                required=False,
+                default=DEFAULT_MAP_CONCURRENCY,
+                min_value=1,
+            ),
+            NodeField(
+                name="ordered",
+                label="Keep Order",
+                type=FieldType.BOOLEAN,
+                description="Return results in input order instead of as they finish",
+                required=False,
+                default=True,
+            ),
+            NodeField(
+                name="on_item_error",
+                label="On Item Error",
+                type=FieldType.SELECT,
+                description="Record failed items and carry on, or fail the node",
+                required=False,
+                default="continue",
+                options=[
+                    {"label": "Record and continue", "value": "continue"},
+                    {"label": "Fail the node", "value": "stop"},
+                ],
+            ),
+        ]
+
+    @classmethod
+    def get_outputs(cls) -> list[NodeOutput]:
+        return [
+            NodeOutput(
+                name="results",
+                type="array",
+                description="Output of each item's run; failed items are {index, error}",
+            ),
+            NodeOutput(
+                name="indexes",
+                type="array",
+                description="Item index of each result (differs from 0..n-1 when unordered)",
+            ),
+            NodeOutput(
+                name="errors",
+                type="array",
+                description="The failed items, as {index, error}",
+            ),
+            NodeOutput(name="total", type="number", description="Number of items"),
+            NodeOutput(name="failed", type="number", description="Number of failed items"),
+        ]
+
+    async def execute(self, config: dict, context: dict) -> Any:
+        """Map over the items."""
+        from src.core.workflow.items import get_items
+
+        items = config.get("array", context.get("$prev"))
+        items = get_items(items if items is not None else [])
+        workflow = self._get_workflow(config)
+        concurrency = max(1, int(config.get("max_concurrency") or DEFAULT_MAP_CONCURRENCY))
+        ordered = config.get("ordered", True)
+        stop_on_error = config.get("on_item_error", "continue") == "stop"
+
+        map_id = str(uuid4())
+        semaphore = asyncio.Semaphore(concurrency)
+        results: list[tuple[int, Any]] = []
+        errors: list[dict] = []
+
+        async def run_item(index: int, item: Any):
+            async with semaphore:
+                error = None
+                try:
+                    result = await run_workflow(
+                        workflow, {"item": item, "index": index}, trigger_type="map"
+                    )
+                    output = result["output"]
+                except Exception as e:
+                    if stop_on_error:
+                        raise
+                    error = str(e) or type(e).__name__
+                    output = {"index": index, "error": error}
+                    errors.append(output)
+                results.append((index, output))
+                _notify(
+                    MapProgress(
+                        map_id=map_id,
+                        total=len(items),
+                        completed=len(results),
+                        failed=len(errors),
+                        index=index,
+                        error=error,
+                    )
+                )
+
+        tasks = [asyncio.create_task(run_item(i, item)) for i, item in enumerate(items)]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        if ordered:
+            results.sort(key=lambda pair: pair[0])
+            errors.sort(key=lambda error: error["index"])
+        logger.debug(f"Mapped {workflow.name} over {len(items)} items ({len(errors)} failed)")
+
+        return {
+            "results": [output for _, output in results],
+            "indexes": [index for index, _ in results],
+            "errors": errors,
+            "total": len(items),
+            "failed": len(errors),
+        }
+
+    def _get_workflow(self, config: dict):
+        """Get the workflow to run for each item."""
+        from src.core.workflow.models import Workflow
+
+        subgraph = config.get("subgraph")
+        if isinstance(subgraph, str) and subgraph.strip():
+            subgraph = json.loads(subgraph)
+        if subgraph:
+            if not isinstance(subgraph, dict) or not subgraph.get("nodes"):
+                raise ValueError("Sub-graph needs a list of nodes")
+            # Same sub-graph, same ID and version: the compiled plan is reused
+            digest = hashlib.sha256(
+                json.dumps(subgraph, sort_keys=True, default=str).encode("utf-8")
+            ).hexdigest()[:16]
+            return Workflow(
+                id=f"map-{digest}",
+                name="Map sub-graph",
+                nodes=subgraph["nodes"],
+                connections=subgraph.get("connections", []),
+                variables=subgraph.get("variables", {}),
+                created_at=_SUBGRAPH_VERSION,
+                updated_at=_SUBGRAPH_VERSION,
+            )
+
+        workflow_id = str(config.get("workflow_id") or "").strip()
+        if not workflow_id:
+            raise ValueError("Either a workflow ID or a sub-graph is required")
+        return load_workflow(workflow_id)
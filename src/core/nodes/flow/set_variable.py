@@ -86,13 +86,20 @@ class SetVariableNode(FlowNode):
         if value_type != "auto":
             value = self._convert_type(value, value_type)
 
-        # Store in context (workflow executor will handle this)
+        # The executor scopes the variable to downstream nodes (see get_variable_updates)
         return {
             "name": name,
             "value": value,
             "previous": context.get("$prev", {}),
         }
 
+    @classmethod
+    def get_variable_updates(cls, output: Any) -> dict | None:
+        """Expose the variable to downstream nodes as ``$vars.<name>``."""
+        if isinstance(output, dict) and output.get("name"):
+            return {output["name"]: output.get("value")}
+        return None
+
     def _convert_type(self, value: Any, target_type: str) -> Any:
         """Convert value to the specified type."""
         if target_type == "string":
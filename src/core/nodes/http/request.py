@@ -18,6 +18,7 @@ class HTTPRequestNode(HTTPNode):
     name = "HTTP Request"
     description = "Make an HTTP request to any URL"
     icon = "http"
+    reads_prev = False
 
     @classmethod
     def get_inputs(cls) -> list[NodeField]:
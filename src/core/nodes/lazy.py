@@ -0,0 +1,44 @@
+"""
+Lazy Node Exports
+
+Helpers that let node packages expose their classes without importing every
+module up front (PEP 562 module ``__getattr__``).
+"""
+
+import importlib
+from collections.abc import Callable
+from typing import Any
+
+
+def lazy_exports(
+    package_globals: dict[str, Any],
+    node_modules: dict[str, str],
+    node_lists: dict[str, list[str]],
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Build ``__getattr__`` and ``__dir__`` for a node package.
+
+    Args:
+        package_globals: The package's ``globals()``
+        node_modules: Class name -> module that defines it
+        node_lists: List name (e.g. "APP_NODES") -> class names it contains
+
+    Returns:
+        Tuple of (__getattr__, __dir__) functions for the package
+    """
+
+    def module_getattr(name: str) -> Any:
+        if name in node_lists:
+            value = [module_getattr(class_name) for class_name in node_lists[name]]
+        elif name in node_modules:
+            value = getattr(importlib.import_module(node_modules[name]), name)
+        else:
+            module_name = package_globals["__name__"]
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        package_globals[name] = value
+        return value
+
+    def module_dir() -> list[str]:
+        return sorted(set(package_globals) | set(node_modules) | set(node_lists))
+
+    return module_getattr, module_dir
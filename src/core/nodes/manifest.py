@@ -0,0 +1,159 @@
+"""
+Node Manifest
+
+Pre-generated index of the built-in node types, so the registry can list and
+describe every node without importing its module.
+
+Each entry maps a node type to the module and class implementing it plus the
+node's static definition. Regenerate the manifest after adding or changing a
+built-in node:
+
+    python -m src.core.nodes.manifest
+"""
+
+import importlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any
+
+from src.core.nodes.base import BaseNode
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_PATH = Path(__file__).parent / "manifest.json"
+
+# Core nodes that are always available, as (module, class name)
+BUILTIN_NODES = [
+    ("src.core.nodes.triggers.manual", "ManualTriggerNode"),
+    ("src.core.nodes.triggers.schedule", "ScheduleTriggerNode"),
+    ("src.core.nodes.http.request", "HTTPRequestNode"),
+    ("src.core.nodes.flow.if_else", "IfElseNode"),
+    ("src.core.nodes.flow.set_variable", "SetVariableNode"),
+    ("src.core.nodes.data.read_file", "ReadFileNode"),
+    ("src.core.nodes.data.write_file", "WriteFileNode"),
+    ("src.core.nodes.flow.log_debug", "LogDebugNode"),
+    ("src.core.nodes.flow.execute_workflow", "ExecuteWorkflowNode"),
+    ("src.core.nodes.flow.map", "MapNode"),
+]
+
+# Optional node groups, as (label, package, list of node classes in the package)
+BUILTIN_NODE_GROUPS = [
+    ("AI", "src.core.nodes.ai", "AI_NODES"),
+    ("App", "src.core.nodes.apps", "APP_NODES"),
+    ("Utility", "src.core.nodes.utility", "UTILITY_NODES"),
+    ("Coding", "src.core.nodes.coding", "CODING_NODES"),
+    ("Execution", "src.core.nodes.execution", "EXECUTION_NODES"),
+]
+
+
+def iter_builtin_node_classes():
+    """
+    Import and yield every built-in node class.
+
+    Groups that fail to import are logged and skipped, like optional nodes
+    with missing dependencies.
+    """
+    for module_name, class_name in BUILTIN_NODES:
+        yield getattr(importlib.import_module(module_name), class_name)
+
+    for label, package, attr in BUILTIN_NODE_GROUPS:
+        try:
+            node_classes = getattr(importlib.import_module(package), attr)
+        except ImportError as e:
+            logger.warning(f"Could not load {label} nodes: {e}")
+            continue
+        logger.info(f"Loaded {len(node_classes)} {label} nodes")
+        yield from node_classes
+
+
+def manifest_entry(node_class: type[BaseNode]) -> dict[str, Any]:
+    """Build the manifest entry for a node class."""
+    return {
+        "module": node_class.__module__,
+        "class": node_class.__name__,
+        "category": node_class.category,
+        "is_trigger": node_class.is_trigger,
+        "definition": node_class.get_definition().model_dump(mode="json"),
+    }
+
+
+def generate_manifest() -> dict[str, dict[str, Any]]:
+    """Import every built-in node and build the manifest, keyed by node type."""
+    return {
+        node_class.type: manifest_entry(node_class) for node_class in iter_builtin_node_classes()
+    }
+
+
+def write_manifest(path: Path = MANIFEST_PATH) -> int:
+    """
+    Regenerate the manifest file.
+
+    Returns:
+        Number of node types written
+    """
+    manifest = generate_manifest()
+    path.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    return len(manifest)
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> dict[str, dict[str, Any]] | None:
+    """
+    Load the manifest file.
+
+    Returns:
+        Manifest entries keyed by node type, or None if it is missing or invalid
+    """
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read node manifest {path}: {e}")
+        return None
+
+
+def profile_startup() -> dict[str, Any]:
+    """
+    Measure registry startup with the manifest against importing every node module.
+
+    Builds a private registry (the global singleton is left alone), times its
+    creation, then times importing each lazily registered node module. The import
+    time is what an eager registry would have paid up front.
+
+    Returns:
+        Dict with registry_ms, deferred_import_ms, node counts and the slowest modules
+    """
+    from src.core.nodes.registry import NodeRegistry
+
+    start = time.perf_counter()
+    registry = object.__new__(NodeRegistry)
+    registry._initialized = False
+    registry.__init__()
+    registry_ms = (time.perf_counter() - start) * 1000
+
+    lazy_types = list(registry._lazy)
+    module_ms: dict[str, float] = {}
+    start = time.perf_counter()
+    for node_type in lazy_types:
+        module = registry._lazy[node_type]["module"]
+        module_start = time.perf_counter()
+        registry.get_handler_class(node_type)
+        module_ms[module] = module_ms.get(module, 0.0) + (time.perf_counter() - module_start) * 1000
+    deferred_import_ms = (time.perf_counter() - start) * 1000
+
+    slowest = sorted(module_ms.items(), key=lambda item: item[1], reverse=True)[:5]
+    return {
+        "registry_ms": registry_ms,
+        "deferred_import_ms": deferred_import_ms,
+        "node_count": len(registry.node_types),
+        "lazy_node_count": len(lazy_types),
+        "module_count": len(module_ms),
+        "slowest_modules": slowest,
+    }
+
+
+if __name__ == "__main__":
+    count = write_manifest()
+    print(f"Wrote {count} node types to {MANIFEST_PATH}")
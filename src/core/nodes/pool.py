@@ -0,0 +1,105 @@
+"""
+Node Handler Pool
+
+Reusable handler instances so nodes can keep warm resources between executions.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+
+from src.core.nodes.base import BaseNode
+
+logger = logging.getLogger(__name__)
+
+# Idle instances kept per node type
+DEFAULT_POOL_SIZE = 8
+
+# Seconds an idle instance is kept before it is torn down
+DEFAULT_IDLE_TIMEOUT = 300.0
+
+
+class HandlerPool:
+    """
+    Bounded pool of set-up handler instances for one node class.
+
+    Each acquired instance is used by one node execution at a time. Instances
+    are created on demand, so concurrency is never blocked by the pool; at most
+    ``max_size`` idle instances are kept, and idle instances older than
+    ``idle_timeout`` seconds are torn down.
+    """
+
+    def __init__(
+        self,
+        handler_class: type[BaseNode],
+        max_size: int = DEFAULT_POOL_SIZE,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ):
+        self.handler_class = handler_class
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.created = 0
+        self.reused = 0
+        self.closed = False
+        self._idle: deque[tuple[BaseNode, float]] = deque()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def idle_count(self) -> int:
+        """Number of idle instances ready for reuse."""
+        return len(self._idle)
+
+    async def acquire(self) -> BaseNode:
+        """Get a set-up handler instance, reusing an idle one if possible."""
+        self._check_loop()
+        await self.evict_idle()
+
+        if self._idle:
+            handler, _ = self._idle.pop()
+            self.reused += 1
+            return handler
+
+        handler = self.handler_class()
+        await handler.setup()
+        self.created += 1
+        return handler
+
+    async def release(self, handler: BaseNode):
+        """Return a handler instance to the pool."""
+        if self.closed or len(self._idle) >= self.max_size:
+            await self._teardown(handler)
+            return
+        self._idle.append((handler, time.monotonic()))
+
+    async def evict_idle(self):
+        """Tear down instances that have been idle longer than idle_timeout."""
+        cutoff = time.monotonic() - self.idle_timeout
+        while self._idle and self._idle[0][1] < cutoff:
+            handler, _ = self._idle.popleft()
+            await self._teardown(handler)
+
+    async def close(self):
+        """Tear down every idle instance and stop accepting returns."""
+        self.closed = True
+        while self._idle:
+            handler, _ = self._idle.popleft()
+            await self._teardown(handler)
+
+    def _check_loop(self):
+        """Drop idle instances created on a different (possibly closed) event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._idle:
+                logger.debug(
+                    f"Discarding {len(self._idle)} idle {self.handler_class.type} "
+                    "handlers from another event loop"
+                )
+                self._idle.clear()
+            self._loop = loop
+
+    async def _teardown(self, handler: BaseNode):
+        try:
+            await handler.teardown()
+        except Exception as e:
+            logger.warning(f"Teardown failed for {self.handler_class.type} handler: {e}")
@@ -4,9 +4,15 @@ Node Registry
 Central registry for all available node types.
 """
 
+import importlib
+import json
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
 
 from src.core.nodes.base import BaseNode, NodeDefinition
+from src.core.nodes.pool import DEFAULT_IDLE_TIMEOUT, DEFAULT_POOL_SIZE, HandlerPool
 
 logger = logging.getLogger(__name__)
 
@@ -29,85 +35,62 @@ class NodeRegistry:
             return
         self._initialized = True
         self._handlers = {}
+        # Node type -> manifest entry for built-in nodes whose module is not imported yet
+        self._lazy: dict[str, dict[str, Any]] = {}
+        # Memoized definitions, cleared whenever node types change
+        self._definitions: dict[str, NodeDefinition] = {}
+        self._palette: dict[str, list[NodeDefinition]] | None = None
+        self._palette_json: str | None = None
+        # Bumped whenever node types change so cached execution plans can be invalidated
+        self._generation = 0
+        # Pools of reusable handler instances, keyed by handler class
+        self._pools: dict[type[BaseNode], HandlerPool] = {}
+        self.pool_size = DEFAULT_POOL_SIZE
+        self.pool_idle_timeout = DEFAULT_IDLE_TIMEOUT
         self._load_builtin_nodes()
 
     def _load_builtin_nodes(self):
-        """Load all built-in nodes."""
-        # Import and register built-in nodes
-        from src.core.nodes.data.read_file import ReadFileNode
-        from src.core.nodes.data.write_file import WriteFileNode
-        from src.core.nodes.flow.if_else import IfElseNode
-        from src.core.nodes.flow.log_debug import LogDebugNode
-        from src.core.nodes.flow.set_variable import SetVariableNode
-        from src.core.nodes.http.request import HTTPRequestNode
-        from src.core.nodes.triggers.manual import ManualTriggerNode
-        from src.core.nodes.triggers.schedule import ScheduleTriggerNode
-
-        builtin_nodes = [
-            ManualTriggerNode,
-            ScheduleTriggerNode,
-            HTTPRequestNode,
-            IfElseNode,
-            SetVariableNode,
-            ReadFileNode,
-            WriteFileNode,
-            LogDebugNode,
-        ]
-
-        for node_class in builtin_nodes:
-            self.register(node_class)
-
-        # Load AI nodes
-        try:
-            from src.core.nodes.ai import AI_NODES
-
-            for node_class in AI_NODES:
+        """
+        Load all built-in nodes.
+
+        Uses the pre-generated manifest so node modules are only imported the
+        first time their handler class is needed. Falls back to importing every
+        node up front if the manifest is missing.
+        """
+        from src.core.nodes.manifest import iter_builtin_node_classes, load_manifest
+
+        manifest = load_manifest()
+        if manifest is None:
+            logger.warning("Node manifest not found, importing all nodes")
+            for node_class in iter_builtin_node_classes():
                 self.register(node_class)
-            logger.info(f"Loaded {len(AI_NODES)} AI nodes")
-        except ImportError as e:
-            logger.warning(f"Could not load AI nodes: {e}")
-
-        # Load App integration nodes
-        try:
-            from src.core.nodes.apps import APP_NODES
-
-            for node_class in APP_NODES:
-                self.register(node_class)
-            logger.info(f"Loaded {len(APP_NODES)} App nodes")
-        except ImportError as e:
-            logger.warning(f"Could not load App nodes: {e}")
-
-        # Load Utility nodes
-        try:
-            from src.core.nodes.utility import UTILITY_NODES
-
-            for node_class in UTILITY_NODES:
-                self.register(node_class)
-            logger.info(f"Loaded {len(UTILITY_NODES)} Utility nodes")
-        except ImportError as e:
-            logger.warning(f"Could not load Utility nodes: {e}")
-
-        # Load Coding/Development nodes
-        try:
-            from src.core.nodes.coding import CODING_NODES
+            logger.info(f"Total: {len(self._handlers)} nodes registered")
+            return
 
-            for node_class in CODING_NODES:
-                self.register(node_class)
-            logger.info(f"Loaded {len(CODING_NODES)} Coding nodes")
-        except ImportError as e:
-            logger.warning(f"Could not load Coding nodes: {e}")
+        for node_type, entry in manifest.items():
+            if node_type not in self._handlers:
+                self._lazy[node_type] = entry
+        logger.info(f"Total: {len(self.node_types)} nodes registered ({len(self._lazy)} lazy)")
 
-        # Load Execution nodes
+    def _import_lazy(self, node_type: str) -> type[BaseNode] | None:
+        """Import the module for a lazily registered node type."""
+        entry = self._lazy.pop(node_type)
         try:
-            from src.core.nodes.execution import EXECUTION_NODES
-
-            for node_class in EXECUTION_NODES:
-                self.register(node_class)
-            logger.info(f"Loaded {len(EXECUTION_NODES)} Execution nodes")
-        except ImportError as e:
-            logger.warning(f"Could not load Execution nodes: {e}")
-
-        logger.info(f"Total: {len(self._handlers)} nodes registered")
+            module = importlib.import_module(entry["module"])
+            node_class = getattr(module, entry["class"])
+        except (ImportError, AttributeError) as e:
+            logger.warning(f"Could not load node '{node_type}' from {entry['module']}: {e}")
+            return None
+
+        if node_class.type != node_type:
+            logger.warning(
+                f"Node manifest is out of date: {entry['class']} has type '{node_class.type}', "
+                f"expected '{node_type}'"
+            )
+        # Not a new node type, so the generation is left alone
+        self._handlers[node_type] = node_class
+        logger.debug(f"Loaded node: {node_type}")
+        return node_class
 
     def register(self, node_class: type[BaseNode]):
         """Register a node type."""
@@ -115,45 +98,176 @@ class NodeRegistry:
             raise TypeError(f"{node_class} must be a subclass of BaseNode")
 
         self._handlers[node_class.type] = node_class
+        self._lazy.pop(node_class.type, None)
+        self._invalidate_definitions(node_class.type)
+        self._generation += 1
         logger.debug(f"Registered node: {node_class.type}")
 
     def unregister(self, node_type: str):
         """Unregister a node type."""
-        if node_type in self._handlers:
-            del self._handlers[node_type]
+        if node_type in self._handlers or node_type in self._lazy:
+            self._handlers.pop(node_type, None)
+            self._lazy.pop(node_type, None)
+            self._invalidate_definitions(node_type)
+            self._generation += 1
+
+    @property
+    def generation(self) -> int:
+        """Counter that changes every time a node type is registered or unregistered."""
+        return self._generation
+
+    def get_handler_class(self, node_type: str) -> type[BaseNode] | None:
+        """
+        Get the handler class for a node type without instantiating it.
+
+        Imports the node's module on first use if it was registered lazily.
+        """
+        handler_class = self._handlers.get(node_type)
+        if handler_class is None and node_type in self._lazy:
+            handler_class = self._import_lazy(node_type)
+        return handler_class
 
     def get_handler(self, node_type: str) -> BaseNode | None:
         """Get a node handler instance by type."""
-        handler_class = self._handlers.get(node_type)
+        handler_class = self.get_handler_class(node_type)
         if handler_class:
             return handler_class()
         return None
 
+    def configure_pools(self, max_size: int | None = None, idle_timeout: float | None = None):
+        """
+        Configure limits for handler pools created from now on.
+
+        Args:
+            max_size: Maximum idle instances kept per node type
+            idle_timeout: Seconds an idle instance is kept before teardown
+        """
+        if max_size is not None:
+            self.pool_size = max_size
+        if idle_timeout is not None:
+            self.pool_idle_timeout = idle_timeout
+
+    def get_pool(self, handler_class: type[BaseNode]) -> HandlerPool:
+        """Get (or create) the handler pool for a node class."""
+        pool = self._pools.get(handler_class)
+        if pool is None:
+            pool = HandlerPool(handler_class, self.pool_size, self.pool_idle_timeout)
+            self._pools[handler_class] = pool
+        return pool
+
+    async def acquire(self, handler_class: type[BaseNode]) -> BaseNode:
+        """Get a pooled, set-up handler instance. Return it with release()."""
+        return await self.get_pool(handler_class).acquire()
+
+    async def release(self, handler: BaseNode):
+        """Return a handler instance obtained from acquire()."""
+        await self.get_pool(type(handler)).release(handler)
+
+    @asynccontextmanager
+    async def lease(self, handler_class: type[BaseNode]) -> AsyncIterator[BaseNode]:
+        """Borrow a pooled handler instance for the duration of a block."""
+        handler = await self.acquire(handler_class)
+        try:
+            yield handler
+        finally:
+            await self.release(handler)
+
+    async def close_pools(self):
+        """Tear down all pooled handler instances."""
+        pools = list(self._pools.values())
+        self._pools.clear()
+        for pool in pools:
+            await pool.close()
+
+    def _invalidate_definitions(self, node_type: str):
+        """Drop memoized definitions after a node type is registered or unregistered."""
+        self._definitions.pop(node_type, None)
+        self._palette = None
+        self._palette_json = None
+
     def get_definition(self, node_type: str) -> NodeDefinition | None:
-        """Get the node definition by type."""
+        """
+        Get the node definition by type.
+
+        Definitions are built once per node type and shared between callers, so
+        treat the returned object as read-only.
+        """
+        definition = self._definitions.get(node_type)
+        if definition is not None:
+            return definition
+
         handler_class = self._handlers.get(node_type)
         if handler_class:
-            return handler_class.get_definition()
-        return None
+            definition = handler_class.get_definition()
+        elif node_type in self._lazy:
+            definition = NodeDefinition.model_validate(self._lazy[node_type]["definition"])
+        else:
+            return None
+
+        self._definitions[node_type] = definition
+        return definition
 
     def get_all_definitions(self) -> list[NodeDefinition]:
         """Get all registered node definitions."""
-        return [cls.get_definition() for cls in self._handlers.values()]
+        return [self.get_definition(node_type) for node_type in self.node_types]
 
     def get_by_category(self, category: str) -> list[NodeDefinition]:
         """Get all nodes in a category."""
-        return [cls.get_definition() for cls in self._handlers.values() if cls.category == category]
+        return [
+            self.get_definition(node_type)
+            for node_type in self.node_types
+            if self._get_metadata(node_type, "category") == category
+        ]
 
     def get_triggers(self) -> list[NodeDefinition]:
         """Get all trigger nodes."""
-        return [cls.get_definition() for cls in self._handlers.values() if cls.is_trigger]
+        return [
+            self.get_definition(node_type)
+            for node_type in self.node_types
+            if self._get_metadata(node_type, "is_trigger")
+        ]
+
+    def get_palette(self) -> dict[str, list[NodeDefinition]]:
+        """
+        Get node definitions grouped for the editor palette.
+
+        Returns:
+            Category -> definitions sorted by name, with categories sorted by name
+        """
+        if self._palette is None:
+            palette: dict[str, list[NodeDefinition]] = {}
+            for definition in self.get_all_definitions():
+                palette.setdefault(definition.category or "other", []).append(definition)
+            self._palette = {
+                category: sorted(palette[category], key=lambda d: d.name)
+                for category in sorted(palette)
+            }
+        return self._palette
+
+    def get_palette_json(self) -> str:
+        """Get the editor palette serialized as JSON (category -> list of definitions)."""
+        if self._palette_json is None:
+            self._palette_json = json.dumps(
+                {
+                    category: [definition.model_dump(mode="json") for definition in definitions]
+                    for category, definitions in self.get_palette().items()
+                }
+            )
+        return self._palette_json
+
+    def _get_metadata(self, node_type: str, key: str):
+        """Read a class attribute, from the manifest if the node is not loaded yet."""
+        handler_class = self._handlers.get(node_type)
+        if handler_class:
+            return getattr(handler_class, key)
+        return self._lazy[node_type][key]
 
     @property
     def node_types(self) -> list[str]:
         """Get all registered node types."""
-        return list(self._handlers.keys())
+        return [*self._handlers, *(t for t in self._lazy if t not in self._handlers)]
 
     @property
     def categories(self) -> list[str]:
         """Get all unique categories."""
-        return list(set(cls.category for cls in self._handlers.values()))
+        return list(set(self._get_metadata(t, "category") for t in self.node_types))
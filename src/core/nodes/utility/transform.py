@@ -4,6 +4,8 @@ Data Transform Utility Nodes - Transform and manipulate data.
 
 import json
 
+from src.core.expressions import get_parser
+from src.core.expressions.batch import evaluate_items
 from src.core.nodes.base import BaseNode, FieldType, NodeField
 
 
@@ -18,6 +20,7 @@ class JSONParseNode(BaseNode):
     description = "Parse JSON string to object"
     icon = "data_object"
     color = "#6B7280"  # Gray
+    execution_affinity = "cpu"
 
     inputs = [
         NodeField(
@@ -61,6 +64,7 @@ class JSONStringifyNode(BaseNode):
     description = "Convert object to JSON string"
     icon = "text_fields"
     color = "#6B7280"
+    execution_affinity = "cpu"
 
     inputs = [
         NodeField(
@@ -105,6 +109,7 @@ class TextSplitNode(BaseNode):
     description = "Split text into array"
     icon = "call_split"
     color = "#6B7280"
+    execution_affinity = "cpu"
 
     inputs = [
         NodeField(
@@ -214,6 +219,7 @@ class TextReplaceNode(BaseNode):
     description = "Find and replace in text"
     icon = "find_replace"
     color = "#6B7280"
+    execution_affinity = "cpu"
 
     inputs = [
         NodeField(
@@ -277,6 +283,10 @@ class TextReplaceNode(BaseNode):
 class ArrayFilterNode(BaseNode):
     """
     Filter array items by condition.
+
+    With a ``condition`` expression such as ``{{$item.price > 100}}``, items are
+    kept where it is truthy. The condition is evaluated for every item at once
+    (see src.core.expressions.batch) rather than once per item.
     """
 
     type = "array-filter"
@@ -285,6 +295,10 @@ class ArrayFilterNode(BaseNode):
     description = "Filter array items"
     icon = "filter_list"
     color = "#6B7280"
+    execution_affinity = "cpu"
+    # Evaluated per item here, not resolved once for the node
+    raw_config_keys = ("condition",)
+    expression_config_keys = ("condition",)
 
     inputs = [
         NodeField(
@@ -324,6 +338,14 @@ class ArrayFilterNode(BaseNode):
             required=False,
             description="Value to compare against.",
         ),
+        NodeField(
+            name="condition",
+            label="Condition",
+            type=FieldType.EXPRESSION,
+            required=False,
+            description="Keep items where this is true, e.g. {{$item.price > 100}}. "
+            "Overrides property and operator.",
+        ),
     ]
 
     outputs = [
@@ -348,6 +370,14 @@ class ArrayFilterNode(BaseNode):
         if isinstance(items, str):
             items = json.loads(items)
 
+        condition = config.get("condition")
+        if condition:
+            parser = get_parser()
+            compiled = parser.compile_string(condition) or parser.compile(condition)
+            keep = evaluate_items(compiled, items, context)
+            filtered = [item for item, kept in zip(items, keep) if kept]
+            return {"filtered": filtered, "count": len(filtered)}
+
         def check(item):
             if prop:
                 item_val = item.get(prop) if isinstance(item, dict) else item
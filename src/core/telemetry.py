@@ -0,0 +1,426 @@
+"""
+Telemetry
+
+Optional tracing and metrics for workflow runs, nodes, AI gateway calls, RAG
+queries and webhook requests. Instrumented code calls get_telemetry() and uses:
+
+    with telemetry.span("node.execute", {"node.type": "http"}) as span:
+        span.set_attribute("node.success", True)
+    telemetry.add("skynette.node.failures", 1, {"node.type": "http"})
+    telemetry.record("skynette.node.duration", 12.5, {"node.type": "http"})
+
+The default backend does nothing. The backend is chosen with the
+``SKYNETTE_TELEMETRY`` environment variable:
+
+    off     no telemetry (default)
+    file    spans and metric data points as JSON lines, for offline use;
+            written to ``SKYNETTE_TELEMETRY_FILE`` (default ``telemetry.jsonl``
+            in the data directory)
+    otlp    OpenTelemetry, exported over OTLP (configured with the standard
+            ``OTEL_EXPORTER_OTLP_*`` variables)
+    otel    OpenTelemetry, using the tracer and meter providers the host
+            process already set up (e.g. under ``opentelemetry-instrument``)
+
+OpenTelemetry packages are optional; see METRICS for the metrics recorded.
+enable_metrics() additionally aggregates the metrics in process, whatever the
+backend, so they can be scraped (see src.core.metrics).
+"""
+
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+COUNTER = "counter"
+UP_DOWN_COUNTER = "updowncounter"
+HISTOGRAM = "histogram"
+
+# Metric name -> (kind, unit, description)
+METRICS: dict[str, tuple[str, str, str]] = {
+    "skynette.workflow.runs": (COUNTER, "{run}", "Workflow runs, by final status"),
+    "skynette.workflow.duration": (HISTOGRAM, "ms", "Workflow run duration"),
+    "skynette.workflow.active": (UP_DOWN_COUNTER, "{run}", "Workflow runs in progress"),
+    "skynette.node.duration": (HISTOGRAM, "ms", "Node run duration"),
+    "skynette.node.failures": (COUNTER, "{run}", "Failed node runs"),
+    "skynette.ai.requests": (COUNTER, "{request}", "AI provider calls, by outcome"),
+    "skynette.ai.duration": (HISTOGRAM, "ms", "AI provider call duration"),
+    "skynette.ai.tokens": (COUNTER, "{token}", "AI tokens used, by token.type"),
+    "skynette.ai.cost": (COUNTER, "USD", "Estimated AI cost"),
+    "skynette.rag.queries": (COUNTER, "{query}", "RAG collection queries"),
+    "skynette.rag.duration": (HISTOGRAM, "ms", "RAG query duration"),
+    "skynette.webhook.requests": (COUNTER, "{request}", "Webhook requests, by status"),
+    "skynette.webhook.duration": (HISTOGRAM, "ms", "Webhook request handling duration"),
+}
+
+DEFAULT_FILE_NAME = "telemetry.jsonl"
+
+
+def _clean(attributes: dict[str, Any] | None) -> dict[str, Any]:
+    """Drop None values and turn unsupported values into strings."""
+    cleaned = {}
+    for key, value in (attributes or {}).items():
+        if value is None:
+            continue
+        if not isinstance(value, str | bool | int | float):
+            value = str(value)
+        cleaned[key] = value
+    return cleaned
+
+
+class Span:
+    """A span that records nothing; backends return subclasses."""
+
+    def set_attribute(self, key: str, value: Any):
+        """Set an attribute on the span."""
+
+    def set_attributes(self, attributes: dict[str, Any]):
+        """Set several attributes on the span."""
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def record_error(self, error: BaseException | str):
+        """Mark the span as failed."""
+
+
+_NOOP_SPAN = Span()
+
+
+class Telemetry:
+    """Telemetry backend that does nothing. The default."""
+
+    enabled = False
+
+    @contextmanager
+    def span(self, name: str, attributes: dict[str, Any] | None = None) -> Iterator[Span]:
+        """
+        Trace the body of a ``with`` block.
+
+        Spans started inside the block (in the same task, or tasks it starts)
+        are its children. An exception leaving the block marks the span failed.
+        """
+        yield _NOOP_SPAN
+
+    def add(self, name: str, value: float = 1, attributes: dict[str, Any] | None = None):
+        """Add to a counter from METRICS."""
+
+    def record(self, name: str, value: float, attributes: dict[str, Any] | None = None):
+        """Record a histogram value from METRICS."""
+
+    def shutdown(self):
+        """Flush anything buffered."""
+
+
+class _FileSpan(Span):
+    def __init__(self, name: str, trace_id: str, parent_id: str | None, attributes: dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.error: str | None = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes.update(_clean({key: value}))
+
+    def record_error(self, error: BaseException | str):
+        self.error = str(error) or type(error).__name__
+
+
+# Span that new spans of the file backend are children of
+_current_file_span: ContextVar[_FileSpan | None] = ContextVar("telemetry_span", default=None)
+
+
+class FileTelemetry(Telemetry):
+    """
+    Writes spans and metric data points to a JSON lines file.
+
+    Every line has a ``type`` of ``span``, ``counter`` or ``histogram``. Spans
+    carry ``trace_id``/``span_id``/``parent_id`` so runs can be pieced together
+    later, or converted to another format.
+    """
+
+    enabled = True
+
+    def __init__(self, path: str | Path):
+        """
+        Args:
+            path: File to append to
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def _write(self, entry: dict):
+        line = json.dumps(entry, default=str)
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line + "\n")
+                self._file.flush()
+
+    @contextmanager
+    def span(self, name: str, attributes: dict[str, Any] | None = None) -> Iterator[Span]:
+        parent = _current_file_span.get()
+        span = _FileSpan(
+            name,
+            parent.trace_id if parent else secrets.token_hex(16),
+            parent.span_id if parent else None,
+            _clean(attributes),
+        )
+        reset = _current_file_span.set(span)
+        start = time.time()
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            _current_file_span.reset(reset)
+            self._write(
+                {
+                    "type": "span",
+                    "name": span.name,
+                    "trace_id": span.trace_id,
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "start": start,
+                    "duration_ms": (time.perf_counter() - started) * 1000,
+                    "status": "error" if span.error is not None else "ok",
+                    "error": span.error,
+                    "attributes": span.attributes,
+                }
+            )
+
+    def _point(self, kind: str, name: str, value: float, attributes: dict | None):
+        self._write(
+            {
+                "type": kind,
+                "name": name,
+                "value": value,
+                "time": time.time(),
+                "attributes": _clean(attributes),
+            }
+        )
+
+    def add(self, name: str, value: float = 1, attributes: dict[str, Any] | None = None):
+        self._point(COUNTER, name, value, attributes)
+
+    def record(self, name: str, value: float, attributes: dict[str, Any] | None = None):
+        self._point(HISTOGRAM, name, value, attributes)
+
+    def shutdown(self):
+        with self._lock:
+            self._file.close()
+
+
+class _OtelSpan(Span):
+    def __init__(self, span):
+        self._span = span
+
+    def set_attribute(self, key: str, value: Any):
+        cleaned = _clean({key: value})
+        if cleaned:
+            self._span.set_attribute(key, cleaned[key])
+
+    def record_error(self, error: BaseException | str):
+        from opentelemetry.trace import Status, StatusCode
+
+        if isinstance(error, BaseException):
+            self._span.record_exception(error)
+        self._span.set_status(Status(StatusCode.ERROR, str(error)))
+
+
+class OpenTelemetry(Telemetry):
+    """Sends spans and metrics through the OpenTelemetry API."""
+
+    enabled = True
+
+    def __init__(self, configure_otlp: bool = False, service_name: str = "skynette"):
+        """
+        Args:
+            configure_otlp: Set up the OpenTelemetry SDK to export over OTLP. If
+                False, the providers already set up by the host process are used.
+            service_name: ``service.name`` resource attribute (with configure_otlp)
+
+        Raises:
+            RuntimeError: If the OpenTelemetry packages are not installed
+        """
+        try:
+            from opentelemetry import metrics, trace
+        except ImportError:
+            raise RuntimeError(
+                "OpenTelemetry not installed. Install with: pip install opentelemetry-api"
+            )
+        self._tracer_provider = None
+        self._meter_provider = None
+        if configure_otlp:
+            self._configure_otlp(service_name)
+
+        self._tracer = trace.get_tracer("skynette")
+        meter = metrics.get_meter("skynette")
+        self._instruments = {}
+        for name, (kind, unit, description) in METRICS.items():
+            create = {
+                COUNTER: meter.create_counter,
+                UP_DOWN_COUNTER: meter.create_up_down_counter,
+                HISTOGRAM: meter.create_histogram,
+            }[kind]
+            self._instruments[name] = create(name, unit=unit, description=description)
+
+    def _configure_otlp(self, service_name: str):
+        try:
+            from opentelemetry import metrics, trace
+            from opentelemetry.exporter.otlp.proto.http.metric_exporter import (
+                OTLPMetricExporter,
+            )
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            from opentelemetry.sdk.metrics import MeterProvider
+            from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        except ImportError:
+            raise RuntimeError(
+                "OpenTelemetry SDK not installed. Install with: "
+                "pip install opentelemetry-sdk opentelemetry-exporter-otlp-proto-http"
+            )
+        resource = Resource.create({"service.name": service_name})
+        self._tracer_provider = TracerProvider(resource=resource)
+        self._tracer_provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        trace.set_tracer_provider(self._tracer_provider)
+        self._meter_provider = MeterProvider(
+            resource=resource,
+            metric_readers=[PeriodicExportingMetricReader(OTLPMetricExporter())],
+        )
+        metrics.set_meter_provider(self._meter_provider)
+
+    @contextmanager
+    def span(self, name: str, attributes: dict[str, Any] | None = None) -> Iterator[Span]:
+        with self._tracer.start_as_current_span(name, attributes=_clean(attributes)) as span:
+            yield _OtelSpan(span)
+
+    def add(self, name: str, value: float = 1, attributes: dict[str, Any] | None = None):
+        self._instruments[name].add(value, attributes=_clean(attributes))
+
+    def record(self, name: str, value: float, attributes: dict[str, Any] | None = None):
+        self._instruments[name].record(value, attributes=_clean(attributes))
+
+    def shutdown(self):
+        if self._tracer_provider is not None:
+            self._tracer_provider.shutdown()
+        if self._meter_provider is not None:
+            self._meter_provider.shutdown()
+
+
+def create_telemetry(backend: str | None = None, path: str | Path | None = None) -> Telemetry:
+    """
+    Create a telemetry backend.
+
+    Args:
+        backend: ``off``, ``file``, ``otlp`` or ``otel`` (defaults to
+            ``SKYNETTE_TELEMETRY``)
+        path: File for the ``file`` backend (defaults to
+            ``SKYNETTE_TELEMETRY_FILE``, then the data directory)
+
+    Returns:
+        The backend; the no-op one if the requested backend is unknown or its
+        packages are missing
+    """
+    backend = (backend or os.environ.get("SKYNETTE_TELEMETRY") or "off").lower()
+    try:
+        if backend == "file":
+            path = path or os.environ.get("SKYNETTE_TELEMETRY_FILE")
+            if not path:
+                from src.data.storage import get_storage
+
+                path = get_storage().data_dir / DEFAULT_FILE_NAME
+            return FileTelemetry(path)
+        if backend in ("otlp", "otel"):
+            return OpenTelemetry(configure_otlp=backend == "otlp")
+    except (RuntimeError, OSError) as e:
+        logger.warning(f"Telemetry backend '{backend}' unavailable, disabling telemetry: {e}")
+        return Telemetry()
+    if backend not in ("off", "none", ""):
+        logger.warning(f"Unknown telemetry backend '{backend}', disabling telemetry")
+    return Telemetry()
+
+
+class _MetricsTelemetry(Telemetry):
+    """Passes everything to a backend and also aggregates metrics in process."""
+
+    enabled = True
+
+    def __init__(self, backend: Telemetry, metrics):
+        self.backend = backend
+        self.metrics = metrics
+
+    def span(self, name: str, attributes: dict[str, Any] | None = None):
+        return self.backend.span(name, attributes)
+
+    def add(self, name: str, value: float = 1, attributes: dict[str, Any] | None = None):
+        self.metrics.add(name, value, attributes)
+        self.backend.add(name, value, attributes)
+
+    def record(self, name: str, value: float, attributes: dict[str, Any] | None = None):
+        self.metrics.record(name, value, attributes)
+        self.backend.record(name, value, attributes)
+
+    def shutdown(self):
+        self.backend.shutdown()
+
+
+# Singleton telemetry backend, and what get_telemetry() returns for it
+_backend: Telemetry | None = None
+_telemetry: Telemetry | None = None
+
+# In-process metrics, once enabled
+_metrics = None
+
+
+def _install(backend: Telemetry | None):
+    global _backend, _telemetry
+    _backend = backend
+    if backend is not None and _metrics is not None:
+        _telemetry = _MetricsTelemetry(backend, _metrics)
+    else:
+        _telemetry = backend
+
+
+def get_telemetry() -> Telemetry:
+    """Get the global telemetry backend (configured from the environment on first use)."""
+    if _telemetry is None:
+        _install(create_telemetry())
+    return _telemetry
+
+
+def set_telemetry(telemetry: Telemetry | None):
+    """Replace the global telemetry backend (None reconfigures from the environment)."""
+    if _backend is not None and _backend is not telemetry:
+        _backend.shutdown()
+    _install(telemetry)
+
+
+def enable_metrics():
+    """
+    Aggregate metrics in process, in addition to the configured backend.
+
+    Returns:
+        The global MetricsRegistry
+    """
+    global _metrics
+    if _metrics is None:
+        from src.core.metrics import MetricsRegistry
+
+        _metrics = MetricsRegistry()
+        _install(_backend)
+    return _metrics
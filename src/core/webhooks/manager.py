@@ -5,12 +5,14 @@ Provides a lightweight HTTP server for receiving webhooks that trigger workflows
 Supports multiple authentication methods and secure endpoint management.
 """
 
+import asyncio
 import hashlib
 import hmac
 import json
 import logging
 import secrets
 import sqlite3
+import time
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
@@ -19,8 +21,18 @@ from pathlib import Path
 from typing import Any
 from urllib.parse import parse_qs
 
+from src.core.metrics import monitor_event_loop
+from src.core.telemetry import enable_metrics, get_telemetry
+
 logger = logging.getLogger(__name__)
 
+# Paths served by WebhookServer itself
+METRICS_PATH = "/metrics"
+HEALTH_PATH = "/healthz"
+RESERVED_PATHS = frozenset({METRICS_PATH, HEALTH_PATH})
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
 
 class AuthMethod(str, Enum):
     """Webhook authentication methods."""
@@ -408,6 +420,9 @@ class WebhookManager:
         if not path.startswith("/"):
             path = "/" + path
 
+        if path in RESERVED_PATHS:
+            raise ValueError(f"Webhook path '{path}' is reserved")
+
         # Check if path already exists
         existing = self.store.get_by_path(path)
         if existing:
@@ -522,6 +537,29 @@ class WebhookManager:
         Returns:
             WebhookResponse to send back
         """
+        telemetry = get_telemetry()
+        started = time.perf_counter()
+        webhook = self._path_cache.get(request.path)
+        span_attributes = {
+            "webhook.path": request.path,
+            "http.method": request.method,
+            "workflow.id": webhook.workflow_id if webhook else None,
+        }
+        with telemetry.span("webhook.request", span_attributes) as span:
+            response = await self._handle_request(request)
+            span.set_attribute("http.status_code", response.status)
+            if response.status >= 500:
+                span.record_error(f"HTTP {response.status}")
+
+        attributes = {"http.method": request.method, "http.status_code": response.status}
+        telemetry.add("skynette.webhook.requests", 1, attributes)
+        telemetry.record(
+            "skynette.webhook.duration", (time.perf_counter() - started) * 1000, attributes
+        )
+        return response
+
+    async def _handle_request(self, request: WebhookRequest) -> WebhookResponse:
+        """Route, authenticate and trigger a webhook request."""
         # Find webhook by path
         webhook = self._path_cache.get(request.path)
         if not webhook:
@@ -654,7 +692,9 @@ class WebhookServer:
     """
     Lightweight HTTP server for receiving webhooks.
 
-    Uses aiohttp for async HTTP handling.
+    Uses aiohttp for async HTTP handling. Besides webhooks, it serves
+    ``/metrics`` (Prometheus text format) and ``/healthz``; webhooks cannot be
+    registered on those paths.
     """
 
     def __init__(
@@ -664,10 +704,26 @@ class WebhookServer:
         # For production, configure firewall rules appropriately.
         host: str = "0.0.0.0",  # nosec B104 - intentional for webhook reception
         port: int = 5678,
+        queue=None,
+        workers: int = 0,
     ):
+        """
+        Args:
+            manager: Webhook manager that handles requests
+            host: Interface to listen on
+            port: Port to listen on
+            queue: ExecutionQueue whose depth /metrics reports (optional)
+            workers: Queue workers to run alongside the server (0 leaves the
+                queue to ``skynette worker``)
+        """
         self.manager = manager
         self.host = host
         self.port = port
+        self.queue = queue
+        self.workers = workers
+        self.metrics = None
+        self._started_at: float | None = None
+        self._lag_task: asyncio.Task | None = None
         self._app = None
         self._runner = None
         self._site = None
@@ -680,7 +736,16 @@ class WebhookServer:
             logger.error("aiohttp required for webhook server: pip install aiohttp")
             return
 
+        self.metrics = enable_metrics()
+        if self.queue is not None:
+            self.metrics.register_gauge("skynette.queue.runs", self._queue_depth)
+        self._started_at = time.monotonic()
+        self._lag_task = asyncio.create_task(monitor_event_loop(self.metrics))
+
         self._app = web.Application()
+        # Registered before the catch-all route, so webhooks can't shadow them
+        self._app.router.add_get(METRICS_PATH, self._handle_metrics)
+        self._app.router.add_get(HEALTH_PATH, self._handle_health)
         self._app.router.add_route("*", "/{path:.*}", self._handle_request)
 
         self._runner = web.AppRunner(self._app)
@@ -689,14 +754,49 @@ class WebhookServer:
         self._site = web.TCPSite(self._runner, self.host, self.port)
         await self._site.start()
 
+        if self.queue is not None and self.workers:
+            self.queue.start(self.workers)
+
         logger.info(f"Webhook server started at http://{self.host}:{self.port}")
 
     async def stop(self):
         """Stop the webhook server."""
+        if self._lag_task:
+            self._lag_task.cancel()
+            self._lag_task = None
+        if self.metrics is not None and self.queue is not None:
+            self.metrics.unregister_gauge("skynette.queue.runs")
+        if self.queue is not None and self.workers:
+            await self.queue.stop()
         if self._runner:
             await self._runner.cleanup()
             logger.info("Webhook server stopped")
 
+    def _queue_depth(self) -> dict:
+        """Queue runs by status, for the skynette.queue.runs gauge."""
+        return {
+            (("status", status),): count for status, count in self.queue.status_counts().items()
+        }
+
+    async def _handle_metrics(self, aiohttp_request):
+        """Serve metrics in the Prometheus text exposition format."""
+        from aiohttp import web
+
+        # The format's content type carries its version, which web.Response's
+        # content_type argument can't express
+        return web.Response(
+            body=self.metrics.render().encode("utf-8"),
+            headers={"Content-Type": PROMETHEUS_CONTENT_TYPE},
+        )
+
+    async def _handle_health(self, aiohttp_request):
+        """Report that the server is up."""
+        from aiohttp import web
+
+        return web.json_response(
+            {"status": "ok", "uptime_seconds": round(time.monotonic() - self._started_at, 3)}
+        )
+
     async def _handle_request(self, aiohttp_request):
         """Handle incoming aiohttp request."""
         from aiohttp import web
@@ -745,10 +845,20 @@ def get_webhook_manager() -> WebhookManager:
 
 
 def get_webhook_server() -> WebhookServer:
-    """Get the global webhook server instance."""
+    """
+    Get the global webhook server instance.
+
+    Webhook runs go through the global execution queue, so bursts are absorbed
+    by the queue rather than run all at once; the server runs queue workers.
+    """
     global _server, _manager
     if _server is None:
+        from src.core.workflow.queue import DEFAULT_WORKERS, get_execution_queue
+
         if _manager is None:
             _manager = WebhookManager()
-        _server = WebhookServer(_manager)
+        queue = get_execution_queue()
+        if _manager._trigger_callback is None:
+            _manager.set_trigger_callback(queue.trigger_callback)
+        _server = WebhookServer(_manager, queue=queue, workers=DEFAULT_WORKERS)
     return _server
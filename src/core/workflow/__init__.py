@@ -4,7 +4,26 @@ Workflow Management Module
 Handles workflow parsing, validation, and execution.
 """
 
+from src.core.workflow.cache import get_result_cache
+from src.core.workflow.dataflow import DataFlow, get_dataflow_cache
 from src.core.workflow.executor import WorkflowExecutor
 from src.core.workflow.models import Workflow, WorkflowConnection, WorkflowNode
+from src.core.workflow.plan import ExecutionPlan, get_plan_cache
+from src.core.workflow.process_pool import CPUNodePool, get_cpu_pool
+from src.core.workflow.queue import ExecutionQueue, get_execution_queue
 
-__all__ = ["Workflow", "WorkflowNode", "WorkflowConnection", "WorkflowExecutor"]
+__all__ = [
+    "Workflow",
+    "WorkflowNode",
+    "WorkflowConnection",
+    "WorkflowExecutor",
+    "ExecutionPlan",
+    "get_plan_cache",
+    "DataFlow",
+    "get_dataflow_cache",
+    "get_result_cache",
+    "ExecutionQueue",
+    "get_execution_queue",
+    "CPUNodePool",
+    "get_cpu_pool",
+]
@@ -0,0 +1,276 @@
+"""
+Node Result Cache
+
+Content-addressed cache of node outputs, so deterministic nodes with the same
+resolved configuration can be skipped on later runs.
+
+Caching is opt-in per node through ``WorkflowNode.config["cache"]``:
+
+    cache: true                 # cache with the default TTL
+    cache: 600                  # cache for 600 seconds
+    cache:
+      ttl: 600
+      include_prev: true        # also key on the upstream output ($prev)
+
+The key is the node type plus a hash of the resolved config (and ``$prev`` when
+``include_prev`` is set). Nodes that read ``$prev`` directly rather than through
+an expression should set ``include_prev``.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Default time-to-live for cached results, in seconds
+DEFAULT_CACHE_TTL = 3600.0
+
+# Maximum number of results kept in memory
+DEFAULT_CACHE_SIZE = 1024
+
+# Config keys read by the executor rather than the node; they do not affect its output
+EXECUTOR_CONFIG_KEYS = frozenset({"cache", "on_error", "retry", "node_timeout", "items_mode"})
+
+# Returned by cache lookups that found nothing (None is a valid node output)
+MISS = object()
+
+
+def get_cache_policy(config: dict) -> dict | None:
+    """
+    Read the cache setting from a node config.
+
+    Args:
+        config: The node's (unresolved) config
+
+    Returns:
+        Dict with ``ttl`` and ``include_prev``, or None if caching is off
+    """
+    setting = config.get("cache")
+    if not setting:
+        return None
+
+    policy = {"ttl": DEFAULT_CACHE_TTL, "include_prev": False}
+    if isinstance(setting, dict):
+        if not setting.get("enabled", True):
+            return None
+        policy["ttl"] = setting.get("ttl", DEFAULT_CACHE_TTL)
+        policy["include_prev"] = bool(setting.get("include_prev", False))
+    elif not isinstance(setting, bool):
+        policy["ttl"] = setting
+
+    try:
+        policy["ttl"] = float(policy["ttl"])
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid cache ttl {policy['ttl']!r}, using {DEFAULT_CACHE_TTL}s")
+        policy["ttl"] = DEFAULT_CACHE_TTL
+    return policy
+
+
+def cache_key(node_type: str, resolved_config: dict, prev: Any = MISS) -> str:
+    """
+    Build the content-addressed key for a node result.
+
+    Args:
+        node_type: The node type
+        resolved_config: Node config after expressions are resolved
+        prev: Upstream output to include in the key, if any
+
+    Returns:
+        Hex digest identifying the result
+    """
+    config = {k: v for k, v in resolved_config.items() if k not in EXECUTOR_CONFIG_KEYS}
+    payload = {"type": node_type, "config": config}
+    if prev is not MISS:
+        payload["prev"] = prev
+    encoded = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class MemoryResultCache:
+    """In-memory LRU of node results with per-entry expiry."""
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        """Get a cached value, or MISS."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISS
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return MISS
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any, ttl: float):
+        """Store a value for ``ttl`` seconds."""
+        entry = (time.time() + ttl, copy.deepcopy(value))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteResultCache:
+    """Persistent tier for node results, stored as JSON in SQLite."""
+
+    def __init__(self, db_path: Path | None = None):
+        if db_path:
+            self.db_path = Path(db_path)
+        else:
+            self.db_path = Path.home() / ".skynette" / "node_cache.db"
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    def _init_db(self):
+        """Initialize the cache table."""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS node_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    def get(self, key: str) -> Any:
+        """Get a cached value, or MISS."""
+        entry = self.get_entry(key)
+        return MISS if entry is None else entry[1]
+
+    def get_entry(self, key: str) -> tuple[float, Any] | None:
+        """Get ``(expires_at, value)`` for a live entry, or None."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            row = conn.execute(
+                "SELECT value, expires_at FROM node_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= time.time():
+                conn.execute("DELETE FROM node_cache WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            return row[1], json.loads(row[0])
+        finally:
+            conn.close()
+
+    def set(self, key: str, value: Any, ttl: float):
+        """Store a value for ``ttl`` seconds. Values that are not JSON are skipped."""
+        try:
+            encoded = json.dumps(value)
+        except (TypeError, ValueError):
+            logger.debug(f"Not persisting cache entry {key[:12]}: output is not JSON")
+            return
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO node_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, encoded, time.time() + ttl),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def clear(self):
+        """Remove all entries."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("DELETE FROM node_cache")
+            conn.commit()
+        finally:
+            conn.close()
+
+
+class NodeResultCache:
+    """
+    Node result cache with an in-memory LRU and an optional SQLite tier.
+
+    Lookups check memory first, then disk; disk hits are copied back into memory.
+    """
+
+    def __init__(
+        self,
+        memory: MemoryResultCache | None = None,
+        disk: SQLiteResultCache | None = None,
+    ):
+        self.memory = memory or MemoryResultCache()
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+
+    def enable_disk(self, db_path: Path | None = None):
+        """Add (or replace) the SQLite tier."""
+        self.disk = SQLiteResultCache(db_path)
+
+    def get(self, key: str) -> Any:
+        """Get a cached value, or MISS."""
+        value = self.memory.get(key)
+        if value is MISS and self.disk is not None:
+            try:
+                entry = self.disk.get_entry(key)
+            except sqlite3.Error as e:
+                logger.warning(f"Node cache lookup failed: {e}")
+                entry = None
+            if entry is not None:
+                expires_at, value = entry
+                self.memory.set(key, value, expires_at - time.time())
+
+        if value is MISS:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: float = DEFAULT_CACHE_TTL):
+        """Store a value in every tier."""
+        self.memory.set(key, value, ttl)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value, ttl)
+            except sqlite3.Error as e:
+                logger.warning(f"Node cache write failed: {e}")
+
+    def clear(self):
+        """Remove all entries from every tier."""
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+
+# Global result cache instance
+_result_cache: NodeResultCache | None = None
+
+
+def get_result_cache() -> NodeResultCache:
+    """Get the global node result cache."""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = NodeResultCache()
+    return _result_cache
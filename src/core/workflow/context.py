@@ -0,0 +1,197 @@
+"""
+Execution Context
+
+Copy-on-write state shared by the nodes of a workflow run.
+
+Nodes still receive a plain dict with ``$trigger``, ``$vars``, ``$nodes`` and
+``$prev``, but the values in it are shared read-only views rather than copies:
+
+- ``$trigger`` is a read-only view of the trigger data.
+- ``$nodes`` is a read-only, live view of the outputs recorded so far.
+- ``$vars`` is a ScopedMap. Nodes that set variables (see
+  ``BaseNode.get_variable_updates``) add a layer for their downstream nodes
+  only, so concurrent branches never see each other's changes.
+
+Building a node's context, forking for a resume and scoping variables are all
+O(1) in the size of the data.
+"""
+
+from collections import ChainMap
+from collections.abc import Iterator, Mapping
+from types import MappingProxyType
+from typing import Any
+
+# Context keys managed by ExecutionContext
+CONTEXT_KEYS = ("$trigger", "$vars", "$nodes", "$prev")
+
+# Marks a context without a $prev value (None is a valid output)
+_NO_PREV = object()
+
+
+class ScopedMap(Mapping):
+    """
+    Immutable mapping made of chained layers.
+
+    ``child()`` returns a new map that shares every existing layer, so a scope
+    can be extended without copying it. Chains are flattened once they get deep
+    to keep lookups fast.
+    """
+
+    __slots__ = ("_layer", "_parent", "_depth")
+
+    # Flatten chains deeper than this
+    MAX_DEPTH = 32
+
+    def __init__(self, layer: Mapping | None = None, parent: "ScopedMap | None" = None):
+        self._layer = dict(layer or {})
+        self._parent = parent
+        self._depth = parent._depth + 1 if parent is not None else 0
+
+    def child(self, updates: Mapping | None) -> "ScopedMap":
+        """Get a new map with ``updates`` layered on top of this one."""
+        if not updates:
+            return self
+        if self._depth >= self.MAX_DEPTH:
+            return ScopedMap({**self.to_dict(), **updates})
+        return ScopedMap(updates, self)
+
+    def __getitem__(self, key: Any) -> Any:
+        scope = self
+        while scope is not None:
+            if key in scope._layer:
+                return scope._layer[key]
+            scope = scope._parent
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        scope = self
+        while scope is not None:
+            if key in scope._layer:
+                return True
+            scope = scope._parent
+        return False
+
+    def __iter__(self) -> Iterator:
+        return iter(self.to_dict())
+
+    def __len__(self) -> int:
+        return len(self.to_dict()) if self._parent is not None else len(self._layer)
+
+    def to_dict(self) -> dict:
+        """Flatten into a new dict (outer layers win)."""
+        if self._parent is None:
+            return dict(self._layer)
+        merged = self._parent.to_dict()
+        merged.update(self._layer)
+        return merged
+
+    def copy(self) -> dict:
+        """Get a mutable copy, like ``dict.copy()``."""
+        return self.to_dict()
+
+    def __reduce__(self):
+        # Pickle flat, e.g. for the CPU node process pool
+        return (ScopedMap, (self.to_dict(),))
+
+    def __repr__(self) -> str:
+        return f"ScopedMap({self.to_dict()!r})"
+
+
+class ExecutionContext:
+    """
+    Run-wide execution state.
+
+    The executor records outputs with ``set_output`` and hands each node the
+    dict returned by ``node_context``. ``fork`` starts a new run (e.g. a resume)
+    on top of this one without copying any outputs.
+    """
+
+    def __init__(
+        self,
+        trigger: Mapping | None = None,
+        variables: Mapping | None = None,
+        outputs: Mapping | None = None,
+        extra: Mapping | None = None,
+        prev: Any = _NO_PREV,
+    ):
+        self.trigger = _read_only(trigger)
+        self.variables = variables if isinstance(variables, ScopedMap) else ScopedMap(variables)
+        # New outputs go into the first map; earlier runs' outputs are shared below it
+        self.outputs = ChainMap({}, outputs) if outputs is not None else ChainMap()
+        self.nodes = MappingProxyType(self.outputs)
+        self.extra = MappingProxyType(dict(extra or {}))
+        self.prev = prev
+
+    @classmethod
+    def from_dict(cls, context: Mapping) -> "ExecutionContext":
+        """Build a context from a plain ``{"$trigger": ..., "$nodes": ...}`` dict."""
+        if isinstance(context, ExecutionContext):
+            return context
+        return cls(
+            trigger=context.get("$trigger"),
+            variables=context.get("$vars"),
+            outputs=context.get("$nodes"),
+            extra={k: v for k, v in context.items() if k not in CONTEXT_KEYS},
+            prev=context.get("$prev", _NO_PREV),
+        )
+
+    @property
+    def has_prev(self) -> bool:
+        """Whether the context carries a ``$prev`` value (e.g. from a resumed run)."""
+        return self.prev is not _NO_PREV
+
+    def fork(self, trigger: Mapping | None = None) -> "ExecutionContext":
+        """
+        Start a new run that sees this run's outputs and variables.
+
+        Outputs recorded by the fork are not visible to this context.
+        """
+        forked = ExecutionContext(
+            trigger=trigger if trigger is not None else self.trigger,
+            variables=self.variables,
+            extra=self.extra,
+            prev=self.prev,
+        )
+        forked.outputs = self.outputs.new_child()
+        forked.nodes = MappingProxyType(forked.outputs)
+        return forked
+
+    def set_output(self, node_id: str, output: Any):
+        """Record a node's output, making it visible through ``$nodes``."""
+        self.outputs[node_id] = output
+
+    def release_output(self, node_id: str):
+        """Drop an output recorded by this run once no node will read it again."""
+        self.outputs.maps[0].pop(node_id, None)
+
+    def get_output(self, node_id: str, default: Any = None) -> Any:
+        """Get a recorded node output."""
+        return self.outputs.get(node_id, default)
+
+    def node_context(self, prev: Any = _NO_PREV, variables: ScopedMap | None = None) -> dict:
+        """
+        Build the context dict passed to a node.
+
+        Args:
+            prev: Value for ``$prev`` (omitted if not given)
+            variables: Variable scope for the node (defaults to the run's variables)
+        """
+        context = dict(self.extra)
+        context["$trigger"] = self.trigger
+        context["$vars"] = variables if variables is not None else self.variables
+        context["$nodes"] = self.nodes
+        if prev is not _NO_PREV:
+            context["$prev"] = prev
+        return context
+
+    def to_dict(self) -> dict:
+        """Snapshot as a plain dict, e.g. to resume from later."""
+        return self.node_context(self.prev)
+
+
+def _read_only(value: Mapping | None) -> Mapping:
+    if value is None:
+        return MappingProxyType({})
+    if isinstance(value, MappingProxyType | ScopedMap):
+        return value
+    return MappingProxyType(value)
@@ -0,0 +1,320 @@
+"""
+Data Flow
+
+Works out which node outputs each node reads, from the {{expressions}} in its
+config (see ``ConfigTemplate.references``), and what that means for a run:
+
+- Inferred edges: a node that reads ``$nodes.X`` but is not downstream of X
+  waits for X as if they were connected. It still takes ``$prev`` only from
+  its connections.
+- Missing references: ``$nodes.X`` where X is not in the workflow, is disabled,
+  is in a cycle or runs after the node reading it. These resolve to None and
+  are logged as warnings.
+- Relaxed connections, with ``settings["dataflow"]``: a connection whose target
+  reads neither ``$prev`` nor the source's output only orders the two nodes, so
+  the target starts without waiting for the source. Connections from nodes that
+  may be skipped (on or below a branch), and from nodes that set variables the
+  target reads, are always kept. A source that fails with ``on_error: stop``
+  can't stop a target that already started.
+- Released outputs, with ``settings["release_outputs"]``: once every node that
+  reads a node's output has finished, the output is dropped from the run
+  context and its result, so long runs don't hold every intermediate value.
+  Outputs no node reads (the workflow's results) are kept, and nothing is
+  released if any node reads ``$nodes`` as a whole.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from src.core.expressions import ConfigTemplate
+from src.core.nodes.base import BaseNode
+from src.core.workflow.cache import get_cache_policy
+from src.core.workflow.items import get_items_policy
+from src.core.workflow.models import Workflow, WorkflowNode
+from src.core.workflow.plan import ExecutionPlan
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of analyzed workflow versions kept in memory
+DEFAULT_DATAFLOW_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class DataFlow:
+    """Data dependencies of one version of a workflow, and the schedule they allow."""
+
+    # Node ID -> compiled config
+    templates: MappingProxyType
+    # Node ID -> IDs of the nodes whose output it reads through $nodes
+    references: MappingProxyType
+    # Node ID -> nodes it waits for / nodes waiting for it
+    waits_for: MappingProxyType
+    unblocks: MappingProxyType
+    # Node ID -> (source node ID, source port) of the connections it takes $prev
+    # and branch liveness from (relaxed connections excluded)
+    incoming: MappingProxyType
+    # Nodes with nothing to wait for, in plan order
+    roots: tuple[str, ...]
+    # (source, target) pairs
+    inferred: tuple[tuple[str, str], ...]
+    relaxed: tuple[tuple[str, str], ...]
+    # Node ID -> referenced node IDs that never run before it
+    missing: MappingProxyType
+    # Node ID -> nodes whose output can be released once it finishes (empty
+    # unless outputs are released)
+    reads: MappingProxyType
+    # Node ID -> nodes that read its output, by connection or reference
+    dependents: MappingProxyType
+
+    def downstream(self, node_ids: Iterable[str]) -> set[str]:
+        """Get the given nodes plus every node that reads their output, directly or not."""
+        seen = set(node_id for node_id in node_ids if node_id in self.dependents)
+        stack = list(seen)
+        while stack:
+            for dependent in self.dependents[stack.pop()]:
+                if dependent not in seen:
+                    seen.add(dependent)
+                    stack.append(dependent)
+        return seen
+
+
+def _overrides(handler_class: type[BaseNode] | None, method: str) -> bool:
+    if handler_class is None:
+        return True
+    return getattr(handler_class, method).__func__ is not getattr(BaseNode, method).__func__
+
+
+def _reaches(successors: Mapping[str, list[str]], start: str, goal: str) -> bool:
+    seen = {start}
+    stack = [start]
+    while stack:
+        for successor in successors[stack.pop()]:
+            if successor == goal:
+                return True
+            if successor not in seen:
+                seen.add(successor)
+                stack.append(successor)
+    return False
+
+
+def _reads_prev(
+    node: WorkflowNode, handler_class: type[BaseNode] | None, template: ConfigTemplate
+) -> bool:
+    if not node.enabled or handler_class is None or handler_class.reads_prev:
+        return True
+    if "$prev" in template.references.roots or get_items_policy(node.config):
+        return True
+    cache_policy = get_cache_policy(node.config)
+    return bool(cache_policy and cache_policy["include_prev"])
+
+
+def analyze_dataflow(
+    workflow: Workflow,
+    plan: ExecutionPlan,
+    templates: Mapping[str, ConfigTemplate],
+    relax: bool = False,
+    release: bool = False,
+) -> DataFlow:
+    """
+    Analyze the data dependencies of a workflow.
+
+    Args:
+        workflow: The workflow to analyze
+        plan: Compiled plan for the workflow
+        templates: Node ID -> compiled config, for every node in the plan
+        relax: Let nodes start without waiting for connections they don't read
+        release: Work out when node outputs can be released
+
+    Returns:
+        A new DataFlow
+    """
+    order = plan.order
+    nodes = {node_id: plan.get_node(workflow, node_id) for node_id in order}
+    handlers = {node_id: plan.get_handler_class(node.type) for node_id, node in nodes.items()}
+    enabled = {node_id for node_id, node in nodes.items() if node.enabled}
+    # Disabled nodes don't resolve their config, so they read nothing through it
+    references = {
+        node_id: templates[node_id].references if node_id in enabled else None for node_id in order
+    }
+
+    # Order every referenced node before the node reading it, unless that
+    # would create a cycle
+    successors = {node_id: list(plan.successors[node_id]) for node_id in order}
+    inferred: list[tuple[str, str]] = []
+    missing: dict[str, tuple[str, ...]] = {}
+    for target in order:
+        if references[target] is None:
+            continue
+        unresolved = []
+        for source in sorted(references[target].nodes):
+            if source not in enabled or source == target or _reaches(successors, target, source):
+                unresolved.append(source)
+            elif not _reaches(successors, source, target):
+                successors[source].append(target)
+                inferred.append((source, target))
+        if unresolved:
+            missing[target] = tuple(unresolved)
+            logger.warning(
+                f"Node '{target}' of workflow {workflow.name} references nodes that "
+                f"never run before it: {', '.join(unresolved)}"
+            )
+    if inferred:
+        logger.debug(f"Workflow {workflow.name}: inferred {len(inferred)} data dependencies")
+
+    # Connections the target doesn't read only order the two nodes
+    relaxed: list[tuple[str, str]] = []
+    if relax:
+        conditional = plan.downstream(
+            node_id for node_id in order if _overrides(handlers[node_id], "get_active_ports")
+        )
+        scoped = plan.downstream(
+            node_id for node_id in order if _overrides(handlers[node_id], "get_variable_updates")
+        )
+        for target in order:
+            if _reads_prev(nodes[target], handlers[target], templates[target]):
+                continue
+            refs = references[target]
+            for source in plan.predecessors[target]:
+                if (
+                    not refs.all_nodes
+                    and source not in refs.nodes
+                    and source not in conditional
+                    and not ("$vars" in refs.roots and source in scoped)
+                ):
+                    relaxed.append((source, target))
+
+    dropped = set(relaxed)
+    incoming = {
+        node_id: tuple(edge for edge in plan.incoming[node_id] if (edge[0], node_id) not in dropped)
+        for node_id in order
+    }
+    waits_for: dict[str, list[str]] = {node_id: [] for node_id in order}
+    unblocks: dict[str, list[str]] = {node_id: [] for node_id in order}
+    for source, target in [
+        *((s, t) for t in order for s in plan.predecessors[t] if (s, t) not in dropped),
+        *inferred,
+    ]:
+        waits_for[target].append(source)
+        unblocks[source].append(target)
+
+    dependents: dict[str, set[str]] = {node_id: set(plan.successors[node_id]) for node_id in order}
+    for source, target in inferred:
+        dependents[source].add(target)
+    for target, refs in references.items():
+        for source in refs.nodes if refs is not None else ():
+            if source in dependents and source != target:
+                dependents[source].add(target)
+
+    reads: dict[str, tuple[str, ...]] = {}
+    if release and not any(refs is not None and refs.all_nodes for refs in references.values()):
+        for target in order:
+            sources = [source for source, _ in incoming[target]]
+            if references[target] is not None:
+                sources.extend(s for s in references[target].nodes if s in enabled and s != target)
+            if sources:
+                reads[target] = tuple(dict.fromkeys(sources))
+
+    return DataFlow(
+        templates=MappingProxyType(dict(templates)),
+        references=MappingProxyType(
+            {
+                node_id: refs.nodes if refs is not None else frozenset()
+                for node_id, refs in references.items()
+            }
+        ),
+        waits_for=MappingProxyType({k: tuple(v) for k, v in waits_for.items()}),
+        unblocks=MappingProxyType({k: tuple(v) for k, v in unblocks.items()}),
+        incoming=MappingProxyType(incoming),
+        roots=tuple(node_id for node_id in order if not waits_for[node_id]),
+        inferred=tuple(inferred),
+        relaxed=tuple(relaxed),
+        missing=MappingProxyType(missing),
+        reads=MappingProxyType(reads),
+        dependents=MappingProxyType({k: tuple(v) for k, v in dependents.items()}),
+    )
+
+
+class DataFlowCache:
+    """
+    LRU cache of data flow analyses keyed by workflow version and node fingerprints.
+
+    Fingerprints change whenever a node's config does (see
+    src.core.workflow.incremental), so edited expressions are analyzed again.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_DATAFLOW_CACHE_SIZE):
+        self.max_size = max_size
+        self._analyses: OrderedDict[tuple, DataFlow] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        workflow: Workflow,
+        plan: ExecutionPlan,
+        fingerprints: Mapping[str, str],
+        get_template: Callable[[str], ConfigTemplate],
+    ) -> DataFlow:
+        """
+        Get the data flow of a workflow, analyzing it if needed.
+
+        Args:
+            workflow: The workflow about to run
+            plan: Compiled plan for the workflow
+            fingerprints: Current node fingerprints (see node_fingerprints)
+            get_template: Compiles the config of a node, given its ID
+        """
+        relax = bool(workflow.settings.get("dataflow", False))
+        release = bool(workflow.settings.get("release_outputs", False))
+        key = (
+            workflow.id,
+            plan.signature,
+            plan.registry_generation,
+            tuple(fingerprints.get(node_id) for node_id in plan.order),
+            relax,
+            release,
+        )
+
+        with self._lock:
+            dataflow = self._analyses.get(key)
+            if dataflow is not None:
+                self._analyses.move_to_end(key)
+                self.hits += 1
+                return dataflow
+
+        templates = {node_id: get_template(node_id) for node_id in plan.order}
+        dataflow = analyze_dataflow(workflow, plan, templates, relax, release)
+
+        with self._lock:
+            self.misses += 1
+            self._analyses[key] = dataflow
+            self._analyses.move_to_end(key)
+            while len(self._analyses) > self.max_size:
+                self._analyses.popitem(last=False)
+
+        return dataflow
+
+    def clear(self):
+        """Drop all cached analyses."""
+        with self._lock:
+            self._analyses.clear()
+
+    def __len__(self) -> int:
+        return len(self._analyses)
+
+
+# Global data flow cache instance
+_dataflow_cache: DataFlowCache | None = None
+
+
+def get_dataflow_cache() -> DataFlowCache:
+    """Get the global data flow cache."""
+    global _dataflow_cache
+    if _dataflow_cache is None:
+        _dataflow_cache = DataFlowCache()
+    return _dataflow_cache
@@ -6,26 +6,92 @@ Handles the execution of workflows.
 
 import asyncio
 import logging
+import time
+from collections import Counter, deque
+from collections.abc import Awaitable, Callable, Mapping
 from datetime import UTC, datetime
-
-from src.core.expressions import resolve_expressions
+from functools import partial
+from typing import Any
+
+from src.core.blobs import (
+    DEFAULT_SPILL_THRESHOLD,
+    BlobRef,
+    estimate_size,
+    get_blob_store,
+    get_spill_threshold,
+)
+from src.core.cancellation import (
+    CancellationToken,
+    current_token,
+    get_deadline,
+    reset_current_token,
+    set_current_token,
+)
+from src.core.expressions import ConfigTemplate, References, get_parser, get_template_cache
+from src.core.nodes.base import BaseNode
 from src.core.nodes.registry import NodeRegistry
+from src.core.telemetry import get_telemetry
+from src.core.workflow.cache import MISS, cache_key, get_cache_policy, get_result_cache
+from src.core.workflow.context import ExecutionContext, ScopedMap
+from src.core.workflow.dataflow import DataFlow, get_dataflow_cache
+from src.core.workflow.incremental import find_reusable_results, node_fingerprints
+from src.core.workflow.items import (
+    ItemsPolicy,
+    batched,
+    get_items,
+    get_items_policy,
+    item_context,
+)
 from src.core.workflow.models import (
     ExecutionResult,
+    NodeAttempt,
     Workflow,
     WorkflowExecution,
     WorkflowNode,
 )
+from src.core.workflow.plan import ExecutionPlan, get_plan_cache
+from src.core.workflow.process_pool import get_cpu_pool
+from src.core.workflow.profiler import EXECUTE, RESOLVE, STORE, NodeTimer
+from src.core.workflow.retry import (
+    RetryPolicy,
+    get_output_status,
+    get_retry_after,
+    get_retry_policy,
+    is_timeout,
+)
 
 logger = logging.getLogger(__name__)
 
+# Default number of nodes that may run at the same time within one execution
+DEFAULT_MAX_CONCURRENCY = 10
+
+# Seconds cancelled nodes get to clean up (e.g. kill subprocesses) before the run ends
+CANCEL_GRACE_PERIOD = 5.0
+
 
 class WorkflowExecutor:
-    """Executes workflows by running nodes in order."""
+    """Executes workflows by running each node once its upstream nodes have finished."""
 
     def __init__(self):
         self.node_registry = NodeRegistry()
+        self.plan_cache = get_plan_cache()
+        self.result_cache = get_result_cache()
+        self.cpu_pool = get_cpu_pool()
+        self.blob_store = get_blob_store()
+        self.template_cache = get_template_cache()
+        self.dataflow_cache = get_dataflow_cache()
         self.current_execution: WorkflowExecution | None = None
+        self.cancel_token: CancellationToken | None = None
+
+    def cancel(self, reason: str = "Cancelled by user"):
+        """
+        Cancel the current execution.
+
+        Running nodes are cancelled and no further nodes start; the execution
+        ends with status ``cancelled``. Call from the executor's event loop.
+        """
+        if self.cancel_token is not None:
+            self.cancel_token.cancel(reason)
 
     async def execute(
         self,
@@ -33,7 +99,10 @@ class WorkflowExecutor:
         trigger_data: dict = None,
         trigger_type: str = "manual",
         resume_from: str | None = None,
-        previous_context: dict | None = None,
+        previous_context: Mapping | ExecutionContext | None = None,
+        previous_execution: WorkflowExecution | None = None,
+        dirty_nodes: set[str] | None = None,
+        cancel_token: CancellationToken | None = None,
     ) -> WorkflowExecution:
         """
         Execute a workflow and return the execution result.
@@ -43,7 +112,14 @@ class WorkflowExecutor:
             trigger_data: Data passed from the trigger
             trigger_type: Type of trigger (manual, schedule, webhook, etc.)
             resume_from: Optional node ID to resume execution from (skips prior nodes)
-            previous_context: Context from previous execution (for resume)
+            previous_context: Context from previous execution (for resume), as an
+                ExecutionContext or a plain dict
+            previous_execution: Previous run of this workflow. Only nodes that changed
+                since then (and everything downstream of them) run again; the rest
+                reuse their previous output.
+            dirty_nodes: Node IDs to re-run even if their definition did not change
+            cancel_token: Token whose cancellation also cancels this run. Runs
+                started from inside another run follow that run's token by default.
 
         Returns:
             WorkflowExecution with results
@@ -58,105 +134,520 @@ class WorkflowExecutor:
             trigger_data=trigger_data,
         )
         self.current_execution = execution
+        token = CancellationToken(
+            get_deadline(workflow.settings), parent=cancel_token or current_token()
+        )
+        self.cancel_token = token
+        reset_token = set_current_token(token)
+
+        telemetry = get_telemetry()
+        span_attributes = {
+            "workflow.id": workflow.id,
+            "workflow.name": workflow.name,
+            "execution.id": execution.id,
+            "trigger.type": execution.trigger_type,
+        }
+        with telemetry.span("workflow.run", span_attributes) as span:
+            telemetry.add("skynette.workflow.active", 1)
+            try:
+                # Get the compiled plan (cached across runs of the same workflow version)
+                plan = self.plan_cache.get(workflow, self.node_registry)
+                logger.info(f"Executing workflow {workflow.name} with {len(plan.order)} nodes")
+
+                # Context for passing data between nodes
+                if previous_context:
+                    # Resume on top of the previous context; its outputs are shared, not copied
+                    context = ExecutionContext.from_dict(previous_context).fork(
+                        trigger_data or None
+                    )
+                    logger.info("Resuming with context from previous execution")
+                else:
+                    context = ExecutionContext(trigger=trigger_data, variables=workflow.variables)
+
+                execution.node_fingerprints = node_fingerprints(workflow, plan)
+                dataflow = self._dataflow(workflow, plan, execution.node_fingerprints)
+                reusable = {}
+                if previous_execution is not None:
+                    reusable = find_reusable_results(
+                        workflow,
+                        plan,
+                        execution.node_fingerprints,
+                        previous_execution,
+                        trigger_data,
+                        dirty_nodes,
+                        dataflow,
+                    )
+                    logger.info(
+                        f"Incremental run: reusing {len(reusable)} of "
+                        f"{len(plan.order)} node results"
+                    )
+
+                await self._run_graph(
+                    workflow, plan, dataflow, context, execution, resume_from, reusable, token
+                )
+
+                # Mark execution as complete
+                if execution.status == "running":
+                    execution.status = "completed"
+
+                execution.completed_at = datetime.now(UTC)
+                execution.duration_ms = (
+                    execution.completed_at - execution.started_at
+                ).total_seconds() * 1000
+
+                logger.info(
+                    f"Workflow {workflow.name} execution {execution.status} "
+                    f"in {execution.duration_ms:.2f}ms"
+                )
+
+            except Exception as e:
+                execution.status = "failed"
+                execution.error = str(e)
+                execution.completed_at = datetime.now(UTC)
+                logger.exception(f"Workflow execution failed: {e}")
+
+            finally:
+                self.current_execution = None
+                self.cancel_token = None
+                reset_current_token(reset_token)
+                token.detach()
+                telemetry.add("skynette.workflow.active", -1)
+
+            span.set_attribute("workflow.status", execution.status)
+            if execution.status == "failed":
+                span.record_error(execution.error or "Workflow failed")
+
+        attributes = {"workflow.id": workflow.id, "status": execution.status}
+        telemetry.add("skynette.workflow.runs", 1, attributes)
+        if execution.duration_ms:
+            telemetry.record("skynette.workflow.duration", execution.duration_ms, attributes)
+
+        return execution
 
+    def _get_max_concurrency(self, workflow: Workflow) -> int:
+        """Get the maximum number of nodes allowed to run at once for a workflow."""
         try:
-            # Get execution order
-            node_order = workflow.get_execution_order()
-            logger.info(f"Executing workflow {workflow.name} with {len(node_order)} nodes")
-
-            # Context for passing data between nodes
-            if previous_context:
-                # Resume with previous context
-                context = previous_context.copy()
-                context["$trigger"] = trigger_data or context.get("$trigger", {})
-                logger.info("Resuming with context from previous execution")
-            else:
-                context = {
-                    "$trigger": trigger_data,
-                    "$vars": workflow.variables.copy(),
-                    "$nodes": {},
-                }
+            limit = int(workflow.settings.get("max_concurrency", DEFAULT_MAX_CONCURRENCY))
+        except (TypeError, ValueError):
+            limit = DEFAULT_MAX_CONCURRENCY
+        return max(1, limit)
+
+    async def _run_graph(
+        self,
+        workflow: Workflow,
+        plan: ExecutionPlan,
+        dataflow: DataFlow,
+        context: ExecutionContext,
+        execution: WorkflowExecution,
+        resume_from: str | None = None,
+        reusable: dict[str, ExecutionResult] | None = None,
+        token: CancellationToken | None = None,
+    ):
+        """
+        Run the workflow graph, starting each node as soon as the nodes it waits for finish.
+
+        A node waits for its upstream nodes and for the nodes whose output it
+        reads through ``$nodes`` (see src.core.workflow.dataflow). Independent
+        branches run concurrently, bounded by the workflow's
+        ``max_concurrency`` setting. A failed node with ``on_error: stop`` prevents
+        any further nodes from starting; nodes already running are allowed to finish.
+
+        Connections leaving a branching node (e.g. If/Else) through a port that was
+        not taken are dead. Nodes whose incoming connections are all dead are
+        skipped and recorded in ``execution.skipped_nodes``; merge nodes only take
+        ``$prev`` from their live inputs.
 
-            # Handle resume - skip nodes until we reach resume_from
-            skip_until_resume = resume_from is not None
-            skipped_nodes = []
+        With the ``release_outputs`` setting, a node's output is dropped from the
+        context and its result once every node reading it has finished.
 
-            # Execute nodes in order
-            for node_id in node_order:
-                node = workflow.get_node(node_id)
-                if not node or not node.enabled:
-                    continue
+        When the token is cancelled or its deadline passes, running nodes are
+        cancelled and recorded as failed, and the execution ends ``cancelled``.
+
+        Args:
+            workflow: The workflow being executed
+            plan: Compiled execution plan for the workflow
+            dataflow: Data dependencies of the workflow and the compiled node configs
+            context: Shared execution context (node outputs are recorded in it)
+            execution: Execution record to add results to
+            resume_from: Optional node ID to resume execution from (skips prior nodes)
+            reusable: Previous results to use instead of running those nodes
+            token: The run's cancellation token (passed to nodes as ``$cancel``)
+        """
+        reusable = reusable or {}
+        token = token or CancellationToken()
+        position = plan.position
+        incoming = dataflow.incoming
+
+        # Nodes before the resume point are treated as already finished
+        resume_index = position.get(resume_from) if resume_from else None
+        if resume_from and resume_index is None:
+            logger.warning(f"Resume node '{resume_from}' not found, running all nodes")
+
+        waiting = {node_id: len(dataflow.waits_for[node_id]) for node_id in plan.order}
+        ready = deque(dataflow.roots)
+        # Profiling: when each node became ready, and output sizes passed downstream
+        origin = time.perf_counter()
+        ready_at: dict[str, float] = {}
+        # Node ID -> (estimated size, whether the estimate was truncated)
+        output_sizes: dict[str, tuple[int | None, bool]] = {}
+        input_sizes: dict[str, tuple[int | None, bool]] = {}
+
+        # Value each finished node passes downstream as $prev
+        prev_outputs: dict[str, Any] = {}
+        # Variable scope each finished node passes downstream as $vars
+        scopes: dict[str, ScopedMap] = {}
+        # Output ports taken by each finished node (None means every port)
+        active_ports: dict[str, set[str] | None] = {}
+        skipped: set[str] = set()
+        # Nodes still to finish reading each output, when outputs are released
+        unread = Counter(source for sources in dataflow.reads.values() for source in sources)
+        results: dict[str, ExecutionResult] = {}
+        running: dict[asyncio.Task, str] = {}
+        max_concurrency = self._get_max_concurrency(workflow)
+        stopped = False
+        cancelled = asyncio.ensure_future(token.wait())
+
+        def is_live(source: str, port: str) -> bool:
+            if source in skipped:
+                return False
+            ports = active_ports.get(source)
+            return ports is None or port == "output" or port in ports
+
+        def live_predecessors(node_id: str) -> list[str]:
+            return [source for source, port in incoming[node_id] if is_live(source, port)]
+
+        def latest_predecessor(node_id: str) -> str | None:
+            finished = [p for p in live_predecessors(node_id) if p in prev_outputs]
+            return max(finished, key=position.__getitem__) if finished else None
+
+        def prev_for(node_id: str) -> Any:
+            source = latest_predecessor(node_id)
+            if source is not None:
+                return prev_outputs[source]
+            return context.prev if context.has_prev else None
+
+        def scope_for(node_id: str) -> ScopedMap:
+            # Like $prev, merge nodes take the scope of their latest live input
+            source = latest_predecessor(node_id)
+            return scopes[source] if source is not None else context.variables
+
+        def finish(
+            node_id: str,
+            output: Any,
+            ports: set[str] | None = None,
+            updates: dict | None = None,
+        ):
+            scopes[node_id] = scope_for(node_id).child(updates)
+            prev_outputs[node_id] = output
+            active_ports[node_id] = ports
+            for successor in dataflow.unblocks[node_id]:
+                waiting[successor] -= 1
+                if waiting[successor] == 0:
+                    ready_at[successor] = time.perf_counter()
+                    ready.append(successor)
+            for source in dataflow.reads.get(node_id, ()):
+                unread[source] -= 1
+                if unread[source] == 0:
+                    release(source)
+
+        def release(node_id: str):
+            # Every node reading this output has finished
+            context.release_output(node_id)
+            prev_outputs[node_id] = None
+            result = results.get(node_id)
+            if result is not None and result.data is not None:
+                result.data = None
+                result.released = True
+
+        try:
+            while ready or running:
+                if token.cancelled:
+                    await self._cancel_running(plan, running, execution, token.reason)
+                    break
+
+                while ready and not stopped and len(running) < max_concurrency:
+                    node_id = ready.popleft()
+                    node = plan.get_node(workflow, node_id)
+
+                    if resume_index is not None and position[node_id] < resume_index:
+                        logger.debug(f"Skipping node '{node_id}' (before resume point)")
+                        finish(node_id, context.get_output(node_id))
+                        continue
+
+                    if incoming[node_id] and not live_predecessors(node_id):
+                        # Only reachable through branches that were not taken
+                        logger.debug(f"Skipping node '{node_id}' (branch not taken)")
+                        skipped.add(node_id)
+                        execution.add_skipped(node_id)
+                        finish(node_id, None)
+                        continue
+
+                    if not node or not node.enabled:
+                        # Disabled nodes pass their input straight through
+                        finish(node_id, prev_for(node_id))
+                        continue
+
+                    if node_id in reusable:
+                        # Clean node in an incremental run
+                        result = reusable[node_id].model_copy(update={"reused": True})
+                        execution.add_result(result)
+                        results[node_id] = result
+                        context.set_output(node_id, result.data)
+                        output_sizes[node_id] = (result.bytes_out, result.bytes_out_truncated)
+                        finish(node_id, result.data, *self._routing(plan, node, result.data))
+                        continue
 
-                # Handle resume - skip nodes until we reach the resume point
-                if skip_until_resume:
                     if node_id == resume_from:
-                        skip_until_resume = False
                         logger.info(f"Resuming execution from node '{node.name}'")
+
+                    if incoming[node_id] or context.has_prev:
+                        node_context = context.node_context(prev_for(node_id), scope_for(node_id))
                     else:
-                        skipped_nodes.append(node_id)
-                        logger.debug(f"Skipping node '{node.name}' (before resume point)")
+                        node_context = context.node_context(variables=scope_for(node_id))
+                    node_context["$cancel"] = token
+                    source = latest_predecessor(node_id)
+                    input_sizes[node_id] = output_sizes.get(source, (None, False))
+                    handler_class = plan.get_handler_class(node.type)
+                    template = dataflow.templates[node_id]
+                    timer = NodeTimer(origin, ready_at.get(node_id))
+                    task = asyncio.create_task(
+                        self._run_node(workflow, node, node_context, handler_class, timer, template)
+                    )
+                    running[task] = node_id
+
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(
+                    [*running, cancelled],
+                    timeout=token.remaining(),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                done.discard(cancelled)
+
+                # Record in topological order so results are deterministic
+                for task in sorted(done, key=lambda t: position[running[t]]):
+                    node_id = running.pop(task)
+                    result = task.result()
+                    result.bytes_in, result.bytes_in_truncated = input_sizes.pop(
+                        node_id, (None, False)
+                    )
+                    output_sizes[node_id] = (result.bytes_out, result.bytes_out_truncated)
+                    execution.add_result(result)
+                    results[node_id] = result
+
+                    node = plan.get_node(workflow, node_id)
+
+                    if result.success:
+                        # Store result in context for downstream nodes
+                        context.set_output(node_id, result.data)
+                        finish(node_id, result.data, *self._routing(plan, node, result.data))
                         continue
 
-                result = await self._execute_node(node, context)
-                execution.add_result(result)
-
-                if result.success:
-                    # Store result in context for downstream nodes
-                    context["$nodes"][node_id] = result.data
-                    context["$prev"] = result.data
-                else:
                     # Handle error based on node configuration
                     error_strategy = node.config.get("on_error", "stop")
-                    if error_strategy == "stop":
+                    if error_strategy == "continue":
+                        context.set_output(node_id, None)
+                        finish(node_id, None)
+                    elif not stopped:
+                        # "stop" (and unknown strategies): let running nodes finish,
+                        # but start nothing new
+                        stopped = True
                         execution.status = "failed"
                         execution.error = result.error
-                        break
-                    elif error_strategy == "continue":
-                        context["$nodes"][node_id] = None
-                        context["$prev"] = None
-                    # Other strategies: retry, fallback, etc.
-
-            # Mark execution as complete
-            if execution.status == "running":
-                execution.status = "completed"
-
-            execution.completed_at = datetime.now(UTC)
-            execution.duration_ms = (
-                execution.completed_at - execution.started_at
-            ).total_seconds() * 1000
-
-            logger.info(
-                f"Workflow {workflow.name} execution {execution.status} "
-                f"in {execution.duration_ms:.2f}ms"
+        finally:
+            cancelled.cancel()
+            for task in running:
+                task.cancel()
+
+    async def _cancel_running(
+        self,
+        plan: ExecutionPlan,
+        running: dict[asyncio.Task, str],
+        execution: WorkflowExecution,
+        reason: str,
+    ):
+        """Cancel the running nodes, wait for them to clean up and record them as failed."""
+        logger.info(f"Cancelling execution {execution.id}: {reason}")
+        for task in running:
+            task.cancel()
+        if running:
+            _, pending = await asyncio.wait(running, timeout=CANCEL_GRACE_PERIOD)
+            for task in pending:
+                logger.warning(f"Node '{running[task]}' did not stop after being cancelled")
+
+        now = datetime.now(UTC)
+        for task, node_id in sorted(running.items(), key=lambda t: plan.position[t[1]]):
+            if task.done() and not task.cancelled():
+                # Finished before it could be cancelled
+                execution.add_result(task.result())
+                continue
+            execution.add_result(
+                ExecutionResult(
+                    node_id=node_id,
+                    success=False,
+                    error=reason,
+                    started_at=now,
+                    completed_at=now,
+                )
             )
+        running.clear()
+        execution.status = "cancelled"
+        execution.error = reason
 
-        except Exception as e:
-            execution.status = "failed"
-            execution.error = str(e)
-            execution.completed_at = datetime.now(UTC)
-            logger.exception(f"Workflow execution failed: {e}")
+    def _routing(
+        self, plan: ExecutionPlan, node: WorkflowNode, output: Any
+    ) -> tuple[set[str] | None, dict | None]:
+        """
+        Get what a finished node passes on besides its output.
 
-        finally:
-            self.current_execution = None
+        Returns:
+            The output ports it took (None means every port) and the variables it
+            set for downstream nodes (None if none)
+        """
+        handler_class = plan.get_handler_class(node.type) or self.node_registry.get_handler_class(
+            node.type
+        )
+        if handler_class is None:
+            return None, None
+        if isinstance(output, BlobRef):
+            if (
+                handler_class.get_active_ports.__func__ is BaseNode.get_active_ports.__func__
+                and handler_class.get_variable_updates.__func__
+                is BaseNode.get_variable_updates.__func__
+            ):
+                return None, None
+            output = output.load()
+        return handler_class.get_active_ports(output), handler_class.get_variable_updates(output)
+
+    async def _run_node(
+        self,
+        workflow: Workflow,
+        node: WorkflowNode,
+        context: dict,
+        handler_class: type[BaseNode] | None,
+        timer: NodeTimer,
+        template: ConfigTemplate | None = None,
+    ) -> ExecutionResult:
+        """Execute a node inside a telemetry span and record its metrics."""
+        telemetry = get_telemetry()
+        attributes = {"workflow.id": workflow.id, "node.type": node.type}
+        with telemetry.span("node.execute", {**attributes, "node.id": node.id}) as span:
+            result = await self._execute_node(
+                node, context, handler_class, workflow.settings, timer, template
+            )
+            span.set_attributes(
+                {
+                    "node.success": result.success,
+                    "node.cache_hit": result.cache_hit,
+                    "node.attempts": len(result.attempts) or 1,
+                    "node.bytes_out": result.bytes_out,
+                }
+            )
+            if not result.success:
+                span.record_error(result.error or "Node failed")
 
-        return execution
+        telemetry.record(
+            "skynette.node.duration", result.duration_ms, {**attributes, "success": result.success}
+        )
+        if not result.success:
+            telemetry.add("skynette.node.failures", 1, attributes)
+        return result
+
+    async def _execute_node(
+        self,
+        node: WorkflowNode,
+        context: dict,
+        handler_class: type[BaseNode] | None = None,
+        settings: dict | None = None,
+        timer: NodeTimer | None = None,
+        template: ConfigTemplate | None = None,
+    ) -> ExecutionResult:
+        """
+        Execute a single node.
 
-    async def _execute_node(self, node: WorkflowNode, context: dict) -> ExecutionResult:
-        """Execute a single node."""
+        Args:
+            node: The node to execute
+            context: Execution context for the node
+            handler_class: Handler class resolved by the plan (looked up if not given)
+            settings: Workflow settings (for defaults such as ``node_timeout``)
+            timer: Records the node's phases (see src.core.workflow.profiler)
+            template: The node's compiled config (compiled here if not given)
+        """
         start_time = datetime.now(UTC)
+        attempts: list[NodeAttempt] = []
+        timer = timer or NodeTimer(time.perf_counter())
+        timer.started()
 
         try:
-            # Get node handler from registry
-            handler = self.node_registry.get_handler(node.type)
-            if not handler:
+            # Use the handler class resolved by the plan, falling back to the registry
+            handler_class = handler_class or self.node_registry.get_handler_class(node.type)
+            if not handler_class:
                 raise ValueError(f"Unknown node type: {node.type}")
 
-            # Resolve expressions in node config
-            resolved_config = self._resolve_expressions(node.config, context)
+            with timer.span(RESOLVE):
+                # Nodes read $prev directly, so a spilled upstream output is loaded for them
+                prev = context.get("$prev")
+                if isinstance(prev, BlobRef):
+                    context = dict(context)
+                    context["$prev"] = await asyncio.to_thread(prev.store.read, prev.sha)
+
+                template = template or self._config_template(node, handler_class)
 
-            # Execute the node
-            logger.debug(f"Executing node {node.name} ({node.type})")
-            output = await handler.execute(resolved_config, context)
+                # Opt-in items mode: one run per item of the upstream output
+                items_policy = get_items_policy(node.config)
+                if items_policy:
+                    resolved_config = {}
+                    cache_policy = None
+                else:
+                    # Resolve expressions in node config
+                    resolved_config = template.render(context)
+                    # Opt-in result cache keyed by node type and resolved config
+                    cache_policy = get_cache_policy(node.config)
+
+                cache_hit = None
+                output = MISS
+                if cache_policy:
+                    prev = context.get("$prev") if cache_policy["include_prev"] else MISS
+                    key = cache_key(node.type, resolved_config, prev)
+                    output = self.result_cache.get(key)
+                    cache_hit = output is not MISS
+                    if cache_hit:
+                        logger.debug(f"Using cached result for node {node.name}")
+
+            ran = output is MISS
+            if ran:
+                logger.debug(f"Executing node {node.name} ({node.type})")
+                retry_policy = get_retry_policy(node.config, settings)
+                with timer.span(EXECUTE):
+                    if items_policy:
+                        output = await self._execute_items(
+                            node, handler_class, template, context, items_policy, retry_policy
+                        )
+                    else:
+                        invoke = partial(
+                            self._invoke,
+                            handler_class,
+                            resolved_config,
+                            context,
+                            template.raw_references,
+                        )
+                        output = await self._call_handler(node, invoke, retry_policy, attempts)
+
+            with timer.span(STORE):
+                if ran and cache_policy:
+                    self.result_cache.set(key, output, cache_policy["ttl"])
+
+                # Large outputs go to the blob store; only a reference stays in memory
+                threshold = get_spill_threshold(settings)
+                # The estimate stops at the limit, so larger outputs are recorded as truncated
+                size_limit = threshold or DEFAULT_SPILL_THRESHOLD
+                bytes_out = estimate_size(output, size_limit)
+                truncated = bytes_out >= size_limit
+                if threshold and bytes_out >= threshold:
+                    output = await asyncio.to_thread(self.blob_store.spill, output, threshold)
+                    if isinstance(output, BlobRef):
+                        bytes_out, truncated = output.size, False
 
             end_time = datetime.now(UTC)
             duration_ms = (end_time - start_time).total_seconds() * 1000
@@ -168,6 +659,11 @@ class WorkflowExecutor:
                 duration_ms=duration_ms,
                 started_at=start_time,
                 completed_at=end_time,
+                cache_hit=cache_hit,
+                attempts=attempts,
+                spans=timer.spans,
+                bytes_out=bytes_out,
+                bytes_out_truncated=truncated,
             )
 
         except Exception as e:
@@ -183,11 +679,203 @@ class WorkflowExecutor:
                 duration_ms=duration_ms,
                 started_at=start_time,
                 completed_at=end_time,
+                attempts=attempts,
+                spans=timer.spans,
+            )
+
+    async def _call_handler(
+        self,
+        node: WorkflowNode,
+        invoke: Callable[[], Awaitable[Any]],
+        policy: RetryPolicy | None,
+        attempts: list[NodeAttempt],
+    ) -> Any:
+        """
+        Run a node, with the node's timeout and retries.
+
+        With a retry policy, each attempt is bounded by the policy's timeout and
+        recorded in ``attempts``. Retryable failures are retried with backoff;
+        the last failure is raised.
+
+        Args:
+            node: The node being run
+            invoke: Runs one attempt (see _invoke and _invoke_batch)
+            policy: Timeout and retry settings, if any
+            attempts: List to record attempts in
+        """
+        if policy is None:
+            return await invoke()
+
+        for attempt in range(1, policy.max_attempts + 1):
+            record = NodeAttempt(attempt=attempt, success=False)
+            attempts.append(record)
+            attempt_start = time.perf_counter()
+            retry_after = None
+
+            try:
+                output = await asyncio.wait_for(invoke(), timeout=policy.timeout)
+            except Exception as e:
+                record.duration_ms = (time.perf_counter() - attempt_start) * 1000
+                error = e
+                if is_timeout(e) and not str(e):
+                    error = TimeoutError(f"Node timed out after {policy.timeout:g}s")
+                record.error = str(error) or type(error).__name__
+                if attempt == policy.max_attempts or not policy.should_retry_error(e):
+                    if error is e:
+                        raise
+                    raise error from e
+            else:
+                record.duration_ms = (time.perf_counter() - attempt_start) * 1000
+                if attempt == policy.max_attempts or not policy.should_retry_output(output):
+                    record.success = True
+                    return output
+                record.error = f"HTTP {get_output_status(output)}"
+                retry_after = get_retry_after(output)
+
+            delay = policy.get_delay(attempt, retry_after)
+            record.retry_delay_ms = delay * 1000
+            logger.warning(
+                f"Node {node.name} attempt {attempt}/{policy.max_attempts} failed "
+                f"({record.error}), retrying in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+
+    async def _invoke(
+        self,
+        handler_class: type[BaseNode],
+        config: dict,
+        context: dict,
+        references: References | None = None,
+    ) -> Any:
+        """
+        Run a single attempt of a node.
+
+        CPU-bound nodes run in the process pool when their config and context can
+        be pickled; everything else runs on a pooled handler on the event loop.
+        ``references`` (what the node's raw expressions read) says which ``$nodes``
+        outputs a worker process needs.
+        """
+        if self.cpu_pool.wants(handler_class):
+            payload = self.cpu_pool.pack(handler_class, config, context, references)
+            if payload is not None:
+                return await self.cpu_pool.run(payload)
+
+        async with self.node_registry.lease(handler_class) as handler:
+            return await handler.execute(config, context)
+
+    async def _invoke_batch(
+        self, handler_class: type[BaseNode], configs: list[dict], contexts: list[dict]
+    ) -> list:
+        """Run a single attempt of a node's execute_batch fast path."""
+        async with self.node_registry.lease(handler_class) as handler:
+            outputs = list(await handler.execute_batch(configs, contexts))
+        if len(outputs) != len(configs):
+            raise ValueError(
+                f"execute_batch returned {len(outputs)} outputs for {len(configs)} items"
+            )
+        return outputs
+
+    async def _execute_items(
+        self,
+        node: WorkflowNode,
+        handler_class: type[BaseNode],
+        template: ConfigTemplate,
+        context: dict,
+        policy: ItemsPolicy,
+        retry_policy: RetryPolicy | None,
+    ) -> list:
+        """
+        Run a node in items mode (see src.core.workflow.items).
+
+        Timeouts and retries apply to each item, or to each batch for nodes with
+        an execute_batch fast path. Individual attempts are not recorded.
+
+        Returns:
+            One output per item, in input order
+        """
+        items = get_items(context.get("$prev"), policy.path)
+        outputs: list[Any] = [None] * len(items)
+        has_fast_path = handler_class.execute_batch is not BaseNode.execute_batch
+        semaphore = asyncio.Semaphore(policy.concurrency)
+
+        def failed(index: int, error: Exception) -> dict:
+            if not policy.continue_on_error:
+                raise error
+            logger.warning(f"Node {node.name} failed on item {index}: {error}")
+            return {"error": str(error), "index": index}
+
+        async def run_batch(start: int, batch: list):
+            async with semaphore:
+                indexes = range(start, start + len(batch))
+                contexts = [item_context(context, item, i) for i, item in zip(indexes, batch)]
+                configs = template.render_batch(contexts)
+
+                if has_fast_path:
+                    invoke = partial(self._invoke_batch, handler_class, configs, contexts)
+                    try:
+                        results = await self._call_handler(node, invoke, retry_policy, [])
+                    except Exception as e:
+                        results = [failed(i, e) for i in indexes]
+                    outputs[start : start + len(batch)] = results
+                    return
+
+                for i, config, item_ctx in zip(indexes, configs, contexts):
+                    invoke = partial(
+                        self._invoke, handler_class, config, item_ctx, template.raw_references
+                    )
+                    try:
+                        outputs[i] = await self._call_handler(node, invoke, retry_policy, [])
+                    except Exception as e:
+                        outputs[i] = failed(i, e)
+
+        tasks = [
+            asyncio.create_task(run_batch(start, batch))
+            for start, batch in zip(
+                range(0, len(items), policy.batch_size), batched(items, policy.batch_size)
             )
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        logger.debug(f"Node {node.name} processed {len(items)} items in {len(tasks)} batches")
+        return outputs
+
+    def _dataflow(
+        self, workflow: Workflow, plan: ExecutionPlan, fingerprints: dict[str, str]
+    ) -> DataFlow:
+        """Get the data dependencies of a workflow, with every node's config compiled."""
+
+        def get_template(node_id: str) -> ConfigTemplate:
+            node = plan.get_node(workflow, node_id)
+            return self._config_template(
+                node, plan.get_handler_class(node.type), fingerprints.get(node_id)
+            )
+
+        return self.dataflow_cache.get(workflow, plan, fingerprints, get_template)
 
-    def _resolve_expressions(self, config: dict, context: dict) -> dict:
-        """Resolve {{expressions}} in configuration values using the expression parser."""
-        return resolve_expressions(config, context)
+    def _config_template(
+        self,
+        node: WorkflowNode,
+        handler_class: type[BaseNode] | None,
+        fingerprint: str | None = None,
+    ) -> ConfigTemplate:
+        """
+        Get a node's config compiled for resolving {{expressions}}.
+
+        Templates are cached by node fingerprint, which changes whenever the
+        config does. Keys listed in the handler's ``raw_config_keys`` are passed
+        through as written; those also in ``expression_config_keys`` still count
+        towards the template's references.
+        """
+        raw_keys = handler_class.raw_config_keys if handler_class else ()
+        expression_keys = handler_class.expression_config_keys if handler_class else ()
+        if fingerprint is None:
+            return get_parser().compile_config(node.config, raw_keys, expression_keys)
+        return self.template_cache.get(fingerprint, node.config, raw_keys, expression_keys)
 
 
 class DebugExecutor(WorkflowExecutor):
@@ -219,7 +907,19 @@ class DebugExecutor(WorkflowExecutor):
         self.step_mode = True
         self._pause_event.set()
 
-    async def _execute_node(self, node: WorkflowNode, context: dict) -> ExecutionResult:
+    def _get_max_concurrency(self, workflow: Workflow) -> int:
+        """Run one node at a time so breakpoints and stepping stay predictable."""
+        return 1
+
+    async def _execute_node(
+        self,
+        node: WorkflowNode,
+        context: dict,
+        handler_class: type[BaseNode] | None = None,
+        settings: dict | None = None,
+        timer: NodeTimer | None = None,
+        template: ConfigTemplate | None = None,
+    ) -> ExecutionResult:
         """Execute a node with debug support."""
         # Check for breakpoint
         if node.id in self.breakpoints or self.step_mode:
@@ -233,4 +933,4 @@ class DebugExecutor(WorkflowExecutor):
             if self.step_mode:
                 self._pause_event.clear()
 
-        return await super()._execute_node(node, context)
+        return await super()._execute_node(node, context, handler_class, settings, timer, template)
@@ -0,0 +1,95 @@
+"""
+Incremental Execution
+
+Works out which nodes of a workflow need to run again after an edit, so the
+rest can reuse their outputs from the previous execution.
+
+A node is dirty if its fingerprint (type, config, enabled flag and incoming
+connections) changed since the previous run, if it was explicitly marked dirty,
+or if it has no reusable result. Everything downstream of a dirty node is dirty
+too, including nodes that only read its output through ``$nodes``.
+"""
+
+import hashlib
+import json
+
+from src.core.workflow.dataflow import DataFlow
+from src.core.workflow.models import ExecutionResult, Workflow, WorkflowExecution
+from src.core.workflow.plan import ExecutionPlan
+
+
+def node_fingerprints(workflow: Workflow, plan: ExecutionPlan) -> dict[str, str]:
+    """
+    Fingerprint every node in the plan.
+
+    Workflow variables are part of every fingerprint, since any node may
+    reference them.
+
+    Returns:
+        Node ID -> hex digest
+    """
+    variables = json.dumps(workflow.variables, sort_keys=True, default=str)
+    fingerprints = {}
+    for node_id in plan.order:
+        node = plan.get_node(workflow, node_id)
+        payload = {
+            "type": node.type,
+            "config": node.config,
+            "enabled": node.enabled,
+            "incoming": sorted(plan.incoming[node_id]),
+            "vars": variables,
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str)
+        fingerprints[node_id] = hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+    return fingerprints
+
+
+def find_reusable_results(
+    workflow: Workflow,
+    plan: ExecutionPlan,
+    fingerprints: dict[str, str],
+    previous: WorkflowExecution,
+    trigger_data: dict,
+    dirty_nodes: set[str] | None = None,
+    dataflow: DataFlow | None = None,
+) -> dict[str, ExecutionResult]:
+    """
+    Find previous results that can be reused instead of running a node again.
+
+    Args:
+        workflow: The workflow about to run
+        plan: Compiled plan for the workflow
+        fingerprints: Current node fingerprints (see node_fingerprints)
+        previous: The previous execution of the same workflow
+        trigger_data: Trigger data for the new run; if it differs, nothing is reused
+        dirty_nodes: Node IDs the caller knows have changed
+        dataflow: Data dependencies of the workflow; without them only
+            connections make a node dirty
+
+    Returns:
+        Node ID -> previous successful result, for every clean node
+    """
+    if previous.workflow_id != workflow.id or previous.trigger_data != trigger_data:
+        return {}
+
+    previous_results = {
+        result.node_id: result
+        for result in previous.node_results
+        if result.success and not result.released
+    }
+
+    changed = set(dirty_nodes or ())
+    for node_id in plan.order:
+        node = plan.get_node(workflow, node_id)
+        if previous.node_fingerprints.get(node_id) != fingerprints[node_id]:
+            changed.add(node_id)
+        elif node.enabled and node_id not in previous_results and not previous.is_skipped(node_id):
+            # Failed, never ran or released its output, so there is nothing to reuse
+            changed.add(node_id)
+
+    dirty = (dataflow or plan).downstream(changed)
+    return {
+        node_id: previous_results[node_id]
+        for node_id in plan.order
+        if node_id not in dirty and node_id in previous_results
+    }
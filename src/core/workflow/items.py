@@ -0,0 +1,121 @@
+"""
+Item Batches
+
+Opt-in items mode, which runs a node once per item of its upstream output
+instead of once per run. Configured per node with ``items_mode`` (not
+``items``, which several nodes take as an input):
+
+    items_mode: true            # one run per item of $prev
+    items_mode:
+      path: data.rows           # where the list is in $prev (default: $prev, or $prev.items)
+      batch_size: 50            # items handed to the node at a time
+      concurrency: 4            # batches in flight at once
+      continue_on_error: false  # record failed items instead of failing the node
+
+For each item, ``$prev`` and ``$item`` are the item and ``$index`` is its
+position, and config expressions are resolved per item. The node's output is
+the list of per-item outputs, in input order.
+
+Nodes with a bulk fast path (a multi-row insert, a batched embeddings call)
+override ``BaseNode.execute_batch`` and get one call per batch. Other nodes run
+the items of a batch one after another. The result cache is not used in items
+mode.
+"""
+
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Items handed to a node at a time
+DEFAULT_BATCH_SIZE = 50
+
+# Batches in flight at once
+DEFAULT_ITEM_CONCURRENCY = 4
+
+
+@dataclass(frozen=True)
+class ItemsPolicy:
+    """Batching settings for a node in items mode."""
+
+    path: str | None = None
+    batch_size: int = DEFAULT_BATCH_SIZE
+    concurrency: int = DEFAULT_ITEM_CONCURRENCY
+    continue_on_error: bool = False
+
+
+def get_items_policy(config: dict) -> ItemsPolicy | None:
+    """
+    Read the items_mode setting from a node config.
+
+    Args:
+        config: The node's (unresolved) config
+
+    Returns:
+        ItemsPolicy, or None if the node runs once per run
+    """
+    setting = config.get("items_mode")
+    if not setting:
+        return None
+    if not isinstance(setting, dict):
+        return ItemsPolicy()
+    if not setting.get("enabled", True):
+        return None
+
+    try:
+        return ItemsPolicy(
+            path=setting.get("path") or None,
+            batch_size=max(1, int(setting.get("batch_size", DEFAULT_BATCH_SIZE))),
+            concurrency=max(1, int(setting.get("concurrency", DEFAULT_ITEM_CONCURRENCY))),
+            continue_on_error=bool(setting.get("continue_on_error", False)),
+        )
+    except (TypeError, ValueError) as e:
+        logger.warning(f"Invalid items settings {setting!r}, using defaults: {e}")
+        return ItemsPolicy()
+
+
+def get_items(prev: Any, path: str | None = None) -> list:
+    """
+    Find the list of items in an upstream output.
+
+    Args:
+        prev: The upstream output ($prev)
+        path: Dotted path to the list, e.g. ``data.rows``
+
+    Raises:
+        ValueError: If there is no list at the path
+    """
+    value = prev
+    if path:
+        for part in path.split("."):
+            if isinstance(value, Mapping):
+                value = value.get(part)
+            elif isinstance(value, list | tuple) and part.lstrip("-").isdigit():
+                index = int(part)
+                value = value[index] if -len(value) <= index < len(value) else None
+            else:
+                value = None
+                break
+    elif isinstance(value, Mapping) and isinstance(value.get("items"), list | tuple):
+        value = value["items"]
+
+    if not isinstance(value, list | tuple):
+        where = f"$prev.{path}" if path else "$prev"
+        raise ValueError(f"Items mode needs a list at {where}, got {type(value).__name__}")
+    return list(value)
+
+
+def batched(items: list, size: int) -> list[list]:
+    """Split a list into consecutive batches of at most ``size`` items."""
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def item_context(context: dict, item: Any, index: int) -> dict:
+    """Build the context for one item."""
+    item_ctx = dict(context)
+    item_ctx["$prev"] = item
+    item_ctx["$item"] = item
+    item_ctx["$index"] = index
+    return item_ctx
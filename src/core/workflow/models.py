@@ -4,6 +4,7 @@ Workflow Data Models
 Pydantic models for workflow definitions.
 """
 
+from collections import deque
 from datetime import UTC, datetime
 from typing import Any
 from uuid import uuid4
@@ -78,11 +79,11 @@ class Workflow(BaseModel):
             in_degree[conn.target_node_id] += 1
 
         # Kahn's algorithm for topological sort
-        queue = [node_id for node_id, degree in in_degree.items() if degree == 0]
+        queue = deque(node_id for node_id, degree in in_degree.items() if degree == 0)
         order = []
 
         while queue:
-            node_id = queue.pop(0)
+            node_id = queue.popleft()
             order.append(node_id)
 
             for neighbor in graph[node_id]:
@@ -283,6 +284,24 @@ class Workflow(BaseModel):
         return workflow
 
 
+class NodeAttempt(BaseModel):
+    """One attempt at running a node with a timeout or retry policy."""
+
+    attempt: int
+    success: bool
+    error: str | None = None
+    duration_ms: float = 0
+    retry_delay_ms: float | None = None  # Wait before the next attempt, if retried
+
+
+class NodeSpan(BaseModel):
+    """A timed phase of a node run (see src.core.workflow.profiler)."""
+
+    name: str  # wait, queue, resolve, execute, store
+    start_ms: float  # Since the start of the run
+    duration_ms: float
+
+
 class ExecutionResult(BaseModel):
     """Result of a single node execution."""
 
@@ -293,6 +312,16 @@ class ExecutionResult(BaseModel):
     duration_ms: float = 0
     started_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
     completed_at: datetime | None = None
+    cache_hit: bool | None = None  # None when the node has no cache setting
+    reused: bool = False  # Output carried over from a previous execution
+    released: bool = False  # Output dropped once the nodes reading it had run
+    attempts: list[NodeAttempt] = Field(default_factory=list)  # Only with a retry/timeout policy
+    spans: list[NodeSpan] = Field(default_factory=list)  # Where the node's time went
+    bytes_in: int | None = None  # Estimated JSON size of $prev
+    bytes_out: int | None = None  # Estimated JSON size of the output
+    # The estimate stopped at the spill threshold: the size is at least bytes_in/out
+    bytes_in_truncated: bool = False
+    bytes_out_truncated: bool = False
 
 
 class WorkflowExecution(BaseModel):
@@ -304,6 +333,9 @@ class WorkflowExecution(BaseModel):
     trigger_type: str = "manual"
     trigger_data: dict = Field(default_factory=dict)
     node_results: list[ExecutionResult] = Field(default_factory=list)
+    skipped_nodes: list[str] = Field(default_factory=list)  # Nodes on branches not taken
+    # Node ID -> fingerprint of its definition, used for incremental re-runs
+    node_fingerprints: dict[str, str] = Field(default_factory=dict)
     started_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
     completed_at: datetime | None = None
     error: str | None = None
@@ -313,6 +345,24 @@ class WorkflowExecution(BaseModel):
         """Add a node execution result."""
         self.node_results.append(result)
 
+    def add_skipped(self, node_id: str):
+        """Record a node that was skipped because its branch was not taken."""
+        self.skipped_nodes.append(node_id)
+
+    def is_skipped(self, node_id: str) -> bool:
+        """Check whether a node was skipped."""
+        return node_id in self.skipped_nodes
+
+    @property
+    def cache_hits(self) -> int:
+        """Number of nodes whose output came from the result cache."""
+        return sum(1 for result in self.node_results if result.cache_hit is True)
+
+    @property
+    def cache_misses(self) -> int:
+        """Number of cached nodes that had to run."""
+        return sum(1 for result in self.node_results if result.cache_hit is False)
+
     def get_result(self, node_id: str) -> ExecutionResult | None:
         """Get result for a specific node."""
         for result in self.node_results:
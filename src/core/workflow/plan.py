@@ -0,0 +1,253 @@
+"""
+Execution Plans
+
+Compiled, immutable view of a workflow graph used by the executor.
+
+Building a plan resolves everything that only depends on the workflow definition
+(node index, predecessor/successor lists, topological order and levels, handler
+classes) so repeated runs of the same workflow skip that work entirely.
+"""
+
+import logging
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any
+
+from src.core.nodes.base import BaseNode
+from src.core.nodes.registry import NodeRegistry
+from src.core.workflow.models import Workflow, WorkflowNode
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of compiled plans kept in memory
+DEFAULT_PLAN_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """Compiled execution plan for one version of a workflow."""
+
+    workflow_id: str
+    version: datetime
+    signature: int
+    registry_generation: int
+    # Topologically sorted node IDs (nodes in cycles are excluded)
+    order: tuple[str, ...]
+    # Node ID -> index into workflow.nodes
+    node_index: MappingProxyType
+    # Node ID -> index into order
+    position: MappingProxyType
+    # Node ID -> upstream / downstream node IDs, in connection order
+    predecessors: MappingProxyType
+    successors: MappingProxyType
+    # Node ID -> (source node ID, source port) for every incoming connection
+    incoming: MappingProxyType
+    # Groups of node IDs that can run once all previous levels have finished
+    levels: tuple[tuple[str, ...], ...]
+    # Node type -> handler class (None if the type was not registered)
+    handler_classes: MappingProxyType
+
+    def get_node(self, workflow: Workflow, node_id: str) -> WorkflowNode | None:
+        """Get a node from the workflow this plan was compiled for."""
+        index = self.node_index.get(node_id)
+        if index is None:
+            return None
+        return workflow.nodes[index]
+
+    def get_handler_class(self, node_type: str) -> type[BaseNode] | None:
+        """Get the pre-resolved handler class for a node type."""
+        return self.handler_classes.get(node_type)
+
+    def downstream(self, node_ids) -> set[str]:
+        """Get the given nodes plus every node reachable from them."""
+        seen = set(node_id for node_id in node_ids if node_id in self.successors)
+        stack = list(seen)
+        while stack:
+            for successor in self.successors[stack.pop()]:
+                if successor not in seen:
+                    seen.add(successor)
+                    stack.append(successor)
+        return seen
+
+    @property
+    def roots(self) -> tuple[str, ...]:
+        """Node IDs with no upstream connections."""
+        return self.levels[0] if self.levels else ()
+
+
+def workflow_signature(workflow: Workflow) -> int:
+    """
+    Hash the parts of a workflow that affect its graph.
+
+    The editor adds nodes and connections without bumping ``updated_at``, so the
+    plan cache also checks this signature before reusing a plan.
+    """
+    return hash(
+        (
+            tuple((node.id, node.type, node.enabled) for node in workflow.nodes),
+            tuple(
+                (conn.source_node_id, conn.source_port, conn.target_node_id)
+                for conn in workflow.connections
+            ),
+        )
+    )
+
+
+def compile_plan(workflow: Workflow, registry: NodeRegistry | None = None) -> ExecutionPlan:
+    """
+    Compile a workflow into an execution plan.
+
+    Args:
+        workflow: The workflow to compile
+        registry: Node registry used to resolve handler classes
+
+    Returns:
+        A new ExecutionPlan
+    """
+    registry = registry or NodeRegistry()
+
+    node_index = {node.id: index for index, node in enumerate(workflow.nodes)}
+    predecessors: dict[str, list[str]] = {node_id: [] for node_id in node_index}
+    successors: dict[str, list[str]] = {node_id: [] for node_id in node_index}
+    incoming: dict[str, list[tuple[str, str]]] = {node_id: [] for node_id in node_index}
+
+    for conn in workflow.connections:
+        source, target = conn.source_node_id, conn.target_node_id
+        if source not in node_index or target not in node_index:
+            continue
+        incoming[target].append((source, conn.source_port))
+        if source not in predecessors[target]:
+            predecessors[target].append(source)
+            successors[source].append(target)
+
+    # Kahn's algorithm, tracking the level (longest distance from a root) of each node
+    in_degree = {node_id: len(preds) for node_id, preds in predecessors.items()}
+    level_of = {node_id: 0 for node_id in node_index}
+    queue = deque(node_id for node_id, degree in in_degree.items() if degree == 0)
+    order: list[str] = []
+
+    while queue:
+        node_id = queue.popleft()
+        order.append(node_id)
+
+        for neighbor in successors[node_id]:
+            level_of[neighbor] = max(level_of[neighbor], level_of[node_id] + 1)
+            in_degree[neighbor] -= 1
+            if in_degree[neighbor] == 0:
+                queue.append(neighbor)
+
+    if len(order) != len(node_index):
+        logger.warning(
+            f"Workflow {workflow.name} has a cycle; "
+            f"{len(node_index) - len(order)} nodes will not run"
+        )
+
+    levels: list[list[str]] = []
+    for node_id in order:
+        level = level_of[node_id]
+        while len(levels) <= level:
+            levels.append([])
+        levels[level].append(node_id)
+
+    scheduled = set(order)
+    handler_classes = {node.type: registry.get_handler_class(node.type) for node in workflow.nodes}
+
+    return ExecutionPlan(
+        workflow_id=workflow.id,
+        version=workflow.updated_at,
+        signature=workflow_signature(workflow),
+        registry_generation=registry.generation,
+        order=tuple(order),
+        node_index=MappingProxyType(node_index),
+        position=MappingProxyType({node_id: index for index, node_id in enumerate(order)}),
+        predecessors=MappingProxyType(
+            {
+                node_id: tuple(p for p in preds if p in scheduled)
+                for node_id, preds in predecessors.items()
+            }
+        ),
+        successors=MappingProxyType(
+            {
+                node_id: tuple(s for s in succs if s in scheduled)
+                for node_id, succs in successors.items()
+            }
+        ),
+        incoming=MappingProxyType(
+            {
+                node_id: tuple(edge for edge in edges if edge[0] in scheduled)
+                for node_id, edges in incoming.items()
+            }
+        ),
+        levels=tuple(tuple(level) for level in levels),
+        handler_classes=MappingProxyType(handler_classes),
+    )
+
+
+class ExecutionPlanCache:
+    """
+    LRU cache of compiled plans keyed by (workflow.id, updated_at).
+
+    Plans are rebuilt when the workflow graph signature or the node registry
+    changes, so stale handler classes or edited graphs are never reused.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_PLAN_CACHE_SIZE):
+        self.max_size = max_size
+        self._plans: OrderedDict[tuple[str, Any], ExecutionPlan] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, workflow: Workflow, registry: NodeRegistry | None = None) -> ExecutionPlan:
+        """Get the plan for a workflow, compiling it if needed."""
+        registry = registry or NodeRegistry()
+        key = (workflow.id, workflow.updated_at)
+
+        with self._lock:
+            plan = self._plans.get(key)
+            if (
+                plan is not None
+                and plan.registry_generation == registry.generation
+                and plan.signature == workflow_signature(workflow)
+            ):
+                self._plans.move_to_end(key)
+                self.hits += 1
+                return plan
+
+        plan = compile_plan(workflow, registry)
+
+        with self._lock:
+            self.misses += 1
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.max_size:
+                self._plans.popitem(last=False)
+
+        return plan
+
+    def invalidate(self, workflow_id: str | None = None):
+        """Drop cached plans for one workflow, or all plans."""
+        with self._lock:
+            if workflow_id is None:
+                self._plans.clear()
+                return
+            for key in [k for k in self._plans if k[0] == workflow_id]:
+                del self._plans[key]
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+
+# Global plan cache instance
+_plan_cache: ExecutionPlanCache | None = None
+
+
+def get_plan_cache() -> ExecutionPlanCache:
+    """Get the global execution plan cache."""
+    global _plan_cache
+    if _plan_cache is None:
+        _plan_cache = ExecutionPlanCache()
+    return _plan_cache
@@ -0,0 +1,197 @@
+"""
+CPU Node Process Pool
+
+Runs nodes that declare ``execution_affinity = "cpu"`` in a managed
+ProcessPoolExecutor, so heavy transforms don't block the event loop shared by
+concurrent runs and the webhook server.
+
+Only the resolved config and a slice of the context (``$prev``, ``$trigger``
+and ``$vars``) are sent to the worker process, plus the ``$nodes`` outputs
+read by expressions the node resolves itself (``expression_config_keys``). Small payloads, and ones that
+cannot be pickled, run on the event loop as usual: for them, the round trip to
+another process costs more than the work itself.
+"""
+
+import asyncio
+import importlib
+import logging
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from types import MappingProxyType
+from typing import Any
+
+from src.core.expressions.compiler import References
+from src.core.nodes.base import BaseNode
+
+logger = logging.getLogger(__name__)
+
+# Context keys sent to worker processes
+CONTEXT_SLICE_KEYS = ("$prev", "$trigger", "$vars")
+
+# Payloads smaller than this (pickled, in bytes) are not worth offloading
+DEFAULT_MIN_PAYLOAD = 64 * 1024
+
+
+def default_pool_size() -> int:
+    """Leave one core for the event loop."""
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def _warm_worker(modules: tuple[str, ...]) -> int:
+    """Import node modules in a worker so the first real task doesn't pay for it."""
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+    return os.getpid()
+
+
+def _run_node(payload: bytes) -> Any:
+    """Run a pickled (handler class, config, context) to completion in a worker process."""
+    handler_class, config, context = pickle.loads(payload)  # nosec B301 - from our own process
+    handler = handler_class()
+    return asyncio.run(handler.execute(config, context))
+
+
+class CPUNodePool:
+    """Lazily created process pool for CPU-bound nodes."""
+
+    def __init__(self, max_workers: int | None = None, min_payload: int = DEFAULT_MIN_PAYLOAD):
+        self.max_workers = max_workers or default_pool_size()
+        self.min_payload = min_payload
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.enabled = True
+
+    @property
+    def started(self) -> bool:
+        """Whether worker processes have been created."""
+        return self._executor is not None
+
+    def configure(
+        self,
+        max_workers: int | None = None,
+        enabled: bool | None = None,
+        min_payload: int | None = None,
+    ):
+        """
+        Change the pool size or offloading threshold, or turn offloading off.
+
+        Resizing takes effect the next time the pool starts.
+        """
+        if max_workers is not None:
+            self.max_workers = max(1, int(max_workers))
+        if min_payload is not None:
+            self.min_payload = max(0, int(min_payload))
+        if enabled is not None:
+            self.enabled = enabled
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                logger.info(f"Started CPU node pool with {self.max_workers} processes")
+            return self._executor
+
+    async def warm_up(self, node_classes: list[type[BaseNode]] | None = None) -> int:
+        """
+        Start every worker process and pre-import node modules.
+
+        Args:
+            node_classes: CPU nodes whose modules should be imported up front
+
+        Returns:
+            Number of distinct worker processes that answered
+        """
+        modules = tuple(sorted({cls.__module__ for cls in node_classes or ()}))
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, _warm_worker, modules)
+                for _ in range(self.max_workers)
+            )
+        )
+        return len(set(pids))
+
+    def wants(self, handler_class: type[BaseNode]) -> bool:
+        """Check whether a node should run in the pool."""
+        return self.enabled and getattr(handler_class, "execution_affinity", "io") == "cpu"
+
+    def pack(
+        self,
+        handler_class: type[BaseNode],
+        config: dict,
+        context: dict,
+        references: References | None = None,
+    ) -> bytes | None:
+        """
+        Serialize a node call for a worker process.
+
+        Args:
+            handler_class: The node to run
+            config: Its resolved config
+            context: Its full context, sliced with slice_context()
+            references: What the node's raw expressions read (see
+                ConfigTemplate.raw_references)
+
+        Returns:
+            The payload for run(), or None if it is too small to be worth
+            offloading or the config or context can't be pickled
+        """
+        try:
+            payload = pickle.dumps(
+                (handler_class, config, self.slice_context(context, references)),
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        except Exception as e:
+            logger.debug(f"Running {handler_class.type} on the event loop: {e}")
+            return None
+        return payload if len(payload) >= self.min_payload else None
+
+    @staticmethod
+    def slice_context(context: dict, references: References | None = None) -> dict:
+        """Keep only the context keys sent to worker processes."""
+        sliced = {}
+        for key in CONTEXT_SLICE_KEYS:
+            if key in context:
+                value = context[key]
+                # Read-only views can't be pickled; workers get their own copy anyway
+                sliced[key] = dict(value) if isinstance(value, MappingProxyType) else value
+
+        outputs = context.get("$nodes")
+        if references is not None and outputs is not None:
+            if references.all_nodes:
+                sliced["$nodes"] = dict(outputs)
+            elif references.nodes:
+                sliced["$nodes"] = {
+                    node_id: outputs[node_id] for node_id in references.nodes if node_id in outputs
+                }
+        return sliced
+
+    async def run(self, payload: bytes) -> Any:
+        """Run a node packed with pack() in a worker process and return its output."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), _run_node, payload)
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# Global pool instance
+_cpu_pool: CPUNodePool | None = None
+
+
+def get_cpu_pool() -> CPUNodePool:
+    """Get the global CPU node pool."""
+    global _cpu_pool
+    if _cpu_pool is None:
+        _cpu_pool = CPUNodePool()
+    return _cpu_pool
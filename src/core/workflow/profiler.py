@@ -0,0 +1,283 @@
+"""
+Execution Profiler
+
+The executor records where each node's time goes as spans on its
+ExecutionResult, measured from the start of the run:
+
+    wait      waiting for upstream nodes to finish
+    queue     ready, but waiting for a free slot (max_concurrency)
+    resolve   loading a spilled $prev, resolving expressions, cache lookup
+    execute   the handler, including retries and items mode batches
+    store     writing the result cache and spilling large outputs
+
+along with the estimated JSON size of its input and output (``bytes_in``,
+``bytes_out``). Estimating stops at the spill threshold, so for larger values
+the size is a lower bound, flagged by ``bytes_in_truncated`` and
+``bytes_out_truncated``.
+
+to_chrome_trace() turns a run into Chrome trace JSON (chrome://tracing,
+Perfetto), and performance_report() summarizes many runs of a workflow to show
+which nodes dominate its latency.
+"""
+
+import math
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from src.core.workflow.models import ExecutionResult, NodeSpan, Workflow, WorkflowExecution
+
+# Span names, in the order they happen
+WAIT = "wait"
+QUEUE = "queue"
+RESOLVE = "resolve"
+EXECUTE = "execute"
+STORE = "store"
+PHASES = (WAIT, QUEUE, RESOLVE, EXECUTE, STORE)
+
+# Phases spent before the node starts running
+WAITING_PHASES = (WAIT, QUEUE)
+
+
+class NodeTimer:
+    """Records the phases of one node run as spans."""
+
+    def __init__(self, origin: float, ready_at: float | None = None):
+        """
+        Args:
+            origin: ``time.perf_counter()`` at the start of the run
+            ready_at: When the node's upstream nodes had all finished
+        """
+        self.origin = origin
+        self.ready_at = ready_at if ready_at is not None else origin
+        self.spans: list[NodeSpan] = []
+
+    def add(self, name: str, start: float, end: float):
+        """Record a span between two ``time.perf_counter()`` readings."""
+        self.spans.append(
+            NodeSpan(
+                name=name,
+                start_ms=(start - self.origin) * 1000,
+                duration_ms=max(0.0, end - start) * 1000,
+            )
+        )
+
+    def started(self):
+        """Record the wait and queue phases, as the node starts running."""
+        now = time.perf_counter()
+        if self.ready_at > self.origin:
+            self.add(WAIT, self.origin, self.ready_at)
+        self.add(QUEUE, self.ready_at, now)
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the body of a ``with`` block as a span."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter())
+
+
+def phase_totals(result: ExecutionResult) -> dict[str, float]:
+    """Total milliseconds a node spent in each phase."""
+    totals: dict[str, float] = {}
+    for span in result.spans:
+        totals[span.name] = totals.get(span.name, 0.0) + span.duration_ms
+    return totals
+
+
+def to_chrome_trace(execution: WorkflowExecution, workflow: Workflow | None = None) -> dict:
+    """
+    Convert a run's spans to the Chrome trace event format.
+
+    Each node is a complete ("X") event with its running phases nested inside
+    it; nodes that overlapped in time are put on separate rows. Time spent
+    waiting for upstream nodes is in each node's args rather than drawn.
+
+    Args:
+        execution: The run to convert
+        workflow: The workflow, to label nodes with their names
+
+    Returns:
+        A ``{"traceEvents": [...]}`` dict, ready for json.dump
+    """
+    names = {node.id: node.name for node in workflow.nodes} if workflow else {}
+    title = workflow.name if workflow else execution.workflow_id
+    events: list[dict] = [
+        {
+            "name": "process_name",
+            "ph": "M",
+            "pid": 1,
+            "tid": 0,
+            "args": {"name": f"{title} ({execution.id[:8]})"},
+        }
+    ]
+
+    lanes: list[float] = []  # End time (ms) of the last node on each row
+    timed = [r for r in execution.node_results if r.spans]
+    for result in sorted(timed, key=_run_start):
+        start = _run_start(result)
+        end = max(span.start_ms + span.duration_ms for span in result.spans)
+        lane = next((i for i, free_at in enumerate(lanes) if free_at <= start), len(lanes))
+        if lane == len(lanes):
+            lanes.append(end)
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": 1,
+                    "tid": lane + 1,
+                    "args": {"name": f"Row {lane + 1}"},
+                }
+            )
+        lanes[lane] = end
+
+        totals = phase_totals(result)
+        events.append(
+            {
+                "name": names.get(result.node_id, result.node_id),
+                "cat": "node",
+                "ph": "X",
+                "ts": start * 1000,
+                "dur": (end - start) * 1000,
+                "pid": 1,
+                "tid": lane + 1,
+                "args": {
+                    "node_id": result.node_id,
+                    "success": result.success,
+                    "error": result.error,
+                    "cache_hit": result.cache_hit,
+                    "attempts": len(result.attempts) or 1,
+                    "wait_ms": round(totals.get(WAIT, 0.0), 3),
+                    "bytes_in": result.bytes_in,
+                    "bytes_out": result.bytes_out,
+                    "bytes_in_truncated": result.bytes_in_truncated,
+                    "bytes_out_truncated": result.bytes_out_truncated,
+                },
+            }
+        )
+        for span in result.spans:
+            if span.name == WAIT:
+                continue
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": "phase",
+                    "ph": "X",
+                    "ts": span.start_ms * 1000,
+                    "dur": span.duration_ms * 1000,
+                    "pid": 1,
+                    "tid": lane + 1,
+                }
+            )
+
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def _run_start(result: ExecutionResult) -> float:
+    """Start (ms) of a node's first span after waiting for its upstream nodes."""
+    spans = [span for span in result.spans if span.name != WAIT] or result.spans
+    return min(span.start_ms for span in spans)
+
+
+@dataclass
+class NodePerformance:
+    """Timing of one node across many runs."""
+
+    node_id: str
+    runs: int = 0
+    failures: int = 0
+    total_ms: float = 0.0
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+    max_ms: float = 0.0
+    # Mean milliseconds per run in each phase
+    phase_ms: dict[str, float] = field(default_factory=dict)
+    mean_bytes_in: float | None = None
+    mean_bytes_out: float | None = None
+    # Some runs' sizes were truncated, so the mean is a lower bound
+    bytes_in_truncated: bool = False
+    bytes_out_truncated: bool = False
+
+    @property
+    def mean_ms(self) -> float:
+        """Mean time from the node starting (after waiting) to finishing."""
+        return self.total_ms / self.runs if self.runs else 0.0
+
+
+def performance_report(executions: Iterable[WorkflowExecution]) -> list[NodePerformance]:
+    """
+    Summarize node timings across runs of a workflow.
+
+    Node time counts from when the node could start (after waiting for its
+    upstream nodes) to when it finished. Reused results and runs recorded
+    before spans existed are left out.
+
+    Returns:
+        One entry per node, slowest (by total time) first
+    """
+    durations: dict[str, list[float]] = {}
+    phases: dict[str, dict[str, float]] = {}
+    failures: dict[str, int] = {}
+    sizes_in: dict[str, list[int]] = {}
+    sizes_out: dict[str, list[int]] = {}
+    truncated_in: set[str] = set()
+    truncated_out: set[str] = set()
+
+    for execution in executions:
+        for result in execution.node_results:
+            if not result.spans or result.reused:
+                continue
+            node_id = result.node_id
+            totals = phase_totals(result)
+            durations.setdefault(node_id, []).append(
+                sum(ms for name, ms in totals.items() if name not in WAITING_PHASES)
+            )
+            node_phases = phases.setdefault(node_id, {})
+            for name, ms in totals.items():
+                node_phases[name] = node_phases.get(name, 0.0) + ms
+            if not result.success:
+                failures[node_id] = failures.get(node_id, 0) + 1
+            if result.bytes_in is not None:
+                sizes_in.setdefault(node_id, []).append(result.bytes_in)
+            if result.bytes_out is not None:
+                sizes_out.setdefault(node_id, []).append(result.bytes_out)
+            if result.bytes_in_truncated:
+                truncated_in.add(node_id)
+            if result.bytes_out_truncated:
+                truncated_out.add(node_id)
+
+    report = []
+    for node_id, times in durations.items():
+        times.sort()
+        runs = len(times)
+        report.append(
+            NodePerformance(
+                node_id=node_id,
+                runs=runs,
+                failures=failures.get(node_id, 0),
+                total_ms=sum(times),
+                p50_ms=_percentile(times, 50),
+                p95_ms=_percentile(times, 95),
+                max_ms=times[-1],
+                phase_ms={name: ms / runs for name, ms in phases[node_id].items()},
+                mean_bytes_in=_mean(sizes_in.get(node_id)),
+                mean_bytes_out=_mean(sizes_out.get(node_id)),
+                bytes_in_truncated=node_id in truncated_in,
+                bytes_out_truncated=node_id in truncated_out,
+            )
+        )
+    report.sort(key=lambda entry: entry.total_ms, reverse=True)
+    return report
+
+
+def _percentile(ordered: list[float], percent: float) -> float:
+    """Nearest-rank percentile of a sorted list."""
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _mean(values: list[int] | None) -> float | None:
+    return sum(values) / len(values) if values else None
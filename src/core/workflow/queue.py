@@ -0,0 +1,545 @@
+"""
+Execution Queue
+
+Durable, SQLite-backed queue of workflow runs, drained by a pool of async
+workers.
+
+Runs are picked by priority lane (manual before webhook before schedule), then
+by age, while respecting a per-workflow concurrency limit. A worker holds a
+lease on each run and renews it while the run is in progress; if the worker
+dies, the lease expires and another worker picks the run up again, so every run
+is delivered at least once.
+
+Queued and running runs are also written to the ``executions`` table, so they
+show up in execution history before they finish.
+
+Workers make their SQLite calls in threads, so a busy database (connections
+wait up to 30s for a lock) never blocks the event loop. Database errors are
+logged and the worker carries on; a run whose result could not be recorded is
+delivered again once its lease expires.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import uuid4
+
+from src.core.workflow.models import WorkflowExecution
+
+logger = logging.getLogger(__name__)
+
+# Lower runs first
+PRIORITIES = {"manual": 0, "webhook": 1, "schedule": 2}
+DEFAULT_PRIORITY = PRIORITIES["webhook"]
+
+DEFAULT_WORKERS = 4
+DEFAULT_WORKFLOW_CONCURRENCY = 2
+DEFAULT_LEASE_TIMEOUT = 60.0
+DEFAULT_MAX_DELIVERIES = 3
+DEFAULT_POLL_INTERVAL = 0.5
+
+# Runs a queued workflow: (workflow_id, trigger_data, trigger_type) -> execution
+Runner = Callable[[str, dict, str], Awaitable[WorkflowExecution]]
+
+
+@dataclass
+class QueuedRun:
+    """A run waiting in (or leased from) the queue."""
+
+    id: str
+    workflow_id: str
+    trigger_type: str
+    trigger_data: dict
+    priority: int
+    status: str  # queued, leased, done, dead
+    deliveries: int = 0
+    enqueued_at: float = 0.0
+    lease_owner: str | None = None
+    lease_expires_at: float | None = None
+    last_error: str | None = None
+
+
+async def run_saved_workflow(
+    workflow_id: str, trigger_data: dict, trigger_type: str
+) -> WorkflowExecution:
+    """Default runner: load a saved workflow and execute it."""
+    from src.core.workflow.executor import WorkflowExecutor
+    from src.data.storage import get_storage
+
+    workflow = get_storage().load_workflow_cached(workflow_id)
+    if workflow is None:
+        raise ValueError(f"Workflow not found: {workflow_id}")
+    return await WorkflowExecutor().execute(
+        workflow, trigger_data=trigger_data, trigger_type=trigger_type
+    )
+
+
+class ExecutionQueue:
+    """Persistent priority queue of workflow runs with a worker pool."""
+
+    def __init__(
+        self,
+        db_path: Path | None = None,
+        runner: Runner | None = None,
+        storage=None,
+        workflow_concurrency: int = DEFAULT_WORKFLOW_CONCURRENCY,
+        lease_timeout: float = DEFAULT_LEASE_TIMEOUT,
+        max_deliveries: int = DEFAULT_MAX_DELIVERIES,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            db_path: SQLite database for the queue (defaults to the storage database)
+            runner: Coroutine that executes a run (defaults to run_saved_workflow)
+            storage: WorkflowStorage used to publish queued/running status
+            workflow_concurrency: Default maximum concurrent runs per workflow
+            lease_timeout: Seconds before an unrenewed lease can be taken over
+            max_deliveries: Deliveries before a run that keeps failing is given up
+            poll_interval: Seconds an idle worker waits before checking again
+        """
+        if storage is None:
+            from src.data.storage import get_storage
+
+            storage = get_storage()
+        self.storage = storage
+        self.db_path = Path(db_path) if db_path else Path(storage.db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.runner = runner or run_saved_workflow
+        self.workflow_concurrency = workflow_concurrency
+        self.workflow_limits: dict[str, int] = {}
+        self.lease_timeout = lease_timeout
+        self.max_deliveries = max_deliveries
+        self.poll_interval = poll_interval
+
+        self._workers: list[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self):
+        """Initialize the queue table."""
+        conn = self._connect()
+        # Let workers read while another connection writes
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS execution_queue (
+                id TEXT PRIMARY KEY,
+                workflow_id TEXT NOT NULL,
+                trigger_type TEXT NOT NULL,
+                trigger_data TEXT,
+                priority INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                deliveries INTEGER DEFAULT 0,
+                enqueued_at REAL NOT NULL,
+                available_at REAL NOT NULL,
+                lease_owner TEXT,
+                lease_expires_at REAL,
+                last_error TEXT
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_execution_queue_ready
+            ON execution_queue(status, priority, enqueued_at)
+        """)
+        conn.close()
+
+    # ------------------------------------------------------------------
+    # Producer API
+    # ------------------------------------------------------------------
+
+    def enqueue(
+        self,
+        workflow_id: str,
+        trigger_data: dict | None = None,
+        trigger_type: str = "manual",
+        priority: int | None = None,
+    ) -> str:
+        """
+        Add a run to the queue.
+
+        Args:
+            workflow_id: Workflow to run
+            trigger_data: Data passed to the trigger
+            trigger_type: manual, webhook, schedule, ...
+            priority: Override the lane derived from trigger_type (lower runs first)
+
+        Returns:
+            The run ID, which is also the ID of its execution record
+        """
+        run_id = self._insert(workflow_id, trigger_data or {}, trigger_type, priority)
+        self._wakeup.set()
+        return run_id
+
+    def _insert(
+        self, workflow_id: str, trigger_data: dict, trigger_type: str, priority: int | None
+    ) -> str:
+        """Write a new run and its queued execution record (blocking)."""
+        if priority is None:
+            priority = PRIORITIES.get(trigger_type, DEFAULT_PRIORITY)
+
+        run_id = str(uuid4())
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute(
+                """
+                INSERT INTO execution_queue
+                (id, workflow_id, trigger_type, trigger_data, priority, status,
+                 enqueued_at, available_at)
+                VALUES (?, ?, ?, ?, ?, 'queued', ?, ?)
+            """,
+                (
+                    run_id,
+                    workflow_id,
+                    trigger_type,
+                    json.dumps(trigger_data, default=str),
+                    priority,
+                    now,
+                    now,
+                ),
+            )
+        finally:
+            conn.close()
+
+        self._publish_status(run_id, workflow_id, trigger_type, trigger_data, "queued")
+        logger.debug(f"Queued run {run_id} for workflow {workflow_id} ({trigger_type})")
+        return run_id
+
+    async def trigger_callback(self, workflow_id: str, trigger_data: dict) -> dict:
+        """
+        Webhook trigger callback that queues the run instead of awaiting it.
+
+        ``get_webhook_server()`` installs it on the global webhook manager.
+        """
+        run_id = await asyncio.to_thread(
+            self._insert, workflow_id, trigger_data or {}, "webhook", None
+        )
+        self._wakeup.set()
+        return {"id": run_id, "status": "queued"}
+
+    def get(self, run_id: str) -> QueuedRun | None:
+        """Get a run by ID."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM execution_queue WHERE id = ?", (run_id,)).fetchone()
+        finally:
+            conn.close()
+        return self._row_to_run(row) if row else None
+
+    def pending_count(self) -> int:
+        """Number of runs queued or in progress."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM execution_queue WHERE status IN ('queued', 'leased')"
+            ).fetchone()
+        finally:
+            conn.close()
+        return row[0]
+
+    def status_counts(self) -> dict[str, int]:
+        """Number of runs queued and in progress (leased)."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) FROM execution_queue "
+                "WHERE status IN ('queued', 'leased') GROUP BY status"
+            ).fetchall()
+        finally:
+            conn.close()
+        return {"queued": 0, "leased": 0, **{row[0]: row[1] for row in rows}}
+
+    async def wait(self, run_id: str, timeout: float | None = None) -> QueuedRun | None:
+        """Wait until a run is done (or given up), polling the queue."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            run = await asyncio.to_thread(self.get, run_id)
+            if run is None or run.status in ("done", "dead"):
+                return run
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Run {run_id} did not finish within {timeout}s")
+            await asyncio.sleep(min(self.poll_interval, 0.05))
+
+    def set_workflow_limit(self, workflow_id: str, limit: int):
+        """Set the maximum number of concurrent runs for one workflow."""
+        self.workflow_limits[workflow_id] = max(1, int(limit))
+
+    # ------------------------------------------------------------------
+    # Leasing
+    # ------------------------------------------------------------------
+
+    def claim(self, worker_id: str) -> QueuedRun | None:
+        """
+        Lease the next runnable run.
+
+        Runs whose lease has expired are claimed again (at-least-once delivery).
+        Runs of a workflow that is already at its concurrency limit are passed over.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            # Take the write lock up front so two processes can't claim the same run
+            conn.execute("BEGIN IMMEDIATE")
+            active: dict[str, int] = {}
+            for row in conn.execute(
+                """
+                SELECT workflow_id, COUNT(*) FROM execution_queue
+                WHERE status = 'leased' AND lease_expires_at >= ?
+                GROUP BY workflow_id
+            """,
+                (now,),
+            ):
+                active[row[0]] = row[1]
+
+            candidates = conn.execute(
+                """
+                SELECT * FROM execution_queue
+                WHERE available_at <= ?
+                  AND (status = 'queued' OR (status = 'leased' AND lease_expires_at < ?))
+                ORDER BY priority, enqueued_at
+            """,
+                (now, now),
+            )
+            for row in candidates:
+                limit = self.workflow_limits.get(row["workflow_id"], self.workflow_concurrency)
+                if active.get(row["workflow_id"], 0) >= limit:
+                    continue
+                conn.execute(
+                    """
+                    UPDATE execution_queue
+                    SET status = 'leased', lease_owner = ?, lease_expires_at = ?,
+                        deliveries = deliveries + 1
+                    WHERE id = ?
+                """,
+                    (worker_id, now + self.lease_timeout, row["id"]),
+                )
+                conn.execute("COMMIT")
+                return self.get(row["id"])
+
+            conn.execute("COMMIT")
+            return None
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def renew(self, run_id: str, worker_id: str) -> bool:
+        """Extend a lease. Returns False if the lease was lost."""
+        return self._update_leased(
+            run_id,
+            worker_id,
+            "lease_expires_at = ?",
+            (time.time() + self.lease_timeout,),
+        )
+
+    def complete(self, run_id: str, worker_id: str) -> bool:
+        """Mark a leased run as done."""
+        return self._update_leased(
+            run_id, worker_id, "status = 'done', lease_owner = NULL, lease_expires_at = NULL", ()
+        )
+
+    def fail(self, run_id: str, worker_id: str, error: str) -> str | None:
+        """
+        Record a failed delivery.
+
+        The run goes back in the queue with a delay, or is given up ("dead")
+        after ``max_deliveries``.
+
+        Returns:
+            The run's new status, or None if the lease was lost
+        """
+        run = self.get(run_id)
+        if run is None:
+            return None
+        status = self._failed_status(run)
+        delay = 0.0 if status == "dead" else min(2.0**run.deliveries, self.lease_timeout)
+        updated = self._update_leased(
+            run_id,
+            worker_id,
+            "status = ?, lease_owner = NULL, lease_expires_at = NULL, "
+            "available_at = ?, last_error = ?",
+            (status, time.time() + delay, error),
+        )
+        return status if updated else None
+
+    def _failed_status(self, run: QueuedRun) -> str:
+        """The status a failed delivery of a run moves it to."""
+        return "dead" if run.deliveries >= self.max_deliveries else "queued"
+
+    def _update_leased(self, run_id: str, worker_id: str, assignments: str, params: tuple):
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                f"UPDATE execution_queue SET {assignments} "  # nosec B608 - fixed assignments
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (*params, run_id, worker_id),
+            )
+            return cursor.rowcount > 0
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def start(self, workers: int = DEFAULT_WORKERS):
+        """Start worker tasks on the running event loop."""
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        for index in range(workers):
+            worker_id = f"worker-{index}-{uuid4().hex[:8]}"
+            self._workers.append(asyncio.create_task(self._worker(worker_id)))
+        logger.info(f"Execution queue started with {workers} workers")
+
+    async def stop(self):
+        """Stop the workers. Runs in progress are cancelled and will be re-delivered."""
+        self._stopping = True
+        self._wakeup.set()
+        workers, self._workers = self._workers, []
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        logger.info("Execution queue stopped")
+
+    async def drain(self, timeout: float | None = None):
+        """Wait until nothing is queued or running."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while await asyncio.to_thread(self.pending_count):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError("Execution queue did not drain in time")
+            await asyncio.sleep(min(self.poll_interval, 0.05))
+
+    async def _worker(self, worker_id: str):
+        while not self._stopping:
+            try:
+                run = await asyncio.to_thread(self.claim, worker_id)
+            except sqlite3.Error as e:
+                logger.warning(f"Queue claim failed: {e}")
+                run = None
+
+            if run is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self._process(run, worker_id)
+            except Exception as e:
+                # Keep the worker alive; the lease expires and the run is delivered again
+                logger.exception(f"Could not record the result of run {run.id}: {e}")
+
+    async def _process(self, run: QueuedRun, worker_id: str):
+        """Execute a leased run, renewing its lease until it finishes."""
+        await asyncio.to_thread(
+            self._publish_status,
+            run.id,
+            run.workflow_id,
+            run.trigger_type,
+            run.trigger_data,
+            "running",
+        )
+        heartbeat = asyncio.create_task(self._heartbeat(run.id, worker_id))
+        try:
+            execution = await self.runner(run.workflow_id, run.trigger_data, run.trigger_type)
+        except Exception as e:
+            logger.exception(f"Queued run {run.id} failed: {e}")
+            # Record the outcome before releasing the row, as on success: wait()
+            # returns as soon as the row is dead
+            dead = self._failed_status(run) == "dead"
+            await asyncio.to_thread(
+                self._publish_status,
+                run.id,
+                run.workflow_id,
+                run.trigger_type,
+                run.trigger_data,
+                "failed" if dead else "queued",
+                str(e) if dead else None,
+            )
+            await asyncio.to_thread(self.fail, run.id, worker_id, str(e))
+            return
+        finally:
+            heartbeat.cancel()
+
+        # The execution record takes the run's ID so history shows a single entry
+        execution.id = run.id
+        await asyncio.to_thread(self.storage.save_execution, execution)
+        await asyncio.to_thread(self.complete, run.id, worker_id)
+
+    async def _heartbeat(self, run_id: str, worker_id: str):
+        while True:
+            await asyncio.sleep(self.lease_timeout / 3)
+            try:
+                renewed = await asyncio.to_thread(self.renew, run_id, worker_id)
+            except sqlite3.Error as e:
+                logger.warning(f"Could not renew lease on run {run_id}: {e}")
+                continue
+            if not renewed:
+                logger.warning(f"Lost lease on run {run_id}")
+                return
+
+    def _publish_status(
+        self,
+        run_id: str,
+        workflow_id: str,
+        trigger_type: str,
+        trigger_data: dict,
+        status: str,
+        error: str | None = None,
+    ):
+        """Write a placeholder execution record so queued/running runs are visible."""
+        execution = WorkflowExecution(
+            id=run_id,
+            workflow_id=workflow_id,
+            status=status,
+            trigger_type=trigger_type,
+            trigger_data=trigger_data,
+            error=error,
+        )
+        try:
+            self.storage.save_execution(execution)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not record status of run {run_id}: {e}")
+
+    def _row_to_run(self, row: sqlite3.Row) -> QueuedRun:
+        return QueuedRun(
+            id=row["id"],
+            workflow_id=row["workflow_id"],
+            trigger_type=row["trigger_type"],
+            trigger_data=json.loads(row["trigger_data"] or "{}"),
+            priority=row["priority"],
+            status=row["status"],
+            deliveries=row["deliveries"],
+            enqueued_at=row["enqueued_at"],
+            lease_owner=row["lease_owner"],
+            lease_expires_at=row["lease_expires_at"],
+            last_error=row["last_error"],
+        )
+
+
+# Global queue instance
+_queue: ExecutionQueue | None = None
+
+
+def get_execution_queue() -> ExecutionQueue:
+    """Get the global execution queue."""
+    global _queue
+    if _queue is None:
+        _queue = ExecutionQueue()
+    return _queue
@@ -0,0 +1,177 @@
+"""
+Node Retry Policies
+
+Timeouts, retries and backoff applied by the executor around each node. Unlike
+the ``retry_on_error`` decorators in ``src.core.errors``, every attempt is
+recorded and retries can be triggered by HTTP status codes in a node's output.
+
+Configured per node:
+
+    node_timeout: 30            # seconds per attempt
+    retry:
+      max_attempts: 3           # total attempts, including the first
+      delay: 1.0                # delay before the first retry, in seconds
+      backoff: 2.0              # multiplier for the delay after each retry
+      max_delay: 30.0           # upper bound for a single delay
+      jitter: true              # randomize delays to avoid retry storms
+      retry_on: [timeout, 5xx, rate_limit]
+
+``retry: 3`` is shorthand for ``max_attempts: 3`` with default backoff. By
+default only transient failures are retried: timeouts, HTTP 5xx and rate
+limits (HTTP 429). Other errors, such as HTTP 4xx responses, auth failures or
+bad config, would fail again, and retrying could repeat non-idempotent
+requests; add ``error`` to ``retry_on`` to retry on any exception. A
+workflow-wide default timeout can be set with ``settings["node_timeout"]``.
+"""
+
+import logging
+import random
+from dataclasses import dataclass
+from typing import Any
+
+from src.core.errors.exceptions import AIRateLimitError, ConnectionTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Conditions a node can be retried on ("error": any exception)
+RETRY_CONDITIONS = ("timeout", "5xx", "rate_limit", "error")
+
+# Transient failures, retried unless retry_on says otherwise
+DEFAULT_RETRY_ON = ("timeout", "5xx", "rate_limit")
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Timeout and retry settings for a node."""
+
+    max_attempts: int = 1
+    timeout: float | None = None
+    delay: float = 1.0
+    backoff: float = 2.0
+    max_delay: float = 30.0
+    jitter: bool = True
+    retry_on: tuple[str, ...] = DEFAULT_RETRY_ON
+
+    def get_delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """
+        Get the delay before the next attempt.
+
+        Args:
+            attempt: The attempt that just failed (1-based)
+            retry_after: Delay requested by the server (e.g. a Retry-After header)
+
+        Returns:
+            Seconds to wait
+        """
+        if retry_after is not None:
+            return min(max(retry_after, 0.0), self.max_delay)
+        delay = min(self.delay * self.backoff ** (attempt - 1), self.max_delay)
+        if self.jitter:
+            # "Full jitter": anywhere between zero and the exponential delay
+            delay = random.uniform(0, delay)
+        return delay
+
+    def should_retry_error(self, error: BaseException) -> bool:
+        """Check whether an exception raised by a node should be retried."""
+        if is_timeout(error):
+            return "timeout" in self.retry_on or "error" in self.retry_on
+        status = get_error_status(error)
+        if status is not None and self._status_matches(status):
+            return True
+        if isinstance(error, AIRateLimitError):
+            return "rate_limit" in self.retry_on or "error" in self.retry_on
+        return "error" in self.retry_on
+
+    def should_retry_output(self, output: Any) -> bool:
+        """Check whether a node's output is an HTTP response worth retrying."""
+        status = get_output_status(output)
+        return status is not None and self._status_matches(status)
+
+    def _status_matches(self, status: int) -> bool:
+        if status == 429:
+            return "rate_limit" in self.retry_on
+        return status >= 500 and "5xx" in self.retry_on
+
+
+def get_retry_policy(config: dict, settings: dict | None = None) -> RetryPolicy | None:
+    """
+    Read the timeout and retry settings for a node.
+
+    Args:
+        config: The node's config
+        settings: The workflow's settings (for a default ``node_timeout``)
+
+    Returns:
+        RetryPolicy, or None if the node has neither a timeout nor retries
+    """
+    settings = settings or {}
+    timeout = config.get("node_timeout", settings.get("node_timeout"))
+    retry = config.get("retry")
+
+    if not timeout and not retry:
+        return None
+
+    options: dict[str, Any] = {}
+    if isinstance(retry, dict):
+        options = {k: v for k, v in retry.items() if k in RetryPolicy.__dataclass_fields__}
+        if "retry_on" in options:
+            retry_on = options["retry_on"]
+            if isinstance(retry_on, str):
+                retry_on = [retry_on]
+            unknown = set(retry_on) - set(RETRY_CONDITIONS)
+            if unknown:
+                logger.warning(f"Ignoring unknown retry conditions: {sorted(unknown)}")
+            options["retry_on"] = tuple(c for c in retry_on if c in RETRY_CONDITIONS)
+    elif retry and not isinstance(retry, bool):
+        options["max_attempts"] = retry
+
+    try:
+        if "max_attempts" in options:
+            options["max_attempts"] = max(1, int(options["max_attempts"]))
+        for key in ("delay", "backoff", "max_delay"):
+            if key in options:
+                options[key] = float(options[key])
+        if timeout:
+            options["timeout"] = float(timeout)
+    except (TypeError, ValueError) as e:
+        logger.warning(f"Invalid retry settings {retry!r}: {e}")
+        return None
+
+    return RetryPolicy(**options)
+
+
+def is_timeout(error: BaseException) -> bool:
+    """Check whether an exception is a timeout (asyncio, socket or HTTP client)."""
+    if isinstance(error, TimeoutError | ConnectionTimeoutError):
+        return True
+    return any(cls.__name__ == "TimeoutException" for cls in type(error).__mro__)
+
+
+def get_error_status(error: BaseException) -> int | None:
+    """Get the HTTP status code carried by an exception, if any."""
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def get_output_status(output: Any) -> int | None:
+    """Get the HTTP status code from an HTTP Request style output, if any."""
+    if isinstance(output, dict) and isinstance(output.get("status"), int):
+        return output["status"]
+    return None
+
+
+def get_retry_after(output: Any) -> float | None:
+    """Get the Retry-After delay (in seconds) from an HTTP Request style output."""
+    if not isinstance(output, dict):
+        return None
+    headers = output.get("headers") or {}
+    if not isinstance(headers, dict):
+        return None
+    for name, value in headers.items():
+        if name.lower() == "retry-after":
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+    return None
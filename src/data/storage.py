@@ -7,9 +7,16 @@ Handles persistence of workflows to YAML files and execution history to SQLite.
 import json
 import logging
 import sqlite3
+import threading
 from datetime import UTC, datetime
 from pathlib import Path
 
+from src.core.blobs import (
+    DEFAULT_BLOB_GRACE_PERIOD,
+    BlobStore,
+    encode_blob_refs,
+    find_blob_refs,
+)
 from src.core.workflow.models import Workflow, WorkflowExecution
 
 logger = logging.getLogger(__name__)
@@ -28,6 +35,12 @@ class WorkflowStorage:
 
         self.workflows_dir = self.data_dir / "workflows"
         self.db_path = self.data_dir / "skynette.db"
+        # Spilled node outputs; the executor's default store for the default data dir
+        self.blob_store = BlobStore(self.data_dir / "blobs")
+
+        # Workflow ID -> (file path, (mtime_ns, size), parsed workflow); see load_workflow_cached
+        self._parsed: dict[str, tuple[Path, tuple[int, int], Workflow]] = {}
+        self._parsed_lock = threading.Lock()
 
         # Ensure directories exist
         self.workflows_dir.mkdir(parents=True, exist_ok=True)
@@ -178,6 +191,7 @@ class WorkflowStorage:
         """Save a workflow to YAML file and update database."""
         # Update timestamp
         workflow.updated_at = datetime.now(UTC)
+        self._forget_parsed(workflow.id)
 
         # Generate file path
         safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in workflow.name)
@@ -238,8 +252,55 @@ class WorkflowStorage:
         with open(file_path, encoding="utf-8") as f:
             return Workflow.from_yaml(f.read())
 
+    def load_workflow_cached(self, workflow_id: str) -> Workflow | None:
+        """
+        Load a workflow by ID, reusing the parsed YAML while the file is unchanged.
+
+        The returned workflow is shared with other callers and must not be
+        modified; use load_workflow() to get a copy for editing.
+        """
+        with self._parsed_lock:
+            entry = self._parsed.get(workflow_id)
+        if entry is not None:
+            file_path, stamp, workflow = entry
+            try:
+                stat = file_path.stat()
+            except OSError:
+                stat = None
+            if stat is not None and (stat.st_mtime_ns, stat.st_size) == stamp:
+                return workflow
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            row = conn.execute(
+                "SELECT file_path FROM workflows WHERE id = ?", (workflow_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if not row:
+            logger.warning(f"Workflow {workflow_id} not found in database")
+            return None
+
+        file_path = Path(row[0])
+        try:
+            stat = file_path.stat()
+            with open(file_path, encoding="utf-8") as f:
+                workflow = Workflow.from_yaml(f.read())
+        except FileNotFoundError:
+            logger.warning(f"Workflow file not found: {file_path}")
+            return None
+
+        with self._parsed_lock:
+            self._parsed[workflow_id] = (file_path, (stat.st_mtime_ns, stat.st_size), workflow)
+        return workflow
+
+    def _forget_parsed(self, workflow_id: str):
+        with self._parsed_lock:
+            self._parsed.pop(workflow_id, None)
+
     def delete_workflow(self, workflow_id: str) -> bool:
         """Delete a workflow."""
+        self._forget_parsed(workflow_id)
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         cursor.execute("SELECT file_path FROM workflows WHERE id = ?", (workflow_id,))
@@ -251,12 +312,16 @@ class WorkflowStorage:
             if file_path.exists():
                 file_path.unlink()
 
+            # Outputs its executions spilled, freed below
+            blobs = self._execution_blobs(conn, workflow_id)
+
             # Delete from database
             cursor.execute("DELETE FROM workflows WHERE id = ?", (workflow_id,))
             cursor.execute("DELETE FROM executions WHERE workflow_id = ?", (workflow_id,))
             conn.commit()
             conn.close()
             logger.info(f"Deleted workflow {workflow_id}")
+            self._free_blobs(blobs)
             return True
 
         conn.close()
@@ -329,31 +394,36 @@ class WorkflowStorage:
     def save_execution(self, execution: WorkflowExecution) -> str:
         """Save an execution record."""
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            INSERT OR REPLACE INTO executions
-            (id, workflow_id, status, trigger_type, trigger_data, node_results,
-             started_at, completed_at, error, duration_ms)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-            (
-                execution.id,
-                execution.workflow_id,
-                execution.status,
-                execution.trigger_type,
-                json.dumps(execution.trigger_data),
-                json.dumps([r.model_dump() for r in execution.node_results], default=str),
-                execution.started_at.isoformat(),
-                execution.completed_at.isoformat() if execution.completed_at else None,
-                execution.error,
-                execution.duration_ms,
-            ),
-        )
-
-        conn.commit()
-        conn.close()
+        try:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO executions
+                (id, workflow_id, status, trigger_type, trigger_data, node_results,
+                 started_at, completed_at, error, duration_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                (
+                    execution.id,
+                    execution.workflow_id,
+                    execution.status,
+                    execution.trigger_type,
+                    json.dumps(execution.trigger_data),
+                    # Spilled outputs are stored as {"$blob": sha, "size": n}
+                    json.dumps(
+                        [r.model_dump() for r in execution.node_results],
+                        default=encode_blob_refs,
+                    ),
+                    execution.started_at.isoformat(),
+                    execution.completed_at.isoformat() if execution.completed_at else None,
+                    execution.error,
+                    execution.duration_ms,
+                ),
+            )
+            conn.commit()
+        finally:
+            # Queue workers save from several threads; never leave a failed
+            # write's transaction (and its lock) open
+            conn.close()
         return execution.id
 
     def get_executions(self, workflow_id: str | None = None, limit: int = 100) -> list[dict]:
@@ -405,6 +475,123 @@ class WorkflowStorage:
         conn.close()
         return executions
 
+    def load_execution(self, execution_id: str) -> WorkflowExecution | None:
+        """Load an execution record, including its node results."""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        row = conn.execute("SELECT * FROM executions WHERE id = ?", (execution_id,)).fetchone()
+        conn.close()
+        return self._row_to_execution(row) if row else None
+
+    def load_executions(self, workflow_id: str, limit: int = 1000) -> list[WorkflowExecution]:
+        """Load a workflow's most recent execution records, including their node results."""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute(
+            """
+            SELECT * FROM executions
+            WHERE workflow_id = ?
+            ORDER BY started_at DESC
+            LIMIT ?
+        """,
+            (workflow_id, limit),
+        ).fetchall()
+        conn.close()
+        return [self._row_to_execution(row) for row in rows]
+
+    def referenced_blobs(self) -> set[str]:
+        """Get the SHAs of every blob referenced by execution history."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute(
+                "SELECT node_results FROM executions WHERE node_results LIKE ?",
+                ('%"$blob"%',),
+            ).fetchall()
+        finally:
+            conn.close()
+        shas = set()
+        for (node_results,) in rows:
+            shas |= find_blob_refs(json.loads(node_results))
+        return shas
+
+    def _execution_blobs(self, conn: sqlite3.Connection, workflow_id: str) -> dict[str, float]:
+        """Get the blobs a workflow's executions refer to, with when each was last used."""
+        rows = conn.execute(
+            """
+            SELECT node_results, completed_at FROM executions
+            WHERE workflow_id = ? AND node_results LIKE ?
+        """,
+            (workflow_id, '%"$blob"%'),
+        ).fetchall()
+        blobs: dict[str, float] = {}
+        for node_results, completed_at in rows:
+            # Runs without an end time may still be writing; leave their blobs to prune_blobs
+            if not completed_at:
+                continue
+            finished = datetime.fromisoformat(completed_at)
+            if finished.tzinfo is None:
+                finished = finished.replace(tzinfo=UTC)
+            for sha in find_blob_refs(json.loads(node_results)):
+                blobs[sha] = max(blobs.get(sha, 0.0), finished.timestamp())
+        return blobs
+
+    def _free_blobs(self, blobs: dict[str, float]) -> int:
+        """
+        Delete blobs of deleted executions that no remaining execution refers to.
+
+        A blob written again after the last of those executions finished is in
+        use by a newer run (blobs are shared by content), so it is kept.
+        """
+        try:
+            referenced = self.referenced_blobs()
+            freed = 0
+            for sha, finished in blobs.items():
+                modified = self.blob_store.modified_at(sha)
+                if sha in referenced or modified is None or modified > finished:
+                    continue
+                if self.blob_store.delete(sha):
+                    freed += 1
+        except (OSError, sqlite3.Error, ValueError) as e:
+            logger.warning(f"Could not free blobs: {e}")
+            return 0
+        if freed:
+            logger.info(f"Freed {freed} blobs of deleted executions")
+        return freed
+
+    def prune_blobs(self, min_age: float = DEFAULT_BLOB_GRACE_PERIOD) -> int:
+        """
+        Delete spilled outputs no execution in history refers to.
+
+        Args:
+            min_age: Keep blobs written or reused less than this many seconds
+                ago, which runs still in progress may be using
+
+        Returns:
+            The number of blobs deleted
+        """
+        try:
+            return self.blob_store.prune(self.referenced_blobs(), min_age)
+        except (OSError, sqlite3.Error, ValueError) as e:
+            logger.warning(f"Could not prune blobs: {e}")
+            return 0
+
+    def _row_to_execution(self, row: sqlite3.Row) -> WorkflowExecution:
+        # Spilled outputs stay as {"$blob": sha, "size": n}
+        return WorkflowExecution(
+            id=row["id"],
+            workflow_id=row["workflow_id"],
+            status=row["status"],
+            trigger_type=row["trigger_type"] or "manual",
+            trigger_data=json.loads(row["trigger_data"] or "{}"),
+            node_results=json.loads(row["node_results"] or "[]"),
+            started_at=datetime.fromisoformat(row["started_at"]),
+            completed_at=(
+                datetime.fromisoformat(row["completed_at"]) if row["completed_at"] else None
+            ),
+            error=row["error"],
+            duration_ms=row["duration_ms"] or 0,
+        )
+
     # ==================== Settings ====================
 
     def get_setting(self, key: str, default: str = None) -> str | None:
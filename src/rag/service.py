@@ -8,10 +8,12 @@ Main service orchestrating RAG operations:
 """
 
 import hashlib
+import time
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
+from src.core.telemetry import get_telemetry
 from src.rag.chromadb_client import ChromaDBClient
 from src.rag.embeddings import EmbeddingManager
 from src.rag.models import Collection, Document
@@ -234,12 +236,22 @@ class RAGService:
         Returns:
             List of dicts with 'content', 'similarity', 'metadata'
         """
-        # Generate query embedding
-        query_embedding = await self.embedding_manager.embed(query)
+        telemetry = get_telemetry()
+        attributes = {"rag.collection_id": collection_id}
+        started = time.perf_counter()
+        with telemetry.span("rag.query", {**attributes, "rag.top_k": top_k}) as span:
+            # Generate query embedding
+            query_embedding = await self.embedding_manager.embed(query)
+
+            # Query ChromaDB
+            results = await self.chromadb.query(
+                collection_id, query_embedding, top_k=top_k, min_similarity=min_similarity
+            )
+            span.set_attribute("rag.results", len(results))
 
-        # Query ChromaDB
-        results = await self.chromadb.query(
-            collection_id, query_embedding, top_k=top_k, min_similarity=min_similarity
+        telemetry.add("skynette.rag.queries", 1, attributes)
+        telemetry.record(
+            "skynette.rag.duration", (time.perf_counter() - started) * 1000, attributes
         )
 
         # Format results
@@ -57,6 +57,8 @@ class SkynetteApp:
         self.workflows_list = []
         self.selected_node_id: str = None
         self.last_execution_result = None
+        # Nodes edited since the last run; when set, Run only re-executes what changed
+        self.dirty_node_ids: set[str] = set()
         self.simple_mode = True  # Start in Simple mode by default
 
         # Updater state
@@ -1617,18 +1619,11 @@ class SkynetteApp:
 
     def _build_advanced_editor_content(self) -> ft.Control:
         """Build advanced visual canvas editor content."""
-        # Build node palette
-        categories = {}
-        for node_def in self.node_registry.get_all_definitions():
-            cat = node_def.category or "other"
-            if cat not in categories:
-                categories[cat] = []
-            categories[cat].append(node_def)
-
+        # Build node palette (grouping and sorting is cached by the registry)
         palette_items = []
-        for cat_name, nodes in sorted(categories.items()):
+        for cat_name, nodes in self.node_registry.get_palette().items():
             node_buttons = []
-            for node_def in sorted(nodes, key=lambda n: n.name):
+            for node_def in nodes:
                 node_buttons.append(
                     ft.ListTile(
                         title=ft.Text(node_def.name, size=12),
@@ -1946,6 +1941,7 @@ class SkynetteApp:
         node = next((n for n in self.current_workflow.nodes if n.id == node_id), None)
         if node:
             node.config[field_name] = value
+            self.dirty_node_ids.add(node_id)
 
     def _add_connection(self, source_id: str, target_id: str):
         """Add a connection between two nodes."""
@@ -2318,7 +2314,19 @@ class SkynetteApp:
         # Run async execution in the event loop
         async def run_async():
             try:
-                execution = await self.executor.execute(self.current_workflow)
+                # After edits, re-run only the changed nodes and everything downstream
+                previous = self.last_execution_result
+                incremental = (
+                    self.dirty_node_ids
+                    and previous is not None
+                    and previous.workflow_id == self.current_workflow.id
+                )
+                execution = await self.executor.execute(
+                    self.current_workflow,
+                    previous_execution=previous if incremental else None,
+                    dirty_nodes=set(self.dirty_node_ids),
+                )
+                self.dirty_node_ids.clear()
                 self.storage.save_execution(execution)
 
                 # Store result for UI display
@@ -2,8 +2,14 @@
 
 import flet as ft
 
+from src.core.workflow.models import Workflow, WorkflowExecution
+from src.core.workflow.profiler import PHASES, WAIT
+from src.data.storage import get_storage
 from src.ui.theme import Theme
 
+# Width in pixels of the waterfall's time axis
+WATERFALL_WIDTH = 480
+
 
 class RunsView(ft.Column):
     """Workflow execution history and logs."""
@@ -233,4 +239,93 @@ class RunsView(ft.Column):
         )
 
     def _view_run_details(self, run):
-        print(f"Viewing run: {run['id']}")
+        storage = get_storage()
+        execution = storage.load_execution(run["id"])
+        if execution is None or self.page is None:
+            return
+
+        def close(e):
+            self.page.close(dialog)
+
+        dialog = ft.AlertDialog(
+            title=ft.Text(f"Run {execution.id[:8]} timeline"),
+            content=ft.Container(
+                content=self._build_waterfall(
+                    execution, storage.load_workflow(execution.workflow_id)
+                ),
+                width=WATERFALL_WIDTH + 240,
+            ),
+            actions=[ft.TextButton("Close", on_click=close)],
+            actions_alignment=ft.MainAxisAlignment.END,
+        )
+        self.page.open(dialog)
+
+    def _build_waterfall(self, execution: WorkflowExecution, workflow: Workflow | None = None):
+        """Draw each node's spans on a shared time axis."""
+        names = {node.id: node.name for node in workflow.nodes} if workflow else {}
+        colors = {
+            "wait": Theme.BORDER,
+            "queue": Theme.TEXT_SECONDARY,
+            "resolve": Theme.WARNING,
+            "execute": Theme.PRIMARY,
+            "store": Theme.SUCCESS,
+        }
+        results = [r for r in execution.node_results if r.spans]
+        if not results:
+            return ft.Text("No timing recorded for this run.", color=Theme.TEXT_SECONDARY)
+
+        end_ms = max(s.start_ms + s.duration_ms for r in results for s in r.spans) or 1.0
+        scale = WATERFALL_WIDTH / end_ms
+
+        rows = []
+        for result in sorted(results, key=lambda r: min(s.start_ms for s in r.spans)):
+            bars = [
+                ft.Container(
+                    left=span.start_ms * scale,
+                    top=4,
+                    width=max(1.0, span.duration_ms * scale),
+                    height=12,
+                    bgcolor=colors.get(span.name, Theme.PRIMARY),
+                    border_radius=2,
+                    tooltip=f"{span.name}: {span.duration_ms:.1f}ms",
+                )
+                for span in result.spans
+            ]
+            running_ms = sum(s.duration_ms for s in result.spans if s.name != WAIT)
+            rows.append(
+                ft.Row(
+                    controls=[
+                        ft.Text(
+                            names.get(result.node_id, result.node_id),
+                            size=12,
+                            width=140,
+                            no_wrap=True,
+                            color=Theme.TEXT_PRIMARY if result.success else Theme.ERROR,
+                        ),
+                        ft.Stack(controls=bars, width=WATERFALL_WIDTH, height=20),
+                        ft.Text(f"{running_ms:.0f}ms", size=11, color=Theme.TEXT_SECONDARY),
+                    ],
+                    spacing=Theme.SPACING_SM,
+                )
+            )
+
+        legend = ft.Row(
+            controls=[
+                ft.Row(
+                    controls=[
+                        ft.Container(width=10, height=10, bgcolor=colors[phase]),
+                        ft.Text(phase, size=11, color=Theme.TEXT_SECONDARY),
+                    ],
+                    spacing=4,
+                )
+                for phase in PHASES
+            ],
+            spacing=Theme.SPACING_MD,
+        )
+
+        return ft.Column(
+            controls=[legend, *rows],
+            spacing=Theme.SPACING_XS,
+            scroll=ft.ScrollMode.AUTO,
+            tight=True,
+        )
@@ -0,0 +1 @@
+"""Micro-benchmarks for Skynette core hot paths."""
@@ -0,0 +1,140 @@
+"""
+Expression Engine Benchmarks
+
+Compares the legacy string-splitting evaluator with the compiled one on
+configs shaped like real workflow nodes. Precedence and short-circuit
+correctness are covered by tests/unit/test_expressions.py.
+
+Timings are reported, not asserted, since they depend on the machine and its
+load. These are skipped by default; run them with
+``pytest -m benchmark -s`` to see the timings.
+"""
+
+import time
+from collections.abc import Callable
+
+import pytest
+
+from src.core.expressions import ExpressionParser, evaluate_items
+from tests.benchmarks.legacy_parser import LegacyExpressionParser
+
+pytestmark = pytest.mark.benchmark
+
+CONTEXT = {
+    "$prev": {
+        "order": {
+            "id": "ord_1042",
+            "subtotal": 180.5,
+            "tax": 14.44,
+            "total": 194.94,
+            "items": [{"sku": "A-1", "qty": 2}, {"sku": "B-7", "qty": 1}],
+        },
+        "customer": {"name": "Ada Lovelace", "email": "ada@example.com", "tier": "gold"},
+    },
+    "$trigger": {"body": {"event": "order.created", "retries": "2"}},
+    "$vars": {"api_token": "tok_123", "min_total": 100, "discount": 0.1},
+    "$nodes": {"lookup": {"status": 200, "body": {"warehouse": "EU-2"}}},
+}
+
+# Node configs whose expressions the legacy evaluator handles correctly, so
+# both evaluators do the same work
+CONFIGS = {
+    "http_request": {
+        "method": "POST",
+        "url": "https://api.example.com/orders/{{$prev.order.id}}/ship",
+        "headers": {
+            "Authorization": "Bearer {{$vars.api_token}}",
+            "Content-Type": "application/json",
+        },
+        "body": {
+            "warehouse": "{{$nodes.lookup.body.warehouse}}",
+            "items": "{{$prev.order.items.length}}",
+            "charge": "{{$prev.order.subtotal + $prev.order.tax}}",
+        },
+        "timeout": 30,
+    },
+    "if_condition": {
+        "condition": "{{$prev.order.total >= $vars.min_total}}",
+        "label": "Large order",
+    },
+    "slack_message": {
+        "channel": "#orders",
+        "text": "New order {{$prev.order.id}} from {{$prev.customer.name}} "
+        "({{$prev.customer.email}}): {{$prev.order.items.length}} items, "
+        "{{$prev.order.total}} total",
+        "username": "{{$upper($prev.customer.tier)}} bot",
+    },
+    "set_variables": {
+        "variables": {
+            "attempt": "{{$trigger.body.retries + 1}}",
+            "discounted": "{{$prev.order.subtotal * $vars.discount}}",
+            "event": "{{$trigger.body.event}}",
+            "first_sku": "{{$prev.order.items.first.sku}}",
+        }
+    },
+}
+
+
+def _best_time(run: Callable[[], object], number: int = 500, repeat: int = 5) -> float:
+    """Best time per call over a few rounds, in microseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        best = min(best, time.perf_counter() - start)
+    return best / number * 1e6
+
+
+@pytest.fixture
+def legacy():
+    return LegacyExpressionParser()
+
+
+@pytest.fixture
+def parser():
+    return ExpressionParser()
+
+
+class TestBenchmarks:
+    """Legacy vs compiled evaluation of realistic node configs."""
+
+    @pytest.mark.parametrize("name", list(CONFIGS))
+    def test_config(self, parser, legacy, name):
+        """Test compiled configs resolve to the same values and report timings."""
+        config = CONFIGS[name]
+        template = parser.compile_config(config)
+        assert template.render(CONTEXT) == legacy.resolve(config, CONTEXT)
+
+        old = _best_time(lambda: legacy.resolve(config, CONTEXT))
+        cached = _best_time(lambda: parser.resolve(config, CONTEXT))
+        new = _best_time(lambda: template.render(CONTEXT))
+        print(
+            f"\n{name}: legacy {old:.1f}us, cached resolve {cached:.1f}us "
+            f"({old / cached:.1f}x), template {new:.1f}us ({old / new:.1f}x)"
+        )
+
+    def test_short_circuit(self, parser):
+        """Time a guarded expensive call the guard skips."""
+        expression = "$prev.order.total > 1000 && $hash($json($prev.order)) != ''"
+        guarded = parser.compile(expression)
+        unguarded = parser.compile("$hash($json($prev.order)) != ''")
+
+        skipped = _best_time(lambda: guarded(CONTEXT))
+        called = _best_time(lambda: unguarded(CONTEXT))
+        print(f"\nshort circuit: skipped {skipped:.1f}us, called {called:.1f}us")
+
+    def test_filter_items(self, parser):
+        """Time filtering 100k items per item and as one batch."""
+        items = [{"price": n % 250, "sku": f"S-{n}"} for n in range(100_000)]
+        compiled = parser.compile("$item.price > 100")
+
+        def per_item():
+            return [compiled({"$item": item, "$prev": item}) for item in items]
+
+        batched = evaluate_items(compiled, items)
+        assert batched == per_item()
+
+        old = _best_time(per_item, number=1, repeat=3)
+        new = _best_time(lambda: evaluate_items(compiled, items), number=1, repeat=3)
+        print(f"\nfilter 100k items: per item {old / 1e3:.1f}ms, batch {new / 1e3:.1f}ms")
@@ -764,6 +764,29 @@ class TestSQLiteQueryNode:
         assert result["row_count"] == 1
         assert result["last_id"] == 1
 
+    @pytest.mark.asyncio
+    async def test_execute_batch(self, node, config, tmp_path):
+        """Test a batch of inserts runs on one connection, in order."""
+        import sqlite3
+        db_path = tmp_path / "test.db"
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.commit()
+        conn.close()
+
+        configs = [
+            {**config, "query": "INSERT INTO items (name) VALUES (?)",
+             "parameters": [name], "operation": "execute"}
+            for name in ("a", "b", "c")
+        ]
+
+        results = await node.execute_batch(configs, [{}] * 3)
+
+        assert [r["last_id"] for r in results] == [1, 2, 3]
+        conn = sqlite3.connect(str(db_path))
+        assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 3
+        conn.close()
+
     def test_node_definition(self, node):
         """Test node has correct definition."""
         assert node.type == "sqlite-query"
@@ -0,0 +1,244 @@
+"""
+Unit Tests for the Blob Store
+
+Tests for spilling large node outputs to disk behind lazy references.
+"""
+
+import json
+import pickle
+import sqlite3
+
+import pytest
+
+from src.core.blobs import BlobRef, BlobStore, estimate_size, get_spill_threshold, is_blob_json
+from src.core.expressions import resolve_expressions
+from src.core.nodes.base import BaseNode
+from src.core.workflow.executor import WorkflowExecutor
+from src.core.workflow.models import Workflow, WorkflowConnection, WorkflowNode
+from src.data.storage import WorkflowStorage
+
+
+class BigOutputNode(BaseNode):
+    """A node that returns a configurable number of items."""
+
+    type = "big-output"
+    name = "Big Output"
+    category = "test"
+
+    async def execute(self, config: dict, context: dict):
+        return {"items": [{"id": i, "text": "x" * 20} for i in range(config.get("count", 10))]}
+
+
+class PrevLengthNode(BaseNode):
+    """A node that reads $prev directly and an expression result from config."""
+
+    type = "prev-length"
+    name = "Prev Length"
+    category = "test"
+
+    async def execute(self, config: dict, context: dict):
+        return {"prev_items": len(context["$prev"]["items"]), "configured": config.get("count")}
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create a blob store in a temp directory."""
+    return BlobStore(tmp_path / "blobs")
+
+
+@pytest.fixture
+def executor(store):
+    """Create an executor that spills to the temp store."""
+    executor = WorkflowExecutor()
+    executor.blob_store = store
+    executor.node_registry._handlers["big-output"] = BigOutputNode
+    executor.node_registry._handlers["prev-length"] = PrevLengthNode
+    yield executor
+    executor.node_registry._handlers.pop("big-output", None)
+    executor.node_registry._handlers.pop("prev-length", None)
+
+
+def _workflow(count: int, spill_threshold: int = 1024) -> Workflow:
+    return Workflow(
+        name="Spill",
+        nodes=[
+            WorkflowNode(id="big", type="big-output", name="Big", config={"count": count}),
+            WorkflowNode(
+                id="len",
+                type="prev-length",
+                name="Length",
+                config={"count": "{{$nodes.big.items.length}}"},
+            ),
+        ],
+        connections=[WorkflowConnection(source_node_id="big", target_node_id="len")],
+        settings={"spill_threshold": spill_threshold},
+    )
+
+
+class TestBlobStore:
+    """Tests for the content-addressed store."""
+
+    def test_put_and_read(self, store):
+        """Test values round-trip through the store."""
+        ref = store.put({"a": [1, 2, 3]})
+
+        assert store.exists(ref.sha)
+        assert store.read(ref.sha) == {"a": [1, 2, 3]}
+        assert ref.size == len(json.dumps({"a": [1, 2, 3]}))
+
+    def test_content_addressed(self, store):
+        """Test equal values share a blob."""
+        assert store.put([1, 2]) == store.put([1, 2])
+        assert store.put([1, 2]) != store.put([2, 1])
+
+    def test_ref_loads_once(self, store):
+        """Test a ref reads from disk on first access only."""
+        ref = store.put({"x": 1})
+        assert not ref.loaded
+        assert ref.load() == {"x": 1}
+
+        store.delete(ref.sha)
+        assert ref.load() == {"x": 1}
+
+    def test_ref_pickles_without_value(self, store):
+        """Test pickled refs don't carry the loaded value."""
+        ref = store.put({"x": 1})
+        ref.load()
+
+        copy = pickle.loads(pickle.dumps(ref))
+        assert copy == ref
+        assert not copy.loaded
+        assert copy.load() == {"x": 1}
+
+    def test_spill_threshold(self, store):
+        """Test only values at or above the threshold are spilled."""
+        assert store.spill({"a": "small"}, threshold=1024) == {"a": "small"}
+        assert isinstance(store.spill({"a": "x" * 2048}, threshold=1024), BlobRef)
+
+    def test_spill_skips_non_json(self, store):
+        """Test values that can't be encoded as JSON stay in memory."""
+        value = {"data": b"x" * 2048}
+        assert store.spill(value, threshold=1024) is value
+
+    def test_json_form(self, store):
+        """Test the serialized form round-trips to a ref."""
+        ref = store.put([1])
+        encoded = ref.to_json()
+
+        assert is_blob_json(encoded)
+        assert not is_blob_json({"$blob": ref.sha, "size": 3, "other": 1})
+        assert store.from_json(encoded) == ref
+
+    def test_prune(self, store):
+        """Test unreferenced blobs are deleted unless written recently."""
+        kept = store.put({"keep": 1})
+        dropped = store.put({"drop": 1})
+
+        assert store.prune({kept.sha}) == 0
+        assert store.prune({kept.sha}, min_age=0) == 1
+        assert store.exists(kept.sha)
+        assert not store.exists(dropped.sha)
+        assert set(store.shas()) == {kept.sha}
+
+    def test_estimate_size_stops_at_limit(self):
+        """Test size estimates stop once they reach the limit."""
+        assert estimate_size({"a": "xy"}, 1000) < 20
+        assert 100 <= estimate_size(["x" * 100] * 1000, 100) < 10_000
+
+    def test_spill_threshold_setting(self):
+        """Test reading the threshold from workflow settings."""
+        assert get_spill_threshold({"spill_threshold": 0}) == 0
+        assert get_spill_threshold({"spill_threshold": "2048"}) == 2048
+        assert get_spill_threshold({}) > 0
+
+
+class TestExpressionAccess:
+    """Tests for loading refs from expressions."""
+
+    def test_expression_loads_ref(self, store):
+        """Test node output refs are loaded when an expression reads them."""
+        ref = store.put({"items": [1, 2, 3]})
+        context = {"$nodes": {"big": ref}, "$prev": ref}
+
+        assert resolve_expressions("{{$nodes.big.items.length}}", context) == 3
+        assert resolve_expressions("{{$prev.items}}", context) == [1, 2, 3]
+        assert resolve_expressions("{{$nodes.big}}", context) == {"items": [1, 2, 3]}
+        assert ref.loaded
+
+
+class TestExecutorSpill:
+    """Tests for spilling outputs during execution."""
+
+    @pytest.mark.asyncio
+    async def test_large_output_spilled(self, executor, store):
+        """Test large outputs are replaced by refs that downstream nodes can use."""
+        execution = await executor.execute(_workflow(count=100))
+
+        assert execution.status == "completed"
+        big, length = execution.node_results
+        assert isinstance(big.data, BlobRef)
+        assert store.exists(big.data.sha)
+        assert length.data == {"prev_items": 100, "configured": 100}
+
+    @pytest.mark.asyncio
+    async def test_small_output_kept(self, executor):
+        """Test outputs under the threshold stay in memory."""
+        execution = await executor.execute(_workflow(count=2))
+
+        assert isinstance(execution.node_results[0].data, dict)
+
+    @pytest.mark.asyncio
+    async def test_spill_disabled(self, executor):
+        """Test a zero threshold turns spilling off."""
+        execution = await executor.execute(_workflow(count=100, spill_threshold=0))
+
+        assert isinstance(execution.node_results[0].data, dict)
+
+    @pytest.mark.asyncio
+    async def test_history_stores_ref(self, executor, tmp_path):
+        """Test execution history stores the ref instead of the payload."""
+        execution = await executor.execute(_workflow(count=100))
+        storage = WorkflowStorage(data_dir=str(tmp_path / "data"))
+        storage.save_execution(execution)
+
+        conn = sqlite3.connect(storage.db_path)
+        row = conn.execute("SELECT node_results FROM executions").fetchone()
+        conn.close()
+
+        stored = json.loads(row[0])
+        ref = execution.node_results[0].data
+        assert stored[0]["data"] == {"$blob": ref.sha, "size": ref.size}
+
+    @pytest.mark.asyncio
+    async def test_deleting_workflow_frees_blobs(self, executor, tmp_path):
+        """Test blobs are freed once no execution in history refers to them."""
+        storage = WorkflowStorage(data_dir=str(tmp_path / "data"))
+        executor.blob_store = storage.blob_store
+        workflow = _workflow(count=100)
+        storage.save_workflow(workflow)
+        execution = await executor.execute(workflow)
+        storage.save_execution(execution)
+        sha = execution.node_results[0].data.sha
+
+        assert storage.referenced_blobs() == {sha}
+        assert storage.prune_blobs(min_age=0) == 0
+
+        storage.delete_workflow(workflow.id)
+        assert not storage.blob_store.exists(sha)
+
+    @pytest.mark.asyncio
+    async def test_deleting_workflow_keeps_reused_blobs(self, executor, tmp_path):
+        """Test a blob reused by a newer run isn't freed with the deleted workflow."""
+        storage = WorkflowStorage(data_dir=str(tmp_path / "data"))
+        executor.blob_store = storage.blob_store
+        workflow = _workflow(count=100)
+        storage.save_workflow(workflow)
+        storage.save_execution(await executor.execute(workflow))
+
+        # Another run, not saved yet, spills the same output
+        newer = await executor.execute(_workflow(count=100))
+        sha = newer.node_results[0].data.sha
+
+        storage.delete_workflow(workflow.id)
+        assert storage.blob_store.exists(sha)
+        assert storage.prune_blobs() == 0
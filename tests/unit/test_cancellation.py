@@ -0,0 +1,207 @@
+"""
+Unit Tests for Cancellation
+
+Tests for cancellation tokens, run deadlines and killing subprocesses.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.core.cancellation import CancellationToken, get_deadline, run_process
+from src.core.nodes.base import BaseNode
+from src.core.workflow.executor import WorkflowExecutor
+from src.core.workflow.models import Workflow, WorkflowConnection, WorkflowNode
+
+
+class SleepNode(BaseNode):
+    """A node that sleeps, recording whether it was cancelled."""
+
+    type = "sleep"
+    name = "Sleep"
+    category = "test"
+
+    cancelled: list[str] = []
+
+    async def execute(self, config: dict, context: dict):
+        try:
+            await asyncio.sleep(config.get("seconds", 0))
+        except asyncio.CancelledError:
+            SleepNode.cancelled.append(config.get("label", ""))
+            raise
+        return {"slept": config.get("seconds", 0), "token": context["$cancel"] is not None}
+
+
+@pytest.fixture
+def executor():
+    """Create an executor with the sleep node registered."""
+    executor = WorkflowExecutor()
+    executor.node_registry._handlers["sleep"] = SleepNode
+    SleepNode.cancelled = []
+    yield executor
+    executor.node_registry._handlers.pop("sleep", None)
+
+
+def _workflow(settings: dict | None = None) -> Workflow:
+    return Workflow(
+        name="Sleepy",
+        nodes=[
+            WorkflowNode(id="quick", type="sleep", name="Quick", config={"seconds": 0}),
+            WorkflowNode(
+                id="slow", type="sleep", name="Slow", config={"seconds": 10, "label": "slow"}
+            ),
+            WorkflowNode(id="after", type="sleep", name="After", config={"seconds": 0}),
+        ],
+        connections=[
+            WorkflowConnection(source_node_id="quick", target_node_id="slow"),
+            WorkflowConnection(source_node_id="slow", target_node_id="after"),
+        ],
+        settings=settings or {},
+    )
+
+
+class TestCancellationToken:
+    """Tests for the token."""
+
+    def test_cancel_keeps_first_reason(self):
+        """Test cancelling sets the reason once."""
+        token = CancellationToken()
+        assert not token.cancelled and token.remaining() is None
+
+        token.cancel("first")
+        token.cancel("second")
+
+        assert token.cancelled and token.reason == "first"
+        with pytest.raises(asyncio.CancelledError):
+            token.raise_if_cancelled()
+
+    def test_deadline(self):
+        """Test a passed deadline counts as cancelled."""
+        assert CancellationToken(timeout=60).remaining() > 59
+        token = CancellationToken(timeout=0)
+
+        assert token.cancelled
+        assert token.reason == "Deadline exceeded"
+
+    def test_child_follows_parent(self):
+        """Test children inherit the parent's deadline and cancellation."""
+        parent = CancellationToken(timeout=30)
+        child = CancellationToken(timeout=60, parent=parent)
+        detached = CancellationToken(parent=parent)
+        detached.detach()
+
+        assert child.deadline == parent.deadline
+        parent.cancel("stop")
+
+        assert child.reason == "stop"
+        assert not detached.cancelled
+
+    def test_get_deadline(self):
+        """Test reading deadline_seconds from settings."""
+        assert get_deadline({}) is None
+        assert get_deadline({"deadline_seconds": 0}) is None
+        assert get_deadline({"deadline_seconds": "2.5"}) == 2.5
+        assert get_deadline({"deadline_seconds": "soon"}) is None
+
+
+class TestRunProcess:
+    """Tests for cancellable subprocesses."""
+
+    @pytest.mark.asyncio
+    async def test_output(self):
+        """Test output is captured like subprocess.run."""
+        result = await run_process(
+            [sys.executable, "-c", "import sys; print(sys.stdin.read().upper())"], input="hi"
+        )
+
+        assert result.returncode == 0
+        assert result.stdout.strip() == "HI"
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        """Test the timeout raises TimeoutExpired and is shortened by the deadline."""
+        with pytest.raises(subprocess.TimeoutExpired):
+            await run_process([sys.executable, "-c", "import time; time.sleep(10)"], timeout=0.2)
+
+        token = CancellationToken(timeout=0.2)
+        with pytest.raises(subprocess.TimeoutExpired):
+            await run_process(
+                [sys.executable, "-c", "import time; time.sleep(10)"], timeout=30, token=token
+            )
+
+    @pytest.mark.skipif(os.name == "nt", reason="Uses POSIX process groups")
+    @pytest.mark.asyncio
+    async def test_cancel_kills_process_tree(self, tmp_path):
+        """Test cancelling the task kills the process and its children."""
+        pid_file = tmp_path / "child.pid"
+        script = (
+            "import subprocess, sys, time\n"
+            "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])\n"
+            f"open({str(pid_file)!r}, 'w').write(str(child.pid))\n"
+            "time.sleep(30)\n"
+        )
+        task = asyncio.create_task(run_process([sys.executable, "-c", script], timeout=30))
+        for _ in range(100):
+            if pid_file.exists() and pid_file.read_text():
+                break
+            await asyncio.sleep(0.05)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        child_pid = int(pid_file.read_text())
+        for _ in range(50):
+            try:
+                os.kill(child_pid, 0)
+            except ProcessLookupError:
+                break
+            await asyncio.sleep(0.05)
+        else:
+            pytest.fail("Grandchild process is still running")
+
+
+class TestExecutorCancellation:
+    """Tests for cancelling running executions."""
+
+    @pytest.mark.asyncio
+    async def test_cancel(self, executor):
+        """Test cancel() stops running nodes and ends the run as cancelled."""
+        run = asyncio.create_task(executor.execute(_workflow()))
+        await asyncio.sleep(0.05)
+
+        executor.cancel("Stopped by test")
+        execution = await asyncio.wait_for(run, timeout=5)
+
+        assert execution.status == "cancelled"
+        assert execution.error == "Stopped by test"
+        assert execution.get_result("quick").data["token"] is True
+        assert execution.get_result("slow").error == "Stopped by test"
+        assert execution.get_result("after") is None
+        assert SleepNode.cancelled == ["slow"]
+
+    @pytest.mark.asyncio
+    async def test_deadline(self, executor):
+        """Test deadline_seconds cancels a run that takes too long."""
+        execution = await asyncio.wait_for(
+            executor.execute(_workflow({"deadline_seconds": 0.1})), timeout=5
+        )
+
+        assert execution.status == "cancelled"
+        assert execution.error == "Deadline exceeded"
+        assert execution.get_result("quick").success
+        assert SleepNode.cancelled == ["slow"]
+
+    @pytest.mark.asyncio
+    async def test_caller_token(self, executor):
+        """Test a token passed in cancels the run."""
+        token = CancellationToken()
+        token.cancel("Never started")
+
+        execution = await executor.execute(_workflow(), cancel_token=token)
+
+        assert execution.status == "cancelled"
+        assert execution.node_results == []
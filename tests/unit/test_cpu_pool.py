@@ -0,0 +1,182 @@
+"""
+Unit Tests for the CPU Node Process Pool
+
+Tests for running CPU-bound nodes in worker processes.
+"""
+
+import os
+import threading
+
+import pytest
+
+from src.core.expressions import get_parser
+from src.core.nodes.base import BaseNode
+from src.core.nodes.utility.transform import JSONParseNode
+from src.core.workflow.executor import WorkflowExecutor
+from src.core.workflow.models import Workflow, WorkflowNode
+from src.core.workflow.process_pool import DEFAULT_MIN_PAYLOAD, CPUNodePool
+
+
+class PidNode(BaseNode):
+    """A CPU node that reports the process it ran in."""
+
+    type = "pid"
+    name = "PID"
+    category = "test"
+    execution_affinity = "cpu"
+
+    async def execute(self, config: dict, context: dict):
+        return {"pid": os.getpid(), "trigger": context.get("$trigger"), "keys": sorted(context)}
+
+
+class IONode(PidNode):
+    """The same node, left on the event loop."""
+
+    type = "pid-io"
+    execution_affinity = "io"
+
+
+@pytest.fixture
+def pool():
+    """Create a small pool that offloads payloads of any size."""
+    pool = CPUNodePool(max_workers=2, min_payload=0)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.fixture
+def executor(pool):
+    """Create an executor that uses the test pool."""
+    executor = WorkflowExecutor()
+    executor.cpu_pool = pool
+    executor.node_registry._handlers["pid"] = PidNode
+    executor.node_registry._handlers["pid-io"] = IONode
+    yield executor
+    executor.node_registry._handlers.pop("pid", None)
+    executor.node_registry._handlers.pop("pid-io", None)
+
+
+def _workflow(node_type: str, config: dict | None = None) -> Workflow:
+    node = WorkflowNode(id="n1", type=node_type, name="Node", config=config or {})
+    return Workflow(name="Pool", nodes=[node])
+
+
+class TestCPUNodePool:
+    """Tests for the pool itself."""
+
+    def test_only_cpu_nodes_are_wanted(self, pool):
+        """Test only nodes with a cpu affinity are offloaded."""
+        assert pool.wants(PidNode)
+        assert not pool.wants(IONode)
+        assert pool.wants(JSONParseNode)
+
+        pool.configure(enabled=False)
+        assert not pool.wants(PidNode)
+
+    def test_pack_slices_context(self, pool):
+        """Test only the context slice is sent to workers."""
+        context = {"$prev": 1, "$trigger": {}, "$vars": {}, "$nodes": {}, "other": 2}
+        assert pool.slice_context(context) == {"$prev": 1, "$trigger": {}, "$vars": {}}
+        assert pool.pack(PidNode, {}, context) is not None
+
+    def test_slice_includes_referenced_nodes(self, pool):
+        """Test $nodes outputs read by the node's raw expressions are sent along."""
+        context = {"$prev": 1, "$nodes": {"a": 1, "b": 2}}
+        reads_a = get_parser().compile("$nodes.a > $prev").references
+        reads_all = get_parser().compile("$json($nodes)").references
+
+        assert pool.slice_context(context, reads_a) == {"$prev": 1, "$nodes": {"a": 1}}
+        assert pool.slice_context(context, reads_all)["$nodes"] == {"a": 1, "b": 2}
+
+    def test_pack_skips_unpicklable_payloads(self, pool):
+        """Test payloads that can't be pickled stay on the event loop."""
+        assert pool.pack(PidNode, {"lock": threading.Lock()}, {}) is None
+
+    def test_pack_skips_small_payloads(self, pool):
+        """Test payloads below the threshold stay on the event loop."""
+        pool.configure(min_payload=1024)
+        assert pool.pack(PidNode, {}, {"$prev": "x"}) is None
+        assert pool.pack(PidNode, {}, {"$prev": "x" * 2048}) is not None
+
+    @pytest.mark.asyncio
+    async def test_warm_up_starts_workers(self, pool):
+        """Test warm up starts the worker processes."""
+        assert not pool.started
+        processes = await pool.warm_up([PidNode])
+        assert pool.started
+        assert 1 <= processes <= pool.max_workers
+
+        pool.shutdown()
+        assert not pool.started
+
+
+class TestExecutorOffload:
+    """Tests for offloading nodes from the executor."""
+
+    @pytest.mark.asyncio
+    async def test_cpu_node_runs_in_worker(self, executor):
+        """Test a CPU node runs in another process with the context slice."""
+        execution = await executor.execute(_workflow("pid"), {"value": 1})
+
+        assert execution.status == "completed"
+        output = execution.node_results[0].data
+        assert output["pid"] != os.getpid()
+        assert output["trigger"] == {"value": 1}
+        assert "$nodes" not in output["keys"]
+
+    @pytest.mark.asyncio
+    async def test_io_node_runs_in_process(self, executor):
+        """Test nodes without a cpu affinity run on the event loop."""
+        execution = await executor.execute(_workflow("pid-io"))
+
+        assert execution.node_results[0].data["pid"] == os.getpid()
+        assert not executor.cpu_pool.started
+
+    @pytest.mark.asyncio
+    async def test_unpicklable_config_falls_back(self, executor):
+        """Test a CPU node whose config can't be pickled still runs."""
+        execution = await executor.execute(_workflow("pid", {"lock": threading.Lock()}))
+
+        assert execution.status == "completed"
+        assert execution.node_results[0].data["pid"] == os.getpid()
+
+    @pytest.mark.asyncio
+    async def test_offloaded_condition_reads_nodes(self, executor):
+        """Test a filter condition reading $nodes gives the same result in a worker."""
+        executor.cpu_pool.configure(min_payload=DEFAULT_MIN_PAYLOAD)
+        items = [{"price": n % 200} for n in range(20_000)]
+        workflow = Workflow(
+            name="Pool",
+            nodes=[
+                WorkflowNode(
+                    id="limit",
+                    type="json-parse",
+                    name="Limit",
+                    config={"json_string": '{"value": 150}'},
+                ),
+                WorkflowNode(
+                    id="filter",
+                    type="array-filter",
+                    name="Filter",
+                    config={
+                        "items": items,
+                        "condition": "{{$item.price > $nodes.limit.data.value}}",
+                    },
+                ),
+            ],
+        )
+        execution = await executor.execute(workflow)
+
+        assert execution.status == "completed"
+        assert execution.get_result("filter").data["count"] == 4900
+        assert executor.cpu_pool.started
+
+    @pytest.mark.asyncio
+    async def test_builtin_transform_offloaded(self, executor):
+        """Test a built-in transform node produces the same output in a worker."""
+        workflow = _workflow("json-parse", {"json_string": '{"a": [1, 2]}'})
+        execution = await executor.execute(workflow)
+
+        assert execution.status == "completed"
+        assert execution.node_results[0].data["data"] == {"a": [1, 2]}
+        assert executor.cpu_pool.started
@@ -0,0 +1,276 @@
+"""
+Unit Tests for Data Flow Analysis
+
+Tests for expression references, analyze_dataflow and how the executor uses
+them to order, parallelize and release node outputs.
+"""
+
+import asyncio
+
+import pytest
+
+from src.core.expressions import get_parser
+from src.core.nodes.base import BaseNode
+from src.core.workflow.dataflow import DataFlowCache, analyze_dataflow
+from src.core.workflow.executor import WorkflowExecutor
+from src.core.workflow.models import Workflow, WorkflowConnection, WorkflowNode
+from src.core.workflow.plan import compile_plan
+
+
+class MockValueNode(BaseNode):
+    """Returns its ``value`` config after an optional delay, recording the order it ran in."""
+
+    type = "mock_value"
+    name = "Mock Value"
+    category = "test"
+    reads_prev = False
+
+    started: list[str] = []
+
+    async def execute(self, config: dict, context: dict):
+        MockValueNode.started.append(config.get("name"))
+        await asyncio.sleep(config.get("delay", 0))
+        return config.get("value")
+
+
+class MockConditionNode(BaseNode):
+    """Evaluates its raw ``condition`` expression itself, like ArrayFilterNode."""
+
+    type = "mock_condition"
+    name = "Mock Condition"
+    category = "test"
+    reads_prev = False
+    raw_config_keys = ("condition",)
+    expression_config_keys = ("condition",)
+
+    async def execute(self, config: dict, context: dict):
+        return get_parser().compile(config["condition"])(context)
+
+
+@pytest.fixture
+def executor():
+    executor = WorkflowExecutor()
+    executor.node_registry._handlers["mock_value"] = MockValueNode
+    executor.node_registry._handlers["mock_condition"] = MockConditionNode
+    MockValueNode.started = []
+    yield executor
+    executor.node_registry._handlers.pop("mock_value", None)
+    executor.node_registry._handlers.pop("mock_condition", None)
+
+
+def _node(node_id: str, value=None, delay: float = 0, **config) -> WorkflowNode:
+    config = {"name": node_id, "value": value, "delay": delay, **config}
+    return WorkflowNode(id=node_id, type="mock_value", name=node_id.upper(), config=config)
+
+
+def _connect(*pairs: str) -> list[WorkflowConnection]:
+    return [
+        WorkflowConnection(source_node_id=source, target_node_id=target)
+        for source, target in (pair.split("->") for pair in pairs)
+    ]
+
+
+def _analyze(workflow: Workflow, **options):
+    plan = compile_plan(workflow)
+    parser = get_parser()
+    templates = {
+        node_id: parser.compile_config(plan.get_node(workflow, node_id).config)
+        for node_id in plan.order
+    }
+    return analyze_dataflow(workflow, plan, templates, **options)
+
+
+class TestReferences:
+    """Tests for the references of compiled expressions and configs."""
+
+    def test_expression_references(self):
+        """Test node, variable and root references are found without evaluating."""
+        refs = get_parser().compile("$node.fetch.body.id + $vars.offset > $prev.count").references
+
+        assert refs.nodes == {"fetch"}
+        assert refs.variables == {"offset"}
+        assert refs.roots == {"$nodes", "$vars", "$prev"}
+        assert not refs.all_nodes
+
+    def test_config_references(self):
+        """Test a config's references combine every leaf, inside calls too."""
+        template = get_parser().compile_config(
+            {
+                "url": "https://api/{{$nodes.auth.token}}",
+                "body": {"rows": "{{$length($nodes.load.rows)}}", "dump": "{{$json($nodes)}}"},
+                "static": "{{not an expression}}",
+            }
+        )
+
+        assert template.references.nodes == {"auth", "load"}
+        assert template.references.all_nodes
+
+    def test_expression_key_references(self):
+        """Test raw keys holding an expression still count towards the references."""
+        config = {"condition": "$item.id != $nodes.skip.id", "label": "{{$nodes.name}}"}
+        parser = get_parser()
+
+        assert parser.compile_config(config, ("condition",)).references.nodes == {"name"}
+        template = parser.compile_config(config, ("condition",), ("condition",))
+        assert template.references.nodes == {"name", "skip"}
+        assert template.render({"$nodes": {"name": "x"}})["condition"] == config["condition"]
+        braced = parser.compile_config({"condition": "{{$nodes.a > 1}}"}, (), ("condition",))
+        assert braced.references.nodes == {"a"}
+
+
+@pytest.mark.usefixtures("executor")
+class TestAnalyze:
+    """Tests for analyze_dataflow."""
+
+    def test_inferred_edge(self):
+        """Test a node reading an unconnected node waits for it."""
+        workflow = Workflow(
+            name="Refs",
+            nodes=[_node("a"), _node("b", "{{$nodes.c}}"), _node("c")],
+            connections=_connect("a->b"),
+        )
+        dataflow = _analyze(workflow)
+
+        assert dataflow.inferred == (("c", "b"),)
+        assert set(dataflow.waits_for["b"]) == {"a", "c"}
+        assert dataflow.roots == ("a", "c")
+        assert dataflow.downstream(["c"]) == {"c", "b"}
+
+    def test_missing_references(self, caplog):
+        """Test references to unknown, disabled and later nodes are reported."""
+        disabled = _node("off")
+        disabled.enabled = False
+        workflow = Workflow(
+            name="Refs",
+            nodes=[_node("a", "{{$nodes.b}} {{$nodes.nope}} {{$nodes.off}}"), _node("b"), disabled],
+            connections=_connect("a->b"),
+        )
+        dataflow = _analyze(workflow)
+
+        assert dataflow.missing == {"a": ("b", "nope", "off")}
+        assert dataflow.inferred == ()
+        assert "never run before it" in caplog.text
+
+    def test_relaxed_connections(self):
+        """Test only connections the target doesn't read are relaxed."""
+        workflow = Workflow(
+            name="Relax",
+            nodes=[
+                _node("a"),
+                _node("b"),
+                _node("c", "{{$nodes.a}}"),
+                _node("d", "{{$prev}}"),
+            ],
+            connections=_connect("a->b", "a->c", "a->d"),
+        )
+
+        assert _analyze(workflow).relaxed == ()
+        dataflow = _analyze(workflow, relax=True)
+        assert dataflow.relaxed == (("a", "b"),)
+        assert dataflow.incoming["b"] == ()
+        assert set(dataflow.roots) == {"a", "b"}
+
+
+@pytest.mark.asyncio
+class TestExecutorDataFlow:
+    """Tests for the executor's use of data dependencies."""
+
+    async def test_reference_waits_for_unconnected_node(self, executor):
+        """Test a node reading a slower unconnected node gets its output."""
+        workflow = Workflow(
+            name="Refs",
+            nodes=[_node("slow", 42, delay=0.05), _node("reader", "{{$nodes.slow}}")],
+        )
+        execution = await executor.execute(workflow)
+
+        assert execution.status == "completed"
+        assert execution.get_result("reader").data == 42
+
+    async def test_dataflow_setting_runs_unread_connections_in_parallel(self, executor):
+        """Test a target that doesn't read its source starts without waiting for it."""
+        workflow = Workflow(
+            name="Parallel",
+            nodes=[_node("slow", 1, delay=0.05), _node("fast", 2)],
+            connections=_connect("slow->fast"),
+            settings={"dataflow": True},
+        )
+        execution = await executor.execute(workflow)
+
+        assert execution.status == "completed"
+        assert MockValueNode.started == ["slow", "fast"]
+        assert execution.get_result("fast").completed_at < execution.get_result("slow").completed_at
+
+    async def test_release_outputs(self, executor):
+        """Test outputs are released once read, and final outputs are kept."""
+        workflow = Workflow(
+            name="Release",
+            nodes=[
+                _node("a", [1, 2, 3]),
+                _node("b", "{{$nodes.a.length}}"),
+                _node("c", "{{$prev}}"),
+            ],
+            connections=_connect("a->b", "b->c"),
+            settings={"release_outputs": True},
+        )
+        execution = await executor.execute(workflow)
+
+        assert execution.get_result("c").data == 3
+        assert not execution.get_result("c").released
+        for node_id in ("a", "b"):
+            assert execution.get_result(node_id).released
+            assert execution.get_result(node_id).data is None
+
+    async def test_release_outputs_read_by_raw_expression(self, executor):
+        """Test a node read only by a raw expression key waits and is kept for it."""
+        workflow = Workflow(
+            name="Condition",
+            nodes=[
+                _node("limit", {"min": 3}, delay=0.05),
+                WorkflowNode(
+                    id="check",
+                    type="mock_condition",
+                    name="Check",
+                    config={"condition": "$vars.n >= $nodes.limit.min"},
+                ),
+            ],
+            variables={"n": 4},
+            settings={"release_outputs": True},
+        )
+        execution = await executor.execute(workflow)
+
+        assert execution.status == "completed"
+        assert execution.get_result("check").data is True
+        assert execution.get_result("limit").released
+
+    async def test_incremental_run_follows_references(self, executor):
+        """Test editing a node re-runs nodes that read it through $nodes."""
+        workflow = Workflow(
+            name="Incremental",
+            nodes=[_node("a", 1), _node("b", "{{$nodes.a}}"), _node("c", "x")],
+        )
+        first = await executor.execute(workflow)
+
+        workflow.nodes[0].config["value"] = 2
+        second = await executor.execute(workflow, previous_execution=first)
+
+        assert second.get_result("b").data == 2
+        assert not second.get_result("b").reused
+        assert second.get_result("c").reused
+
+
+class TestDataFlowCache:
+    """Tests for DataFlowCache."""
+
+    def test_cached_until_config_changes(self):
+        """Test analyses are reused until a fingerprint changes."""
+        workflow = Workflow(name="Cache", nodes=[_node("a"), _node("b", "{{$nodes.a}}")])
+        plan = compile_plan(workflow)
+        cache = DataFlowCache()
+
+        def get_template(node_id):
+            return get_parser().compile_config(plan.get_node(workflow, node_id).config)
+
+        first = cache.get(workflow, plan, {"a": "1", "b": "1"}, get_template)
+        assert cache.get(workflow, plan, {"a": "1", "b": "1"}, get_template) is first
+        assert cache.get(workflow, plan, {"a": "1", "b": "2"}, get_template) is not first
+        assert (cache.hits, cache.misses) == (1, 2)
@@ -0,0 +1,185 @@
+"""
+Unit Tests for the Execute Workflow Node
+
+Tests for calling saved workflows from other workflows.
+"""
+
+import os
+
+import pytest
+
+import src.core.workflow.queue as queue_module
+import src.data.storage as storage_module
+from src.core.nodes.base import BaseNode
+from src.core.nodes.flow.execute_workflow import ExecuteWorkflowNode
+from src.core.workflow.executor import WorkflowExecutor
+from src.core.workflow.models import Workflow, WorkflowConnection, WorkflowNode
+from src.core.workflow.queue import ExecutionQueue
+from src.data.storage import WorkflowStorage
+
+
+class EchoNode(BaseNode):
+    """A node that returns its trigger data."""
+
+    type = "echo"
+    name = "Echo"
+    category = "test"
+
+    async def execute(self, config: dict, context: dict):
+        return {"trigger": dict(context["$trigger"]), "suffix": config.get("suffix")}
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """Use storage in a temporary directory as the global storage."""
+    storage = WorkflowStorage(data_dir=str(tmp_path))
+    monkeypatch.setattr(storage_module, "_storage", storage)
+    return storage
+
+
+@pytest.fixture
+def executor():
+    """Create an executor with the echo node registered."""
+    executor = WorkflowExecutor()
+    executor.node_registry._handlers["echo"] = EchoNode
+    executor.node_registry._handlers["execute_workflow"] = ExecuteWorkflowNode
+    yield executor
+    executor.node_registry._handlers.pop("echo", None)
+
+
+def _child(storage) -> Workflow:
+    child = Workflow(
+        name="Child",
+        nodes=[
+            WorkflowNode(id="first", type="echo", name="First"),
+            WorkflowNode(id="last", type="echo", name="Last", config={"suffix": "done"}),
+        ],
+        connections=[WorkflowConnection(source_node_id="first", target_node_id="last")],
+    )
+    storage.save_workflow(child)
+    return child
+
+
+class TestExecuteWorkflowNode:
+    """Tests for the node."""
+
+    @pytest.mark.asyncio
+    async def test_inline_returns_outputs(self, storage, executor):
+        """Test the child runs with the inputs and its outputs are returned."""
+        child = _child(storage)
+
+        result = await ExecuteWorkflowNode().execute(
+            {"workflow_id": child.id, "inputs": {"x": 1}}, {}
+        )
+
+        assert result["status"] == "completed"
+        assert result["output"] == {"trigger": {"x": 1}, "suffix": "done"}
+        assert set(result["outputs"]) == {"first", "last"}
+
+    @pytest.mark.asyncio
+    async def test_inputs_default_to_prev(self, storage, executor):
+        """Test non-dict inputs are wrapped, and $prev is used without inputs."""
+        child = _child(storage)
+        node = ExecuteWorkflowNode()
+
+        result = await node.execute({"workflow_id": child.id}, {"$prev": {"y": 2}})
+        assert result["output"]["trigger"] == {"y": 2}
+
+        result = await node.execute({"workflow_id": child.id, "inputs": [1, 2]}, {})
+        assert result["output"]["trigger"] == {"input": [1, 2]}
+
+    @pytest.mark.asyncio
+    async def test_missing_workflow(self, storage, executor):
+        """Test unknown workflow IDs fail the node."""
+        with pytest.raises(ValueError, match="not found"):
+            await ExecuteWorkflowNode().execute({"workflow_id": "nope"}, {})
+
+    @pytest.mark.asyncio
+    async def test_recursion_detected(self, storage, executor):
+        """Test a workflow that calls itself fails instead of recursing forever."""
+        looping = Workflow(name="Loop")
+        looping.nodes = [
+            WorkflowNode(
+                id="call",
+                type="execute_workflow",
+                name="Call",
+                config={"workflow_id": looping.id},
+            )
+        ]
+        storage.save_workflow(looping)
+
+        with pytest.raises(RuntimeError, match="calls itself"):
+            await ExecuteWorkflowNode().execute({"workflow_id": looping.id}, {})
+
+    @pytest.mark.asyncio
+    async def test_used_in_workflow(self, storage, executor):
+        """Test the node passes the child's output downstream."""
+        child = _child(storage)
+        parent = Workflow(
+            name="Parent",
+            nodes=[
+                WorkflowNode(
+                    id="call",
+                    type="execute_workflow",
+                    name="Call",
+                    config={"workflow_id": child.id, "inputs": {"from": "parent"}},
+                ),
+                WorkflowNode(
+                    id="after",
+                    type="echo",
+                    name="After",
+                    config={"suffix": "{{$prev.output.suffix}}"},
+                ),
+            ],
+            connections=[WorkflowConnection(source_node_id="call", target_node_id="after")],
+        )
+
+        execution = await executor.execute(parent)
+
+        assert execution.status == "completed"
+        assert execution.get_result("after").data["suffix"] == "done"
+
+    @pytest.mark.asyncio
+    async def test_queue_mode(self, storage, executor, monkeypatch):
+        """Test queue mode enqueues the child and returns at once."""
+        queue = ExecutionQueue(storage=storage)
+        monkeypatch.setattr(queue_module, "_queue", queue)
+        child = _child(storage)
+
+        result = await ExecuteWorkflowNode().execute(
+            {"workflow_id": child.id, "inputs": {"x": 1}, "mode": "queue"}, {}
+        )
+
+        assert result["status"] == "queued"
+        run = queue.get(result["execution_id"])
+        assert run.workflow_id == child.id
+        assert run.trigger_data == {"x": 1}
+
+
+class TestCachedWorkflowLoading:
+    """Tests for reusing parsed workflow YAML."""
+
+    def test_cached_until_file_changes(self, storage):
+        """Test the parsed workflow is reused until its file changes."""
+        child = _child(storage)
+
+        first = storage.load_workflow_cached(child.id)
+        assert storage.load_workflow_cached(child.id) is first
+
+        file_path = storage._parsed[child.id][0]
+        stat = file_path.stat()
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert storage.load_workflow_cached(child.id) is not first
+
+    def test_save_and_delete_invalidate(self, storage):
+        """Test saving or deleting a workflow drops its cached copy."""
+        child = _child(storage)
+        first = storage.load_workflow_cached(child.id)
+
+        child.name = "Renamed"
+        storage.save_workflow(child)
+        assert storage.load_workflow_cached(child.id).name == "Renamed"
+        assert storage.load_workflow_cached(child.id) is not first
+
+        storage.delete_workflow(child.id)
+        assert storage.load_workflow_cached(child.id) is None
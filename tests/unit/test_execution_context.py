@@ -0,0 +1,238 @@
+"""
+Unit Tests for the Execution Context
+
+Tests for copy-on-write context state and branch-scoped variables.
+"""
+
+import pickle
+
+import pytest
+
+from src.core.nodes.base import BaseNode
+from src.core.workflow.context import ExecutionContext, ScopedMap
+from src.core.workflow.executor import WorkflowExecutor
+from src.core.workflow.models import Workflow, WorkflowConnection, WorkflowNode
+
+
+class VarsReaderNode(BaseNode):
+    """A node that reports the variables and outputs it can see."""
+
+    type = "vars-reader"
+    name = "Vars Reader"
+    category = "test"
+
+    async def execute(self, config: dict, context: dict):
+        return {"vars": dict(context["$vars"]), "nodes": sorted(context["$nodes"])}
+
+
+class MutatingNode(BaseNode):
+    """A node that tries to change shared context state."""
+
+    type = "mutator"
+    name = "Mutator"
+    category = "test"
+
+    async def execute(self, config: dict, context: dict):
+        errors = []
+        for key in ("$vars", "$nodes", "$trigger"):
+            try:
+                context[key]["injected"] = True
+            except TypeError:
+                errors.append(key)
+        context["local"] = True
+        return {"read_only": errors}
+
+
+@pytest.fixture
+def executor():
+    """Create an executor with the test nodes registered."""
+    executor = WorkflowExecutor()
+    executor.node_registry._handlers["vars-reader"] = VarsReaderNode
+    executor.node_registry._handlers["mutator"] = MutatingNode
+    yield executor
+    executor.node_registry._handlers.pop("vars-reader", None)
+    executor.node_registry._handlers.pop("mutator", None)
+
+
+class TestScopedMap:
+    """Tests for the layered variable map."""
+
+    def test_child_shares_parent(self):
+        """Test children see parent values and override them without copying."""
+        root = ScopedMap({"a": 1, "b": 2})
+        child = root.child({"b": 3, "c": 4})
+
+        assert dict(child) == {"a": 1, "b": 3, "c": 4}
+        assert dict(root) == {"a": 1, "b": 2}
+        assert child._parent is root
+
+    def test_dict_like_api(self):
+        """Test the map works wherever a read-only dict is expected."""
+        scope = ScopedMap({"a": 1}).child({"b": 2})
+        target = {}
+        target.update(scope)
+
+        assert target == {"a": 1, "b": 2}
+        assert scope.get("a") == 1
+        assert scope.get("missing", "x") == "x"
+        assert "b" in scope and "c" not in scope
+        assert list(scope.keys()) == ["a", "b"]
+        assert len(scope) == 2
+        assert scope == {"a": 1, "b": 2}
+
+    def test_copy_is_mutable(self):
+        """Test copy() gives the caller their own dict."""
+        scope = ScopedMap({"a": 1})
+        copy = scope.copy()
+        copy["a"] = 2
+
+        assert scope["a"] == 1
+
+    def test_empty_child_is_same_map(self):
+        """Test adding no variables doesn't add a layer."""
+        scope = ScopedMap({"a": 1})
+        assert scope.child(None) is scope
+        assert scope.child({}) is scope
+
+    def test_deep_chains_flatten(self):
+        """Test long chains are flattened to keep lookups fast."""
+        scope = ScopedMap()
+        for i in range(ScopedMap.MAX_DEPTH * 2):
+            scope = scope.child({f"v{i}": i})
+
+        assert scope._depth <= ScopedMap.MAX_DEPTH
+        assert scope["v0"] == 0
+        assert len(scope) == ScopedMap.MAX_DEPTH * 2
+
+    def test_pickles_flat(self):
+        """Test maps can be sent to worker processes."""
+        scope = ScopedMap({"a": 1}).child({"b": 2})
+        assert pickle.loads(pickle.dumps(scope)) == {"a": 1, "b": 2}
+
+
+class TestExecutionContext:
+    """Tests for the run-wide context."""
+
+    def test_node_context(self):
+        """Test node contexts expose read-only views of the run state."""
+        context = ExecutionContext(trigger={"t": 1}, variables={"v": 2})
+        context.set_output("n1", {"x": 1})
+
+        node_context = context.node_context(prev={"x": 1})
+        assert node_context["$trigger"]["t"] == 1
+        assert node_context["$vars"]["v"] == 2
+        assert node_context["$nodes"]["n1"] == {"x": 1}
+        assert node_context["$prev"] == {"x": 1}
+        assert "$prev" not in context.node_context()
+
+        with pytest.raises(TypeError):
+            node_context["$nodes"]["n2"] = {}
+
+    def test_nodes_view_is_live(self):
+        """Test outputs recorded later are visible through existing views."""
+        context = ExecutionContext()
+        nodes = context.node_context()["$nodes"]
+        context.set_output("n1", 1)
+
+        assert nodes["n1"] == 1
+
+    def test_fork_shares_outputs(self):
+        """Test forks see earlier outputs but don't write back to them."""
+        context = ExecutionContext(trigger={"t": 1})
+        context.set_output("n1", "first")
+
+        forked = context.fork(trigger={"t": 2})
+        forked.set_output("n2", "second")
+        forked.set_output("n1", "replaced")
+
+        assert forked.get_output("n1") == "replaced"
+        assert forked.trigger == {"t": 2}
+        assert dict(context.nodes) == {"n1": "first"}
+
+    def test_from_dict(self):
+        """Test plain context dicts (e.g. saved for resume) are accepted."""
+        context = ExecutionContext.from_dict(
+            {"$trigger": {"t": 1}, "$vars": {"v": 1}, "$nodes": {"n1": 1}, "$prev": 5, "x": 2}
+        )
+
+        assert context.has_prev and context.prev == 5
+        assert context.get_output("n1") == 1
+        assert context.node_context()["x"] == 2
+        assert ExecutionContext.from_dict(context) is context
+
+
+class TestExecutorContext:
+    """Tests for context handling in the executor."""
+
+    @pytest.mark.asyncio
+    async def test_nodes_cannot_mutate_shared_state(self, executor):
+        """Test nodes get read-only views and private top-level dicts."""
+        workflow = Workflow(
+            name="Mutate",
+            nodes=[
+                WorkflowNode(id="m", type="mutator", name="Mutator"),
+                WorkflowNode(id="r", type="vars-reader", name="Reader"),
+            ],
+            connections=[WorkflowConnection(source_node_id="m", target_node_id="r")],
+            variables={"v": 1},
+        )
+
+        execution = await executor.execute(workflow, {"t": 1})
+
+        assert execution.status == "completed"
+        assert execution.get_result("m").data["read_only"] == ["$vars", "$nodes", "$trigger"]
+        assert execution.get_result("r").data["vars"] == {"v": 1}
+        assert execution.trigger_data == {"t": 1}
+        assert workflow.variables == {"v": 1}
+
+    @pytest.mark.asyncio
+    async def test_variables_scoped_to_branch(self, executor):
+        """Test variables set on one branch are only visible downstream of it."""
+        set_x = WorkflowNode(
+            id="set",
+            type="set_variable",
+            name="Set X",
+            config={"variable_name": "x", "value": "1", "value_type": "number"},
+        )
+        workflow = Workflow(
+            name="Scopes",
+            nodes=[
+                WorkflowNode(id="start", type="vars-reader", name="Start"),
+                set_x,
+                WorkflowNode(id="after", type="vars-reader", name="After"),
+                WorkflowNode(id="other", type="vars-reader", name="Other"),
+            ],
+            connections=[
+                WorkflowConnection(source_node_id="start", target_node_id="set"),
+                WorkflowConnection(source_node_id="set", target_node_id="after"),
+                WorkflowConnection(source_node_id="start", target_node_id="other"),
+            ],
+            variables={"base": True},
+        )
+
+        execution = await executor.execute(workflow)
+
+        assert execution.status == "completed"
+        assert execution.get_result("after").data["vars"] == {"base": True, "x": 1}
+        assert execution.get_result("other").data["vars"] == {"base": True}
+        assert workflow.variables == {"base": True}
+
+    @pytest.mark.asyncio
+    async def test_resume_from_context_dict(self, executor):
+        """Test resuming from a plain context dict reuses its outputs."""
+        workflow = Workflow(
+            name="Resume",
+            nodes=[
+                WorkflowNode(id="a", type="vars-reader", name="A"),
+                WorkflowNode(id="b", type="vars-reader", name="B"),
+            ],
+            connections=[WorkflowConnection(source_node_id="a", target_node_id="b")],
+        )
+        previous = {"$trigger": {}, "$vars": {"v": 1}, "$nodes": {"a": {"saved": True}}}
+
+        execution = await executor.execute(workflow, resume_from="b", previous_context=previous)
+
+        assert execution.status == "completed"
+        assert [r.node_id for r in execution.node_results] == ["b"]
+        assert execution.get_result("b").data == {"vars": {"v": 1}, "nodes": ["a"]}
+        assert previous["$nodes"] == {"a": {"saved": True}}
@@ -0,0 +1,166 @@
+"""
+Unit Tests for Execution Plans
+
+Tests for compile_plan and ExecutionPlanCache.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.core.nodes.registry import NodeRegistry
+from src.core.workflow.models import Workflow, WorkflowConnection, WorkflowNode
+from src.core.workflow.plan import ExecutionPlanCache, compile_plan
+
+
+def _diamond_workflow() -> Workflow:
+    """Build an A -> (B, C) -> D workflow."""
+    a = WorkflowNode(id="a", type="manual_trigger", name="A")
+    b = WorkflowNode(id="b", type="log_debug", name="B")
+    c = WorkflowNode(id="c", type="log_debug", name="C")
+    d = WorkflowNode(id="d", type="log_debug", name="D")
+    return Workflow(
+        name="Diamond",
+        nodes=[a, b, c, d],
+        connections=[
+            WorkflowConnection(source_node_id="a", target_node_id="b"),
+            WorkflowConnection(source_node_id="a", target_node_id="c"),
+            WorkflowConnection(source_node_id="b", target_node_id="d"),
+            WorkflowConnection(source_node_id="c", target_node_id="d"),
+        ],
+    )
+
+
+class TestCompilePlan:
+    """Tests for compile_plan."""
+
+    def test_order_and_levels(self):
+        """Test topological order and level grouping."""
+        plan = compile_plan(_diamond_workflow())
+
+        assert plan.order[0] == "a"
+        assert plan.order[-1] == "d"
+        assert plan.levels == (("a",), ("b", "c"), ("d",))
+        assert plan.roots == ("a",)
+
+    def test_predecessors_and_successors(self):
+        """Test adjacency lists."""
+        plan = compile_plan(_diamond_workflow())
+
+        assert plan.predecessors["d"] == ("b", "c")
+        assert plan.successors["a"] == ("b", "c")
+        assert plan.predecessors["a"] == ()
+
+    def test_node_index_lookup(self):
+        """Test nodes are looked up by index instead of scanning."""
+        workflow = _diamond_workflow()
+        plan = compile_plan(workflow)
+
+        assert plan.get_node(workflow, "c") is workflow.nodes[2]
+        assert plan.get_node(workflow, "missing") is None
+
+    def test_handler_classes_resolved(self):
+        """Test handler classes are resolved at compile time."""
+        plan = compile_plan(_diamond_workflow())
+
+        registry = NodeRegistry()
+        assert plan.get_handler_class("log_debug") is registry.get_handler_class("log_debug")
+
+    def test_cycle_nodes_excluded(self):
+        """Test nodes in a cycle are left out of the order."""
+        workflow = Workflow(
+            name="Cycle",
+            nodes=[
+                WorkflowNode(id="a", type="log_debug", name="A"),
+                WorkflowNode(id="b", type="log_debug", name="B"),
+                WorkflowNode(id="c", type="log_debug", name="C"),
+            ],
+            connections=[
+                WorkflowConnection(source_node_id="a", target_node_id="b"),
+                WorkflowConnection(source_node_id="b", target_node_id="c"),
+                WorkflowConnection(source_node_id="c", target_node_id="b"),
+            ],
+        )
+
+        plan = compile_plan(workflow)
+
+        assert plan.order == ("a",)
+        assert plan.successors["a"] == ()
+
+    def test_downstream(self):
+        """Test the downstream closure of a set of nodes."""
+        plan = compile_plan(_diamond_workflow())
+
+        assert plan.downstream({"b"}) == {"b", "d"}
+        assert plan.downstream({"a"}) == {"a", "b", "c", "d"}
+        assert plan.downstream({"missing"}) == set()
+
+    def test_plan_is_immutable(self):
+        """Test the plan cannot be modified."""
+        plan = compile_plan(_diamond_workflow())
+
+        with pytest.raises(AttributeError):
+            plan.order = ()
+        with pytest.raises(TypeError):
+            plan.predecessors["a"] = ("x",)
+
+
+class TestExecutionPlanCache:
+    """Tests for ExecutionPlanCache."""
+
+    def test_reuses_plan_for_same_version(self):
+        """Test the same plan is returned for an unchanged workflow."""
+        cache = ExecutionPlanCache()
+        workflow = _diamond_workflow()
+
+        first = cache.get(workflow)
+        second = cache.get(Workflow.from_yaml(workflow.to_yaml()))
+
+        assert first is second
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_recompiles_on_new_version(self):
+        """Test a new updated_at produces a new plan."""
+        cache = ExecutionPlanCache()
+        workflow = _diamond_workflow()
+
+        first = cache.get(workflow)
+        workflow.updated_at = datetime.now(UTC) + timedelta(seconds=1)
+        second = cache.get(workflow)
+
+        assert first is not second
+
+    def test_recompiles_on_unsaved_graph_edit(self):
+        """Test graph edits are picked up even if updated_at was not bumped."""
+        cache = ExecutionPlanCache()
+        workflow = _diamond_workflow()
+
+        first = cache.get(workflow)
+        workflow.nodes.append(WorkflowNode(id="e", type="log_debug", name="E"))
+        workflow.connections.append(WorkflowConnection(source_node_id="d", target_node_id="e"))
+        second = cache.get(workflow)
+
+        assert first is not second
+        assert second.order[-1] == "e"
+
+    def test_evicts_least_recently_used(self):
+        """Test the cache is bounded."""
+        cache = ExecutionPlanCache(max_size=2)
+
+        workflows = [_diamond_workflow() for _ in range(3)]
+        for workflow in workflows:
+            workflow.id = f"wf-{id(workflow)}"
+            cache.get(workflow)
+
+        assert len(cache) == 2
+
+    def test_invalidate(self):
+        """Test invalidating a single workflow."""
+        cache = ExecutionPlanCache()
+        workflow = _diamond_workflow()
+        cache.get(workflow)
+
+        cache.invalidate(workflow.id)
+
+        assert len(cache) == 0
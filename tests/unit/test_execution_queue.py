@@ -0,0 +1,291 @@
+"""
+Unit Tests for the Execution Queue
+
+Tests for priorities, per-workflow limits, leases and the worker pool.
+"""
+
+import asyncio
+import sqlite3
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.core.webhooks import manager as webhooks
+from src.core.workflow import queue as queue_module
+from src.core.workflow.models import WorkflowExecution
+from src.core.workflow.queue import ExecutionQueue
+from src.data.storage import WorkflowStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """Create storage in a temporary directory."""
+    return WorkflowStorage(data_dir=str(tmp_path))
+
+
+def _make_queue(storage, runner=None, **kwargs) -> ExecutionQueue:
+    async def default_runner(workflow_id, trigger_data, trigger_type):
+        return WorkflowExecution(workflow_id=workflow_id, status="completed")
+
+    kwargs.setdefault("poll_interval", 0.01)
+    return ExecutionQueue(storage=storage, runner=runner or default_runner, **kwargs)
+
+
+def _execution_status(storage, run_id):
+    rows = [e for e in storage.get_executions(limit=100) if e["id"] == run_id]
+    return rows[0]["status"] if rows else None
+
+
+def _make_available(queue, run_id):
+    """Skip the backoff delay of a requeued run."""
+    conn = queue._connect()
+    conn.execute("UPDATE execution_queue SET available_at = 0 WHERE id = ?", (run_id,))
+    conn.close()
+
+
+class TestQueueing:
+    """Tests for enqueueing and claiming runs."""
+
+    def test_enqueue_records_queued_execution(self, storage):
+        """Test queued runs are visible in execution history."""
+        queue = _make_queue(storage)
+
+        run_id = queue.enqueue("wf-1", {"a": 1}, trigger_type="webhook")
+
+        assert queue.get(run_id).status == "queued"
+        assert queue.get(run_id).trigger_data == {"a": 1}
+        assert _execution_status(storage, run_id) == "queued"
+        assert queue.pending_count() == 1
+
+    def test_priority_lanes(self, storage):
+        """Test manual runs are claimed before webhook runs before scheduled runs."""
+        queue = _make_queue(storage, workflow_concurrency=10)
+        schedule = queue.enqueue("wf", trigger_type="schedule")
+        webhook = queue.enqueue("wf", trigger_type="webhook")
+        manual = queue.enqueue("wf", trigger_type="manual")
+
+        claimed = [queue.claim("w").id for _ in range(3)]
+
+        assert claimed == [manual, webhook, schedule]
+        assert queue.claim("w") is None
+
+    def test_fifo_within_lane(self, storage):
+        """Test runs in the same lane are claimed oldest first."""
+        queue = _make_queue(storage, workflow_concurrency=10)
+        first = queue.enqueue("wf", trigger_type="webhook")
+        second = queue.enqueue("wf", trigger_type="webhook")
+
+        assert queue.claim("w").id == first
+        assert queue.claim("w").id == second
+
+    def test_per_workflow_limit(self, storage):
+        """Test a busy workflow does not block other workflows."""
+        queue = _make_queue(storage, workflow_concurrency=1)
+        first = queue.enqueue("busy")
+        queue.enqueue("busy")
+        other = queue.enqueue("other")
+
+        assert queue.claim("w").id == first
+        assert queue.claim("w").id == other
+        assert queue.claim("w") is None
+
+        queue.complete(first, "w")
+        assert queue.claim("w").workflow_id == "busy"
+
+    def test_workflow_limit_override(self, storage):
+        """Test per-workflow limits can be raised."""
+        queue = _make_queue(storage, workflow_concurrency=1)
+        queue.set_workflow_limit("wf", 2)
+        queue.enqueue("wf")
+        queue.enqueue("wf")
+
+        assert queue.claim("w") is not None
+        assert queue.claim("w") is not None
+
+    def test_expired_lease_is_redelivered(self, storage):
+        """Test a run whose worker stopped renewing is claimed again."""
+        queue = _make_queue(storage, lease_timeout=0.01)
+        run_id = queue.enqueue("wf")
+        queue.claim("dead-worker")
+
+        time.sleep(0.02)
+        run = queue.claim("w2")
+
+        assert run.id == run_id
+        assert run.deliveries == 2
+        assert run.lease_owner == "w2"
+        # The old worker can no longer complete it
+        assert queue.complete(run_id, "dead-worker") is False
+        assert queue.complete(run_id, "w2") is True
+
+    def test_failed_delivery_requeued_then_dead(self, storage):
+        """Test failures are retried with a delay and given up after max_deliveries."""
+        queue = _make_queue(storage, max_deliveries=2)
+        run_id = queue.enqueue("wf")
+
+        queue.claim("w")
+        assert queue.fail(run_id, "w", "boom") == "queued"
+        # Backed off, so not immediately available
+        assert queue.claim("w") is None
+
+        _make_available(queue, run_id)
+        queue.claim("w")
+        assert queue.fail(run_id, "w", "boom again") == "dead"
+        assert queue.get(run_id).last_error == "boom again"
+
+
+@pytest.mark.asyncio
+class TestWorkers:
+    """Tests for the worker pool."""
+
+    async def test_workers_drain_queue(self, storage):
+        """Test workers run every queued run and save the execution."""
+        seen = []
+
+        async def runner(workflow_id, trigger_data, trigger_type):
+            seen.append((workflow_id, trigger_data, trigger_type))
+            return WorkflowExecution(workflow_id=workflow_id, status="completed")
+
+        queue = _make_queue(storage, runner=runner)
+        run_ids = [queue.enqueue(f"wf-{i}", {"i": i}, "webhook") for i in range(5)]
+
+        queue.start(workers=3)
+        try:
+            await queue.drain(timeout=5)
+        finally:
+            await queue.stop()
+
+        assert len(seen) == 5
+        assert all(queue.get(run_id).status == "done" for run_id in run_ids)
+        assert all(_execution_status(storage, run_id) == "completed" for run_id in run_ids)
+
+    async def test_running_status_visible(self, storage):
+        """Test a run in progress shows as running in execution history."""
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def runner(workflow_id, trigger_data, trigger_type):
+            started.set()
+            await release.wait()
+            return WorkflowExecution(workflow_id=workflow_id, status="completed")
+
+        queue = _make_queue(storage, runner=runner)
+        run_id = queue.enqueue("wf")
+        queue.start(workers=1)
+        try:
+            await asyncio.wait_for(started.wait(), timeout=5)
+            assert _execution_status(storage, run_id) == "running"
+            release.set()
+            await queue.wait(run_id, timeout=5)
+        finally:
+            await queue.stop()
+
+        assert _execution_status(storage, run_id) == "completed"
+
+    async def test_per_workflow_concurrency(self, storage):
+        """Test workers never exceed the per-workflow limit."""
+        active = 0
+        peak = 0
+
+        async def runner(workflow_id, trigger_data, trigger_type):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            return WorkflowExecution(workflow_id=workflow_id, status="completed")
+
+        queue = _make_queue(storage, runner=runner, workflow_concurrency=2)
+        for _ in range(6):
+            queue.enqueue("wf")
+
+        queue.start(workers=6)
+        try:
+            await queue.drain(timeout=5)
+        finally:
+            await queue.stop()
+
+        assert peak == 2
+
+    async def test_runner_error_marks_dead(self, storage):
+        """Test a run that keeps failing is recorded as failed."""
+
+        async def runner(workflow_id, trigger_data, trigger_type):
+            raise RuntimeError("workflow missing")
+
+        queue = _make_queue(storage, runner=runner, max_deliveries=1)
+        run_id = queue.enqueue("wf")
+        fail = queue.fail
+        recorded = []
+
+        def checked_fail(*args):
+            # The execution record must be final before wait() can see the dead row
+            recorded.append(_execution_status(storage, run_id))
+            return fail(*args)
+
+        queue.start(workers=1)
+        try:
+            with patch.object(queue, "fail", checked_fail):
+                run = await queue.wait(run_id, timeout=5)
+        finally:
+            await queue.stop()
+
+        assert run.status == "dead"
+        assert recorded == ["failed"]
+        assert _execution_status(storage, run_id) == "failed"
+
+    async def test_worker_survives_storage_errors(self, storage):
+        """Test a database error while recording a result doesn't stop the worker."""
+        save_execution = storage.save_execution
+        failures = []
+
+        def flaky_save(execution):
+            if execution.status == "completed" and not failures:
+                failures.append(execution.id)
+                raise sqlite3.OperationalError("database is locked")
+            return save_execution(execution)
+
+        storage.save_execution = flaky_save
+        queue = _make_queue(storage, lease_timeout=0.2)
+        first = queue.enqueue("wf")
+        second = queue.enqueue("wf")
+
+        queue.start(workers=1)
+        try:
+            await queue.wait(second, timeout=5)
+            # Redelivered once its lease expires
+            await queue.wait(first, timeout=5)
+        finally:
+            await queue.stop()
+
+        assert failures == [first]
+        assert _execution_status(storage, first) == "completed"
+        assert queue.get(first).deliveries == 2
+
+    async def test_webhook_callback_enqueues(self, storage):
+        """Test the webhook callback queues the run in the webhook lane."""
+        queue = _make_queue(storage)
+
+        result = await queue.trigger_callback("wf", {"body": "x"})
+
+        run = queue.get(result["id"])
+        assert result["status"] == "queued"
+        assert run.trigger_type == "webhook"
+        assert run.priority == 1
+
+    async def test_webhook_server_uses_queue(self, storage, tmp_path):
+        """Test the global webhook server sends webhook runs through the queue."""
+        queue = _make_queue(storage)
+        manager = webhooks.WebhookManager(store=webhooks.WebhookStore(tmp_path / "webhooks.db"))
+
+        with (
+            patch.object(queue_module, "_queue", queue),
+            patch.object(webhooks, "_manager", manager),
+            patch.object(webhooks, "_server", None),
+        ):
+            server = webhooks.get_webhook_server()
+
+        assert server.queue is queue
+        assert server.workers > 0
+        assert manager._trigger_callback == queue.trigger_callback
@@ -0,0 +1,172 @@
+"""
+Unit Tests for Batch Expression Evaluation
+
+Tests that evaluating an expression over many contexts or items at once gives
+the same values as evaluating it once per row.
+"""
+
+import pytest
+
+from src.core.expressions import (
+    ExpressionError,
+    ExpressionParser,
+    evaluate_batch,
+    evaluate_items,
+)
+from src.core.nodes.utility.transform import ArrayFilterNode
+
+
+@pytest.fixture
+def parser():
+    return ExpressionParser()
+
+
+@pytest.fixture
+def items():
+    # Mixed rows: ints, floats, strings, missing keys and non-dict items
+    rows = []
+    for n in range(200):
+        row = {"price": n * 1.5 if n % 3 else n, "name": f"item-{n}", "tags": ["a"] * (n % 4)}
+        if n % 7 == 0:
+            row["price"] = None
+        if n % 11 == 0:
+            del row["name"]
+        rows.append(row)
+    rows[5] = "not a dict"
+    return rows
+
+
+def _per_row(compiled, items, context=None):
+    context = context or {}
+    return [
+        compiled.evaluate({**context, "$prev": item, "$item": item, "$index": i})
+        for i, item in enumerate(items)
+    ]
+
+
+class TestEvaluateItems:
+    """Tests for evaluate_items."""
+
+    @pytest.mark.parametrize(
+        "expression",
+        [
+            "$item.price != null && $item.price > 100",
+            "$item.price == null || $item.price <= 10",
+            "$item.name == 'item-3'",
+            "$item.name",
+            "$item.tags.length",
+            "$item.price != null && $item.price * 2 - $vars.offset",
+            "$item.price != null && $item.price / ($index % 5)",
+            "-$index",
+            "!$item.name",
+            "$index >= $vars.offset",
+            "$upper($default($item.name, default='none'))",
+            "$vars.offset + 1",
+        ],
+    )
+    def test_matches_per_row(self, parser, items, expression):
+        """Test batch values match evaluating the expression once per item."""
+        compiled = parser.compile(expression)
+        context = {"$vars": {"offset": 50}}
+
+        assert evaluate_items(compiled, items, context) == _per_row(compiled, items, context)
+
+    def test_interpolated_text(self, parser, items):
+        """Test text with expressions inside is joined per item."""
+        compiled = parser.compile_string("#{{$index}}: {{$item.name}}")
+
+        values = evaluate_items(compiled, items)
+
+        assert values == _per_row(compiled, items)
+        assert values[1] == "#1: item-1"
+        assert values[0] == "#0: "
+
+    def test_numeric_result_types(self, parser):
+        """Test results are Python values, with division by zero giving 0."""
+        items = [{"price": n} for n in range(100)]
+        compiled = parser.compile("$item.price / ($index % 2)")
+
+        values = evaluate_items(compiled, items)
+
+        assert values == _per_row(compiled, items)
+        assert values[:2] == [0, 1.0]
+        assert type(values[0]) is int and type(values[1]) is float
+
+    def test_incomparable_values(self, parser, items):
+        """Test a row that can't be compared fails the whole batch."""
+        with pytest.raises(ExpressionError, match="Cannot compare"):
+            evaluate_items(parser.compile("$item.name > 1"), items)
+
+    def test_start_offsets_index(self, parser):
+        """Test $index starts at the given offset."""
+        values = evaluate_items(parser.compile("$index"), list(range(40)), start=100)
+
+        assert values == list(range(100, 140))
+
+
+class TestEvaluateBatch:
+    """Tests for evaluate_batch."""
+
+    def test_matches_per_context(self, parser):
+        """Test values shared by every context and values that differ per context."""
+        contexts = [
+            {"$vars": {"limit": 10}, "$trigger": {"n": n, "label": str(n)}} for n in range(64)
+        ]
+        for expression in ["$trigger.n * 2 > $vars.limit", "$trigger.label + '!'", "$vars.limit"]:
+            compiled = parser.compile(expression)
+
+            assert evaluate_batch(compiled, contexts) == [compiled(c) for c in contexts]
+
+    def test_small_batches(self, parser):
+        """Test batches too small to vectorize are evaluated per context."""
+        compiled = parser.compile("$prev.x + 1")
+
+        assert evaluate_batch(compiled, [{"$prev": {"x": 1}}, {"$prev": {"x": 2}}]) == [2.0, 3.0]
+
+
+class TestRenderBatch:
+    """Tests for rendering a compiled config for many contexts."""
+
+    def test_matches_render(self, parser):
+        """Test render_batch gives what render gives for each context."""
+        template = parser.compile_config(
+            {
+                "url": "https://api/items/{{$item.id}}",
+                "body": {"total": "{{$item.price * $item.qty}}", "tags": ["x", "{{$index}}"]},
+                "static": {"deep": [1, 2]},
+                "script": "{{$item.raw}}",
+            },
+            raw_keys=("script",),
+        )
+        contexts = [{"$item": {"id": n, "price": n, "qty": 2}, "$index": n} for n in range(50)]
+
+        rendered = template.render_batch(contexts)
+
+        assert rendered == [template.render(c) for c in contexts]
+        assert rendered[3]["body"] == {"total": 6.0, "tags": ["x", 3]}
+        assert rendered[3]["static"] == template.config["static"]
+        assert rendered[3]["static"] is not rendered[4]["static"]
+
+
+@pytest.mark.asyncio
+class TestArrayFilterCondition:
+    """Tests for ArrayFilterNode's condition expression."""
+
+    async def test_condition(self, items):
+        """Test items are kept where the condition is true."""
+        result = await ArrayFilterNode().execute(
+            {"items": items, "condition": "{{$item.price != null && $item.price > 100}}"},
+            {"$vars": {}},
+        )
+
+        expected = [i for i in items if isinstance(i, dict) and (i["price"] or 0) > 100]
+        assert result == {"filtered": expected, "count": len(expected)}
+
+    async def test_condition_reads_shared_context(self):
+        """Test the condition can compare items against workflow variables."""
+        result = await ArrayFilterNode().execute(
+            {"items": [{"n": n} for n in range(100)], "condition": "$item.n >= $vars.min"},
+            {"$vars": {"min": 97}},
+        )
+
+        assert result["filtered"] == [{"n": 97}, {"n": 98}, {"n": 99}]
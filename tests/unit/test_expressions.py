@@ -0,0 +1,325 @@
+"""
+Unit Tests for the Expression Engine
+
+Tests for tokenizing, parsing and evaluating compiled expressions, the
+compiled expression cache and compiled node configs.
+"""
+
+import pytest
+
+from src.core.expressions import (
+    ConfigTemplateCache,
+    ExpressionError,
+    ExpressionParser,
+    ExpressionSyntaxError,
+    resolve_expressions,
+)
+from src.core.expressions.compiler import (
+    Binary,
+    Call,
+    Literal,
+    Variable,
+    parse,
+    tokenize,
+)
+from tests.benchmarks.legacy_parser import LegacyExpressionParser
+
+
+@pytest.fixture
+def parser():
+    return ExpressionParser()
+
+
+@pytest.fixture
+def context():
+    return {
+        "$prev": {"items": [1, 2, 3], "name": "Ada", "price": 150},
+        "$trigger": {"count": "4"},
+        "$vars": {"limit": 2},
+        "$nodes": {"fetch-1": {"status": 200}},
+    }
+
+
+class TestParse:
+    """Tests for the tokenizer and parser."""
+
+    def test_tokens(self):
+        """Test path segments keep hyphens and negative indexes."""
+        kinds = [(t.kind, t.text) for t in tokenize("$nodes.a-b.items.-1 - 2")]
+        assert kinds == [
+            ("variable", "$nodes"),
+            ("op", "."),
+            ("segment", "a-b"),
+            ("op", "."),
+            ("segment", "items"),
+            ("op", "."),
+            ("segment", "-1"),
+            ("op", "-"),
+            ("number", "2"),
+            ("end", ""),
+        ]
+
+    def test_precedence(self):
+        """Test multiplication binds tighter than addition."""
+        assert parse("1 + 2 * 3") == Binary("+", Literal(1), Binary("*", Literal(2), Literal(3)))
+
+    def test_node_alias(self):
+        """Test $node.X is parsed as $nodes.X."""
+        assert parse("$node.fetch.body") == Variable("$nodes", ("fetch", "body"))
+
+    def test_call_with_keyword(self):
+        """Test function calls with positional and keyword arguments."""
+        assert parse("$round($prev.x, digits=2)") == Call(
+            "round", (Variable("$prev", ("x",)),), (("digits", Literal(2)),)
+        )
+
+    @pytest.mark.parametrize("text", ["1 +", "(1", "f(1 2)", "a @ b"])
+    def test_syntax_errors(self, text):
+        """Test malformed expressions raise ExpressionSyntaxError."""
+        with pytest.raises(ExpressionSyntaxError):
+            parse(text)
+
+
+class TestEvaluate:
+    """Tests for evaluating compiled expressions."""
+
+    @pytest.mark.parametrize(
+        "expression, expected",
+        [
+            ("$prev.items.length", 3),
+            ("$prev.items.last", 3),
+            ("$prev.items.-2", 2),
+            ("$nodes.fetch-1.status", 200),
+            ("$prev.missing.deeper", None),
+            ("$trigger.count + 1", 5.0),
+            ("$vars.limit + 3 * 2", 8.0),
+            ("($vars.limit + 3) * 2", 10.0),
+            ("-$vars.limit", -2.0),
+            ("-5", -5),
+            ("$prev.price > 100 && $prev.name == 'Ada'", True),
+            ("!$prev.missing", True),
+            ("'a' + 'b'", "ab"),
+            ("$length($prev.items) >= 3", True),
+            ("upper($prev.name)", "ADA"),
+            ("$default($prev.missing, default='none')", "none"),
+            ("true", True),
+            ("null", None),
+            ("hello", "hello"),
+            ("example.com", "example.com"),
+            ("not an expression", "not an expression"),
+        ],
+    )
+    def test_values(self, parser, context, expression, expected):
+        """Test expressions evaluate like the documented examples."""
+        assert parser.evaluate(expression, context) == expected
+
+    def test_unknown_function(self, parser, context):
+        """Test calling an unknown function raises ExpressionError."""
+        with pytest.raises(ExpressionError, match="Unknown function"):
+            parser.evaluate("$nope()", context)
+
+    def test_incomparable_values(self, parser, context):
+        """Test ordering values of different types raises ExpressionError."""
+        with pytest.raises(ExpressionError, match="Cannot compare"):
+            parser.evaluate("$prev.items > 1", context)
+
+    def test_constants_folded(self, parser, context):
+        """Test operators on constants are evaluated when compiling."""
+        compiled = parser.compile("60 * 60 * 24 + $prev.price")
+
+        assert compiled.node == Binary("+", Literal(86400.0), Variable("$prev", ("price",)))
+        assert compiled(context) == 86550.0
+        assert parser.compile("false && $nope($prev)").node == Literal(False)
+        assert parser.compile("1 < 'a' || $prev.price").node.op == "||"
+
+    def test_function_registered_after_compile(self, parser, context):
+        """Test functions are looked up when called, not when compiled."""
+        compiled = parser.compile("$shout($prev.name)")
+        parser.BUILTIN_FUNCTIONS["shout"] = lambda x: x.upper() + "!"
+
+        assert compiled(context) == "ADA!"
+
+
+class TestPrecedence:
+    """Expressions the legacy string-splitting evaluator got wrong."""
+
+    @pytest.fixture
+    def order(self):
+        return {
+            "$prev": {
+                "order": {"subtotal": 180.5, "total": 194.94, "items": [{"qty": 2}, {"qty": 1}]},
+                "customer": {"tier": "gold"},
+            },
+            "$vars": {"min_total": 100},
+        }
+
+    @pytest.mark.parametrize(
+        "expression, expected",
+        [
+            ("3 * 10 % 4", 2.0),
+            ("(1 + 2) * 3", 9.0),
+            ("-$prev.order.items.length * 2", -4.0),
+            ("$vars.min_total - ($prev.order.subtotal - 80.5)", 0.0),
+            ("!$prev.missing || $prev.order.total > 1000", True),
+            ("$prev.order.total > 1000 || $prev.customer.tier == 'gold'", True),
+            ("$prev.order.total > 100 && $prev.customer.tier == 'gold'", True),
+            ("$length($prev.order.items) > 1 && $prev.order.total > 100", True),
+            ("1 + 2 == 3 && 2 * 3 == 6", True),
+        ],
+    )
+    def test_compiled_is_correct(self, parser, order, expression, expected):
+        """Test the compiled evaluator respects precedence where the legacy one didn't."""
+        assert parser.evaluate(expression, order) == expected
+        assert LegacyExpressionParser().evaluate(expression, order) != expected
+
+    def test_short_circuit_skips_calls(self, parser, order):
+        """Test the right side of && and || isn't evaluated when the left decides."""
+        calls = []
+        parser.BUILTIN_FUNCTIONS["expensive"] = lambda x: calls.append(x) or x
+
+        assert not parser.evaluate("$prev.order.total > 1000 && $expensive($prev.order)", order)
+        assert parser.evaluate("$prev.customer.tier == 'gold' || $expensive(1)", order)
+        assert calls == []
+
+
+class TestResolve:
+    """Tests for resolving expressions in config values."""
+
+    def test_whole_value_keeps_type(self, context):
+        """Test a string that is one expression resolves to the raw value."""
+        assert resolve_expressions({"x": "{{$prev.items}}"}, context) == {"x": [1, 2, 3]}
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("{{Content-Type}}", "Content-Type"),
+            ("{{application/json}}", "application/json"),
+            ("{{x-api-key}}", "x-api-key"),
+            ("{{2024-01-15}}", "2024-01-15"),
+            ("{{1.5.3}}", "1.5.3"),
+            ("Bearer {{Content-Type}}", "Bearer Content-Type"),
+            ("{{1.5}}", 1.5),
+            ("{{10 - 2}}", 8.0),
+        ],
+    )
+    def test_bare_words(self, context, value, expected):
+        """Test unquoted words joined by -, / or . stay text instead of becoming arithmetic."""
+        assert resolve_expressions(value, context) == expected
+
+    def test_interpolation(self, context):
+        """Test expressions inside text are converted to strings."""
+        value = "{{$prev.name}} has {{$prev.items.length}} items{{$prev.missing}}."
+
+        assert resolve_expressions(value, context) == "Ada has 3 items."
+
+    def test_compiled_once(self, parser, context):
+        """Test repeated resolution reuses the compiled expression and string."""
+        config = {"a": "{{$prev.price * 2}}", "b": "Hi {{$prev.name}}", "c": "plain"}
+        for _ in range(3):
+            assert parser.resolve(config, context) == {
+                "a": 300.0,
+                "b": "Hi Ada",
+                "c": "plain",
+            }
+
+        info = parser.cache_info()
+        assert info["expressions"].misses == 2
+        assert info["strings"].misses == 3
+        assert info["strings"].hits == 6
+
+    def test_cache_is_bounded(self, context):
+        """Test least recently used expressions are dropped."""
+        parser = ExpressionParser(cache_size=2)
+        for n in range(5):
+            parser.evaluate(f"{n} + 1", context)
+
+        assert parser.cache_info()["expressions"].currsize == 2
+
+
+class TestConfigTemplate:
+    """Tests for node configs compiled into templates."""
+
+    def test_leaves(self, parser):
+        """Test only expression and interpolated strings are recorded as leaves."""
+        config = {
+            "url": "https://example.com",
+            "body": {"id": "{{$prev.id}}", "tags": ["a", "Hi {{$prev.name}}"]},
+            "static": {"deep": {"list": [1, 2, 3]}},
+            "count": 3,
+        }
+        template = parser.compile_config(config)
+
+        assert [(leaf.path, leaf.kind) for leaf in template.leaves] == [
+            (("body", "id"), "expression"),
+            (("body", "tags", 1), "interpolated"),
+        ]
+        assert [e.source for e in template.expressions] == ["$prev.id", "$prev.name"]
+
+    def test_render_copies_literal_subtrees(self, parser, context):
+        """Test rendering resolves dynamic leaves and copies literal sub-trees."""
+        config = {
+            "body": {"name": "{{$prev.name}}", "tags": ["x", "{{$prev.items.length}} items"]},
+            "static": {"deep": [1, 2, 3]},
+        }
+        resolved = parser.compile_config(config).render(context)
+
+        assert resolved == {
+            "body": {"name": "Ada", "tags": ["x", "3 items"]},
+            "static": {"deep": [1, 2, 3]},
+        }
+        assert resolved is not config
+        assert resolved["static"] is not config["static"]
+        assert resolved["static"]["deep"] is not config["static"]["deep"]
+        assert resolved["body"] is not config["body"]
+
+    def test_mutating_render_keeps_config(self, parser, context):
+        """Test modifying a rendered config in place doesn't change the template's."""
+        config = {"headers": {"Accept": "application/json"}, "ids": [1, 2], "url": "{{$prev.name}}"}
+        template = parser.compile_config(config)
+
+        first = template.render(context)
+        first["headers"]["Authorization"] = "secret"
+        first["ids"].append(3)
+
+        assert config == {
+            "headers": {"Accept": "application/json"},
+            "ids": [1, 2],
+            "url": "{{$prev.name}}",
+        }
+        assert template.render(context)["headers"] == {"Accept": "application/json"}
+        static = parser.compile_config({"a": {"b": [1]}})
+        static.render(context)["a"]["b"].append(2)
+        assert static.render(context) == {"a": {"b": [1]}}
+
+    def test_raw_keys(self, parser, context):
+        """Test raw keys are passed through as written."""
+        template = parser.compile_config(
+            {"subgraph": {"value": "{{$trigger.item}}"}, "x": "{{$vars.limit}}"},
+            raw_keys=("subgraph",),
+        )
+
+        assert template.render(context) == {
+            "subgraph": {"value": "{{$trigger.item}}"},
+            "x": 2,
+        }
+
+    def test_static_config(self, parser, context):
+        """Test a config without expressions is static."""
+        template = parser.compile_config({"a": 1, "b": ["x"]})
+
+        assert template.is_static
+        assert template.render(context) == {"a": 1, "b": ["x"]}
+
+    def test_cache_keyed_by_version(self):
+        """Test the cache compiles again when the version key changes."""
+        cache = ConfigTemplateCache(max_size=2)
+        config = {"a": "{{$prev.x}}"}
+
+        first = cache.get("v1", config)
+        assert cache.get("v1", config) is first
+        config["a"] = "{{$prev.y}}"
+        assert cache.get("v2", config).render({"$prev": {"y": 5}}) == {"a": 5}
+        cache.get("v3", config)
+
+        assert len(cache) == 2
+        assert (cache.hits, cache.misses) == (1, 3)
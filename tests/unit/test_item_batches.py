@@ -0,0 +1,218 @@
+"""
+Unit Tests for Item Batches
+
+Tests for running nodes once per item of their upstream output.
+"""
+
+import asyncio
+
+import pytest
+
+from src.core.nodes.base import BaseNode
+from src.core.workflow.executor import WorkflowExecutor
+from src.core.workflow.items import ItemsPolicy, batched, get_items, get_items_policy
+from src.core.workflow.models import Workflow, WorkflowConnection, WorkflowNode
+
+
+class RowsNode(BaseNode):
+    """A node that outputs a configurable number of rows."""
+
+    type = "rows"
+    name = "Rows"
+    category = "test"
+
+    async def execute(self, config: dict, context: dict):
+        return {"data": {"rows": [{"n": i} for i in range(config.get("count", 5))]}}
+
+
+class DoubleNode(BaseNode):
+    """A node that doubles one value, with a random-ish delay."""
+
+    type = "double"
+    name = "Double"
+    category = "test"
+
+    running = 0
+    max_running = 0
+
+    async def execute(self, config: dict, context: dict):
+        DoubleNode.running += 1
+        DoubleNode.max_running = max(DoubleNode.max_running, DoubleNode.running)
+        try:
+            value = config["value"]
+            if value == config.get("fail_on"):
+                raise ValueError(f"bad value {value}")
+            await asyncio.sleep(0.001 * (7 - value % 7))
+            return {"doubled": value * 2, "index": context["$index"]}
+        finally:
+            DoubleNode.running -= 1
+
+
+class BulkNode(BaseNode):
+    """A node with an execute_batch fast path that records batch sizes."""
+
+    type = "bulk"
+    name = "Bulk"
+    category = "test"
+
+    batches: list[int] = []
+
+    async def execute(self, config: dict, context: dict):
+        raise AssertionError("execute() should not be called in items mode")
+
+    async def execute_batch(self, configs: list[dict], contexts: list[dict]):
+        BulkNode.batches.append(len(configs))
+        return [{"value": config["value"]} for config in configs]
+
+
+@pytest.fixture
+def executor():
+    """Create an executor with the test nodes registered."""
+    executor = WorkflowExecutor()
+    for node_class in (RowsNode, DoubleNode, BulkNode):
+        executor.node_registry._handlers[node_class.type] = node_class
+    DoubleNode.running = DoubleNode.max_running = 0
+    BulkNode.batches = []
+    yield executor
+    for node_class in (RowsNode, DoubleNode, BulkNode):
+        executor.node_registry._handlers.pop(node_class.type, None)
+
+
+def _workflow(node_type: str, config: dict, count: int = 5) -> Workflow:
+    return Workflow(
+        name="Items",
+        nodes=[
+            WorkflowNode(id="rows", type="rows", name="Rows", config={"count": count}),
+            WorkflowNode(id="each", type=node_type, name="Each", config=config),
+        ],
+        connections=[WorkflowConnection(source_node_id="rows", target_node_id="each")],
+    )
+
+
+class TestItemsPolicy:
+    """Tests for reading items settings and finding items."""
+
+    def test_policy(self):
+        """Test the items setting forms."""
+        assert get_items_policy({}) is None
+        assert get_items_policy({"items_mode": True}) == ItemsPolicy()
+        assert get_items_policy({"items_mode": {"enabled": False}}) is None
+        policy = get_items_policy({"items_mode": {"batch_size": "10", "concurrency": 0}})
+        assert policy.batch_size == 10
+        assert policy.concurrency == 1
+
+    def test_get_items(self):
+        """Test finding the item list in an upstream output."""
+        assert get_items([1, 2]) == [1, 2]
+        assert get_items({"items": [1]}) == [1]
+        assert get_items({"data": {"rows": [3]}}, "data.rows") == [3]
+        assert get_items({"pages": [{"rows": [4]}]}, "pages.0.rows") == [4]
+
+        with pytest.raises(ValueError, match=r"\$prev.data"):
+            get_items({"data": {}}, "data")
+
+    def test_batched(self):
+        """Test splitting into batches."""
+        assert batched([1, 2, 3, 4, 5], 2) == [[1, 2], [3, 4], [5]]
+        assert batched([], 2) == []
+
+
+class TestItemsExecution:
+    """Tests for running nodes in items mode."""
+
+    @pytest.mark.asyncio
+    async def test_per_item_results_in_order(self, executor):
+        """Test each item runs with its own config and results keep input order."""
+        config = {
+            "value": "{{$item.n}}",
+            "items_mode": {"path": "data.rows", "batch_size": 2, "concurrency": 3},
+        }
+        execution = await executor.execute(_workflow("double", config, count=9))
+
+        assert execution.status == "completed"
+        output = execution.get_result("each").data
+        assert [o["doubled"] for o in output] == [i * 2 for i in range(9)]
+        assert [o["index"] for o in output] == list(range(9))
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bounded(self, executor):
+        """Test no more batches than the concurrency limit run at once."""
+        config = {
+            "value": "{{$prev.n}}",
+            "items_mode": {"path": "data.rows", "batch_size": 1, "concurrency": 2},
+        }
+        execution = await executor.execute(_workflow("double", config, count=10))
+
+        assert execution.status == "completed"
+        assert DoubleNode.max_running == 2
+
+    @pytest.mark.asyncio
+    async def test_fast_path_gets_batches(self, executor):
+        """Test nodes with execute_batch get one call per batch."""
+        config = {"value": "{{$item.n}}", "items_mode": {"path": "data.rows", "batch_size": 4}}
+        execution = await executor.execute(_workflow("bulk", config, count=10))
+
+        assert execution.status == "completed"
+        assert sorted(BulkNode.batches) == [2, 4, 4]
+        assert [o["value"] for o in execution.get_result("each").data] == list(range(10))
+
+    @pytest.mark.asyncio
+    async def test_item_failure_fails_node(self, executor):
+        """Test a failed item fails the node by default."""
+        config = {"value": "{{$item.n}}", "fail_on": 3, "items_mode": {"path": "data.rows"}}
+        execution = await executor.execute(_workflow("double", config))
+
+        assert execution.status == "failed"
+        assert "bad value 3" in execution.get_result("each").error
+
+    @pytest.mark.asyncio
+    async def test_continue_on_error(self, executor):
+        """Test failed items can be recorded in place instead."""
+        config = {
+            "value": "{{$item.n}}",
+            "fail_on": 3,
+            "items_mode": {"path": "data.rows", "continue_on_error": True},
+        }
+        execution = await executor.execute(_workflow("double", config))
+
+        assert execution.status == "completed"
+        output = execution.get_result("each").data
+        assert output[3] == {"error": "bad value 3", "index": 3}
+        assert output[4]["doubled"] == 8
+
+    @pytest.mark.asyncio
+    async def test_missing_list_fails(self, executor):
+        """Test items mode without an upstream list fails clearly."""
+        config = {"value": 1, "items_mode": {"path": "data.missing"}}
+        execution = await executor.execute(_workflow("double", config))
+
+        assert execution.status == "failed"
+        assert "needs a list" in execution.get_result("each").error
+
+    @pytest.mark.asyncio
+    async def test_items_input_is_not_items_mode(self, executor):
+        """Test nodes whose ``items`` input is a list run once, as configured."""
+        workflow = Workflow(
+            name="Items input",
+            nodes=[
+                WorkflowNode(id="rows", type="rows", name="Rows", config={"count": 2}),
+                WorkflowNode(
+                    id="join", type="text-join", name="Join", config={"items": ["a", "b"]}
+                ),
+                WorkflowNode(
+                    id="filter",
+                    type="array-filter",
+                    name="Filter",
+                    config={"items": [1, 5, 9], "operator": "greater_than", "value": "4"},
+                ),
+            ],
+            connections=[
+                WorkflowConnection(source_node_id="rows", target_node_id="join"),
+                WorkflowConnection(source_node_id="join", target_node_id="filter"),
+            ],
+        )
+        execution = await executor.execute(workflow)
+
+        assert execution.status == "completed"
+        assert execution.get_result("join").data == {"text": "a, b"}
+        assert execution.get_result("filter").data == {"filtered": [5, 9], "count": 2}
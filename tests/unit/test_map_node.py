@@ -0,0 +1,175 @@
+"""
+Unit Tests for the Map Node
+
+Tests for running a sub-workflow once per array element.
+"""
+
+import asyncio
+
+import pytest
+
+import src.data.storage as storage_module
+from src.core.nodes.base import BaseNode
+from src.core.nodes.flow.map import MapNode, add_progress_listener, remove_progress_listener
+from src.core.workflow.executor import WorkflowExecutor
+from src.core.workflow.models import Workflow, WorkflowConnection, WorkflowNode
+from src.data.storage import WorkflowStorage
+
+
+class SquareNode(BaseNode):
+    """A node that squares its value after a delay, tracking concurrency."""
+
+    type = "square"
+    name = "Square"
+    category = "test"
+
+    running = 0
+    max_running = 0
+
+    async def execute(self, config: dict, context: dict):
+        SquareNode.running += 1
+        SquareNode.max_running = max(SquareNode.max_running, SquareNode.running)
+        try:
+            value = config["value"]
+            if value == config.get("fail_on"):
+                raise ValueError(f"bad value {value}")
+            await asyncio.sleep(0.001 * config.get("delay", 0))
+            return {"square": value * value}
+        finally:
+            SquareNode.running -= 1
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """Use storage in a temporary directory as the global storage."""
+    storage = WorkflowStorage(data_dir=str(tmp_path))
+    monkeypatch.setattr(storage_module, "_storage", storage)
+    return storage
+
+
+@pytest.fixture
+def executor():
+    """Create an executor with the test node registered."""
+    executor = WorkflowExecutor()
+    executor.node_registry._handlers["square"] = SquareNode
+    SquareNode.running = SquareNode.max_running = 0
+    yield executor
+    executor.node_registry._handlers.pop("square", None)
+
+
+def _subgraph(**config) -> dict:
+    return {
+        "nodes": [
+            {
+                "id": "sq",
+                "type": "square",
+                "name": "Square",
+                "config": {"value": "{{$trigger.item}}", **config},
+            }
+        ]
+    }
+
+
+class TestMapNode:
+    """Tests for the node."""
+
+    @pytest.mark.asyncio
+    async def test_subgraph_per_item(self, executor):
+        """Test each element runs the sub-graph and results keep input order."""
+        result = await MapNode().execute({"array": [1, 2, 3], "subgraph": _subgraph()}, {})
+
+        assert result["results"] == [{"square": 1}, {"square": 4}, {"square": 9}]
+        assert result["indexes"] == [0, 1, 2]
+        assert result["total"] == 3 and result["failed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bounded(self, executor):
+        """Test no more items than max_concurrency run at once."""
+        await MapNode().execute(
+            {
+                "array": list(range(8)),
+                "subgraph": _subgraph(delay=2),
+                "max_concurrency": 3,
+            },
+            {},
+        )
+
+        assert SquareNode.max_running == 3
+
+    @pytest.mark.asyncio
+    async def test_unordered(self, executor):
+        """Test unordered results come back as items finish, with their indexes."""
+        subgraph = _subgraph(delay="{{10 - $trigger.item}}")
+        result = await MapNode().execute(
+            {"array": [0, 5, 9], "subgraph": subgraph, "ordered": False}, {}
+        )
+
+        assert result["indexes"] == [2, 1, 0]
+        assert result["results"] == [{"square": 81}, {"square": 25}, {"square": 0}]
+
+    @pytest.mark.asyncio
+    async def test_item_errors_isolated(self, executor):
+        """Test a failed item is recorded without failing the others."""
+        result = await MapNode().execute({"array": [1, 2, 3], "subgraph": _subgraph(fail_on=2)}, {})
+
+        assert result["results"][0] == {"square": 1}
+        assert result["results"][2] == {"square": 9}
+        assert result["results"][1]["index"] == 1
+        assert "bad value 2" in result["results"][1]["error"]
+        assert result["errors"] == [result["results"][1]]
+        assert result["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stop_on_item_error(self, executor):
+        """Test on_item_error: stop fails the node."""
+        with pytest.raises(RuntimeError, match="bad value 2"):
+            await MapNode().execute(
+                {"array": [1, 2, 3], "subgraph": _subgraph(fail_on=2), "on_item_error": "stop"},
+                {},
+            )
+
+    @pytest.mark.asyncio
+    async def test_progress_events(self, executor):
+        """Test listeners hear about every item."""
+        events = []
+        add_progress_listener(events.append)
+        try:
+            await MapNode().execute({"array": [1, 2], "subgraph": _subgraph(fail_on=2)}, {})
+        finally:
+            remove_progress_listener(events.append)
+
+        assert [e.completed for e in events] == [1, 2]
+        assert events[-1].total == 2 and events[-1].failed == 1
+        assert len({e.map_id for e in events}) == 1
+
+    @pytest.mark.asyncio
+    async def test_saved_workflow(self, storage, executor):
+        """Test mapping a saved workflow over $prev."""
+        child = Workflow(name="Child", **_subgraph())
+        storage.save_workflow(child)
+
+        result = await MapNode().execute({"workflow_id": child.id}, {"$prev": {"items": [4]}})
+
+        assert result["results"] == [{"square": 16}]
+
+    @pytest.mark.asyncio
+    async def test_subgraph_not_resolved_by_parent(self, executor):
+        """Test the executor leaves the sub-graph's expressions for each item's run."""
+        workflow = Workflow(
+            name="Parent",
+            nodes=[
+                WorkflowNode(
+                    id="map",
+                    type="map",
+                    name="Map",
+                    config={"array": "{{$trigger.numbers}}", "subgraph": _subgraph()},
+                ),
+                WorkflowNode(id="after", type="square", name="After", config={"value": 1}),
+            ],
+            connections=[WorkflowConnection(source_node_id="map", target_node_id="after")],
+        )
+
+        execution = await executor.execute(workflow, {"numbers": [2, 3]})
+
+        assert execution.status == "completed"
+        assert execution.get_result("map").data["results"] == [{"square": 4}, {"square": 9}]
@@ -0,0 +1,155 @@
+"""
+Unit Tests for the Metrics Registry
+
+Tests for in-process metric aggregation, the Prometheus text format and the
+webhook server's reserved paths.
+"""
+
+import asyncio
+
+import pytest
+
+from src.core import telemetry as telemetry_module
+from src.core.metrics import MetricsRegistry, monitor_event_loop, prometheus_name
+from src.core.telemetry import Telemetry, enable_metrics, get_telemetry, set_telemetry
+from src.core.webhooks.manager import RESERVED_PATHS, WebhookManager, WebhookStore
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry(buckets=(0.01, 0.1, 1.0))
+
+
+class TestNames:
+    """Tests for Prometheus metric names."""
+
+    def test_units(self):
+        """Test unit suffixes and the counter suffix."""
+        assert prometheus_name("skynette.node.duration", "histogram", "ms") == (
+            "skynette_node_duration_seconds"
+        )
+        assert prometheus_name("skynette.ai.cost", "counter", "USD") == "skynette_ai_cost_usd_total"
+        assert prometheus_name("skynette.ai.tokens", "counter", "{token}") == (
+            "skynette_ai_tokens_total"
+        )
+
+
+class TestRegistry:
+    """Tests for MetricsRegistry."""
+
+    def test_counter(self, registry):
+        """Test counters sum by label set and drop per-run attributes."""
+        registry.add("skynette.webhook.requests", 1, {"http.status_code": 200})
+        registry.add("skynette.webhook.requests", 1, {"http.status_code": 200})
+        registry.add("skynette.webhook.requests", 1, {"http.status_code": 500})
+        registry.add("skynette.node.failures", 1, {"workflow.id": "w1", "node.type": "http"})
+
+        text = registry.render()
+        assert "# TYPE skynette_webhook_requests_total counter" in text
+        assert 'skynette_webhook_requests_total{http_status_code="200"} 2' in text
+        assert 'skynette_webhook_requests_total{http_status_code="500"} 1' in text
+        assert 'skynette_node_failures_total{node_type="http"} 1' in text
+        assert "w1" not in text
+
+    def test_histogram(self, registry):
+        """Test histograms convert ms to seconds and render cumulative buckets."""
+        for ms in (5, 50, 500, 5000):
+            registry.record("skynette.node.duration", ms, {"node.type": "http"})
+
+        text = registry.render()
+        name = "skynette_node_duration_seconds"
+        assert f"# TYPE {name} histogram" in text
+        assert f'{name}_bucket{{node_type="http",le="0.01"}} 1' in text
+        assert f'{name}_bucket{{node_type="http",le="0.1"}} 2' in text
+        assert f'{name}_bucket{{node_type="http",le="1"}} 3' in text
+        assert f'{name}_bucket{{node_type="http",le="+Inf"}} 4' in text
+        assert f'{name}_count{{node_type="http"}} 4' in text
+        assert registry.get("skynette.node.duration", {"node.type": "http"}) == 4
+
+    def test_up_down_counter_is_gauge(self, registry):
+        """Test in-flight runs render as a gauge."""
+        registry.add("skynette.workflow.active", 1)
+        registry.add("skynette.workflow.active", 1)
+        registry.add("skynette.workflow.active", -1)
+
+        text = registry.render()
+        assert "# TYPE skynette_workflow_active gauge" in text
+        assert "skynette_workflow_active 1" in text
+
+    def test_gauges(self, registry):
+        """Test set and callback gauges are read at scrape time."""
+        depth = {"queued": 3}
+        registry.register_gauge(
+            "skynette.queue.runs",
+            lambda: {(("status", k),): v for k, v in depth.items()},
+        )
+        registry.set_gauge("skynette.event_loop.lag", 250)
+
+        depth["queued"] = 5
+        text = registry.render()
+        assert 'skynette_queue_runs{status="queued"} 5' in text
+        assert "skynette_event_loop_lag_seconds 0.25" in text
+
+        registry.unregister_gauge("skynette.queue.runs")
+        assert "skynette_queue_runs" not in registry.render()
+
+    def test_failing_gauge_is_skipped(self, registry):
+        """Test a gauge callback that raises doesn't break the scrape."""
+        registry.register_gauge("skynette.queue.runs", lambda: 1 / 0)
+
+        assert "skynette_queue_runs" not in registry.render()
+
+    def test_label_values_escaped(self, registry):
+        """Test quotes and newlines in label values are escaped."""
+        registry.add("skynette.ai.requests", 1, {"ai.provider": 'a"b\nc'})
+
+        assert 'ai_provider="a\\"b\\nc"' in registry.render()
+
+    @pytest.mark.asyncio
+    async def test_event_loop_monitor(self, registry):
+        """Test the monitor records event-loop lag."""
+        task = asyncio.create_task(monitor_event_loop(registry, interval=0.01))
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+        assert "skynette_event_loop_lag_seconds" in registry.render()
+
+
+class TestEnableMetrics:
+    """Tests for aggregating telemetry metrics in process."""
+
+    @pytest.fixture(autouse=True)
+    def reset(self, monkeypatch):
+        monkeypatch.setattr(telemetry_module, "_metrics", None)
+        set_telemetry(Telemetry())
+        yield
+        monkeypatch.setattr(telemetry_module, "_metrics", None)
+        set_telemetry(Telemetry())
+
+    def test_metrics_collected_with_noop_backend(self):
+        """Test metrics are aggregated even when the backend does nothing."""
+        metrics = enable_metrics()
+        get_telemetry().add("skynette.node.failures", 1, {"node.type": "http"})
+
+        assert metrics.get("skynette.node.failures", {"node.type": "http"}) == 1
+        assert enable_metrics() is metrics
+
+    def test_replaced_backend_keeps_metrics(self):
+        """Test setting a new backend keeps aggregating."""
+        metrics = enable_metrics()
+        set_telemetry(Telemetry())
+        get_telemetry().record("skynette.node.duration", 10, {"node.type": "http"})
+
+        assert metrics.get("skynette.node.duration", {"node.type": "http"}) == 1
+
+
+class TestReservedPaths:
+    """Tests for paths served by the webhook server itself."""
+
+    @pytest.mark.parametrize("path", sorted(RESERVED_PATHS))
+    def test_cannot_register_reserved_path(self, tmp_path, path):
+        """Test webhooks can't be registered on /metrics or /healthz."""
+        manager = WebhookManager(store=WebhookStore(db_path=tmp_path / "webhooks.db"))
+
+        with pytest.raises(ValueError, match="reserved"):
+            manager.register_webhook(workflow_id="w", path=path.lstrip("/"))
@@ -0,0 +1,210 @@
+"""
+Unit Tests for the Node Manifest
+
+Tests for the pre-generated node manifest and lazy registry loading.
+"""
+
+import importlib
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from src.core.nodes.base import BaseNode
+from src.core.nodes.manifest import generate_manifest, load_manifest, profile_startup
+from src.core.nodes.registry import NodeRegistry
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+
+def _fresh_registry() -> NodeRegistry:
+    """Build a registry that is not the global singleton."""
+    registry = object.__new__(NodeRegistry)
+    registry._initialized = False
+    registry.__init__()
+    return registry
+
+
+class TestManifest:
+    """Tests for the manifest file."""
+
+    def test_manifest_is_up_to_date(self):
+        """Test the committed manifest matches the node classes.
+
+        Regenerate with ``python -m src.core.nodes.manifest`` if this fails.
+        """
+        assert load_manifest() == generate_manifest()
+
+    def test_entries_point_at_node_classes(self):
+        """Test every entry names an importable node class of the same type."""
+        for node_type, entry in load_manifest().items():
+            node_class = getattr(importlib.import_module(entry["module"]), entry["class"])
+            assert issubclass(node_class, BaseNode)
+            assert node_class.type == node_type
+
+
+class TestLazyRegistry:
+    """Tests for lazy loading in NodeRegistry."""
+
+    def test_startup_registers_without_importing(self):
+        """Test node types are registered from the manifest, not imported."""
+        registry = _fresh_registry()
+
+        assert len(registry.node_types) == len(load_manifest())
+        assert registry._handlers == {}
+
+    def test_definitions_available_before_import(self):
+        """Test definitions and categories come from the manifest."""
+        registry = _fresh_registry()
+
+        definition = registry.get_definition("http_request")
+
+        assert definition is not None
+        assert definition.name == "HTTP Request"
+        assert "http_request" not in registry._handlers
+        assert "Execution" in registry.categories
+        assert len(registry.get_all_definitions()) == len(registry.node_types)
+
+    def test_handler_imported_on_first_use(self):
+        """Test the module is imported on the first get_handler call."""
+        from src.core.nodes.execution.code_runner import CodeExecutionNode
+
+        registry = _fresh_registry()
+        generation = registry.generation
+
+        handler = registry.get_handler("code_execution")
+
+        assert isinstance(handler, CodeExecutionNode)
+        assert registry._handlers["code_execution"] is CodeExecutionNode
+        assert "code_execution" not in registry._lazy
+        # Loading a known type is not a registry change
+        assert registry.generation == generation
+
+    def test_unknown_type(self):
+        """Test unknown node types still return None."""
+        registry = _fresh_registry()
+
+        assert registry.get_handler("does_not_exist") is None
+        assert registry.get_definition("does_not_exist") is None
+
+    def test_register_overrides_lazy_entry(self):
+        """Test registering a class replaces the manifest entry."""
+
+        class CustomRequestNode(BaseNode):
+            type = "http_request"
+            name = "Custom Request"
+            category = "HTTP"
+
+            async def execute(self, config, context):
+                return {}
+
+        registry = _fresh_registry()
+        registry.register(CustomRequestNode)
+
+        assert registry.get_handler_class("http_request") is CustomRequestNode
+        assert registry.node_types.count("http_request") == 1
+
+    def test_unregister_lazy_entry(self):
+        """Test lazily registered types can be unregistered."""
+        registry = _fresh_registry()
+
+        registry.unregister("http_request")
+
+        assert "http_request" not in registry.node_types
+        assert registry.get_handler_class("http_request") is None
+
+    def test_app_package_import_is_lazy(self):
+        """Test loading one app node does not import every app integration."""
+        code = (
+            "import sys\n"
+            "from src.core.nodes.registry import NodeRegistry\n"
+            "NodeRegistry().get_handler_class('slack-send-message')\n"
+            "print(sorted(m for m in sys.modules if m.startswith('src.core.nodes.apps.')))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert result.stdout.strip() == "['src.core.nodes.apps.slack']"
+
+    def test_package_node_lists(self):
+        """Test package node lists are still available as attributes."""
+        from src.core.nodes import apps
+
+        assert len(apps.APP_NODES) == len(apps.__all__)
+        assert apps.SlackSendMessageNode in apps.APP_NODES
+
+
+class TestProfileStartup:
+    """Tests for the startup profile."""
+
+    def test_report(self):
+        """Test the profile reports counts and timings."""
+        report = profile_startup()
+
+        assert report["node_count"] == len(load_manifest())
+        assert report["lazy_node_count"] == report["node_count"]
+        assert report["registry_ms"] >= 0
+        assert report["deferred_import_ms"] >= 0
+        assert len(report["slowest_modules"]) <= 5
+
+
+class TestDefinitionCache:
+    """Tests for memoized node definitions."""
+
+    def test_definition_is_memoized(self):
+        """Test repeated lookups return the same definition object."""
+        registry = _fresh_registry()
+
+        first = registry.get_definition("http_request")
+        registry.get_handler_class("http_request")
+
+        assert registry.get_definition("http_request") is first
+        assert registry.get_all_definitions()[registry.node_types.index("http_request")] is first
+
+    def test_register_invalidates(self):
+        """Test registering a node type replaces its cached definition and palette."""
+
+        class CustomRequestNode(BaseNode):
+            type = "http_request"
+            name = "Custom Request"
+            category = "HTTP"
+
+            async def execute(self, config, context):
+                return {}
+
+        registry = _fresh_registry()
+        registry.get_definition("http_request")
+        palette_json = registry.get_palette_json()
+
+        registry.register(CustomRequestNode)
+
+        assert registry.get_definition("http_request").name == "Custom Request"
+        assert registry.get_palette_json() != palette_json
+        assert "Custom Request" in registry.get_palette_json()
+
+    def test_unregister_invalidates(self):
+        """Test unregistering a node type removes it from the palette."""
+        registry = _fresh_registry()
+        registry.get_palette()
+
+        registry.unregister("http_request")
+
+        assert registry.get_definition("http_request") is None
+        names = [d.type for defs in registry.get_palette().values() for d in defs]
+        assert "http_request" not in names
+
+    def test_palette_sorted(self):
+        """Test the palette is grouped by category and sorted by name."""
+        registry = _fresh_registry()
+        palette = registry.get_palette()
+
+        assert list(palette) == sorted(palette)
+        for definitions in palette.values():
+            assert [d.name for d in definitions] == sorted(d.name for d in definitions)
+        assert registry.get_palette() is palette
+        assert set(json.loads(registry.get_palette_json())) == set(palette)
@@ -0,0 +1,141 @@
+"""
+Unit Tests for Node Handler Pooling
+
+Tests for HandlerPool and the NodeRegistry lease/acquire API.
+"""
+
+import asyncio
+
+import pytest
+
+from src.core.nodes.base import BaseNode
+from src.core.nodes.pool import HandlerPool
+from src.core.nodes.registry import NodeRegistry
+from src.core.workflow.executor import WorkflowExecutor
+from src.core.workflow.models import Workflow, WorkflowNode
+
+
+class WarmNode(BaseNode):
+    """Node that counts lifecycle calls."""
+
+    type = "warm_node"
+    name = "Warm Node"
+    category = "test"
+
+    setups = 0
+    teardowns = 0
+
+    async def setup(self):
+        WarmNode.setups += 1
+        self.client = object()
+
+    async def teardown(self):
+        WarmNode.teardowns += 1
+
+    async def execute(self, config: dict, context: dict):
+        return {"client_id": id(self.client)}
+
+
+@pytest.fixture(autouse=True)
+def reset_counters():
+    WarmNode.setups = 0
+    WarmNode.teardowns = 0
+    yield
+
+
+@pytest.mark.asyncio
+class TestHandlerPool:
+    """Tests for HandlerPool."""
+
+    async def test_reuses_idle_instance(self):
+        """Test a released instance is handed out again without a new setup."""
+        pool = HandlerPool(WarmNode)
+
+        first = await pool.acquire()
+        await pool.release(first)
+        second = await pool.acquire()
+
+        assert first is second
+        assert WarmNode.setups == 1
+        assert pool.reused == 1
+
+    async def test_concurrent_acquires_get_distinct_instances(self):
+        """Test leased instances are never shared."""
+        pool = HandlerPool(WarmNode)
+
+        first = await pool.acquire()
+        second = await pool.acquire()
+
+        assert first is not second
+        assert WarmNode.setups == 2
+
+    async def test_bounded_idle_instances(self):
+        """Test returns beyond max_size are torn down."""
+        pool = HandlerPool(WarmNode, max_size=1)
+
+        handlers = [await pool.acquire() for _ in range(3)]
+        for handler in handlers:
+            await pool.release(handler)
+
+        assert pool.idle_count == 1
+        assert WarmNode.teardowns == 2
+
+    async def test_idle_eviction(self):
+        """Test instances idle longer than idle_timeout are torn down."""
+        pool = HandlerPool(WarmNode, idle_timeout=0.01)
+
+        handler = await pool.acquire()
+        await pool.release(handler)
+        await asyncio.sleep(0.02)
+        await pool.evict_idle()
+
+        assert pool.idle_count == 0
+        assert WarmNode.teardowns == 1
+
+    async def test_close(self):
+        """Test closing tears down idle instances and rejects returns."""
+        pool = HandlerPool(WarmNode)
+        held = await pool.acquire()
+        idle = await pool.acquire()
+        await pool.release(idle)
+
+        await pool.close()
+        await pool.release(held)
+
+        assert pool.idle_count == 0
+        assert WarmNode.teardowns == 2
+
+
+@pytest.mark.asyncio
+class TestRegistryPooling:
+    """Tests for pooled handlers through the registry and executor."""
+
+    async def test_lease(self):
+        """Test lease returns the instance to the pool."""
+        registry = NodeRegistry()
+
+        async with registry.lease(WarmNode) as handler:
+            assert isinstance(handler, WarmNode)
+        async with registry.lease(WarmNode) as again:
+            assert again is handler
+
+        await registry.get_pool(WarmNode).close()
+        registry._pools.pop(WarmNode, None)
+
+    async def test_executor_reuses_warm_handler(self):
+        """Test setup runs once across executions of the same node type."""
+        executor = WorkflowExecutor()
+        executor.node_registry._handlers["warm_node"] = WarmNode
+
+        try:
+            workflow = Workflow(name="Warm", nodes=[WorkflowNode(type="warm_node", name="W")])
+            first = await executor.execute(workflow)
+            second = await executor.execute(workflow)
+
+            assert first.status == "completed"
+            assert first.node_results[0].data == second.node_results[0].data
+            assert WarmNode.setups == 1
+        finally:
+            executor.node_registry._handlers.pop("warm_node", None)
+            await executor.node_registry.get_pool(WarmNode).close()
+            executor.node_registry._pools.pop(WarmNode, None)
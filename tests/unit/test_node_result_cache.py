@@ -0,0 +1,215 @@
+"""
+Unit Tests for the Node Result Cache
+
+Tests for cache policies, keys, the memory/SQLite tiers and executor integration.
+"""
+
+import time
+
+import pytest
+
+from src.core.nodes.base import BaseNode
+from src.core.workflow.cache import (
+    MISS,
+    MemoryResultCache,
+    NodeResultCache,
+    SQLiteResultCache,
+    cache_key,
+    get_cache_policy,
+)
+from src.core.workflow.executor import WorkflowExecutor
+from src.core.workflow.models import Workflow, WorkflowConnection, WorkflowNode
+
+
+class CountingNode(BaseNode):
+    """A node that counts how often it runs."""
+
+    type = "counting"
+    name = "Counting"
+    category = "test"
+
+    calls = 0
+
+    async def execute(self, config: dict, context: dict):
+        CountingNode.calls += 1
+        return {"value": config.get("value"), "call": CountingNode.calls}
+
+
+@pytest.fixture
+def executor():
+    """Create an executor with a private result cache."""
+    executor = WorkflowExecutor()
+    executor.result_cache = NodeResultCache()
+    executor.node_registry._handlers["counting"] = CountingNode
+    CountingNode.calls = 0
+    yield executor
+    executor.node_registry._handlers.pop("counting", None)
+
+
+def _workflow(config: dict) -> Workflow:
+    """Build a trigger -> counting workflow."""
+    trigger = WorkflowNode(id="trigger", type="manual_trigger", name="Trigger")
+    node = WorkflowNode(id="count", type="counting", name="Count", config=config)
+    return Workflow(
+        name="Cached",
+        nodes=[trigger, node],
+        connections=[WorkflowConnection(source_node_id="trigger", target_node_id="count")],
+    )
+
+
+class TestCachePolicy:
+    """Tests for reading the cache setting."""
+
+    def test_off_by_default(self):
+        """Test caching is off unless configured."""
+        assert get_cache_policy({}) is None
+        assert get_cache_policy({"cache": False}) is None
+        assert get_cache_policy({"cache": {"enabled": False}}) is None
+
+    def test_forms(self):
+        """Test the accepted forms of the cache setting."""
+        assert get_cache_policy({"cache": True})["ttl"] == 3600.0
+        assert get_cache_policy({"cache": 60})["ttl"] == 60.0
+        policy = get_cache_policy({"cache": {"ttl": "5", "include_prev": True}})
+        assert policy == {"ttl": 5.0, "include_prev": True}
+
+    def test_invalid_ttl_uses_default(self):
+        """Test an invalid TTL falls back to the default."""
+        assert get_cache_policy({"cache": {"ttl": "soon"}})["ttl"] == 3600.0
+
+
+class TestCacheKey:
+    """Tests for content-addressed keys."""
+
+    def test_same_config_same_key(self):
+        """Test equal configs produce the same key regardless of order."""
+        assert cache_key("t", {"a": 1, "b": 2}) == cache_key("t", {"b": 2, "a": 1})
+
+    def test_type_and_config_change_key(self):
+        """Test the node type and config both affect the key."""
+        assert cache_key("t", {"a": 1}) != cache_key("u", {"a": 1})
+        assert cache_key("t", {"a": 1}) != cache_key("t", {"a": 2})
+
+    def test_cache_setting_ignored(self):
+        """Test executor settings such as cache and retry are not part of the key."""
+        assert cache_key("t", {"a": 1, "cache": 60}) == cache_key("t", {"a": 1, "cache": 5})
+        assert cache_key("t", {"a": 1, "retry": 3}) == cache_key("t", {"a": 1})
+
+    def test_prev_included_when_given(self):
+        """Test $prev is keyed only when include_prev is used."""
+        assert cache_key("t", {}, prev={"x": 1}) != cache_key("t", {}, prev={"x": 2})
+        assert cache_key("t", {}, prev=None) != cache_key("t", {})
+
+
+class TestTiers:
+    """Tests for the memory and SQLite tiers."""
+
+    def test_memory_expiry(self):
+        """Test expired memory entries are misses."""
+        cache = MemoryResultCache()
+        cache.set("k", {"v": 1}, ttl=-1)
+        assert cache.get("k") is MISS
+
+    def test_memory_lru(self):
+        """Test the memory tier evicts the least recently used entry."""
+        cache = MemoryResultCache(max_size=2)
+        cache.set("a", 1, 60)
+        cache.set("b", 2, 60)
+        cache.get("a")
+        cache.set("c", 3, 60)
+        assert cache.get("b") is MISS
+        assert cache.get("a") == 1
+
+    def test_memory_returns_copies(self):
+        """Test callers cannot mutate cached values."""
+        cache = MemoryResultCache()
+        cache.set("k", {"items": [1]}, 60)
+        cache.get("k")["items"].append(2)
+        assert cache.get("k") == {"items": [1]}
+
+    def test_none_is_a_value(self):
+        """Test a None output is cached, not treated as a miss."""
+        cache = MemoryResultCache()
+        cache.set("k", None, 60)
+        assert cache.get("k") is None
+
+    def test_sqlite_roundtrip(self, tmp_path):
+        """Test values, expiry and non-JSON values in the SQLite tier."""
+        cache = SQLiteResultCache(tmp_path / "cache.db")
+        cache.set("k", {"v": [1, 2]}, 60)
+        cache.set("old", 1, -1)
+        cache.set("bad", object(), 60)
+        assert cache.get("k") == {"v": [1, 2]}
+        assert cache.get("old") is MISS
+        assert cache.get("bad") is MISS
+
+    def test_disk_tier_survives_memory_clear(self, tmp_path):
+        """Test disk hits are promoted into memory."""
+        cache = NodeResultCache()
+        cache.enable_disk(tmp_path / "cache.db")
+        cache.set("k", {"v": 1}, 60)
+        cache.memory.clear()
+
+        assert cache.get("k") == {"v": 1}
+        assert len(cache.memory) == 1
+        assert cache.hits == 1
+
+        # A new process sees the persisted entry
+        other = NodeResultCache(disk=SQLiteResultCache(tmp_path / "cache.db"))
+        assert other.get("k") == {"v": 1}
+
+
+@pytest.mark.asyncio
+class TestExecutorCaching:
+    """Tests for result caching in the executor."""
+
+    async def test_uncached_node_always_runs(self, executor):
+        """Test nodes without a cache setting always run."""
+        workflow = _workflow({"value": 1})
+
+        await executor.execute(workflow)
+        execution = await executor.execute(workflow)
+
+        assert CountingNode.calls == 2
+        assert execution.get_result("count").cache_hit is None
+
+    async def test_cached_node_skipped_on_second_run(self, executor):
+        """Test a cached node is not re-run with the same config."""
+        workflow = _workflow({"value": 1, "cache": 60})
+
+        first = await executor.execute(workflow)
+        second = await executor.execute(workflow)
+
+        assert CountingNode.calls == 1
+        assert first.get_result("count").cache_hit is False
+        assert second.get_result("count").cache_hit is True
+        assert second.get_result("count").data == first.get_result("count").data
+        assert (second.cache_hits, second.cache_misses) == (1, 0)
+        assert (first.cache_hits, first.cache_misses) == (0, 1)
+
+    async def test_config_change_misses(self, executor):
+        """Test a different config misses the cache."""
+        await executor.execute(_workflow({"value": 1, "cache": 60}))
+        await executor.execute(_workflow({"value": 2, "cache": 60}))
+
+        assert CountingNode.calls == 2
+
+    async def test_resolved_config_is_keyed(self, executor):
+        """Test the key uses the resolved config, not the template."""
+        workflow = _workflow({"value": "{{$trigger.name}}", "cache": 60})
+
+        await executor.execute(workflow, trigger_data={"name": "a"})
+        await executor.execute(workflow, trigger_data={"name": "a"})
+        await executor.execute(workflow, trigger_data={"name": "b"})
+
+        assert CountingNode.calls == 2
+
+    async def test_ttl_expiry(self, executor):
+        """Test results are re-computed after the TTL."""
+        workflow = _workflow({"value": 1, "cache": 0.01})
+
+        await executor.execute(workflow)
+        time.sleep(0.02)
+        await executor.execute(workflow)
+
+        assert CountingNode.calls == 2
@@ -0,0 +1,244 @@
+"""
+Unit Tests for Node Retry Policies
+
+Tests for timeouts, retries and backoff enforced by the executor.
+"""
+
+import asyncio
+
+import pytest
+
+from src.core.errors.exceptions import AIRateLimitError
+from src.core.nodes.base import BaseNode
+from src.core.workflow.executor import WorkflowExecutor
+from src.core.workflow.models import Workflow, WorkflowNode
+from src.core.workflow.retry import RetryPolicy, get_retry_after, get_retry_policy
+
+
+class FlakyNode(BaseNode):
+    """A node that fails a configured number of times before succeeding."""
+
+    type = "flaky"
+    name = "Flaky"
+    category = "test"
+
+    calls = 0
+
+    async def execute(self, config: dict, context: dict):
+        FlakyNode.calls += 1
+        if FlakyNode.calls <= config.get("failures", 0):
+            error = config.get("error", "boom")
+            if error == "rate_limit":
+                raise AIRateLimitError("slow down")
+            raise ValueError(error)
+        if FlakyNode.calls <= config.get("bad_statuses", 0):
+            return {"status": config.get("status", 503), "headers": {}, "ok": False}
+        await asyncio.sleep(config.get("sleep", 0))
+        return {"status": 200, "calls": FlakyNode.calls}
+
+
+@pytest.fixture
+def executor():
+    """Create an executor with the flaky node registered."""
+    executor = WorkflowExecutor()
+    executor.node_registry._handlers["flaky"] = FlakyNode
+    FlakyNode.calls = 0
+    yield executor
+    executor.node_registry._handlers.pop("flaky", None)
+
+
+def _workflow(config: dict, settings: dict | None = None) -> Workflow:
+    node = WorkflowNode(id="flaky", type="flaky", name="Flaky", config=config)
+    return Workflow(name="Retry", nodes=[node], settings=settings or {})
+
+
+class TestRetryPolicy:
+    """Tests for reading and applying retry policies."""
+
+    def test_no_policy_by_default(self):
+        """Test nodes without retry or timeout settings have no policy."""
+        assert get_retry_policy({}) is None
+        assert get_retry_policy({"retry": False}) is None
+
+    def test_shorthand(self):
+        """Test ``retry: n`` sets the number of attempts."""
+        policy = get_retry_policy({"retry": 3})
+        assert policy.max_attempts == 3
+        assert policy.timeout is None
+
+    def test_full_settings(self):
+        """Test every retry option is read."""
+        policy = get_retry_policy(
+            {
+                "node_timeout": "5",
+                "retry": {"max_attempts": 4, "delay": 0.5, "jitter": False, "retry_on": "5xx"},
+            }
+        )
+        assert policy == RetryPolicy(
+            max_attempts=4, timeout=5.0, delay=0.5, jitter=False, retry_on=("5xx",)
+        )
+
+    def test_workflow_default_timeout(self):
+        """Test the workflow-wide node_timeout applies unless the node overrides it."""
+        assert get_retry_policy({}, {"node_timeout": 10}).timeout == 10.0
+        assert get_retry_policy({"node_timeout": 2}, {"node_timeout": 10}).timeout == 2.0
+
+    def test_exponential_delay(self):
+        """Test delays grow exponentially and are capped."""
+        policy = RetryPolicy(delay=1.0, backoff=2.0, max_delay=5.0, jitter=False)
+        assert [policy.get_delay(n) for n in (1, 2, 3, 4)] == [1.0, 2.0, 4.0, 5.0]
+
+    def test_jitter_stays_in_range(self):
+        """Test jittered delays never exceed the exponential delay."""
+        policy = RetryPolicy(delay=1.0, backoff=2.0)
+        assert all(0 <= policy.get_delay(3) <= 4.0 for _ in range(50))
+
+    def test_retry_after(self):
+        """Test a Retry-After header overrides the computed delay."""
+        policy = RetryPolicy(max_delay=10.0)
+        assert get_retry_after({"headers": {"Retry-After": "3"}}) == 3.0
+        assert policy.get_delay(1, retry_after=60) == 10.0
+
+    def test_retry_conditions(self):
+        """Test retry_on limits which failures are retried."""
+        policy = RetryPolicy(retry_on=("timeout", "rate_limit"))
+        assert policy.should_retry_error(TimeoutError())
+        assert policy.should_retry_error(AIRateLimitError("429"))
+        assert not policy.should_retry_error(ValueError("bad input"))
+        assert policy.should_retry_output({"status": 429})
+        assert not policy.should_retry_output({"status": 503})
+        assert not policy.should_retry_output({"status": 200})
+
+    def test_default_conditions_skip_client_errors(self):
+        """Test only transient failures are retried unless "error" is opted into."""
+
+        class HTTPError(Exception):
+            def __init__(self, status_code):
+                self.response = type("Response", (), {"status_code": status_code})()
+
+        policy = get_retry_policy({"retry": 3})
+        assert policy.should_retry_error(TimeoutError())
+        assert policy.should_retry_error(HTTPError(503))
+        assert policy.should_retry_error(AIRateLimitError("429"))
+        assert not policy.should_retry_error(HTTPError(404))
+        assert not policy.should_retry_error(ValueError("bad config"))
+        assert not policy.should_retry_output({"status": 400})
+
+        assert get_retry_policy({"retry": {"retry_on": ["error"]}}).should_retry_error(
+            ValueError("bad config")
+        )
+
+
+@pytest.mark.asyncio
+class TestExecutorRetries:
+    """Tests for retries in the executor."""
+
+    async def test_retries_until_success(self, executor):
+        """Test a transient failure is retried and every attempt is recorded."""
+        workflow = _workflow(
+            {"failures": 2, "retry": {"max_attempts": 3, "delay": 0, "retry_on": ["error"]}}
+        )
+
+        execution = await executor.execute(workflow)
+
+        result = execution.get_result("flaky")
+        assert execution.status == "completed"
+        assert result.data["calls"] == 3
+        assert [a.success for a in result.attempts] == [False, False, True]
+        assert result.attempts[0].error == "boom"
+        assert result.attempts[0].retry_delay_ms == 0
+
+    async def test_gives_up_after_max_attempts(self, executor):
+        """Test the last error fails the node once attempts run out."""
+        workflow = _workflow(
+            {"failures": 5, "retry": {"max_attempts": 2, "delay": 0, "retry_on": "error"}}
+        )
+
+        execution = await executor.execute(workflow)
+
+        result = execution.get_result("flaky")
+        assert execution.status == "failed"
+        assert result.error == "boom"
+        assert len(result.attempts) == 2
+        assert FlakyNode.calls == 2
+
+    async def test_non_retryable_error_fails_immediately(self, executor):
+        """Test errors outside retry_on are not retried."""
+        workflow = _workflow(
+            {"failures": 1, "retry": {"max_attempts": 3, "delay": 0, "retry_on": ["timeout"]}}
+        )
+
+        execution = await executor.execute(workflow)
+
+        assert execution.status == "failed"
+        assert FlakyNode.calls == 1
+
+    async def test_4xx_output_not_retried_by_default(self, executor):
+        """Test an HTTP 4xx response is returned without retrying."""
+        workflow = _workflow({"bad_statuses": 1, "status": 404, "retry": 3})
+
+        execution = await executor.execute(workflow)
+
+        result = execution.get_result("flaky")
+        assert result.data["status"] == 404
+        assert FlakyNode.calls == 1
+
+    async def test_rate_limit_error_retried(self, executor):
+        """Test rate-limit errors are retried."""
+        workflow = _workflow(
+            {
+                "failures": 1,
+                "error": "rate_limit",
+                "retry": {"max_attempts": 2, "delay": 0, "retry_on": ["rate_limit"]},
+            }
+        )
+
+        execution = await executor.execute(workflow)
+
+        assert execution.status == "completed"
+
+    async def test_timeout(self, executor):
+        """Test a hung node is cancelled after node_timeout."""
+        workflow = _workflow({"sleep": 5, "node_timeout": 0.05})
+
+        execution = await executor.execute(workflow)
+
+        result = execution.get_result("flaky")
+        assert execution.status == "failed"
+        assert result.error == "Node timed out after 0.05s"
+        assert result.duration_ms < 1000
+        assert len(result.attempts) == 1
+
+    async def test_workflow_timeout_setting(self, executor):
+        """Test settings.node_timeout applies to every node."""
+        workflow = _workflow({"sleep": 5}, settings={"node_timeout": 0.05})
+
+        execution = await executor.execute(workflow)
+
+        assert execution.status == "failed"
+
+    async def test_5xx_output_retried(self, executor):
+        """Test an HTTP 5xx response is retried and the final response returned."""
+        workflow = _workflow({"bad_statuses": 1, "retry": {"max_attempts": 3, "delay": 0}})
+
+        execution = await executor.execute(workflow)
+
+        result = execution.get_result("flaky")
+        assert result.data["status"] == 200
+        assert result.attempts[0].error == "HTTP 503"
+
+    async def test_5xx_output_kept_after_last_attempt(self, executor):
+        """Test the last 5xx response is returned as the node output."""
+        workflow = _workflow({"bad_statuses": 5, "retry": {"max_attempts": 2, "delay": 0}})
+
+        execution = await executor.execute(workflow)
+
+        result = execution.get_result("flaky")
+        assert result.success is True
+        assert result.data["status"] == 503
+
+    async def test_no_attempts_without_policy(self, executor):
+        """Test plain nodes do not record attempts."""
+        execution = await executor.execute(_workflow({}))
+
+        assert execution.get_result("flaky").attempts == []
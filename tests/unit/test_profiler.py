@@ -0,0 +1,234 @@
+"""
+Unit Tests for the Execution Profiler
+
+Tests for node spans, Chrome trace export and performance reports.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from src.core.blobs import DEFAULT_SPILL_THRESHOLD
+from src.core.nodes.base import BaseNode
+from src.core.workflow.executor import WorkflowExecutor
+from src.core.workflow.models import (
+    ExecutionResult,
+    NodeSpan,
+    Workflow,
+    WorkflowConnection,
+    WorkflowExecution,
+    WorkflowNode,
+)
+from src.core.workflow.profiler import (
+    EXECUTE,
+    QUEUE,
+    RESOLVE,
+    STORE,
+    WAIT,
+    performance_report,
+    phase_totals,
+    to_chrome_trace,
+)
+from src.data.storage import WorkflowStorage
+
+
+class PayloadNode(BaseNode):
+    """A node that sleeps and returns a payload of a configurable size."""
+
+    type = "payload"
+    name = "Payload"
+    category = "test"
+
+    async def execute(self, config: dict, context: dict):
+        await asyncio.sleep(config.get("sleep", 0))
+        return {"text": "x" * config.get("size", 10)}
+
+
+@pytest.fixture
+def executor():
+    """Create an executor with the payload node registered."""
+    executor = WorkflowExecutor()
+    executor.node_registry._handlers["payload"] = PayloadNode
+    yield executor
+    executor.node_registry._handlers.pop("payload", None)
+
+
+def _workflow() -> Workflow:
+    return Workflow(
+        name="Profiled",
+        nodes=[
+            WorkflowNode(id="a", type="payload", name="A", config={"sleep": 0.02, "size": 1000}),
+            WorkflowNode(id="b", type="payload", name="B", config={"size": "{{$prev.text}}"}),
+            WorkflowNode(id="c", type="payload", name="C", config={"sleep": 0.01}),
+        ],
+        connections=[WorkflowConnection(source_node_id="a", target_node_id="b")],
+    )
+
+
+def _result(node_id: str, spans: list[tuple[str, float, float]], **fields) -> ExecutionResult:
+    return ExecutionResult(
+        node_id=node_id,
+        success=fields.pop("success", True),
+        spans=[NodeSpan(name=n, start_ms=s, duration_ms=d) for n, s, d in spans],
+        **fields,
+    )
+
+
+class TestExecutorSpans:
+    """Tests for spans recorded by the executor."""
+
+    @pytest.mark.asyncio
+    async def test_phases_recorded(self, executor):
+        """Test each node gets queue, resolve, execute and store spans."""
+        execution = await executor.execute(_workflow())
+
+        a = execution.get_result("a")
+        names = [span.name for span in a.spans]
+        assert names == [QUEUE, RESOLVE, EXECUTE, STORE]
+        assert phase_totals(a)[EXECUTE] >= 15
+
+    @pytest.mark.asyncio
+    async def test_wait_for_dependencies(self, executor):
+        """Test downstream nodes record the time spent waiting for upstream nodes."""
+        execution = await executor.execute(_workflow())
+
+        b = execution.get_result("b")
+        assert b.spans[0].name == WAIT
+        assert b.spans[0].duration_ms >= 15
+        assert WAIT not in phase_totals(execution.get_result("c"))
+
+    @pytest.mark.asyncio
+    async def test_bytes_in_and_out(self, executor):
+        """Test output sizes are recorded and passed on as the next node's input size."""
+        execution = await executor.execute(_workflow())
+
+        a, b, c = (execution.get_result(n) for n in "abc")
+        assert a.bytes_out > 1000
+        assert b.bytes_in == a.bytes_out
+        assert a.bytes_in is None and c.bytes_in is None
+        assert not a.bytes_out_truncated and not b.bytes_in_truncated
+
+    @pytest.mark.asyncio
+    async def test_large_sizes_marked_truncated(self, executor):
+        """Test sizes the estimate stopped counting are flagged as lower bounds."""
+        workflow = _workflow()
+        workflow.nodes[0].config["size"] = DEFAULT_SPILL_THRESHOLD * 2
+        workflow.settings = {"spill_threshold": 0}
+        execution = await executor.execute(workflow)
+
+        a, b = execution.get_result("a"), execution.get_result("b")
+        assert a.bytes_out >= DEFAULT_SPILL_THRESHOLD and a.bytes_out_truncated
+        assert b.bytes_in == a.bytes_out and b.bytes_in_truncated
+        assert not b.bytes_out_truncated
+
+    @pytest.mark.asyncio
+    async def test_failed_node_has_spans(self, executor):
+        """Test failed nodes keep the spans recorded before the failure."""
+        workflow = Workflow(name="Broken", nodes=[WorkflowNode(id="x", type="missing", name="X")])
+        execution = await executor.execute(workflow)
+
+        assert [span.name for span in execution.get_result("x").spans] == [QUEUE]
+
+
+class TestChromeTrace:
+    """Tests for Chrome trace export."""
+
+    def test_events(self):
+        """Test nodes become complete events with phases nested inside."""
+        execution = WorkflowExecution(workflow_id="wf")
+        execution.add_result(
+            _result(
+                "a",
+                [(QUEUE, 0, 1), (RESOLVE, 1, 1), (EXECUTE, 2, 8)],
+                bytes_out=10,
+            )
+        )
+        workflow = Workflow(name="Flow", nodes=[WorkflowNode(id="a", type="t", name="Node A")])
+
+        trace = to_chrome_trace(execution, workflow)
+        json.dumps(trace)
+
+        node = next(e for e in trace["traceEvents"] if e.get("cat") == "node")
+        assert node["name"] == "Node A"
+        assert node["ts"] == 0 and node["dur"] == 10_000
+        assert node["args"]["bytes_out"] == 10
+        phases = [e["name"] for e in trace["traceEvents"] if e.get("cat") == "phase"]
+        assert phases == [QUEUE, RESOLVE, EXECUTE]
+
+    def test_overlapping_nodes_get_rows(self):
+        """Test nodes that ran at the same time go on different rows."""
+        execution = WorkflowExecution(workflow_id="wf")
+        execution.add_result(_result("a", [(EXECUTE, 0, 10)]))
+        execution.add_result(_result("b", [(EXECUTE, 5, 10)]))
+        execution.add_result(_result("c", [(WAIT, 0, 12), (EXECUTE, 12, 1)]))
+
+        trace = to_chrome_trace(execution)
+
+        rows = {e["name"]: e["tid"] for e in trace["traceEvents"] if e.get("cat") == "node"}
+        assert rows == {"a": 1, "b": 2, "c": 1}
+
+
+class TestPerformanceReport:
+    """Tests for summarizing many runs."""
+
+    def test_report(self):
+        """Test per-node totals, percentiles and phase means, slowest first."""
+        executions = []
+        for i in range(1, 21):
+            execution = WorkflowExecution(workflow_id="wf")
+            execution.add_result(
+                _result("fast", [(WAIT, 0, 50), (RESOLVE, 50, 1), (EXECUTE, 51, 1)], bytes_out=4)
+            )
+            execution.add_result(
+                _result("slow", [(QUEUE, 0, 2), (EXECUTE, 2, i * 10)], success=i != 20)
+            )
+            execution.add_result(ExecutionResult(node_id="old", success=True))
+            executions.append(execution)
+
+        report = performance_report(executions)
+
+        assert [entry.node_id for entry in report] == ["slow", "fast"]
+        slow, fast = report
+        assert slow.runs == 20 and slow.failures == 1
+        assert slow.p50_ms == 100 and slow.p95_ms == 190 and slow.max_ms == 200
+        assert slow.phase_ms[QUEUE] == 2
+        assert fast.mean_ms == 2
+        assert fast.phase_ms[WAIT] == 50
+        assert fast.mean_bytes_out == 4 and fast.mean_bytes_in is None
+        assert not fast.bytes_out_truncated
+
+    def test_report_truncated_sizes(self):
+        """Test a node whose size was truncated in any run is flagged."""
+        executions = []
+        for truncated in (False, True):
+            execution = WorkflowExecution(workflow_id="wf")
+            execution.add_result(
+                _result("a", [(EXECUTE, 0, 1)], bytes_out=10, bytes_out_truncated=truncated)
+            )
+            executions.append(execution)
+
+        (entry,) = performance_report(executions)
+
+        assert entry.mean_bytes_out == 10
+        assert entry.bytes_out_truncated and not entry.bytes_in_truncated
+
+
+class TestStoredExecutions:
+    """Tests for loading profiled executions back from storage."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self, executor, tmp_path):
+        """Test spans and sizes survive saving and loading."""
+        storage = WorkflowStorage(data_dir=str(tmp_path))
+        workflow = _workflow()
+        storage.save_workflow(workflow)
+        execution = await executor.execute(workflow)
+        storage.save_execution(execution)
+
+        loaded = storage.load_execution(execution.id)
+
+        assert loaded.get_result("a").spans == execution.get_result("a").spans
+        assert loaded.get_result("b").bytes_in == execution.get_result("b").bytes_in
+        assert [e.id for e in storage.load_executions(workflow.id)] == [execution.id]
+        assert storage.load_execution("missing") is None
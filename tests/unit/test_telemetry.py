@@ -0,0 +1,203 @@
+"""
+Unit Tests for Telemetry
+
+Tests for the no-op and file backends and the spans and metrics emitted by the
+executor, AI gateway and webhook manager.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from src.ai.gateway import AICapability, AIGateway, AIResponse
+from src.core.nodes.base import BaseNode
+from src.core.telemetry import (
+    FileTelemetry,
+    Telemetry,
+    create_telemetry,
+    set_telemetry,
+)
+from src.core.webhooks.manager import WebhookManager, WebhookRequest, WebhookStore
+from src.core.workflow.executor import WorkflowExecutor
+from src.core.workflow.models import Workflow, WorkflowConnection, WorkflowNode
+
+
+class EchoNode(BaseNode):
+    """A node that echoes its config, or fails if asked to."""
+
+    type = "echo"
+    name = "Echo"
+    category = "test"
+
+    async def execute(self, config: dict, context: dict):
+        await asyncio.sleep(0)
+        if config.get("fail"):
+            raise ValueError("boom")
+        return {"value": config.get("value")}
+
+
+class FakeProvider:
+    """A provider that returns a fixed response."""
+
+    name = "openai"
+    capabilities = {AICapability.CHAT}
+
+    def is_available(self) -> bool:
+        return True
+
+    async def chat(self, messages, config):
+        return AIResponse(
+            content="hi",
+            provider="openai",
+            model="gpt-4",
+            usage={"prompt_tokens": 1000, "completion_tokens": 500, "total_tokens": 1500},
+        )
+
+
+@pytest.fixture
+def telemetry(tmp_path):
+    """Install a file telemetry backend for the test."""
+    backend = FileTelemetry(tmp_path / "telemetry.jsonl")
+    set_telemetry(backend)
+    yield backend
+    set_telemetry(Telemetry())
+
+
+def _entries(telemetry: FileTelemetry, kind: str | None = None) -> list[dict]:
+    lines = telemetry.path.read_text().splitlines()
+    entries = [json.loads(line) for line in lines]
+    return [e for e in entries if kind is None or e["type"] == kind]
+
+
+class TestBackends:
+    """Tests for backend selection and the file backend."""
+
+    def test_default_is_noop(self, monkeypatch):
+        """Test telemetry is off unless configured."""
+        monkeypatch.delenv("SKYNETTE_TELEMETRY", raising=False)
+        telemetry = create_telemetry()
+
+        assert type(telemetry) is Telemetry
+        assert telemetry.enabled is False
+        with telemetry.span("x") as span:
+            span.set_attribute("a", 1)
+        telemetry.add("skynette.node.failures")
+
+    def test_unknown_backend_is_noop(self):
+        """Test an unknown backend name disables telemetry."""
+        assert type(create_telemetry("nope")) is Telemetry
+
+    def test_file_backend_from_environment(self, monkeypatch, tmp_path):
+        """Test the file backend is created from environment variables."""
+        monkeypatch.setenv("SKYNETTE_TELEMETRY", "file")
+        monkeypatch.setenv("SKYNETTE_TELEMETRY_FILE", str(tmp_path / "t.jsonl"))
+        telemetry = create_telemetry()
+
+        assert isinstance(telemetry, FileTelemetry)
+        telemetry.shutdown()
+
+    def test_nested_spans_share_trace(self, telemetry):
+        """Test child spans link to their parent and trace."""
+        with telemetry.span("outer", {"skipped": None}):
+            with telemetry.span("inner", {"obj": [1]}):
+                pass
+
+        inner, outer = _entries(telemetry, "span")
+        assert inner["parent_id"] == outer["span_id"]
+        assert inner["trace_id"] == outer["trace_id"]
+        assert outer["parent_id"] is None
+        assert outer["attributes"] == {}
+        assert inner["attributes"] == {"obj": "[1]"}
+
+    def test_exception_marks_span_failed(self, telemetry):
+        """Test an exception leaving the span is recorded."""
+        with pytest.raises(ValueError):
+            with telemetry.span("failing"):
+                raise ValueError("bad")
+
+        (span,) = _entries(telemetry, "span")
+        assert span["status"] == "error"
+        assert span["error"] == "bad"
+
+    def test_metric_points(self, telemetry):
+        """Test counters and histograms are written as data points."""
+        telemetry.add("skynette.node.failures", 1, {"node.type": "http"})
+        telemetry.record("skynette.node.duration", 12.5, {"node.type": "http"})
+
+        counter, histogram = _entries(telemetry)
+        assert counter["type"] == "counter" and counter["value"] == 1
+        assert histogram["type"] == "histogram" and histogram["value"] == 12.5
+        assert histogram["attributes"] == {"node.type": "http"}
+
+
+class TestInstrumentation:
+    """Tests for spans and metrics emitted by instrumented components."""
+
+    @pytest.fixture
+    def executor(self):
+        executor = WorkflowExecutor()
+        executor.node_registry._handlers["echo"] = EchoNode
+        yield executor
+        executor.node_registry._handlers.pop("echo", None)
+
+    @pytest.mark.asyncio
+    async def test_workflow_and_node_spans(self, telemetry, executor):
+        """Test node spans are children of the workflow span."""
+        workflow = Workflow(
+            name="Traced",
+            nodes=[
+                WorkflowNode(id="a", type="echo", name="A", config={"value": 1}),
+                WorkflowNode(id="b", type="echo", name="B", config={"fail": True}),
+            ],
+            connections=[WorkflowConnection(source_node_id="a", target_node_id="b")],
+        )
+        await executor.execute(workflow)
+
+        spans = {span["name"]: span for span in _entries(telemetry, "span")}
+        run = spans["workflow.run"]
+        assert run["attributes"]["workflow.id"] == workflow.id
+        assert run["attributes"]["workflow.status"] == "failed"
+        nodes = [s for s in _entries(telemetry, "span") if s["name"] == "node.execute"]
+        assert {s["attributes"]["node.id"] for s in nodes} == {"a", "b"}
+        assert all(s["parent_id"] == run["span_id"] for s in nodes)
+        assert all(s["attributes"]["node.type"] == "echo" for s in nodes)
+
+        counters = {c["name"]: c for c in _entries(telemetry, "counter")}
+        assert counters["skynette.node.failures"]["attributes"]["node.type"] == "echo"
+        assert counters["skynette.workflow.runs"]["attributes"]["status"] == "failed"
+
+    @pytest.mark.asyncio
+    async def test_gateway_tokens_and_cost(self, telemetry):
+        """Test AI calls record latency, tokens and cost."""
+        gateway = AIGateway()
+        gateway.register_provider(FakeProvider())
+        await gateway.chat([])
+
+        (span,) = _entries(telemetry, "span")
+        assert span["name"] == "ai.chat"
+        assert span["attributes"]["ai.prompt_tokens"] == 1000
+        counters = _entries(telemetry, "counter")
+        tokens = {
+            c["attributes"]["token.type"]: c["value"]
+            for c in counters
+            if c["name"] == "skynette.ai.tokens"
+        }
+        assert tokens == {"input": 1000, "output": 500}
+        (cost,) = [c for c in counters if c["name"] == "skynette.ai.cost"]
+        assert cost["value"] == pytest.approx(0.06)
+
+    @pytest.mark.asyncio
+    async def test_webhook_request_metrics(self, telemetry, tmp_path):
+        """Test webhook requests are counted by status."""
+        manager = WebhookManager(store=WebhookStore(db_path=tmp_path / "webhooks.db"))
+        request = WebhookRequest(
+            method="POST", path="/missing", headers={}, query_params={}, body=b""
+        )
+        await manager.handle_request(request)
+
+        (span,) = _entries(telemetry, "span")
+        assert span["attributes"]["http.status_code"] == 404
+        (counter,) = _entries(telemetry, "counter")
+        assert counter["name"] == "skynette.webhook.requests"
+        assert counter["attributes"]["http.status_code"] == 404
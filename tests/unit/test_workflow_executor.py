@@ -52,6 +52,26 @@ class MockDataNode(BaseNode):
         return config.get("return_data", {"default": "data"})
 
 
+class MockSlowNode(BaseNode):
+    """A mock node that sleeps and tracks how many instances run at once."""
+
+    type = "mock_slow"
+    name = "Mock Slow"
+    category = "test"
+
+    active = 0
+    peak = 0
+
+    async def execute(self, config: dict, context: dict):
+        MockSlowNode.active += 1
+        MockSlowNode.peak = max(MockSlowNode.peak, MockSlowNode.active)
+        try:
+            await asyncio.sleep(config.get("delay", 0.05))
+        finally:
+            MockSlowNode.active -= 1
+        return {"prev": context.get("$prev")}
+
+
 @pytest.fixture
 def executor():
     """Create a workflow executor for testing."""
@@ -60,11 +80,15 @@ def executor():
     executor.node_registry._handlers["mock_success"] = MockSuccessNode
     executor.node_registry._handlers["mock_fail"] = MockFailNode
     executor.node_registry._handlers["mock_data"] = MockDataNode
+    executor.node_registry._handlers["mock_slow"] = MockSlowNode
+    MockSlowNode.active = 0
+    MockSlowNode.peak = 0
     yield executor
     # Cleanup - remove mock nodes after test
     executor.node_registry._handlers.pop("mock_success", None)
     executor.node_registry._handlers.pop("mock_fail", None)
     executor.node_registry._handlers.pop("mock_data", None)
+    executor.node_registry._handlers.pop("mock_slow", None)
 
 
 @pytest.mark.asyncio
@@ -284,6 +308,85 @@ class TestWorkflowExecutor:
         assert "Unknown node type" in execution.error or execution.error is not None
 
 
+def _fan_out_workflow(branches: int, settings: dict | None = None):
+    """Build a trigger -> N slow branches -> join workflow."""
+    start = WorkflowNode(type="mock_data", name="Start", config={"return_data": {"n": 1}})
+    join = WorkflowNode(type="mock_success", name="Join")
+    slow_nodes = [WorkflowNode(type="mock_slow", name=f"Slow{i}") for i in range(branches)]
+
+    connections = []
+    for slow in slow_nodes:
+        connections.append(WorkflowConnection(source_node_id=start.id, target_node_id=slow.id))
+        connections.append(WorkflowConnection(source_node_id=slow.id, target_node_id=join.id))
+
+    workflow = Workflow(
+        name="FanOut",
+        nodes=[start, *slow_nodes, join],
+        connections=connections,
+        settings=settings or {},
+    )
+    return workflow, start, slow_nodes, join
+
+
+@pytest.mark.asyncio
+class TestParallelScheduling:
+    """Tests for running independent branches concurrently."""
+
+    async def test_independent_branches_run_concurrently(self, executor):
+        """Sibling branches should overlap instead of running one after another."""
+        workflow, _, slow_nodes, join = _fan_out_workflow(5)
+
+        execution = await executor.execute(workflow)
+
+        assert execution.status == "completed"
+        assert len(execution.node_results) == 7
+        assert MockSlowNode.peak == 5
+        # The join node runs only after every branch has finished
+        assert execution.node_results[-1].node_id == join.id
+
+    async def test_max_concurrency_setting(self, executor):
+        """max_concurrency in workflow settings bounds parallelism."""
+        workflow, _, _, _ = _fan_out_workflow(6, settings={"max_concurrency": 2})
+
+        execution = await executor.execute(workflow)
+
+        assert execution.status == "completed"
+        assert MockSlowNode.peak == 2
+
+    async def test_prev_is_upstream_output(self, executor):
+        """Each branch sees its own upstream node as $prev."""
+        workflow, start, slow_nodes, _ = _fan_out_workflow(3)
+
+        execution = await executor.execute(workflow)
+
+        for slow in slow_nodes:
+            assert execution.get_result(slow.id).data["prev"] == {"n": 1}
+
+    async def test_stop_strategy_prevents_new_nodes(self, executor):
+        """A failing branch with on_error=stop keeps downstream nodes from starting."""
+        start = WorkflowNode(type="mock_success", name="Start")
+        fail = WorkflowNode(type="mock_fail", name="Fail", config={"on_error": "stop"})
+        slow = WorkflowNode(type="mock_slow", name="Slow")
+        after = WorkflowNode(type="mock_success", name="After")
+
+        workflow = Workflow(
+            name="ParallelStop",
+            nodes=[start, fail, slow, after],
+            connections=[
+                WorkflowConnection(source_node_id=start.id, target_node_id=fail.id),
+                WorkflowConnection(source_node_id=start.id, target_node_id=slow.id),
+                WorkflowConnection(source_node_id=slow.id, target_node_id=after.id),
+            ],
+        )
+
+        execution = await executor.execute(workflow)
+
+        assert execution.status == "failed"
+        # The slow sibling was already running and is allowed to finish
+        assert execution.get_result(slow.id).success is True
+        assert execution.get_result(after.id) is None
+
+
 @pytest.mark.asyncio
 class TestDebugExecutor:
     """Tests for DebugExecutor."""
@@ -373,3 +476,225 @@ class TestDebugExecutor:
 
         executor.remove_breakpoint("node1")
         assert "node1" not in executor.breakpoints
+
+
+def _branch_workflow(condition: bool):
+    """Build start -> if_else -> (true_node | false_node) -> merge."""
+    start = WorkflowNode(type="mock_data", name="Start", config={"return_data": {"n": 1}})
+    check = WorkflowNode(
+        type="if_else",
+        name="Check",
+        config={"condition_type": "boolean", "boolean_value": condition},
+    )
+    on_true = WorkflowNode(type="mock_data", name="OnTrue", config={"return_data": "yes"})
+    on_false = WorkflowNode(type="mock_data", name="OnFalse", config={"return_data": "no"})
+    after_false = WorkflowNode(type="mock_success", name="AfterFalse")
+    merge = WorkflowNode(type="mock_slow", name="Merge", config={"delay": 0})
+
+    workflow = Workflow(
+        name="Branch",
+        nodes=[start, check, on_true, on_false, after_false, merge],
+        connections=[
+            WorkflowConnection(source_node_id=start.id, target_node_id=check.id),
+            WorkflowConnection(
+                source_node_id=check.id, source_port="true", target_node_id=on_true.id
+            ),
+            WorkflowConnection(
+                source_node_id=check.id, source_port="false", target_node_id=on_false.id
+            ),
+            WorkflowConnection(source_node_id=on_false.id, target_node_id=after_false.id),
+            WorkflowConnection(source_node_id=on_true.id, target_node_id=merge.id),
+            WorkflowConnection(source_node_id=after_false.id, target_node_id=merge.id),
+        ],
+    )
+    return workflow, on_true, on_false, after_false, merge
+
+
+@pytest.mark.asyncio
+class TestBranchPruning:
+    """Tests for skipping branches that were not taken."""
+
+    async def test_false_branch_skipped(self, executor):
+        """Nodes only reachable through the untaken port are skipped."""
+        workflow, on_true, on_false, after_false, merge = _branch_workflow(True)
+
+        execution = await executor.execute(workflow)
+
+        assert execution.status == "completed"
+        assert execution.get_result(on_true.id).success is True
+        assert execution.get_result(on_false.id) is None
+        assert execution.get_result(after_false.id) is None
+        assert execution.is_skipped(on_false.id)
+        assert execution.is_skipped(after_false.id)
+
+    async def test_merge_uses_live_input(self, executor):
+        """A merge node runs and takes $prev from the branch that ran."""
+        workflow, on_true, on_false, after_false, merge = _branch_workflow(False)
+
+        execution = await executor.execute(workflow)
+
+        assert execution.is_skipped(on_true.id)
+        assert not execution.is_skipped(merge.id)
+        after_false_output = execution.get_result(after_false.id).data
+        assert execution.get_result(merge.id).data["prev"] == after_false_output
+
+    async def test_default_port_always_followed(self, executor):
+        """Connections from the default output port ignore the branch result."""
+        check = WorkflowNode(
+            type="if_else",
+            name="Check",
+            config={"condition_type": "boolean", "boolean_value": False},
+        )
+        log = WorkflowNode(type="mock_success", name="Log")
+        workflow = Workflow(
+            name="DefaultPort",
+            nodes=[check, log],
+            connections=[WorkflowConnection(source_node_id=check.id, target_node_id=log.id)],
+        )
+
+        execution = await executor.execute(workflow)
+
+        assert execution.get_result(log.id).success is True
+        assert execution.skipped_nodes == []
+
+
+def _chain_workflow(length: int = 4):
+    """Build trigger -> n1 -> n2 -> ... data nodes."""
+    nodes = [WorkflowNode(id="trigger", type="manual_trigger", name="Trigger")]
+    connections = []
+    for i in range(1, length + 1):
+        nodes.append(
+            WorkflowNode(id=f"n{i}", type="mock_data", name=f"N{i}", config={"return_data": i})
+        )
+        connections.append(
+            WorkflowConnection(source_node_id=nodes[-2].id, target_node_id=nodes[-1].id)
+        )
+    return Workflow(name="Chain", nodes=nodes, connections=connections)
+
+
+def _reused(execution):
+    return {r.node_id for r in execution.node_results if r.reused}
+
+
+@pytest.mark.asyncio
+class TestIncrementalExecution:
+    """Tests for re-running only the nodes that changed."""
+
+    async def test_unchanged_workflow_reuses_everything(self, executor):
+        """All nodes reuse their previous output when nothing changed."""
+        workflow = _chain_workflow()
+        first = await executor.execute(workflow)
+
+        second = await executor.execute(workflow, previous_execution=first)
+
+        assert second.status == "completed"
+        assert _reused(second) == {"trigger", "n1", "n2", "n3", "n4"}
+        assert second.get_result("n4").data == 4
+
+    async def test_config_change_reruns_downstream(self, executor):
+        """Editing a node re-runs it and everything after it."""
+        workflow = _chain_workflow()
+        first = await executor.execute(workflow)
+
+        workflow.nodes[2].config["return_data"] = 20
+        second = await executor.execute(workflow, previous_execution=first)
+
+        assert _reused(second) == {"trigger", "n1"}
+        assert second.get_result("n2").data == 20
+        assert second.get_result("n2").reused is False
+
+    async def test_reused_outputs_available_to_expressions(self, executor):
+        """Re-run nodes can reference clean nodes through $nodes."""
+        workflow = _chain_workflow(2)
+        first = await executor.execute(workflow)
+
+        workflow.nodes[2].config["return_data"] = "{{$nodes.n1}}-x"
+        second = await executor.execute(workflow, previous_execution=first)
+
+        assert second.get_result("n2").data == "1-x"
+
+    async def test_explicit_dirty_nodes(self, executor):
+        """Nodes passed as dirty re-run even without changes."""
+        workflow = _chain_workflow()
+        first = await executor.execute(workflow)
+
+        second = await executor.execute(workflow, previous_execution=first, dirty_nodes={"n3"})
+
+        assert _reused(second) == {"trigger", "n1", "n2"}
+
+    async def test_failed_node_reruns(self, executor):
+        """Nodes without a successful previous result always run."""
+        workflow = _chain_workflow(2)
+        workflow.nodes[1].type = "mock_fail"
+        workflow.nodes[1].config["on_error"] = "continue"
+        first = await executor.execute(workflow)
+
+        workflow.nodes[1].type = "mock_data"
+        workflow.nodes[1].config.pop("on_error")
+        second = await executor.execute(workflow, previous_execution=first)
+
+        assert _reused(second) == {"trigger"}
+        assert second.get_result("n2").success is True
+
+    async def test_trigger_data_change_runs_everything(self, executor):
+        """Different trigger data means a full run."""
+        workflow = _chain_workflow()
+        first = await executor.execute(workflow, trigger_data={"a": 1})
+
+        second = await executor.execute(workflow, trigger_data={"a": 2}, previous_execution=first)
+
+        assert _reused(second) == set()
+
+    async def test_new_connection_reruns_target(self, executor):
+        """Rewiring a node's inputs makes it dirty."""
+        workflow = _chain_workflow()
+        first = await executor.execute(workflow)
+
+        workflow.connections.append(WorkflowConnection(source_node_id="n1", target_node_id="n3"))
+        second = await executor.execute(workflow, previous_execution=first)
+
+        assert _reused(second) == {"trigger", "n1", "n2"}
+
+
+@pytest.mark.asyncio
+class TestConfigTemplates:
+    """Tests for node configs compiled once and reused across runs."""
+
+    async def test_template_reused_across_runs(self, executor):
+        """Repeated runs of an unchanged node reuse its compiled config."""
+        workflow = Workflow(
+            name="Templates",
+            nodes=[
+                WorkflowNode(
+                    id="n1",
+                    type="mock_data",
+                    name="N1",
+                    config={"return_data": "{{$trigger.value}}"},
+                )
+            ],
+        )
+        executor.template_cache.clear()
+
+        for value in (1, 2, 3):
+            execution = await executor.execute(workflow, trigger_data={"value": value})
+            assert execution.get_result("n1").data == value
+
+        assert len(executor.template_cache) == 1
+
+    async def test_edited_config_takes_effect(self, executor):
+        """Editing a config in place compiles it again on the next run."""
+        workflow = Workflow(
+            name="Templates",
+            nodes=[
+                WorkflowNode(
+                    id="n1", type="mock_data", name="N1", config={"return_data": "{{1 + 1}}"}
+                )
+            ],
+        )
+        first = await executor.execute(workflow)
+
+        workflow.nodes[0].config["return_data"] = "{{2 * 3}}"
+        second = await executor.execute(workflow)
+
+        assert first.get_result("n1").data == 2.0
+        assert second.get_result("n1").data == 6.0